@@ -2,6 +2,7 @@ from flask import Flask, request, jsonify
 from flask_cors import CORS
 from services.firebase_services.firebase_interaction_service import FirebaseInteractionService
 from services.firebase_services.firebase_post_service import FirebasePostService
+from services.firebase_services.async_firebase_user_service import AsyncFirebaseUserService
 from models.emotion_analyzer import EmotionAnalyzer
 from models.content_recommender import ContentRecommender
 from models.ad_manager import AdManager
@@ -16,8 +17,16 @@ from config.config import (
     API_HOST,
     API_PORT,
     EMOTION_CATEGORIES,
-    OPPOSITE_EMOTIONS
+    OPPOSITE_EMOTIONS,
+    EMOTION_HISTORY_MAX_COUNT,
+    CONTENT_QUALITY_JOB_INTERVAL,
+    FANOUT_CALL_TIMEOUT,
+    RECOMMENDATION_BUDGET_SEC,
+    DEADLINE_STAGE_MIN_SEC,
+    AD_PERFORMANCE_REFRESH_INTERVAL,
+    AD_BANDIT_CHECKPOINT_INTERVAL
 )
+import atexit
 import os
 import traceback
 import asyncio
@@ -27,6 +36,16 @@ from services.reccomend_service.user_history_utils import get_recent_shown_post_
 from services.reccomend_service.ab_test_logger import log_recommendation_event
 from services.reccomend_service.cold_start_utils import get_cold_start_content
 from services.reccomend_service.date_utils import parse_timestamp
+from services.reccomend_service.post_catalog import PostCatalog
+from services.reccomend_service.catalog_index import CatalogIndex
+from services.reccomend_service.content_quality import ContentQualityJob, QualityScheduler
+from services.reccomend_service.parallel_fetch import fetch_concurrently
+from services.reccomend_service.deadline import Deadline
+from services.reccomend_service.ad_performance import AdPerformanceRefresher
+from services.reccomend_service.ad_inventory import AdInventory
+from services.reccomend_service.ad_event_buffer import AdEventBuffer
+from services.reccomend_service.ad_bandit import AdBandit, AdBanditCheckpointer
+from services.reccomend_service.emotion_aggregate import load_aggregate, record_interaction
 from datetime import datetime, timezone, timedelta
 import time
 
@@ -46,41 +65,95 @@ firebase = FirebaseInteractionService()
 firebase_post = FirebasePostService()
 emotion_analyzer = EmotionAnalyzer()
 content_recommender = ContentRecommender()
-ad_manager = AdManager(firebase)
+# Reklamlar bir kez yüklenir; snapshot listener ile güncellenir, skor sütunları önbellekte tutulur
+ad_inventory = AdInventory(firebase.db).start()
+# Reklam olayları kuyrukta birikir, batch'lerle yazılır; kapanışta kuyruk boşaltılır
+ad_event_buffer = AdEventBuffer(firebase.db).start()
+# Thompson örneklemesi için (reklam, duygu) sonsalları; worker'lar arası dosya checkpoint'iyle paylaşılır
+ad_bandit = AdBandit()
+ad_manager = AdManager(firebase, inventory=ad_inventory, event_buffer=ad_event_buffer, bandit=ad_bandit)
 word_analyzer = WordAnalyzer()
-user_profile_manager = UserProfileManager(firebase)
+user_profile_manager = UserProfileManager(AsyncFirebaseUserService())
 performance_monitor = PerformanceMonitor()
+# Posts koleksiyonu bir kez yüklenir, sonrasında sadece değişiklikler uygulanır
+post_catalog = PostCatalog(firebase_post).start()
+# Yenilik sırası ve sütun görüntüsü (duygu, kalite, keyword satırları) katalog değiştikçe yeniden kurulur
+catalog_index = CatalogIndex().attach(post_catalog)
+# Kalite skorları süreç içinde periyodik hesaplanır; kapalıysa postMetrics'ten bir kez okunur
+content_quality_job = ContentQualityJob(firebase_post.db)
+quality_scheduler = None
+if CONTENT_QUALITY_JOB_INTERVAL > 0:
+    quality_scheduler = QualityScheduler(content_quality_job, post_catalog, catalog_index).start()
+else:
+    try:
+        catalog_index.set_quality(content_quality_job.load())
+    except Exception as quality_err:
+        print(f"[API ERROR] Kalite skorları okunamadı: {quality_err}")
+# Reklam performans özeti adMetrics'ten arka planda yeniden kurulur; metrik yazımları anında eklenir
+ad_performance_refresher = AdPerformanceRefresher(ad_manager.performance_view, firebase.db)
+if AD_PERFORMANCE_REFRESH_INTERVAL > 0:
+    ad_performance_refresher.start()
+else:
+    try:
+        ad_performance_refresher.run_once()
+    except Exception as ad_perf_err:
+        print(f"[API ERROR] Reklam performans özeti okunamadı: {ad_perf_err}")
+ad_bandit_checkpointer = AdBanditCheckpointer(ad_bandit)
+if AD_BANDIT_CHECKPOINT_INTERVAL > 0:
+    ad_bandit_checkpointer.start()
+else:
+    atexit.register(ad_bandit_checkpointer.close)
+    try:
+        ad_bandit_checkpointer.run_once()
+    except Exception as ad_bandit_err:
+        print(f"[API ERROR] Reklam sonsalları yüklenemedi: {ad_bandit_err}")
 
 MAX_FEED_HISTORY = 100  # Her kullanıcı için maksimum feed geçmişi kaydı
 DOMINANT_EMOTION_THRESHOLD = 0.6 # Threshold for Scenario 2
 
-def has_interaction_with_posts(user_interactions, post_ids):
+def load_emotion_aggregate(user_id, aggregate_data):
     """
-    Belirtilen post_ids listesindeki içeriklere kullanıcı etkileşimi olmuş mu kontrol eder.
-    Sadece like, comment, emotion gibi etkileşimler dikkate alınır.
+    Kullanıcının duygu özetini döndürür. Özeti henüz olmayan (eski) kullanıcılar için
+    etkileşim geçmişinden bir kez oluşturulup kaydedilir; sonraki istekler tek belge okur.
     """
-    post_ids_set = set(post_ids)
-    valid_types = {'like', 'comment', 'emotion'}
-    for interaction in user_interactions:
-        pid = interaction.get('postId') or interaction.get('content_id') or interaction.get('id')
-        if pid in post_ids_set:
-            if interaction.get('interactionType') in valid_types:
-                return True
-    return False
+    if aggregate_data is None:
+        print(f"[API] Kullanıcı {user_id} için duygu özeti yok, geçmişten oluşturuluyor...")
+    return load_aggregate(firebase, user_id, aggregate_data, max_count=EMOTION_HISTORY_MAX_COUNT)
+
+def apply_interaction_to_aggregate(user_id, interaction):
+    """Yeni etkileşimi kullanıcının duygu özetine işler (transaction ile)."""
+    return record_interaction(firebase, user_id, interaction, max_count=EMOTION_HISTORY_MAX_COUNT)
 
 @app.route('/api/recommendations/<user_id>', methods=['GET'])
 def get_recommendations(user_id):
     print(f"[API] /api/recommendations endpoint çağrıldı: user_id={user_id}")
     try:
         now = datetime.now(timezone.utc)
-        # 1. Son aktivite ve feed geçmişi yönetimi (existing logic is complex, keeping as is for now)
-        print("[API DEBUG] Handling last active and feed history...")
-        last_active_doc = None
-        try:
-            last_active_doc = firebase.db.collection('userFeedLastActive').document(user_id).get()
-        except Exception as get_err:
-            print(f"[API ERROR] userFeedLastActive get() hatası: {get_err}")
+        # Tüm aşamalar aynı istek bütçesini paylaşır; isteğe bağlı aşamalar süre azsa atlanır
+        deadline = Deadline(RECOMMENDATION_BUDGET_SEC)
+        # 1-3. Bağımsız okumalar paylaşılan havuzda eşzamanlı yapılır, analizden önce birleştirilir
+        print("[API DEBUG] Fetching last active, shown feeds and emotion aggregate concurrently...")
+
+        def fetch_shown_feeds():
+            docs = firebase.db.collection('userShownFeeds').where('user_id', '==', user_id).order_by('timestamp', direction='DESCENDING').limit(100).stream()
+            return [doc.to_dict() for doc in docs]
+
+        fetched, fetch_timings = fetch_concurrently(
+            {
+                'last_active': lambda: firebase.db.collection('userFeedLastActive').document(user_id).get(),
+                'shown_feeds': fetch_shown_feeds,
+                'emotion_aggregate': lambda: firebase.get_emotion_aggregate(user_id)
+            },
+            defaults={'shown_feeds': [], 'emotion_aggregate': None},
+            default_timeout=deadline.timeout(FANOUT_CALL_TIMEOUT)
+        )
+        performance_monitor.record_source_timings(fetch_timings)
+        print(f"[API DEBUG] Fetch timings (sn): { {k: round(v, 3) for k, v in fetch_timings.items()} }")
 
+        # İçerikler süreç içi katalogdan ve indeksinden gelir (I/O yok, istek başına kopya yok)
+        print(f"[API] Katalog: {len(post_catalog)} adet içerik (katalog v{post_catalog.version})")
+
+        last_active_doc = fetched['last_active']
         last_active = None
         if last_active_doc and last_active_doc.exists:
             last_active_data = last_active_doc.to_dict()
@@ -104,17 +177,9 @@ def get_recommendations(user_id):
             except Exception as delete_err:
                 print(f"[API ERROR] Eski feed geçmişi silinirken hata: {delete_err}")
         else:
-            print("[API DEBUG] Fetching recent shown feeds...")
-            try:
-                shown_feed_docs = firebase.db.collection('userShownFeeds').where('user_id', '==', user_id).order_by('timestamp', direction='DESCENDING').limit(100).stream()
-                count = 0
-                for doc in shown_feed_docs:
-                    data = doc.to_dict()
-                    shown_post_ids.extend(data.get('post_ids', []))
-                    count += 1
-                print(f"[API DEBUG] Found {count} shown feed documents. Total shown_post_ids: {len(shown_post_ids)}")
-            except Exception as e:
-                print(f"[API ERROR] shown_post_ids çekilemedi: {e}")
+            for data in fetched['shown_feeds']:
+                shown_post_ids.extend(data.get('post_ids', []))
+            print(f"[API DEBUG] Found {len(fetched['shown_feeds'])} shown feed documents. Total shown_post_ids: {len(shown_post_ids)}")
 
         # Update last active timestamp (existing logic)
         print("[API DEBUG] Updating last active timestamp...")
@@ -123,23 +188,10 @@ def get_recommendations(user_id):
         except Exception as update_err:
              print(f"[API ERROR] Son aktivite güncellenirken hata: {update_err}")
 
-        # 2. Kullanıcı etkileşimlerini getir (existing logic)
-        print("[API] Kullanıcı etkileşimleri getiriliyor...")
-        user_interactions = []
-        try:
-            user_interactions = firebase.get_user_interactions(user_id)
-            print(f"[API] Kullanıcı etkileşimleri alındı: {len(user_interactions)} adet etkileşim")
-        except Exception as e:
-            print(f"[API ERROR] Kullanıcı etkileşimleri alınamadı: {e}")
-
-        # 3. İçerikleri getir (existing logic)
-        print("[API] İçerikler getiriliyor...")
-        contents = []
-        try:
-            contents = firebase_post.get_all_posts()
-            print(f"[API] İçerikler alındı: {len(contents)} adet içerik")
-        except Exception as e:
-             print(f"[API ERROR] İçerikler alınamadı: {e}")
+        # Tüm etkileşim geçmişi yerine tek özet belgesi (geçmiş uzunluğundan bağımsız)
+        emotion_aggregate = load_emotion_aggregate(user_id, fetched['emotion_aggregate'])
+        has_history = emotion_aggregate.interaction_count > 0
+        print(f"[API] Kullanıcı duygu özeti alındı: {emotion_aggregate.interaction_count} adet etkileşim")
 
         # 4. Duygu analizi ve öneri oluşturma (UPDATED LOGIC)
         emotion_pattern = {}
@@ -149,11 +201,11 @@ def get_recommendations(user_id):
         peak_moment_index = None
         final_mix = [] # Initialize final_mix here
 
-        if not user_interactions:
+        if not has_history:
             # --- SCENARIO 1: COLD START --- #
             print("[API] COLD START: Etkileşim yok, soğuk başlangıç içeriği oluşturuluyor.")
             content_mix = get_cold_start_content(
-                contents,
+                post_catalog.get_posts(),
                 list(EMOTION_CATEGORIES.values()),
                 20 # Desired number of cold start items
             )
@@ -166,9 +218,9 @@ def get_recommendations(user_id):
         else:
             # --- SCENARIOS WITH INTERACTIONS --- #
             # Analyze pattern, current emotion, transitions (existing logic)
-            emotion_pattern = emotion_analyzer.analyze_pattern(user_interactions, user_id)
-            current_emotion, _ = emotion_analyzer.get_current_emotion_and_transitions(user_interactions)
-            personalized_transitions = emotion_analyzer.analyze_transition_patterns(user_interactions)
+            emotion_pattern = emotion_analyzer.analyze_aggregate(emotion_aggregate, user_id)
+            current_emotion = emotion_aggregate.last_emotion
+            personalized_transitions = emotion_aggregate.transition_counts()
             print(f"[API] Analiz: Pattern={emotion_pattern}, Current={current_emotion}, Transitions={len(personalized_transitions)}")
 
             # --- SCENARIO 2: DOMINANT EMOTION CHECK & ADJUSTMENT --- #
@@ -199,7 +251,7 @@ def get_recommendations(user_id):
 
             # --- SCENARIO 3 Check: Feed Esnetme (Existing logic for repeated refresh without interaction) --- #
             if shown_post_ids:
-                interacted = has_interaction_with_posts(user_interactions, shown_post_ids[-20:])
+                interacted = emotion_aggregate.has_engaged_with(shown_post_ids[-20:])
                 if not interacted:
                     print("[API] FEED ESNETME (Etkileşimsiz Yenileme): Desen ayarlanıyor...")
                     # Standard feed esnetme logic (reduce dominant, distribute to others)
@@ -220,15 +272,22 @@ def get_recommendations(user_id):
                         emotion_pattern = temp_pattern
                         print(f"[API] FEED ESNETME Sonrası Desen: {emotion_pattern}")
 
+            # Keyword ilgi profili etkileşim verilen postlardan kurulur (TTL ile önbellekte)
+            keyword_profile = content_recommender.keyword_profiles.get(
+                user_id, emotion_aggregate.recent_post_ids, catalog_index)
+
             # Get content mix using potentially adjusted pattern
             print("[API] Detaylı hikaye akışlı içerik karışımı oluşturuluyor (Ayarlanmış pattern ile)...")
             content_mix, peak_moment_index = content_recommender.get_content_mix(
-                contents,
+                None,  # Aday havuzu catalog_index'in tamamı
                 emotion_pattern, # Use the (potentially adjusted) pattern
                 limit=20,
                 shown_post_ids=shown_post_ids,
                 current_emotion=current_emotion,
-                personalized_transitions=personalized_transitions
+                personalized_transitions=personalized_transitions,
+                catalog_index=catalog_index,
+                keyword_profile=keyword_profile,
+                deadline=deadline
             )
             print(f"[API] İçerik karışımı oluşturuldu ({len(content_mix)} adet). Peak index: {peak_moment_index}")
 
@@ -245,17 +304,24 @@ def get_recommendations(user_id):
                 shown_post_ids = []
                 # Retry content mix without shown_post_ids
                 content_mix, peak_moment_index = content_recommender.get_content_mix(
-                    contents,
+                    None,
                     emotion_pattern,
                     limit=20,
                     shown_post_ids=shown_post_ids, # Now empty
                     current_emotion=current_emotion,
-                    personalized_transitions=personalized_transitions
+                    personalized_transitions=personalized_transitions,
+                    catalog_index=catalog_index,
+                    keyword_profile=keyword_profile,
+                    deadline=deadline
                 )
                 print(f"[API] Fallback sonrası içerik karışımı oluşturuldu ({len(content_mix)} adet). Peak index: {peak_moment_index}")
 
         # 5. Reklamları ekle (only if not cold start)
-        if content_mix:
+        if content_mix and not deadline.allows(DEADLINE_STAGE_MIN_SEC['ads']):
+            deadline.degrade('ads')
+            final_mix = content_mix
+            print(f"[API] Süre bütçesi azaldı ({deadline.remaining():.3f} sn kaldı), reklam yerleştirme atlandı.")
+        elif content_mix:
             print("[API] Stratejik reklam yerleştirme başlatılıyor...")
             ads_start = time.time()
             try:
@@ -296,31 +362,40 @@ def get_recommendations(user_id):
                     user_id=user_id,
                     recommended_posts=[c['id'] for c in final_mix if c.get('type') != 'ad' and 'id' in c],
                     params={
-                        "story_flow_enabled": bool(user_interactions), # False for cold start
-                        "story_flow_type": "detailed_personalized" if user_interactions else "cold_start",
-                        "peak_ad_placement": peak_moment_index is not None if user_interactions else False,
-                        "cold_start": not bool(user_interactions)
+                        "story_flow_enabled": has_history, # False for cold start
+                        "story_flow_type": "detailed_personalized" if has_history else "cold_start",
+                        "peak_ad_placement": peak_moment_index is not None if has_history else False,
+                        "cold_start": not has_history
                      }
                 )
             except Exception as logerr:
                  print(f"[API] Loglama hatası: {logerr}")
 
-        # 8. Feed geçmişi limiti kontrolü (always run)
-        try:
-            shown_feed_docs_list = list(firebase.db.collection('userShownFeeds').where('user_id', '==', user_id).order_by('timestamp', direction='DESCENDING').limit(MAX_FEED_HISTORY + 5).stream())
-            if len(shown_feed_docs_list) > MAX_FEED_HISTORY:
-                print(f"[API] Feed history limit ({MAX_FEED_HISTORY}) reached. Deleting oldest...")
-                for doc in shown_feed_docs_list[MAX_FEED_HISTORY:]:
-                    firebase.db.collection('userShownFeeds').document(doc.id).delete()
-        except Exception as hist_err:
-            print(f"[API ERROR] Feed history cleanup error: {hist_err}")
+        # 8. Feed geçmişi limiti kontrolü (süre bütçesi yetmezse sonraki isteğe kalır)
+        if not deadline.allows(DEADLINE_STAGE_MIN_SEC['history_trim']):
+            deadline.degrade('history_trim')
+            print("[API] Süre bütçesi azaldı, feed geçmişi temizliği atlandı.")
+        else:
+            try:
+                shown_feed_docs_list = list(firebase.db.collection('userShownFeeds').where('user_id', '==', user_id).order_by('timestamp', direction='DESCENDING').limit(MAX_FEED_HISTORY + 5).stream())
+                if len(shown_feed_docs_list) > MAX_FEED_HISTORY:
+                    print(f"[API] Feed history limit ({MAX_FEED_HISTORY}) reached. Deleting oldest...")
+                    for doc in shown_feed_docs_list[MAX_FEED_HISTORY:]:
+                        firebase.db.collection('userShownFeeds').document(doc.id).delete()
+            except Exception as hist_err:
+                print(f"[API ERROR] Feed history cleanup error: {hist_err}")
+
+        if deadline.degraded:
+            print(f"[API] Bozulmuş yanıt ({deadline.elapsed():.3f} sn): atlanan/kısaltılan aşamalar {deadline.degraded_stages}")
 
         return jsonify({
             'success': True,
             'recommendations': final_mix,
             'emotion_pattern': emotion_pattern,
             'current_emotion': current_emotion,
-            'peak_index_for_ad': peak_moment_index
+            'peak_index_for_ad': peak_moment_index,
+            'degraded': deadline.degraded,
+            'degraded_stages': deadline.degraded_stages
         })
 
     except Exception as e:
@@ -361,6 +436,19 @@ def track_interaction():
             print(f"[API] Etkileşim kaydedildi: {success}")
             
             if success:
+                # Kullanıcının duygu özetini güncelle (hata olursa istek başarısız sayılmaz)
+                try:
+                    apply_interaction_to_aggregate(data['userId'], {
+                        'postId': data['postId'],
+                        'interactionType': data['interactionType'],
+                        'emotion': data['emotion'],
+                        'confidence': data.get('confidence', 0.5)
+                    })
+                except Exception as agg_err:
+                    print(f"[API ERROR] Duygu özeti güncellenemedi: {agg_err}")
+                # Keyword profili özetin son postlarından kurulur; yeni etkileşim TTL'i beklemeden yansısın
+                content_recommender.keyword_profiles.invalidate(data['userId'])
+
                 # İçerik etkileşimini güncelle
                 content_recommender.update_content_engagement(
                     data['postId'],
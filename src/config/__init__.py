@@ -10,6 +10,57 @@ from .config import (
     FIREBASE_CONFIG,
     API_HOST,
     API_PORT,
+    POST_CATALOG_POLL_INTERVAL,
+    POST_CATALOG_RESYNC_INTERVAL,
+    POST_CATALOG_READY_TIMEOUT,
+    FANOUT_MAX_WORKERS,
+    FANOUT_CALL_TIMEOUT,
+    EMOTION_AGGREGATE_HALF_LIFE_DAYS,
+    EMOTION_AGGREGATE_RECENT_POSTS,
+    EMOTION_HISTORY_WINDOW_DAYS,
+    EMOTION_HISTORY_MAX_COUNT,
+    INTERACTIONS_MIGRATED,
+    LEGACY_INTERACTION_SCAN_LIMIT,
+    STORY_ARC_LENGTH,
+    STORY_ARC_BEAM_WIDTH,
+    STORY_ARC_PRIOR_STRENGTH,
+    KEYWORD_PROFILE_TTL,
+    KEYWORD_PROFILE_MAX_USERS,
+    KEYWORD_PROFILE_DECAY,
+    ENGAGEMENT_STORE_BACKEND,
+    ENGAGEMENT_STORE_PATH,
+    ENGAGEMENT_STORE_CAPACITY,
+    ENGAGEMENT_HALF_LIFE_DAYS,
+    CANDIDATE_POOL_SIZE,
+    CANDIDATE_MIN_PER_EMOTION,
+    CANDIDATE_ARC_BOOST,
+    CANDIDATE_KEYWORD_TOP,
+    CANDIDATE_KEYWORD_FANOUT,
+    CONTENT_QUALITY_JOB_INTERVAL,
+    CONTENT_QUALITY_JOB_WRITE,
+    CONTENT_QUALITY_RANK_WEIGHT,
+    KEYWORD_BITSET_BITS,
+    MMR_LAMBDA,
+    MMR_OVERSAMPLE,
+    MMR_BUDGET_MS,
+    FILL_RANK_JITTER,
+    MAX_SAME_EMOTION_IN_ROW,
+    RECOMMENDATION_BUDGET_SEC,
+    RANKING_CHUNK_SIZE,
+    DEADLINE_STAGE_MIN_SEC,
+    AD_PERFORMANCE_WINDOW_DAYS,
+    AD_PERFORMANCE_REFRESH_INTERVAL,
+    AD_INVENTORY_POLL_INTERVAL,
+    AD_INVENTORY_READY_TIMEOUT,
+    AD_EVENT_FLUSH_INTERVAL,
+    AD_EVENT_FLUSH_SIZE,
+    AD_EVENT_MAX_PENDING,
+    AD_COUNTER_SHARDS,
+    AD_PEAK_SLOT_BONUS,
+    AD_SELECTION_STRATEGY,
+    AD_BANDIT_PRIOR,
+    AD_BANDIT_CHECKPOINT_PATH,
+    AD_BANDIT_CHECKPOINT_INTERVAL,
     MODEL_PATH,
     BATCH_SIZE,
     EPOCHS,
@@ -60,5 +111,17 @@ from .config import (
     AD_OPTIMIZATION,
     BEHAVIOR_ANALYSIS,
     PERFORMANCE_METRICS,
-    COLLECTION_USER_STORY_FLOW
+    COLLECTION_USER_STORY_FLOW,
+    COLLECTION_USER_EMOTION_AGGREGATES
+)
+from .emotion_tables import (
+    Emotion,
+    EMOTION_LABELS,
+    EMOTION_CODES,
+    N_EMOTIONS,
+    TRANSITION_MATRIX,
+    OPPOSITE_MASK,
+    AD_EMOTION_WEIGHT_VECTOR,
+    AD_EMOTION_IMPACT_VECTOR,
+    POLARITY
 )
@@ -3,6 +3,7 @@ from dotenv import load_dotenv
 from pathlib import Path
 import json
 import random
+import tempfile
 
 # .env dosyasını yükle
 load_dotenv()
@@ -52,11 +53,99 @@ COLLECTION_INTERACTIONS = 'userEmotionInteractions'
 COLLECTION_POST_METRICS = 'postMetrics'
 COLLECTION_USER_EMOTION_HISTORY = 'userEmotionHistory'
 COLLECTION_USER_STORY_FLOW = 'userStoryFlow'
+COLLECTION_USER_EMOTION_AGGREGATES = 'userEmotionAggregates'
 
 # API yapılandırması
 API_HOST = os.getenv('API_HOST', '0.0.0.0')
 API_PORT = int(os.getenv('PORT', 8000))  # Railway için PORT env variable'ını kullan
 
+# İçerik kataloğu (süreç içi post önbelleği)
+POST_CATALOG_POLL_INTERVAL = 30  # Snapshot listener yoksa updated_at sorgu aralığı (saniye)
+POST_CATALOG_RESYNC_INTERVAL = 600  # Polling modunda tam senkronizasyon aralığı (saniye)
+POST_CATALOG_READY_TIMEOUT = 30  # İlk snapshot için bekleme süresi (saniye)
+
+# Eşzamanlı Firestore okumaları
+FANOUT_MAX_WORKERS = 8  # Paylaşılan thread havuzu boyutu
+FANOUT_CALL_TIMEOUT = 5.0  # Okuma başına zaman aşımı (saniye)
+
+# Kullanıcı başına artımlı duygu özeti
+EMOTION_AGGREGATE_HALF_LIFE_DAYS = 7  # Duygu ağırlıklarının yarılanma süresi (gün)
+EMOTION_AGGREGATE_RECENT_POSTS = 50  # Özette tutulan son etkileşimli post sayısı
+
+# Etkileşim geçmişi okuma sınırları
+EMOTION_HISTORY_WINDOW_DAYS = 7  # Duygu analizinin kullandığı pencere (daha eskiler sabit ağırlıkta)
+EMOTION_HISTORY_MAX_COUNT = 500  # Tek okumada alınacak en fazla etkileşim
+# utils/migrate_documents tüm etkileşimlere timestamp_ms yazdıysa 1. O zamana kadar pencereli okumalar
+# timestamp_ms'siz eski kayıtları da (sıralı sorgu onları döndürmez) sınırlı bir taramayla ekler
+INTERACTIONS_MIGRATED = os.getenv('INTERACTIONS_MIGRATED', '0') == '1'
+LEGACY_INTERACTION_SCAN_LIMIT = 1000  # Göç öncesi kullanıcı başına taranan en fazla etkileşim
+
+# Hikaye yayı planlayıcısı (get_content_mix)
+STORY_ARC_LENGTH = 3  # Yaydaki duygu sayısı (mevcut duygu dahil)
+STORY_ARC_BEAM_WIDTH = 4  # Işın aramasında her adımda tutulan yay sayısı
+STORY_ARC_PRIOR_STRENGTH = 5.0  # Genel geçiş matrisinin satır başına sözde sayı ağırlığı
+
+# Kullanıcı keyword ilgi profili
+KEYWORD_PROFILE_TTL = 300  # Profilin önbellekte tutulma süresi (saniye)
+KEYWORD_PROFILE_MAX_USERS = 10000  # Önbellekte tutulan en fazla profil
+KEYWORD_PROFILE_DECAY = 0.95  # Etkileşimli postlar yeniden eskiye bu oranla azalan ağırlık alır
+
+# Post etkileşim sayaçları (ContentRecommender engagement skoru)
+ENGAGEMENT_STORE_BACKEND = os.getenv('ENGAGEMENT_STORE', 'sqlite')  # 'sqlite' (worker'lar arası paylaşılır) veya 'memory'
+ENGAGEMENT_STORE_PATH = os.getenv('ENGAGEMENT_STORE_PATH', os.path.join(tempfile.gettempdir(), 'recommend_engagement.sqlite3'))
+ENGAGEMENT_STORE_CAPACITY = 50000  # Tutulan en fazla post sayacı
+ENGAGEMENT_HALF_LIFE_DAYS = 3  # Sayaçların yarılanma süresi (gün)
+
+# İki aşamalı getirme: get_content_mix'te tam skorlamaya giren aday havuzu
+CANDIDATE_POOL_SIZE = 400  # Duygu kotalarının toplamı
+CANDIDATE_MIN_PER_EMOTION = 10  # İçeriği olan her duyguya ayrılan en az aday (keşif için)
+CANDIDATE_ARC_BOOST = 0.5  # Yaydaki duyguların kota ağırlığına eklenen pay
+CANDIDATE_KEYWORD_TOP = 10  # Aday üretiminde kullanılan en güçlü profil keyword sayısı
+CANDIDATE_KEYWORD_FANOUT = 20  # Bu keyword'lerin her birinden alınan en yeni post sayısı
+
+# Çevrimdışı içerik kalite skorları (postMetrics.quality)
+CONTENT_QUALITY_JOB_INTERVAL = int(os.getenv('CONTENT_QUALITY_JOB_INTERVAL', 3600))  # Süreç içi skorlama aralığı (saniye); 0 kapatır
+CONTENT_QUALITY_JOB_WRITE = os.getenv('CONTENT_QUALITY_JOB_WRITE', '0') == '1'  # Süreç içi iş postMetrics'e de yazsın mı
+CONTENT_QUALITY_RANK_WEIGHT = 0.1  # Doldurma aşaması skorunda kalite payı
+
+# Keyword bit kümeleriyle MMR çeşitlendirmesi (doldurma aşaması)
+KEYWORD_BITSET_BITS = 512  # Post başına keyword bit kümesi genişliği (64'ün katı)
+MMR_LAMBDA = 0.7  # 1: yalnızca skor, 0: yalnızca çeşitlilik
+MMR_OVERSAMPLE = 2  # MMR ile seçilen aday sayısı = kalan slot x bu katsayı
+MMR_BUDGET_MS = 5.0  # MMR seçim süresi üst sınırı; aşılırsa kalanlar skor sırasıyla gelir
+FILL_RANK_JITTER = 0.0  # Doldurma sırasına eklenen rastgele kayma (MMR sırası biriminde); >0 sınırdaki adayların seçimini de değiştirir
+MAX_SAME_EMOTION_IN_ROW = 2  # Akışta arka arkaya gelebilecek aynı duygudan en fazla içerik
+
+# İstek düzeyinde zaman bütçesi (get_recommendations)
+RECOMMENDATION_BUDGET_SEC = float(os.getenv('RECOMMENDATION_BUDGET_SEC', 1.5))  # İsteğin tüm aşamaları için süre
+RANKING_CHUNK_SIZE = 128  # Doldurma aşamasında bir seferde skorlanan aday sayısı
+DEADLINE_STAGE_MIN_SEC = {  # İsteğe bağlı aşamaların başlamak için istediği en az kalan süre
+    'exploration': 0.005,
+    'ads': 0.2,
+    'history_trim': 0.15
+}
+
+# Reklam performans özeti (AdManager skorlaması bellekten okur)
+AD_PERFORMANCE_WINDOW_DAYS = 30  # Gün kovalarıyla tutulan kayan pencere
+AD_PERFORMANCE_REFRESH_INTERVAL = int(os.getenv('AD_PERFORMANCE_REFRESH_INTERVAL', 600))  # adMetrics'ten yeniden kurma aralığı (saniye); 0: yalnızca açılışta
+
+# Süreç içi reklam envanteri (insert_ads aday araması)
+AD_INVENTORY_POLL_INTERVAL = 60  # Snapshot listener yoksa ads koleksiyonunu yeniden okuma aralığı (saniye)
+AD_INVENTORY_READY_TIMEOUT = 10  # İlk snapshot için bekleme süresi (saniye)
+
+# Reklam olay kuyruğu (adMetrics ve shard'lı reklam sayaçları)
+AD_EVENT_FLUSH_INTERVAL = 2.0  # Kuyruğun en geç boşaltılma aralığı (saniye)
+AD_EVENT_FLUSH_SIZE = 200  # Bu kadar olay birikince hemen boşaltılır
+AD_EVENT_MAX_PENDING = 10000  # Yazılamayan olaylarla kuyruk en fazla bu boyuta çıkar
+AD_COUNTER_SHARDS = 10  # Reklam başına sayaç shard belgesi sayısı
+AD_PEAK_SLOT_BONUS = 1.5  # Yerleştirmede peak anından sonraki slotun ağırlık çarpanı
+
+# Thompson örneklemeli reklam seçimi (AdBandit)
+AD_SELECTION_STRATEGY = os.getenv('AD_SELECTION_STRATEGY', 'score')  # 'score' (skor + performans eşiği) veya 'thompson'
+AD_BANDIT_PRIOR = (1.0, 49.0)  # Tıklama olasılığı için Beta(alpha, beta) öncülü; ortalama %2 CTR
+AD_BANDIT_CHECKPOINT_PATH = os.getenv('AD_BANDIT_CHECKPOINT_PATH', os.path.join(tempfile.gettempdir(), 'recommend_ad_bandit.npz'))
+AD_BANDIT_CHECKPOINT_INTERVAL = int(os.getenv('AD_BANDIT_CHECKPOINT_INTERVAL', 60))  # Sayaçların dosyaya eklenme aralığı (saniye); 0: yalnızca açılış ve kapanışta
+
 # Duygu kategorileri (güncellendi)
 EMOTION_CATEGORIES = {
     0: "Üzüntü (Sadness)",
@@ -297,7 +386,8 @@ PERFORMANCE_METRICS = {
     'response_time_threshold': 0.5,  # Saniye
     'cache_hit_ratio': 0.8,
     'error_rate_threshold': 0.01,
-    'scaling_factor': 1.2
+    'scaling_factor': 1.2,
+    'metric_window_size': 100  # Metrik başına tutulan son ölçüm sayısı
 }
 
 # Keyword eşleşme ağırlığı (0.0 - 1.0 arası)
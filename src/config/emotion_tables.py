@@ -0,0 +1,123 @@
+"""
+emotion_tables.py
+Duygu kategorileri için int enum ve config tablolarının derlenmiş NumPy karşılıkları.
+
+config.py'deki tablolar görünen adlarla ("Neşe (Joy)" gibi) anahtarlanır; burada import
+anında kod sırasına (EMOTION_CATEGORIES anahtarları, 0..5) göre dizilere çevrilir.
+Sıcak yollar kodlarla çalışır, string'e yalnızca API sınırında (decode / to_dict) dönülür.
+"""
+from enum import IntEnum
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from .config import (
+    AD_EMOTION_IMPACT,
+    AD_EMOTION_WEIGHTS,
+    EMOTION_CATEGORIES,
+    EMOTION_TRANSITION_MATRIX,
+    OPPOSITE_EMOTIONS
+)
+
+
+class Emotion(IntEnum):
+    SADNESS = 0
+    JOY = 1
+    LOVE = 2
+    ANGER = 3
+    FEAR = 4
+    SURPRISE = 5
+
+    @property
+    def label(self) -> str:
+        """API'de kullanılan görünen ad"""
+        return EMOTION_CATEGORIES[self.value]
+
+    @classmethod
+    def from_label(cls, label: Any) -> Optional['Emotion']:
+        code = EMOTION_CODES.get(label, -1)
+        return cls(code) if code >= 0 else None
+
+
+EMOTION_LABELS: List[str] = [EMOTION_CATEGORIES[k] for k in sorted(EMOTION_CATEGORIES)]
+EMOTION_CODES: Dict[str, int] = {label: code for code, label in enumerate(EMOTION_LABELS)}
+N_EMOTIONS = len(EMOTION_LABELS)
+
+assert [e.value for e in Emotion] == list(range(N_EMOTIONS)), "Emotion enum EMOTION_CATEGORIES ile uyuşmuyor"
+
+POSITIVE_EMOTIONS = (Emotion.JOY, Emotion.LOVE, Emotion.SURPRISE)
+NEGATIVE_EMOTIONS = (Emotion.SADNESS, Emotion.FEAR, Emotion.ANGER)
+
+
+def encode(label: Any) -> int:
+    """Görünen adı koda çevirir; bilinmeyen/boş duygu -1"""
+    return EMOTION_CODES.get(label, -1)
+
+
+def decode(code: int) -> Optional[str]:
+    return EMOTION_LABELS[code] if 0 <= code < N_EMOTIONS else None
+
+
+def encode_all(labels: Iterable[Any]) -> np.ndarray:
+    return np.fromiter((EMOTION_CODES.get(label, -1) for label in labels), dtype=np.int8)
+
+
+def to_vector(values: Mapping[str, float], default: float = 0.0) -> np.ndarray:
+    """{görünen ad: değer} sözlüğünü kod sırasındaki vektöre çevirir"""
+    return np.array([values.get(label, default) for label in EMOTION_LABELS], dtype=np.float64)
+
+
+def to_dict(vector: np.ndarray) -> Dict[str, float]:
+    """Kod sırasındaki vektörü API'nin beklediği {görünen ad: değer} sözlüğüne çevirir"""
+    return {label: float(vector[code]) for code, label in enumerate(EMOTION_LABELS)}
+
+
+def pairs_to_matrix(counts: Mapping[Tuple[str, str], float]) -> np.ndarray:
+    """{(kaynak, hedef): değer} sözlüğünü 6x6 matrise çevirir; bilinmeyen duygular atlanır"""
+    matrix = np.zeros((N_EMOTIONS, N_EMOTIONS))
+    for (from_label, to_label), value in counts.items():
+        i, j = EMOTION_CODES.get(from_label, -1), EMOTION_CODES.get(to_label, -1)
+        if i >= 0 and j >= 0:
+            matrix[i, j] = value
+    return matrix
+
+
+def _compile_matrix(table: Mapping[str, Mapping[str, float]]) -> np.ndarray:
+    matrix = np.zeros((N_EMOTIONS, N_EMOTIONS))
+    for from_label, row in table.items():
+        for to_label, value in row.items():
+            matrix[EMOTION_CODES[from_label], EMOTION_CODES[to_label]] = value
+    return matrix
+
+
+def _compile_mask(table: Mapping[str, Iterable[str]]) -> np.ndarray:
+    mask = np.zeros((N_EMOTIONS, N_EMOTIONS), dtype=bool)
+    for from_label, targets in table.items():
+        for to_label in targets:
+            mask[EMOTION_CODES[from_label], EMOTION_CODES[to_label]] = True
+    return mask
+
+
+# TRANSITION_MATRIX[i, j]: i duygusundan j duygusuna genel geçiş olasılığı
+TRANSITION_MATRIX = _compile_matrix(EMOTION_TRANSITION_MATRIX)
+# OPPOSITE_MASK[i, j]: j, i duygusunun zıttı mı
+OPPOSITE_MASK = _compile_mask(OPPOSITE_EMOTIONS)
+AD_EMOTION_WEIGHT_VECTOR = to_vector(AD_EMOTION_WEIGHTS)
+AD_EMOTION_IMPACT_VECTOR = to_vector(AD_EMOTION_IMPACT)
+# Pozitif duygular +1, negatifler -1
+POLARITY = np.zeros(N_EMOTIONS, dtype=np.int8)
+POLARITY[list(POSITIVE_EMOTIONS)] = 1
+POLARITY[list(NEGATIVE_EMOTIONS)] = -1
+
+
+def opposite_row(code: int) -> np.ndarray:
+    """code duygusunun zıtları için N_EMOTIONS + 1 uzunlukta maske; son hücre (kod -1) hep False"""
+    row = np.zeros(N_EMOTIONS + 1, dtype=bool)
+    if 0 <= code < N_EMOTIONS:
+        row[:N_EMOTIONS] = OPPOSITE_MASK[code]
+    return row
+
+
+for _table in (TRANSITION_MATRIX, OPPOSITE_MASK, AD_EMOTION_WEIGHT_VECTOR, AD_EMOTION_IMPACT_VECTOR, POLARITY):
+    _table.setflags(write=False)
+del _table
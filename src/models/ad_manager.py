@@ -1,86 +1,50 @@
 import logging
-import random
 from typing import Dict, List, Any, Optional, Tuple
-from datetime import datetime, timezone, timedelta
+from datetime import datetime
+
+import numpy as np
+
 from config.config import (
-    COLLECTION_ADS,
-    COLLECTION_AD_METRICS,
     AD_OPTIMIZATION,
     AD_FREQUENCY,
     AD_CONTENT_RATIO,
     AD_RATIO,
     EMOTION_CATEGORIES,
     KEYWORD_MATCH_WEIGHT,
-    AD_PERFORMANCE_WEIGHTS
+    AD_PERFORMANCE_WEIGHTS,
+    MIN_AD_RELEVANCE,
+    AD_SELECTION_STRATEGY
 )
+from config.emotion_tables import Emotion, encode
 from services.firebase_services.firebase_base import FirebaseBase
+from services.reccomend_service.algorithms.ad_placement import ad_slot_scores, assign_ads, slot_weights
+from services.reccomend_service.algorithms.mmr_diversifier import hash_keyword_bitsets
+from services.reccomend_service.ad_bandit import AdBandit
+from services.reccomend_service.ad_event_buffer import AdEventBuffer
+from services.reccomend_service.ad_inventory import AdInventory
+from services.reccomend_service.ad_performance import AdPerformanceView
 
 logger = logging.getLogger(__name__)
 
 class AdManager:
-    def __init__(self, firebase_service: FirebaseBase):
+    def __init__(self, firebase_service: FirebaseBase, performance_view: Optional[AdPerformanceView] = None,
+                 inventory: Optional[AdInventory] = None, event_buffer: Optional[AdEventBuffer] = None,
+                 bandit: Optional[AdBandit] = None, strategy: str = AD_SELECTION_STRATEGY):
         self.firebase = firebase_service
-        self.ad_cache = {}  # Reklam önbelleği
-        self.ad_cache_time = datetime.now()  # Önbellek güncelleme zamanı
+        # Reklam başına 30 günlük performans özeti (skorlama sırasında I/O yapılmaz)
+        self.performance_view = performance_view if performance_view is not None else AdPerformanceView()
+        # Yayındaki reklamlar ve skor sütunları (AdFeatures); ilk kullanımda başlatılır
+        self.inventory = inventory if inventory is not None else AdInventory(firebase_service.db)
+        # Metrik yazımları istek thread'inde yapılmaz; kuyruk batch'lerle boşaltılır
+        self.event_buffer = event_buffer if event_buffer is not None else AdEventBuffer(firebase_service.db).start()
+        # (reklam, duygu) başına tıklama sonsalları; strategy 'thompson' ise CTR yerine örnekleri kullanılır
+        self.bandit = bandit if bandit is not None else AdBandit()
+        self.strategy = strategy
         self.emotion_categories = EMOTION_CATEGORIES
         self.ad_frequency = AD_FREQUENCY
         self.keyword_match_weight = KEYWORD_MATCH_WEIGHT
         self.performance_weights = AD_PERFORMANCE_WEIGHTS
 
-    def _get_ad_performance_metrics(self, ad_id: str) -> Dict[str, float]:
-        """Reklamın performans metriklerini getirir."""
-        try:
-            metrics = self.firebase.db.collection(COLLECTION_AD_METRICS)\
-                .where('ad_id', '==', ad_id)\
-                .where('timestamp', '>=', (datetime.now() - timedelta(days=30)).isoformat())\
-                .stream()
-
-            total_impressions = 0
-            total_clicks = 0
-            total_emotion_changes = 0
-            emotion_change_scores = {}
-
-            for metric in metrics:
-                metric_data = metric.to_dict()
-                metric_type = metric_data.get('metric_type')
-
-                if metric_type == 'impression':
-                    total_impressions += 1
-                elif metric_type == 'click':
-                    total_clicks += 1
-                elif metric_type.startswith('emotion_change_'):
-                    total_emotion_changes += 1
-                    # Duygu değişim skorunu hesapla
-                    emotion_before = metric_data.get('emotion_before')
-                    emotion_after = metric_data.get('emotion_after')
-                    if emotion_before and emotion_after:
-                        change_key = f"{emotion_before}_to_{emotion_after}"
-                        emotion_change_scores[change_key] = emotion_change_scores.get(change_key, 0) + 1
-
-            # CTR hesapla
-            ctr = total_clicks / total_impressions if total_impressions > 0 else 0
-
-            # Duygu değişim oranını hesapla
-            emotion_change_ratio = total_emotion_changes / total_impressions if total_impressions > 0 else 0
-
-            return {
-                'ctr': ctr,
-                'emotion_change_ratio': emotion_change_ratio,
-                'emotion_change_scores': emotion_change_scores,
-                'total_impressions': total_impressions,
-                'total_clicks': total_clicks
-            }
-
-        except Exception as e:
-            logger.error(f"Reklam performans metrikleri alınırken hata: {str(e)}")
-            return {
-                'ctr': 0.0,
-                'emotion_change_ratio': 0.0,
-                'emotion_change_scores': {},
-                'total_impressions': 0,
-                'total_clicks': 0
-            }
-
     def _calculate_ad_relevance(self, ad: Dict[str, Any], content_keywords: set) -> float:
         """Reklamın içerik keywordlerine uygunluğunu hesaplar."""
         try:
@@ -101,152 +65,9 @@ class AdManager:
             logger.error(f"Reklam uygunluğu hesaplanırken hata: {str(e)}")
             return 0.0
 
-    def _get_best_ad_for_content(self, content: Dict[str, Any], active_ads: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
-        """İçerik için en uygun reklamı seçer."""
-        try:
-            content_keywords = set(content.get('keywords', []))
-            content_emotion = content.get('emotion')
-            
-            if not content_keywords:
-                return random.choice(active_ads)
-
-            scored_ads = []
-            for ad in active_ads:
-                # 1. Duygu uygunluğu
-                emotion_score = 1.0 if ad.get('target_emotion') == content_emotion else 0.5
-                
-                # 2. Keyword uygunluğu
-                keyword_score = self._calculate_ad_relevance(ad, content_keywords)
-                
-                # 3. Performans metrikleri
-                performance_metrics = self._get_ad_performance_metrics(ad['id'])
-                performance_score = self._calculate_performance_score(performance_metrics, content_emotion)
-                
-                # 4. Toplam skor hesaplama
-                total_score = (
-                    emotion_score * self.performance_weights['emotion'] +
-                    keyword_score * self.performance_weights['keyword'] +
-                    performance_score * self.performance_weights['performance']
-                )
-                
-                scored_ads.append((total_score, ad))
-
-            # En yüksek skorlu reklamı seç
-            scored_ads.sort(key=lambda x: x[0], reverse=True)
-            
-            # Eğer yüksek performanslı reklamlar varsa, onları önceliklendir
-            high_performing_ads = [
-                (score, ad) for score, ad in scored_ads 
-                if score > 0.7 and self._get_ad_performance_metrics(ad['id'])['ctr'] > 0.02
-            ]
-            
-            if high_performing_ads:
-                # Yüksek performanslı reklamlardan rastgele seç
-                return random.choice(high_performing_ads)[1]
-            
-            return scored_ads[0][1] if scored_ads else None
-
-        except Exception as e:
-            logger.error(f"En uygun reklam seçilirken hata: {str(e)}")
-            return random.choice(active_ads)
-
-    def _calculate_performance_score(self, metrics: Dict[str, Any], target_emotion: str) -> float:
-        """Reklam performans skorunu hesaplar."""
-        try:
-            # CTR skoru
-            ctr_score = min(metrics['ctr'] * 10, 1.0)  # CTR'yi 0-1 arasına normalize et
-            
-            # Duygu değişim skoru
-            emotion_change_score = 0.0
-            if metrics['emotion_change_scores']:
-                # Hedef duyguya yönelik değişimleri kontrol et
-                for change, count in metrics['emotion_change_scores'].items():
-                    if change.endswith(f"_to_{target_emotion}"):
-                        emotion_change_score += count
-                
-                emotion_change_score = min(emotion_change_score / metrics['total_impressions'], 1.0)
-            
-            # Toplam performans skoru
-            performance_score = (
-                ctr_score * self.performance_weights['ctr'] +
-                emotion_change_score * self.performance_weights['emotion_change']
-            )
-            
-            return performance_score
-
-        except Exception as e:
-            logger.error(f"Performans skoru hesaplanırken hata: {str(e)}")
-            return 0.0
-
-    def _get_ads_from_firebase(self) -> List[Dict[str, Any]]:
-        """Firebase'den aktif reklamları getirir."""
-        try:
-            if (datetime.now() - self.ad_cache_time).total_seconds() < 300 and self.ad_cache:
-                return list(self.ad_cache.values())
-
-            ads = self.firebase.get_collection(COLLECTION_ADS)
-            active_ads = [
-                ad for ad in ads 
-                if ad.get('is_active', False) and 
-                datetime.fromisoformat(ad.get('end_date', '2000-01-01')) > datetime.now()
-            ]
-
-            self.ad_cache = {ad['id']: ad for ad in active_ads}
-            self.ad_cache_time = datetime.now()
-
-            return active_ads
-
-        except Exception as e:
-            logger.error(f"Reklamlar getirilirken hata: {str(e)}")
-            return []
-
-    def _create_ad_content(self) -> Dict[str, Any]:
-        """Firebase'den reklam içeriği oluşturur."""
-        try:
-            ads = self._get_ads_from_firebase()
-            if not ads:
-                return None
-
-            total_weight = sum(ad.get('priority', 1.0) for ad in ads)
-            if total_weight == 0:
-                return None
-
-            selected_ad = None
-            random_value = random.uniform(0, total_weight)
-            current_sum = 0
-
-            for ad in ads:
-                current_sum += ad.get('priority', 1.0)
-                if random_value <= current_sum:
-                    selected_ad = ad
-                    break
-
-            if not selected_ad:
-                return None
-
-            self._update_ad_metrics(selected_ad['id'], 'impression')
-
-            return {
-                'id': selected_ad['id'],
-                'type': 'ad',
-                'is_ad': True,
-                'emotion': selected_ad.get('target_emotion', random.choice(self.emotion_categories)),
-                'content': selected_ad['content'],
-                'metadata': {
-                    'created_at': datetime.now().isoformat(),
-                    'target_emotions': selected_ad.get('target_emotions', []),
-                    'priority': selected_ad.get('priority', 1.0),
-                    'advertiser_id': selected_ad.get('advertiser_id'),
-                    'campaign_id': selected_ad.get('campaign_id')
-                }
-            }
-
-        except Exception as e:
-            logger.error(f"Reklam içeriği oluşturulurken hata: {str(e)}")
-            return None
-
     def _update_ad_metrics(self, ad_id: str, metric_type: str, user_id: str = None, 
-                               emotion_before: str = None, emotion_after: str = None):
+                               emotion_before: str = None, emotion_after: str = None,
+                               slot_emotion: str = None):
         """Reklam metriklerini günceller."""
         try:
             metric_data = {
@@ -255,23 +76,25 @@ class AdManager:
                 'metric_type': metric_type,
                 'user_id': user_id,
                 'emotion_before': emotion_before,
-                'emotion_after': emotion_after
+                'emotion_after': emotion_after,
+                'slot_emotion': slot_emotion
             }
 
-            self.firebase.add_document(COLLECTION_AD_METRICS, metric_data)
-
-            ad_ref = self.firebase.db.collection(COLLECTION_ADS).document(ad_id)
-            ad_ref.update({
-                f'metrics.{metric_type}': self.firebase.db.FieldValue.increment(1),
-                'last_updated': datetime.now().isoformat()
-            })
+            # adMetrics belgesi ve reklamın shard'lı sayacı arka planda yazılır
+            self.event_buffer.enqueue(metric_data)
+            self.performance_view.record(metric_data)
+            self.bandit.record(metric_data)
 
         except Exception as e:
             logger.error(f"Reklam metrikleri güncellenirken hata: {str(e)}")
 
     def track_ad_interaction(self, ad_id: str, user_id: str, interaction_type: str, 
-                                 emotion_before: str = None, emotion_after: str = None):
-        """Reklam etkileşimlerini takip eder."""
+                                 emotion_before: str = None, emotion_after: str = None,
+                                 slot_emotion: str = None):
+        """
+        Reklam etkileşimlerini takip eder. `slot_emotion`, reklam öğesinin
+        metadata['slot_emotion'] değeridir; tıklama, gösterimin sayıldığı bağlama yazılır.
+        """
         try:
             metric_type = f"{interaction_type}_count"
             self._update_ad_metrics(
@@ -279,7 +102,8 @@ class AdManager:
                 metric_type, 
                 user_id, 
                 emotion_before, 
-                emotion_after
+                emotion_after,
+                slot_emotion
             )
 
             if emotion_before and emotion_after and emotion_before != emotion_after:
@@ -301,64 +125,58 @@ class AdManager:
         peak_moment_index: Optional[int],
         user_id: str = None
     ) -> List[Dict[str, Any]]:
-        """Reklamları stratejik olarak yerleştirir."""
+        """
+        Reklamları akışın tamamına yerleştirir. Yayındaki tüm reklamlar x slotlar skor matrisi
+        tek vektörel geçişte hesaplanır (algorithms/ad_placement; performans AdPerformanceView
+        özetinden, I/O yok). Slot, önündeki postla skorlanır; placement_strategy bölüm ağırlığı
+        verir, peak slotu ayrıca öne çıkar. Akış başına en fazla AD_OPTIMIZATION['frequency_cap']
+        reklam, her reklam bir kez ve reklamlar arasında en az `ad_frequency` içerik olur.
+        strategy 'thompson' ise CTR, AdBandit'ten (reklam, slot duygusu) başına çekilen örnektir.
+        """
         try:
             if not contents or peak_moment_index is None or peak_moment_index <= 0 or peak_moment_index >= len(contents):
                 logger.info("[AdManager] No valid peak index or contents, returning original list.")
                 return contents
 
-            ads = self.firebase.get_collection(COLLECTION_ADS)
-            if not ads:
-                logger.warning("[AdManager] No ads found in Firebase collection.")
-                return contents
-
-            active_ads = [
-                ad for ad in ads
-                if ad.get('is_active', False) and
-                   parse_timestamp(ad.get('end_date', '2000-01-01')) > datetime.now(timezone.utc)
-            ]
-
-            if not active_ads:
+            features = self.inventory.start().features()
+            if not len(features):
                 logger.warning("[AdManager] No active ads available.")
                 return contents
 
-            # Peak moment'ten önceki içeriği al
-            pre_peak_content = contents[peak_moment_index - 1]
-            
-            # En uygun reklamı seç
-            selected_ad = self._get_best_ad_for_content(pre_peak_content, active_ads)
-            
-            if not selected_ad:
-                selected_ad = random.choice(active_ads)
-
-            ad_content_to_insert = {
-                'id': selected_ad['id'],
-                'type': 'ad',
-                'is_ad': True,
-                'emotion': selected_ad.get('target_emotion', 'Neşe (Joy)'),
-                'content': selected_ad.get('content', 'Reklam İçeriği'),
-                'metadata': {
-                    'created_at': datetime.now().isoformat(),
-                    'advertiser_id': selected_ad.get('advertiser_id'),
-                    'campaign_id': selected_ad.get('campaign_id'),
-                    'keywords': selected_ad.get('keywords', []),
-                    'relevance_score': self._calculate_ad_relevance(
-                        selected_ad, 
-                        set(pre_peak_content.get('keywords', []))
-                    )
-                }
-            }
-
-            result = contents[:peak_moment_index] + [ad_content_to_insert] + contents[peak_moment_index:]
-            logger.info(f"[AdManager] Inserted ad {ad_content_to_insert['id']} at index {peak_moment_index}")
-
-            self._update_ad_metrics(
-                ad_content_to_insert['id'], 
-                'impression', 
-                user_id,
-                emotion_before=pre_peak_content.get('emotion'),
-                emotion_after=contents[peak_moment_index].get('emotion') if peak_moment_index < len(contents) else None
+            # Slot s (1..n-1), contents[s-1] ile contents[s] arasına ekleme konumudur
+            neighbours = contents[:-1]
+            slot_codes = np.fromiter((encode(c.get('emotion')) for c in neighbours), dtype=np.int64, count=len(neighbours))
+            slot_bits = hash_keyword_bitsets([c.get('keywords') or () for c in neighbours])
+            ctr, change_to = self.performance_view.summary(features.ids)
+            if self.strategy == 'thompson':
+                ctr = self.bandit.sample(features.ids, slot_codes)
+            scores = ad_slot_scores(
+                features.emotion_codes, features.keyword_bits, ctr, change_to, slot_codes, slot_bits,
+                slot_weights(len(neighbours), peak_slot=peak_moment_index - 1),
+                ad_dense=features.keyword_dense
             )
+            max_ads = min(AD_OPTIMIZATION['frequency_cap'], max(len(contents) // self.ad_frequency, 1))
+            placement = assign_ads(scores, max_ads, min_gap=self.ad_frequency, min_score=MIN_AD_RELEVANCE)
+
+            result: List[Dict[str, Any]] = []
+            previous = 0
+            for ad_row, slot in placement:
+                position = slot + 1
+                result.extend(contents[previous:position])
+                result.append(self._ad_item(features.ads[ad_row], contents[position - 1]))
+                previous = position
+            result.extend(contents[previous:])
+            logger.info(f"[AdManager] Inserted {len(placement)} ads at indices {[slot + 1 for _, slot in placement]}")
+
+            for ad_row, slot in placement:
+                self._update_ad_metrics(
+                    features.ids[ad_row],
+                    'impression',
+                    user_id,
+                    emotion_before=contents[slot].get('emotion'),
+                    emotion_after=contents[slot + 1].get('emotion'),
+                    slot_emotion=contents[slot].get('emotion')
+                )
 
             return result
 
@@ -366,32 +184,21 @@ class AdManager:
             logger.error(f"[AdManager ERROR] Error inserting ad: {str(e)}", exc_info=True)
             return contents
 
-    def _optimize_ad_placement(self, recommendations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Reklam yerleşimini optimize eder"""
-        ad_count = 0
-        optimized_recommendations = []
-        
-        for rec in recommendations:
-            if rec.get('is_ad', False):
-                if ad_count >= AD_OPTIMIZATION['frequency_cap']:
-                    continue
-                ad_count += 1
-            
-            optimized_recommendations.append(rec)
-        
-        return optimized_recommendations 
-
-def parse_timestamp(timestamp_str: Optional[str]) -> Optional[datetime]:
-    if not timestamp_str:
-        return None
-    try:
-        dt = datetime.fromisoformat(timestamp_str)
-        if dt.tzinfo is None:
-            return dt.replace(tzinfo=timezone.utc)
-        return dt.astimezone(timezone.utc)
-    except ValueError:
-        logger.debug(f"Could not parse timestamp: {timestamp_str}")
-        return None
-    except Exception as e:
-        logger.error(f"Error parsing timestamp '{timestamp_str}': {e}")
-        return None 
\ No newline at end of file
+    def _ad_item(self, ad: Dict[str, Any], previous_content: Dict[str, Any]) -> Dict[str, Any]:
+        """Akışa eklenecek reklam öğesi."""
+        return {
+            'id': ad['id'],
+            'type': 'ad',
+            'is_ad': True,
+            'emotion': ad.get('target_emotion', Emotion.JOY.label),
+            'content': ad.get('content', 'Reklam İçeriği'),
+            'metadata': {
+                'created_at': datetime.now().isoformat(),
+                'advertiser_id': ad.get('advertiser_id'),
+                'campaign_id': ad.get('campaign_id'),
+                'keywords': ad.get('keywords', []),
+                # Reklamdan önceki postun duygusu; tıklama bildirilirken geri gönderilir
+                'slot_emotion': previous_content.get('emotion'),
+                'relevance_score': self._calculate_ad_relevance(ad, set(previous_content.get('keywords', [])))
+            }
+        }
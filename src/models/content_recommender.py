@@ -2,31 +2,56 @@ import logging
 import random
 from typing import Dict, List, Any, Tuple, Optional
 from datetime import datetime, timezone
+
+import numpy as np
+
 from config.config import (
-    CONTENT_QUALITY_METRICS,
+    CONTENT_QUALITY_RANK_WEIGHT,
     TIME_BASED_OPTIMIZATION,
     DIVERSITY_CONTROLS,
     INTERACTION_QUALITY_METRICS,
     INTERACTION_TYPE_WEIGHTS,
-    EMOTION_CATEGORIES,
-    OPPOSITE_EMOTIONS,
-    EMOTION_TRANSITION_MATRIX,
-    KEYWORD_MATCH_WEIGHT
+    KEYWORD_MATCH_WEIGHT,
+    MMR_BUDGET_MS,
+    FILL_RANK_JITTER,
+    MAX_SAME_EMOTION_IN_ROW,
+    MMR_OVERSAMPLE,
+    RANKING_CHUNK_SIZE,
+    DEADLINE_STAGE_MIN_SEC
+)
+from config.emotion_tables import (
+    EMOTION_LABELS,
+    decode,
+    encode,
+    to_vector
 )
 from services.reccomend_service.shuffle_utils import shuffle_same_score
-from services.reccomend_service.date_utils import parse_timestamp
 from services.reccomend_service.cold_start_utils import get_cold_start_content
+from services.reccomend_service.algorithms.emotion_reranker import rerank_by_emotion
+from services.reccomend_service.algorithms.mmr_diversifier import mmr_order
+from services.reccomend_service.arc_planner import ArcPlanner
+from services.reccomend_service.candidate_generator import CandidateGenerator
+from services.reccomend_service.catalog_index import CatalogColumns, CatalogIndex
+from services.reccomend_service.deadline import Deadline
+from services.reccomend_service.engagement_store import EngagementStore, create_engagement_store
+from services.reccomend_service.keyword_profile import KeywordProfile, KeywordProfileCache
+from services.reccomend_service.post_record import PostRecord
 
 logger = logging.getLogger(__name__)
 
 class ContentRecommender:
-    def __init__(self):
-        self.content_engagement = {}  # İçerik bazlı etkileşim istatistikleri
+    def __init__(self, engagement_store: Optional[EngagementStore] = None):
+        # İçerik bazlı, zamanla sönümlenen etkileşim sayaçları (worker'lar arası paylaşılabilir)
+        self.engagement_store = engagement_store if engagement_store is not None else create_engagement_store()
         self.interaction_weights = INTERACTION_TYPE_WEIGHTS
         self.keyword_match_weight = KEYWORD_MATCH_WEIGHT  # Keyword eşleşme ağırlığı
+        self.arc_planner = ArcPlanner()
+        self.candidate_generator = CandidateGenerator()  # İki aşamalı getirmenin aday aşaması
+        self.keyword_profiles = KeywordProfileCache()  # Kullanıcı başına keyword ilgi profilleri
 
-    def calculate_content_relevance(self, content: Dict[str, Any], user_pattern: Dict[str, float]) -> float:
-        """İçeriğin kullanıcı desenine uygunluğunu hesaplar."""
+    def calculate_content_relevance(self, content: Dict[str, Any], user_pattern: Dict[str, float],
+                                    keyword_profile: Optional[KeywordProfile] = None) -> float:
+        """İçeriğin kullanıcı desenine (ve varsa keyword profiline) uygunluğunu hesaplar."""
         try:
             content_emotion = content.get('emotion')
             if content_emotion not in user_pattern:
@@ -34,13 +59,10 @@ class ContentRecommender:
         
             base_relevance = user_pattern.get(content_emotion, 0.0)
             
-            content_id = content.get('id')
-            if content_id in self.content_engagement:
-                engagement_score = self._calculate_engagement_score(content_id)
-                base_relevance *= (1.0 + engagement_score)
+            base_relevance *= (1.0 + self._calculate_engagement_score(content.get('id')))
 
             # Keyword eşleşme skorunu ekle
-            keyword_score = self._calculate_keyword_match_score(content)
+            keyword_score = self._calculate_keyword_match_score(content, keyword_profile)
             base_relevance = base_relevance * (1 - self.keyword_match_weight) + keyword_score * self.keyword_match_weight
 
             return min(1.0, max(0.0, base_relevance))
@@ -50,46 +72,8 @@ class ContentRecommender:
             return 0.0
 
     def _calculate_engagement_score(self, content_id: str) -> float:
-        """İçerik etkileşim skorunu hesaplar."""
-        engagement = self.content_engagement.get(content_id, {})
-        total_engagements = sum(engagement.values())
-        if total_engagements == 0:
-            return 0.0
-        
-        weighted_score = sum(
-            count * self.interaction_weights.get(interaction_type, 0.1)
-            for interaction_type, count in engagement.items()
-        )
-        
-        return min(1.0, weighted_score / total_engagements)
-
-    def _calculate_content_quality_score(self, content: Dict[str, Any]) -> float:
-        """İçerik kalite skorunu hesaplar"""
-        score = 0
-        for metric, weight in CONTENT_QUALITY_METRICS.items():
-            if metric == 'engagement_rate':
-                score += weight * (content.get('likes', 0) + content.get('comments', 0)) / max(content.get('views', 1), 1)
-            elif metric == 'freshness':
-                created_at = content.get('created_at', datetime.now())
-                dt = None
-                if isinstance(created_at, str):
-                    try:
-                        dt = datetime.fromisoformat(created_at)
-                    except Exception:
-                        try:
-                            dt = datetime.strptime(created_at, "%B %d, %Y at %I:%M:%S %p UTC+3")
-                        except Exception:
-                            dt = datetime.now()
-                else:
-                    dt = created_at
-                content_age = (datetime.now() - dt).days
-                score += weight * (1 / (1 + content_age))
-            elif metric == 'user_reputation':
-                score += weight * content.get('user_reputation', 0.5)
-            elif metric == 'content_length':
-                content_length = len(content.get('content', ''))
-                score += weight * min(content_length / 1000, 1)
-        return score
+        """İçerik etkileşim skorunu (sönümlü, 0..1) döndürür."""
+        return self.engagement_store.score(content_id) if content_id is not None else 0.0
 
     def _apply_time_based_optimization(self, score: float, timestamp: datetime) -> float:
         """Zaman bazlı optimizasyon uygular"""
@@ -130,300 +114,285 @@ class ContentRecommender:
         return score
 
     def update_content_engagement(self, content_id: str, interaction_type: str):
-        """İçerik etkileşim istatistiklerini günceller."""
-        if content_id not in self.content_engagement:
-            self.content_engagement[content_id] = {}
-        
-        self.content_engagement[content_id][interaction_type] = (
-            self.content_engagement[content_id].get(interaction_type, 0) + 1
-        )
-
-    def _find_next_emotion(self,
-                           from_emotion: str,
-                           personalized_transitions: Dict[Tuple[str, str], int],
-                           exclude_emotion: Optional[str] = None) -> Optional[str]:
-        """Finds the most frequent next emotion based on personalized data, with fallback."""
-        candidates = []
-        for (f_emo, t_emo), count in personalized_transitions.items():
-            if f_emo == from_emotion and t_emo != exclude_emotion:
-                candidates.append((count, t_emo))
-
-        if candidates:
-            candidates.sort(key=lambda x: x[0], reverse=True)
-            return candidates[0][1] # Return the emotion with the highest count
-        else:
-            # Fallback to generic matrix if no personalized data for this transition
-            generic_transitions = EMOTION_TRANSITION_MATRIX.get(from_emotion, {})
-            if not generic_transitions:
-                return None
-            # Sort generic transitions by probability
-            sorted_generic = sorted(generic_transitions.items(), key=lambda item: item[1], reverse=True)
-            for emo, prob in sorted_generic:
-                 if emo != from_emotion and emo != exclude_emotion: # Avoid self and excluded
-                      return emo
-            # If only self-transition or excluded exists in generic, return None or the first one?
-            return sorted_generic[0][0] if sorted_generic else None
+        """İçerik etkileşim sayaçlarını günceller."""
+        self.engagement_store.record(content_id, interaction_type)
 
     def get_content_mix(
         self,
-        contents: List[Dict],
+        contents: Optional[List[Dict]],
         emotion_pattern: Dict[str, float],
         limit: int = 20,
         shown_post_ids: List[Any] = None,
         current_emotion: Optional[str] = None,
         personalized_transitions: Dict[Tuple[str, str], int] = None,
         repeat_ratio: float = 0.2,
-        timeout_sec: int = 3
+        catalog_index: Optional[CatalogIndex] = None,
+        keyword_profile: Optional[KeywordProfile] = None,
+        deadline: Optional[Deadline] = None
     ) -> Tuple[List[Dict], Optional[int]]:
         """
         Creates a detailed story flow based on personalized transitions.
-        - Plans a 3-step emotional journey (Current -> Next1 -> Next2) using personalized data.
+        - Plans an emotional journey starting at the current emotion (ArcPlanner beam search).
         - Selects content for each step.
-        - Identifies the peak moment based on the most frequent personalized transition.
+        - Identifies the peak moment based on the arc's most probable transition.
         - Fills remaining slots based on relevance and diversity.
-        """
-        import time
-        from collections import defaultdict
-        from datetime import timedelta
-        start_time = time.time()
 
+        `catalog_index` should index `contents`; when it is omitted a temporary
+        index is built from `contents` so every stage is still a bucket lookup.
+        With a shared index, pass `contents=None` to use the whole catalog as the pool
+        (no per-request copy of the catalog); a list restricts the pool to those posts.
+        All stages read one column snapshot of the index, so posts removed while the
+        request runs do not invalidate its candidates.
+        Retrieval has two stages: CandidateGenerator takes a bounded pool from the
+        index's per-emotion recency/quality lists (quotas follow the pattern and the
+        arc), then arc selection, fill-stage scoring and exploration work on that pool
+        only, so per-request cost does not grow with the catalog. Fill order is
+        MMR over keyword bitsets (near-duplicate posts are pushed back), then the
+        per-emotion run-length re-ranker.
+        `keyword_profile` (see KeywordProfileCache) must be built on the same index
+        to be used; its scores favour arc content and add to fill-stage relevance.
+        `deadline` is the request-level budget: fill-stage candidates are scored in
+        priority order (arc emotions first, then newest first) in vectorized chunks
+        and ranking continues with the best-so-far scores once it expires; MMR gets
+        at most the remaining time and exploration is skipped when time is short.
+        Cut or skipped stages are recorded on the deadline.
+        """
         if shown_post_ids is None: shown_post_ids = []
         if personalized_transitions is None: personalized_transitions = {}
 
         logger.info(f"[get_content_mix] DETAILED FLOW. Current: {current_emotion}, Personalized Transitions: {len(personalized_transitions)}")
 
-        # 1. Prepare content pools (as before)
+        # 1. Prepare the catalog index (emotion buckets + precomputed per-emotion lists)
         now = datetime.now(timezone.utc)
-        def safe_parse_timestamp(ts):
-            dt = parse_timestamp(ts)
-            if dt is None: return datetime(1970, 1, 1, tzinfo=timezone.utc)
-            if dt.tzinfo is None: return dt.replace(tzinfo=timezone.utc)
-            return dt.astimezone(timezone.utc)
-        recent_unseen = sorted([c for c in contents if safe_parse_timestamp(c.get('timestamp')) >= now - timedelta(days=7)], key=lambda c: safe_parse_timestamp(c.get('timestamp')), reverse=True)
-        other_unseen = [c for c in contents if c not in recent_unseen]
-        all_unseen_pool = recent_unseen + other_unseen
-        random.shuffle(all_unseen_pool)
-
-        # 2. Plan the Detailed Story Arc (Current -> Next1 -> Next2)
-        story_arc_emotions = []
-        next_emotion_1 = None
-        next_emotion_2 = None
-
-        if current_emotion:
-            story_arc_emotions.append(current_emotion)
-            # Find Next1
-            next_emotion_1 = self._find_next_emotion(current_emotion, personalized_transitions)
-            if next_emotion_1:
-                story_arc_emotions.append(next_emotion_1)
-                # Find Next2 (try not to repeat current or next1)
-                next_emotion_2 = self._find_next_emotion(next_emotion_1, personalized_transitions, exclude_emotion=current_emotion)
-                # If Next2 repeats Next1, try again excluding both
-                if next_emotion_2 == next_emotion_1:
-                     next_emotion_2 = self._find_next_emotion(next_emotion_1, personalized_transitions, exclude_emotion=[current_emotion, next_emotion_1])
-
-                if next_emotion_2:
-                    story_arc_emotions.append(next_emotion_2)
-
-        logger.info(f"[get_content_mix] Planned story arc: {story_arc_emotions}")
-
-        # 3. Select Content for the Story Arc
-        selected_mix: List[Dict] = []
+        now_ts = now.timestamp()
+        index = catalog_index if catalog_index is not None else CatalogIndex.from_posts(contents or [])
+        columns = index.columns()  # İstek boyunca aynı görüntü kullanılır
+        if keyword_profile and keyword_profile.interner is not index.interner:
+            keyword_profile = None
+
+        # 2. Plan the Story Arc (beam search over the user's smoothed transition matrix)
+        arc = self.arc_planner.plan_from_pairs(encode(current_emotion), personalized_transitions,
+                                               columns.emotion_counts() > 0)
+        story_arc: List[int] = arc.codes
+
+        logger.info(f"[get_content_mix] Planned story arc: {arc.labels}")
+
+        # 3. Candidate generation: bounded pool from the global per-emotion lists
+        candidate_rows = self.candidate_generator.generate(columns, emotion_pattern, story_arc, keyword_profile)
+        if contents is not None and catalog_index is not None and len(contents) != len(columns):
+            # Paylaşılan indeks `contents` dışındaki postları da içerebilir
+            pool_ids = {c.get('id') for c in contents}
+            candidate_rows = candidate_rows[[columns.ids[r] in pool_ids for r in candidate_rows]]
+        candidates = [columns.records[r] for r in candidate_rows]
+        candidate_codes = columns.emotion_codes[candidate_rows]
+        keyword_scores = keyword_profile.score_records(candidates) if keyword_profile else None
+        logger.info(f"[get_content_mix] {len(candidates)} candidates generated from {len(columns)} posts.")
+
+        # 4. Select Content for the Story Arc
+        # Seçim PostRecord'lar üzerinde yapılır; tam belgeler sadece dönüşte alınır
+        selected_mix: List[PostRecord] = []
         used_content_ids = set()
-        arc_content_indices = {} # Store index of content for each arc emotion
+        arc_content_indices = {} # Store index of content for each arc emotion code
 
-        for i, arc_emotion in enumerate(story_arc_emotions):
+        for i, arc_code in enumerate(story_arc):
             found_content = False
-            # Önce o duygudaki içerikler içinden, keyword eşleşenleri bul
-            emotion_candidates = [c for c in recent_unseen + other_unseen if c.get('emotion') == arc_emotion and c.get('id') not in used_content_ids]
-            if emotion_candidates:
-                # Kullanıcı keywordleriyle eşleşenleri öne al
-                user_keywords = self._get_user_recent_keywords()
-                keyword_matched = [c for c in emotion_candidates if user_keywords and set(c.get('keywords', [])) & user_keywords]
-                if keyword_matched:
-                    selected = random.choice(keyword_matched)
-                else:
-                    selected = random.choice(emotion_candidates)
+            # Önce o duygudaki adaylar içinden, keyword eşleşenleri bul
+            positions = [p for p in np.flatnonzero(candidate_codes == arc_code) if candidates[p].id not in used_content_ids]
+            if positions:
+                # Kullanıcının keyword profiliyle eşleşenleri öne al
+                keyword_matched = []
+                if keyword_scores is not None:
+                    keyword_matched = [p for p in positions if keyword_scores[p] > 0]
+                selected = candidates[random.choice(keyword_matched or positions)]
                 selected_mix.append(selected)
-                used_content_ids.add(selected['id'])
-                arc_content_indices[arc_emotion] = len(selected_mix) - 1
-                logger.info(f"[get_content_mix] Added arc content [{i+1}/{len(story_arc_emotions)}]: {arc_emotion}")
+                used_content_ids.add(selected.id)
+                arc_content_indices[arc_code] = len(selected_mix) - 1
+                logger.info(f"[get_content_mix] Added arc content [{i+1}/{len(story_arc)}]: {decode(arc_code)}")
                 found_content = True
             if not found_content:
-                logger.warning(f"[get_content_mix] Could not find unseen content for arc step: {arc_emotion}. Stopping arc sequence here.")
-                story_arc_emotions = story_arc_emotions[:i]
+                logger.warning(f"[get_content_mix] Could not find unseen content for arc step: {decode(arc_code)}. Stopping arc sequence here.")
+                story_arc = story_arc[:i]
                 break
 
-        # 4. Determine the Peak Moment Index
+        # 5. Determine the Peak Moment Index: after the content reached by the arc's most probable edge
         peak_moment_index: Optional[int] = None
-        if len(story_arc_emotions) >= 2: # Need at least one transition
-            transition1 = (story_arc_emotions[0], story_arc_emotions[1])
-            transition1_count = personalized_transitions.get(transition1, 0)
-            peak_transition = transition1
-            highest_count = transition1_count
-
-            if len(story_arc_emotions) >= 3:
-                transition2 = (story_arc_emotions[1], story_arc_emotions[2])
-                transition2_count = personalized_transitions.get(transition2, 0)
-                if transition2_count > highest_count:
-                    peak_transition = transition2
-                    highest_count = transition2_count
-                # If counts are equal, maybe prefer the one leading to a more positive emotion?
-                # Or just keep the first one (transition1) for simplicity if counts are equal.
-
-            # Set peak index *after* the content of the emotion reached by the peak transition
-            peak_emotion_reached = peak_transition[1]
-            if peak_emotion_reached in arc_content_indices:
-                peak_moment_index = arc_content_indices[peak_emotion_reached] + 1
-                logger.info(f"[get_content_mix] Peak determined after emotion '{peak_emotion_reached}' (Transition: {peak_transition} Count: {highest_count}). Peak index: {peak_moment_index}")
-            else: # Fallback if something went wrong with indexing
-                 if len(selected_mix) >= 1: peak_moment_index = 1
-                 if len(selected_mix) >= 2: peak_moment_index = 2 # Default to after first or second item
-                 logger.warning("[get_content_mix] Could not map peak emotion to index, using default peak index.")
+        peak_edge = arc.peak_edge(len(story_arc))
+        if peak_edge is not None:
+            peak_code_reached = story_arc[peak_edge + 1]
+            peak_moment_index = arc_content_indices[peak_code_reached] + 1
+            logger.info(f"[get_content_mix] Peak determined after emotion '{decode(peak_code_reached)}' (p={arc.edge_probs[peak_edge]:.3f}). Peak index: {peak_moment_index}")
         elif len(selected_mix) > 0: # If only one arc item, peak is after it
              peak_moment_index = 1
              logger.info("[get_content_mix] Only one arc item, setting peak index to 1.")
 
 
-        # 5. Fill Remaining Slots (similar logic as before, maybe add bonus for arc emotions)
+        # 6. Fill Remaining Slots: fine ranking over the unused candidates only
         remaining_limit = limit - len(selected_mix)
         if remaining_limit > 0:
             logger.info(f"[get_content_mix] Filling remaining {remaining_limit} slots.")
-            remaining_pool = [c for c in all_unseen_pool if c.get('id') not in used_content_ids]
-            scored_contents = []
-            for content in remaining_pool:
-                if time.time() - start_time > timeout_sec:
-                    logger.warning(f"[get_content_mix] TIMEOUT during filling remaining slots!")
-                    break
-
-                emotion = content.get('emotion')
-                if not emotion: continue
-
-                pattern_score = emotion_pattern.get(emotion, 0.0)
-                relevance = self.calculate_content_relevance(content, emotion_pattern)
-                recency_score = 0.2
-                try:
-                    dt = parse_timestamp(content.get('timestamp'))
-                    if dt: days_ago = (now - dt).days
-                    else: days_ago = 999
-                    if days_ago <= 1: recency_score = 1.0
-                    elif days_ago <= 7: recency_score = 0.7
-                    elif days_ago <= 30: recency_score = 0.4
-                except Exception: pass
-
-                # Bonus if emotion is part of the planned (even if not achieved) arc
-                story_bonus = 0.05 if emotion in story_arc_emotions else 0.0
-
-                total_score = pattern_score * 0.4 + relevance * 0.3 + recency_score * 0.15 + story_bonus * 0.1
-                scored_contents.append((total_score, content))
-
-            scored_contents.sort(key=lambda x: x[0], reverse=True)
-            added_count = 0
-            max_same_emotion_in_row = 2
-            for score, content in scored_contents:
-                if len(selected_mix) >= limit: break
-                if content.get('id') not in used_content_ids:
-                    # Son eklenen içeriklerin duygusuna bak
-                    if len(selected_mix) >= max_same_emotion_in_row:
-                        last_emotions = [c['emotion'] for c in selected_mix[-max_same_emotion_in_row:]]
-                        if all(e == content['emotion'] for e in last_emotions):
-                            continue  # Aynı duygudan fazla olmasın
-                    selected_mix.append(content)
-                    used_content_ids.add(content['id'])
-                    added_count += 1
+            unused = np.fromiter((r.id not in used_content_ids for r in candidates), dtype=bool, count=len(candidates))
+            positions_left = np.flatnonzero(unused)
+            # Öncelik sırası: yaydaki duygular önce, sonra yeni olan önce (satır sırası = yenilik)
+            off_arc = ~np.isin(candidate_codes[positions_left], story_arc)
+            positions_left = positions_left[np.lexsort((candidate_rows[positions_left], off_arc))]
+            scores = self._score_by_priority(
+                columns, candidate_rows[positions_left], emotion_pattern, story_arc, now_ts,
+                keyword_scores[positions_left] if keyword_scores is not None else None,
+                deadline
+            )
+            # Süre dolduysa yalnızca skorlanan ön ek sıralanır
+            positions_left = positions_left[:len(scores)]
+            candidate_rows_left = candidate_rows[positions_left]
+
+            # MMR: keyword kümesi seçilenlere çok benzeyen (şablon kopyası) adaylar geriye itilir
+            mmr_budget_ms = MMR_BUDGET_MS if deadline is None else min(MMR_BUDGET_MS, deadline.remaining() * 1000.0)
+            diversified = mmr_order(scores, columns.keyword_bits[candidate_rows_left],
+                                    k=remaining_limit * MMR_OVERSAMPLE, budget_ms=mmr_budget_ms)
+            mmr_rank = np.empty(len(diversified))
+            mmr_rank[diversified] = np.arange(len(diversified), 0, -1)
+            # Yenilemeler arası çeşitlilik: yakın sıradaki adaylar yer değiştirebilir (seri sınırı korunur)
+            if FILL_RANK_JITTER > 0:
+                mmr_rank += np.random.uniform(0.0, FILL_RANK_JITTER, len(mmr_rank))
+
+            # Duygu kuyruklarıyla yeniden sıralama: her konuma seriyi bozmayan en iyi aday gelir
+            order = rerank_by_emotion(
+                candidate_codes[positions_left], mmr_rank, limit=remaining_limit,
+                max_run=MAX_SAME_EMOTION_IN_ROW, strict=True,
+                history=[r.emotion_code for r in selected_mix]
+            )
+            for position in order:
+                record = candidates[positions_left[position]]
+                selected_mix.append(record)
+                used_content_ids.add(record.id)
+            added_count = len(order)
             logger.info(f"[get_content_mix] Added {added_count} more items based on score.")
 
-        # 6. Fallback Fill (if still under limit)
+        # 7. Fallback Fill (if still under limit)
         if len(selected_mix) < limit:
             logger.warning(f"[get_content_mix] Still under limit. Falling back to seen/cold start pool.")
             needed = limit - len(selected_mix)
-            fallback_pool = [c for c in contents if c.get('id') not in used_content_ids] # Broadest pool
-            random.shuffle(fallback_pool)
-            fill_count = 0
-            for content in fallback_pool:
-                 if len(selected_mix) >= limit: break
-                 if content.get('id') not in used_content_ids:
-                      selected_mix.append(content)
-                      used_content_ids.add(content['id'])
-                      fill_count+=1
-            logger.info(f"[get_content_mix] Added {fill_count} items from fallback pool.")
-
-        # 7. Final Shuffle (Maybe only shuffle *after* the planned arc?)
-        # Shuffle items after the planned arc sequence to maintain the initial story flow
-        arc_len = len(story_arc_emotions)
-        if arc_len < len(selected_mix):
-            to_shuffle = selected_mix[arc_len:]
-            random.shuffle(to_shuffle)
-            selected_mix = selected_mix[:arc_len] + to_shuffle
-            logger.info(f"[get_content_mix] Shuffled content after the initial {arc_len} arc items.")
+            if contents is None:
+                fallback_pool = [r for r in columns.records if r.id not in used_content_ids] # Broadest pool
+            else:
+                rows = columns.rows
+                fallback_pool = [columns.records[rows[c.get('id')]] for c in contents
+                                 if c.get('id') in rows and c.get('id') not in used_content_ids]
+            # Rastgele sıra, seri sınırıyla; yalnızca seriyi bozacaklar kaldıysa yine de eklenir
+            order = rerank_by_emotion(
+                [r.emotion_code for r in fallback_pool], np.random.random(len(fallback_pool)), limit=needed,
+                max_run=MAX_SAME_EMOTION_IN_ROW, history=[r.emotion_code for r in selected_mix]
+            )
+            for position in order:
+                selected_mix.append(fallback_pool[position])
+                used_content_ids.add(fallback_pool[position].id)
+            logger.info(f"[get_content_mix] Added {len(order)} items from fallback pool.")
 
         # --- KEŞİF SLOTU: Hiç etkileşim vermediği duygulardan 3 içerik ekle ---
-        explore_emotions = [e for e in EMOTION_CATEGORIES.values() if emotion_pattern.get(e, 0) == 0]
-        exploration_added = 0
-        for emo in explore_emotions:
-            if exploration_added >= 3:
+        explore_codes = np.flatnonzero(to_vector(emotion_pattern) == 0)
+        if deadline is not None and not deadline.allows(DEADLINE_STAGE_MIN_SEC['exploration']):
+            deadline.degrade('exploration')
+            explore_codes = explore_codes[:0]
+        explored: List[PostRecord] = []
+        for code in explore_codes:
+            if len(explored) >= 3:
                 break
-            candidates = [c for c in contents if c.get('emotion') == emo and c.get('id') not in used_content_ids]
-            if candidates:
-                selected = random.choice(candidates)
-                selected_mix.append(selected)
-                used_content_ids.add(selected['id'])
-                exploration_added += 1
+            positions = [p for p in np.flatnonzero(candidate_codes == code) if candidates[p].id not in used_content_ids]
+            if positions:
+                explored.append(candidates[random.choice(positions)])
+        # Keşif içerikleri farklı duygulardandır; yalnızca ilki önceki seriyi uzatabilir
+        for position in rerank_by_emotion([r.emotion_code for r in explored], np.zeros(len(explored)),
+                                          max_run=MAX_SAME_EMOTION_IN_ROW,
+                                          history=[r.emotion_code for r in selected_mix]):
+            selected_mix.append(explored[position])
+            used_content_ids.add(explored[position].id)
+        exploration_added = len(explored)
         if exploration_added > 0:
             logger.info(f"[get_content_mix] {exploration_added} keşif slotu eklendi (hiç etkileşim vermediği duygulardan).")
 
         logger.info(f"[get_content_mix] DETAILED FLOW Tamamlandı. Öneri: {len(selected_mix)}, Peak index: {peak_moment_index}")
-        return selected_mix[:limit], peak_moment_index 
+        return index.materialize(selected_mix[:limit]), peak_moment_index
 
-    def _calculate_keyword_match_score(self, content: Dict[str, Any]) -> float:
-        """İçeriğin keyword eşleşme skorunu hesaplar."""
-        try:
-            content_keywords = set(content.get('keywords', []))
-            if not content_keywords:
-                return 0.0
+    def _score_candidates(
+        self,
+        columns: CatalogColumns,
+        rows: np.ndarray,
+        emotion_pattern: Dict[str, float],
+        story_arc: List[int],
+        now_ts: float,
+        keyword_scores: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Doldurma aşaması skorunu verilen satırların hepsi için tek seferde hesaplar:
+        pattern * 0.4 + relevance * 0.3 + recency * 0.15 + story_bonus * 0.1
+        + quality * CONTENT_QUALITY_RANK_WEIGHT.
+        relevance, calculate_content_relevance ile aynı formüldür; story_arc duygu kodlarıdır.
+        keyword_scores: `rows` ile hizalı keyword profil skorları (yoksa 0).
+        Etkileşim skorları yalnızca bu satırlar için engagement store'dan okunur.
+        """
+        codes = columns.emotion_codes[rows].astype(np.int64)
+        # Son hücre (kod -1) bilinmeyen duygular içindir: desende yok sayılır
+        pattern_table = np.append(to_vector(emotion_pattern), 0.0)
+        in_pattern_table = np.append([label in emotion_pattern for label in EMOTION_LABELS], False)
+        pattern_score = pattern_table[codes]
 
-            # Kullanıcının son etkileşimlerindeki keywordleri al
-            user_keywords = self._get_user_recent_keywords()
-            if not user_keywords:
-                return 0.0
+        engagement = np.array(self.engagement_store.scores_for((columns.ids[r] for r in rows), now_ts),
+                              dtype=np.float64)
 
-            # Jaccard benzerliği hesapla
-            intersection = len(content_keywords.intersection(user_keywords))
-            union = len(content_keywords.union(user_keywords))
-            
-            if union == 0:
-                return 0.0
+        keyword_score = keyword_scores if keyword_scores is not None else np.zeros(len(rows))
 
-            return intersection / union
+        relevance = pattern_score * (1.0 + engagement)
+        relevance = relevance * (1 - self.keyword_match_weight) + keyword_score * self.keyword_match_weight
+        relevance = np.where(in_pattern_table[codes], np.clip(relevance, 0.0, 1.0), 0.0)
 
-        except Exception as e:
-            logger.error(f"Keyword eşleşme skoru hesaplanırken hata: {str(e)}")
-            return 0.0
+        epochs = columns.epochs[rows]
+        days_ago = np.where(epochs != 0, np.floor((now_ts - epochs) / 86400), 999)
+        recency_score = np.select([days_ago <= 1, days_ago <= 7, days_ago <= 30], [1.0, 0.7, 0.4], 0.2)
+
+        story_bonus = np.where(np.isin(codes, story_arc), 0.05, 0.0)
+
+        quality = columns.quality[rows]
+
+        return (pattern_score * 0.4 + relevance * 0.3 + recency_score * 0.15 + story_bonus * 0.1
+                + quality * CONTENT_QUALITY_RANK_WEIGHT)
 
-    def _get_user_recent_keywords(self) -> set:
-        """Kullanıcının son etkileşimlerindeki keywordleri döndürür."""
+    def _score_by_priority(
+        self,
+        columns: CatalogColumns,
+        rows: np.ndarray,
+        emotion_pattern: Dict[str, float],
+        story_arc: List[int],
+        now_ts: float,
+        keyword_scores: Optional[np.ndarray] = None,
+        deadline: Optional[Deadline] = None
+    ) -> np.ndarray:
+        """
+        _score_candidates'i öncelik sırasındaki `rows` üzerinde RANKING_CHUNK_SIZE'lık
+        parçalarla çalıştırır. Süre dolunca durur ve skorlanan ön ekin skorlarını döndürür
+        (en az bir parça skorlanır); kesinti deadline'a 'ranking' olarak yazılır.
+        """
+        if deadline is None:
+            return self._score_candidates(columns, rows, emotion_pattern, story_arc, now_ts, keyword_scores)
+        parts = []
+        for start in range(0, len(rows), RANKING_CHUNK_SIZE):
+            if parts and deadline.expired():
+                deadline.degrade('ranking')
+                logger.warning(f"[get_content_mix] Ranking budget exhausted after {start}/{len(rows)} candidates.")
+                break
+            end = start + RANKING_CHUNK_SIZE
+            parts.append(self._score_candidates(
+                columns, rows[start:end], emotion_pattern, story_arc, now_ts,
+                keyword_scores[start:end] if keyword_scores is not None else None
+            ))
+        return np.concatenate(parts) if parts else np.empty(0)
+
+    def _calculate_keyword_match_score(self, content: Dict[str, Any],
+                                       keyword_profile: Optional[KeywordProfile] = None) -> float:
+        """İçeriğin kullanıcı keyword profiline kosinüs benzerliğini hesaplar."""
         try:
-            recent_keywords = set()
-            # Son 100 etkileşimi kontrol et
-            recent_interactions = list(self.content_engagement.items())[:100]
-            
-            for content_id, interactions in recent_interactions:
-                # Etkileşim sayısına göre ağırlıklandır
-                interaction_count = sum(interactions.values())
-                if interaction_count > 0:
-                    # İçeriğin keywordlerini al ve ağırlıklandır
-                    content = self._get_content_by_id(content_id)
-                    if content:
-                        content_keywords = set(content.get('keywords', []))
-                        recent_keywords.update(content_keywords)
-
-            return recent_keywords
+            if not keyword_profile:
+                return 0.0
+            return keyword_profile.score_keywords(content.get('keywords') or ())
 
         except Exception as e:
-            logger.error(f"Kullanıcı keywordleri alınırken hata: {str(e)}")
-            return set()
-
-    def _get_content_by_id(self, content_id: str) -> Optional[Dict[str, Any]]:
-        """İçerik ID'sine göre içeriği döndürür."""
-        # Bu fonksiyon Firebase'den içerik bilgisini alacak şekilde güncellenebilir
-        # Şimdilik boş bir sözlük döndürüyoruz
-        return {} 
\ No newline at end of file
+            logger.error(f"Keyword eşleşme skoru hesaplanırken hata: {str(e)}")
+            return 0.0
@@ -1,6 +1,8 @@
 import logging
+import threading
 import time
-from typing import Dict, Any
+from collections import deque
+from typing import Deque, Dict, Any
 from config.config import PERFORMANCE_METRICS
 
 logger = logging.getLogger(__name__)
@@ -9,12 +11,16 @@ class PerformanceMonitor:
     def __init__(self):
         self.last_request_time = time.time()
         self.scaling_factor = 1.0
-        self.metrics = {
-            'response_times': [],
-            'error_rates': [],
-            'memory_usage': [],
-            'cpu_usage': []
+        window = PERFORMANCE_METRICS['metric_window_size']
+        # Request thread'leri aynı pencereleri günceller; erişimler _lock altında
+        self._lock = threading.Lock()
+        self.metrics: Dict[str, Deque[float]] = {
+            'response_times': deque(maxlen=window),
+            'error_rates': deque(maxlen=window),
+            'memory_usage': deque(maxlen=window),
+            'cpu_usage': deque(maxlen=window)
         }
+        self.source_timings: Dict[str, Deque[float]] = {}  # Kaynak bazlı okuma süreleri (saniye)
 
     def _check_performance_metrics(self):
         """Sistem performans metriklerini kontrol eder"""
@@ -31,20 +37,43 @@ class PerformanceMonitor:
 
     def _update_metrics(self, metric_name: str, value: float):
         """Performans metriklerini günceller"""
-        self.metrics[metric_name].append(value)
-        if len(self.metrics[metric_name]) > PERFORMANCE_METRICS['metric_window_size']:
-            self.metrics[metric_name].pop(0)
+        with self._lock:
+            self.metrics[metric_name].append(value)
+
+    def _average(self, metric_name: str) -> float:
+        with self._lock:
+            samples = self.metrics[metric_name]
+            return sum(samples) / len(samples) if samples else 0
 
     def get_performance_metrics(self) -> Dict[str, Any]:
         """Güncel performans metriklerini döndürür"""
         return {
             'scaling_factor': self.scaling_factor,
-            'avg_response_time': sum(self.metrics['response_times']) / len(self.metrics['response_times']) if self.metrics['response_times'] else 0,
-            'error_rate': sum(self.metrics['error_rates']) / len(self.metrics['error_rates']) if self.metrics['error_rates'] else 0,
-            'avg_memory_usage': sum(self.metrics['memory_usage']) / len(self.metrics['memory_usage']) if self.metrics['memory_usage'] else 0,
-            'avg_cpu_usage': sum(self.metrics['cpu_usage']) / len(self.metrics['cpu_usage']) if self.metrics['cpu_usage'] else 0
+            'avg_response_time': self._average('response_times'),
+            'error_rate': self._average('error_rates'),
+            'avg_memory_usage': self._average('memory_usage'),
+            'avg_cpu_usage': self._average('cpu_usage'),
+            'avg_source_timings': self.get_source_timings()
         }
 
+    def record_source_timings(self, timings: Dict[str, float]):
+        """Veri kaynağı başına okuma sürelerini kaydeder"""
+        window = PERFORMANCE_METRICS['metric_window_size']
+        with self._lock:
+            for source, seconds in timings.items():
+                samples = self.source_timings.get(source)
+                if samples is None:
+                    samples = self.source_timings[source] = deque(maxlen=window)
+                samples.append(seconds)
+
+    def get_source_timings(self) -> Dict[str, float]:
+        """Kaynak başına ortalama okuma süresini döndürür"""
+        with self._lock:
+            return {
+                source: sum(samples) / len(samples)
+                for source, samples in self.source_timings.items() if samples
+            }
+
     def log_error(self, error: Exception):
         """Hata durumunu kaydeder"""
         self._update_metrics('error_rates', 1.0)
@@ -0,0 +1,150 @@
+"""
+user_history.py
+Bir kullanıcının etkileşim geçmişini istek başına bir kez çözümleyen, zamana göre sıralı
+paralel NumPy dizileri olarak tutan değer nesnesi.
+
+Timestamp'ler tek bir yerde (date_utils.to_epoch, varsa timestamp_ms) parse edilir;
+EmotionAnalyzer analizleri, detect_emotion_loop ve time_weighted_emotion_pattern aynı
+diziler üzerinde vektörel çalışır.
+"""
+import math
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from config.config import INTERACTION_TYPE_WEIGHTS
+from config.emotion_tables import EMOTION_CODES, EMOTION_LABELS, N_EMOTIONS
+from services.reccomend_service.date_utils import to_epoch
+
+# Duygu kodları config.emotion_tables.Emotion ile aynıdır (0..5); geçersiz duygu -1
+EMOTIONS: List[str] = EMOTION_LABELS
+
+DAY_SECONDS = 86400.0
+
+
+def _interaction_epoch(interaction: Dict[str, Any]) -> float:
+    ts_ms = interaction.get('timestamp_ms')
+    if ts_ms is not None:
+        return ts_ms / 1000.0
+    epoch = to_epoch(interaction.get('timestamp'))
+    return epoch if epoch is not None else math.nan
+
+
+class UserHistory:
+    """Zamana göre artan sırada (zamansızlar başta, kendi sıralarıyla) etkileşim dizileri"""
+
+    def __init__(self, epochs: np.ndarray, emotion_codes: np.ndarray, type_weights: np.ndarray,
+                 confidences: np.ndarray, dislikes: np.ndarray):
+        self.epochs = epochs
+        self.emotion_codes = emotion_codes
+        self.type_weights = type_weights
+        self.confidences = confidences
+        self.dislikes = dislikes
+        self.dated = ~np.isnan(epochs)
+        self.valid = emotion_codes >= 0
+
+    @classmethod
+    def from_interactions(cls, interactions: Iterable[Dict[str, Any]]) -> 'UserHistory':
+        epochs, codes, type_weights, confidences, dislikes = [], [], [], [], []
+        for interaction in interactions:
+            interaction_type = interaction.get('interactionType')
+            epochs.append(_interaction_epoch(interaction))
+            codes.append(EMOTION_CODES.get(interaction.get('emotion'), -1))
+            type_weights.append(INTERACTION_TYPE_WEIGHTS.get(interaction_type, 1.0) if interaction_type else 1.0)
+            confidences.append(interaction.get('confidence', 0.5))
+            dislikes.append(interaction_type == 'dislike')
+
+        epochs = np.asarray(epochs, dtype=np.float64)
+        # Zamansızlar -inf ile başa alınır; kararlı sıralama eşitlerde giriş sırasını korur
+        order = np.argsort(np.where(np.isnan(epochs), -np.inf, epochs), kind='stable')
+        return cls(
+            epochs[order],
+            np.asarray(codes, dtype=np.int8)[order],
+            np.asarray(type_weights, dtype=np.float64)[order],
+            np.asarray(confidences, dtype=np.float64)[order],
+            np.asarray(dislikes, dtype=bool)[order]
+        )
+
+    @classmethod
+    def coerce(cls, interactions: Union['UserHistory', Iterable[Dict[str, Any]]]) -> 'UserHistory':
+        """Hazır bir UserHistory'yi olduğu gibi döndürür, etkileşim listesinden ise oluşturur"""
+        if isinstance(interactions, cls):
+            return interactions
+        return cls.from_interactions(interactions or [])
+
+    def __len__(self) -> int:
+        return len(self.epochs)
+
+    def emotion_weights(self, recent_days: float, now: Optional[float] = None) -> Dict[str, float]:
+        """analyze_pattern'in ham duygu ağırlıkları: tip ağırlığı x güven x zaman çarpanı"""
+        now = time.time() if now is None else now
+        age = now - self.epochs
+        days_old = np.floor(age / DAY_SECONDS)
+        with np.errstate(invalid='ignore'):
+            time_factor = np.where(
+                age <= DAY_SECONDS, 2.0,
+                np.where(age <= recent_days * DAY_SECONDS, 1.5, np.maximum(0.5, 1.0 - days_old * 0.1))
+            )
+        time_factor = np.where(self.dated, time_factor, 1.0)
+        weights = self.type_weights * self.confidences * time_factor
+        sums = np.bincount(self.emotion_codes[self.valid], weights=weights[self.valid], minlength=N_EMOTIONS)
+        present = np.bincount(self.emotion_codes[self.valid], minlength=N_EMOTIONS) > 0
+        return {EMOTIONS[c]: float(sums[c]) for c in range(N_EMOTIONS) if present[c]}
+
+    def dislike_emotions(self) -> set:
+        codes = np.unique(self.emotion_codes[self.valid & self.dislikes])
+        return {EMOTIONS[c] for c in codes}
+
+    def transition_counts(self) -> Dict[Tuple[str, str], int]:
+        """Zamanı ve duygusu geçerli ardışık etkileşimler arasındaki geçiş sayıları"""
+        codes = self.emotion_codes[self.dated & self.valid].astype(np.int64)
+        if len(codes) < 2:
+            return {}
+        counts = np.bincount(codes[:-1] * N_EMOTIONS + codes[1:], minlength=N_EMOTIONS * N_EMOTIONS)
+        return {
+            (EMOTIONS[idx // N_EMOTIONS], EMOTIONS[idx % N_EMOTIONS]): int(counts[idx])
+            for idx in np.flatnonzero(counts)
+        }
+
+    def current_emotion(self) -> Optional[str]:
+        """En son zamanlı etkileşimin duygusu; hiç zaman yoksa son geçerli duygu"""
+        if not len(self):
+            return None
+        if self.dated.any():
+            code = int(self.emotion_codes[-1])
+            return EMOTIONS[code] if code >= 0 else None
+        valid_idx = np.flatnonzero(self.valid)
+        return EMOTIONS[int(self.emotion_codes[valid_idx[-1]])] if len(valid_idx) else None
+
+    def detect_loop(self, window: int = 10, threshold: float = 0.8, now: Optional[float] = None) -> Dict[str, Any]:
+        """Son `window` geçerli duyguda tek bir duyguya sıkışma olup olmadığını bulur"""
+        no_loop = {'loop': False, 'emotion': None, 'count': 0, 'days': 0}
+        recent = self.emotion_codes[self.valid][-window:] if window > 0 else []
+        if window <= 0 or len(recent) < window:
+            return no_loop
+        counts = np.bincount(recent, minlength=N_EMOTIONS)
+        code = int(np.argmax(counts))
+        if counts[code] / window < threshold:
+            return no_loop
+        # Sondan itibaren bu duygunun kesintisiz tekrar sayısı
+        mismatches = np.flatnonzero(self.emotion_codes[::-1] != code)
+        streak = int(mismatches[0]) if len(mismatches) else len(self)
+        first_epoch = self.epochs[len(self) - streak] if streak else math.nan
+        now = time.time() if now is None else now
+        days = float((now - first_epoch) / DAY_SECONDS) if not math.isnan(first_epoch) else 0
+        return {'loop': True, 'emotion': EMOTIONS[code], 'count': streak, 'days': days}
+
+    def time_weighted_pattern(self, base_pattern: Dict[str, float], weights: Dict[str, float],
+                              intervals: Dict[str, int], now: Optional[float] = None) -> Dict[str, float]:
+        """Zaman aralığına göre sabit ağırlıklı duygu dağılımı (time_weighted_emotion_pattern)"""
+        now = time.time() if now is None else now
+        mask = self.dated & self.valid
+        days_ago = np.floor((now - self.epochs[mask]) / DAY_SECONDS)
+        w = np.where(days_ago < intervals['24h'], weights['24h'],
+                     np.where(days_ago < intervals['7d'], weights['7d'], weights['older']))
+        sums = np.bincount(self.emotion_codes[mask], weights=w, minlength=N_EMOTIONS)
+        total = float(sums.sum())
+        if total == 0:
+            return base_pattern
+        return {e: float(sums[EMOTION_CODES[e]]) / total if e in EMOTION_CODES else 0.0 for e in base_pattern}
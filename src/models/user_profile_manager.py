@@ -8,12 +8,12 @@ from config.config import (
     USER_PROFILE_FACTORS,
     BEHAVIOR_ANALYSIS
 )
-from services.firebase_services.firebase_base import FirebaseBase
+from services.firebase_services.async_firebase_user_service import AsyncFirebaseUserService
 
 logger = logging.getLogger(__name__)
 
 class UserProfileManager:
-    def __init__(self, firebase_service: FirebaseBase):
+    def __init__(self, firebase_service: AsyncFirebaseUserService):
         self.firebase = firebase_service
         self.emotion_history = {}  # Kullanıcı bazlı duygu geçmişi
 
@@ -57,7 +57,7 @@ class UserProfileManager:
     async def get_user_profile(self, user_id: str) -> Dict[str, Any]:
         """Kullanıcı profilini getirir"""
         try:
-            user_data = await self.firebase.get_user_data(user_id)
+            user_data = await self.firebase.get_user(user_id)
             if not user_data:
                 return {}
             
@@ -78,8 +78,7 @@ class UserProfileManager:
     async def update_user_profile(self, user_id: str, updates: Dict[str, Any]) -> bool:
         """Kullanıcı profilini günceller"""
         try:
-            await self.firebase.update_user_data(user_id, updates)
-            return True
+            return await self.firebase.update_user(user_id, updates)
         except Exception as e:
             logger.error(f"Kullanıcı profili güncellenirken hata: {str(e)}")
             return False
@@ -3,11 +3,21 @@ from .firebase_services.firebase_user_service import FirebaseUserService
 from .firebase_services.firebase_post_service import FirebasePostService
 from .firebase_services.firebase_interaction_service import FirebaseInteractionService
 from .firebase_services.firebase_ad_service import FirebaseAdService
+from .firebase_services.async_firebase_base import AsyncFirebaseBase
+from .firebase_services.async_firebase_user_service import AsyncFirebaseUserService
+from .firebase_services.async_firebase_post_service import AsyncFirebasePostService
+from .firebase_services.async_firebase_interaction_service import AsyncFirebaseInteractionService
+from .firebase_services.async_firebase_ad_service import AsyncFirebaseAdService
 
 __all__ = [
     'FirebaseBase',
     'FirebaseUserService',
     'FirebasePostService',
     'FirebaseInteractionService',
-    'FirebaseAdService'
+    'FirebaseAdService',
+    'AsyncFirebaseBase',
+    'AsyncFirebaseUserService',
+    'AsyncFirebasePostService',
+    'AsyncFirebaseInteractionService',
+    'AsyncFirebaseAdService'
 ]
@@ -3,11 +3,21 @@ from .firebase_user_service import FirebaseUserService
 from .firebase_post_service import FirebasePostService
 from .firebase_interaction_service import FirebaseInteractionService
 from .firebase_ad_service import FirebaseAdService
+from .async_firebase_base import AsyncFirebaseBase
+from .async_firebase_user_service import AsyncFirebaseUserService
+from .async_firebase_post_service import AsyncFirebasePostService
+from .async_firebase_interaction_service import AsyncFirebaseInteractionService
+from .async_firebase_ad_service import AsyncFirebaseAdService
 
 __all__ = [
     'FirebaseBase',
     'FirebaseUserService',
     'FirebasePostService',
     'FirebaseInteractionService',
-    'FirebaseAdService'
+    'FirebaseAdService',
+    'AsyncFirebaseBase',
+    'AsyncFirebaseUserService',
+    'AsyncFirebasePostService',
+    'AsyncFirebaseInteractionService',
+    'AsyncFirebaseAdService'
 ] 
\ No newline at end of file
@@ -0,0 +1,142 @@
+import asyncio
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional
+from .async_firebase_base import AsyncFirebaseBase
+from config import COLLECTION_ADS, COLLECTION_AD_METRICS
+import logging
+
+class AsyncFirebaseAdService(AsyncFirebaseBase):
+    """FirebaseAdService'in asenkron karşılığı"""
+
+    def __init__(self):
+        super().__init__()
+        self.logger = logging.getLogger(__name__)
+
+    async def stream_ads(self, active_only: bool = False) -> AsyncIterator[Dict]:
+        """Reklamları tek tek akıtır"""
+        query = self.db.collection(COLLECTION_ADS)
+        if active_only:
+            query = query.where("is_active", "==", True)
+        async for ad in self._stream_query(query):
+            yield ad
+
+    async def get_all_ads(self) -> List[Dict]:
+        """Tüm reklamları getirir"""
+        try:
+            return [ad async for ad in self.stream_ads()]
+        except Exception as e:
+            self.logger.error(f"Reklamlar alınırken hata: {str(e)}")
+            return []
+
+    async def get_active_ads(self) -> List[Dict]:
+        """Aktif reklamları getirir"""
+        try:
+            return [ad async for ad in self.stream_ads(active_only=True)]
+        except Exception as e:
+            self.logger.error(f"Aktif reklamlar alınırken hata: {str(e)}")
+            return []
+
+    async def get_ads_by_category(self, category: str) -> List[Dict]:
+        """Kategoriye göre reklamları getirir"""
+        try:
+            query = self.db.collection(COLLECTION_ADS)\
+                .where("category", "==", category)\
+                .where("is_active", "==", True)
+            return await self._collect(query)
+        except Exception as e:
+            self.logger.error(f"Kategori bazlı reklamlar alınırken hata: {str(e)}")
+            return []
+
+    async def add_ad(self, ad_data: Dict) -> Optional[str]:
+        """Yeni reklam ekler"""
+        try:
+            ad_data['created_at'] = datetime.now().strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+            ad_data['is_active'] = True
+
+            doc_ref = self.db.collection(COLLECTION_ADS).document()
+            await doc_ref.set(ad_data)
+
+            # Reklam metriklerini başlat
+            await self._initialize_ad_metrics(doc_ref.id)
+
+            return doc_ref.id
+        except Exception as e:
+            self.logger.error(f"Reklam eklenirken hata: {str(e)}")
+            return None
+
+    async def update_ad(self, ad_id: str, ad_data: Dict) -> bool:
+        """Reklamı günceller"""
+        try:
+            ad_data['updated_at'] = datetime.now().strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+            await self.db.collection(COLLECTION_ADS).document(ad_id).set(ad_data, merge=True)
+            return True
+        except Exception as e:
+            self.logger.error(f"Reklam güncellenirken hata: {str(e)}")
+            return False
+
+    async def delete_ad(self, ad_id: str) -> bool:
+        """Reklamı siler"""
+        try:
+            await self.db.collection(COLLECTION_ADS).document(ad_id).delete()
+            return True
+        except Exception as e:
+            self.logger.error(f"Reklam silinirken hata: {str(e)}")
+            return False
+
+    async def update_ad_metrics(self, ad_id: str, metrics: Dict) -> bool:
+        """Reklam metriklerini günceller"""
+        try:
+            data = {
+                **metrics,
+                "updated_at": datetime.now().strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+            }
+            await self.db.collection(COLLECTION_AD_METRICS).document(ad_id).set(data, merge=True)
+            return True
+        except Exception as e:
+            self.logger.error(f"Reklam metrikleri güncellenirken hata: {str(e)}")
+            return False
+
+    async def get_ad_metrics(self, ad_id: str) -> Optional[Dict]:
+        """Reklam metriklerini getirir"""
+        try:
+            return await self._get_document(COLLECTION_AD_METRICS, ad_id)
+        except Exception as e:
+            self.logger.error(f"Reklam metrikleri alınırken hata: {str(e)}")
+            return None
+
+    async def _initialize_ad_metrics(self, ad_id: str) -> None:
+        """Reklam metriklerini başlatır"""
+        try:
+            now = datetime.now().strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+            await self.db.collection(COLLECTION_AD_METRICS).document(ad_id).set({
+                "impressions": 0,
+                "clicks": 0,
+                "conversions": 0,
+                "ctr": 0.0,
+                "conversion_rate": 0.0,
+                "created_at": now,
+                "updated_at": now
+            })
+        except Exception as e:
+            self.logger.error(f"Reklam metrikleri başlatılırken hata: {str(e)}")
+
+    async def get_performance_report(self, start_date: datetime, end_date: datetime) -> List[Dict]:
+        """Reklam performans raporunu getirir; reklam belgeleri eşzamanlı okunur"""
+        try:
+            query = self.db.collection(COLLECTION_AD_METRICS)\
+                .where("updated_at", ">=", start_date)\
+                .where("updated_at", "<=", end_date)
+            metrics = await self._collect(query)
+            ads = await asyncio.gather(*[self._get_document(COLLECTION_ADS, m['id']) for m in metrics])
+
+            for metric_data, ad_data in zip(metrics, ads):
+                if ad_data:
+                    metric_data['ad_info'] = {
+                        'title': ad_data.get('title'),
+                        'category': ad_data.get('category'),
+                        'is_active': ad_data.get('is_active')
+                    }
+            return metrics
+        except Exception as e:
+            self.logger.error(f"Performans raporu alınırken hata: {str(e)}")
+            return []
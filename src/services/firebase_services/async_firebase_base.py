@@ -0,0 +1,117 @@
+from firebase_admin import firestore_async
+import logging
+import traceback
+from typing import Any, AsyncIterator, Dict, List, Optional
+from .firebase_base import initialize_firebase_app
+
+class AsyncFirebaseBase:
+    """FirebaseBase'in Firestore AsyncClient üzerine kurulu asenkron karşılığı.
+
+    Tüm metodlar coroutine'dir; koleksiyon okumaları için `stream_*` async
+    generator'ları belgeleri geldikçe verir. İstemci ilk kullanımda oluşturulur,
+    böylece servis event loop dışında da örneklenebilir.
+    """
+
+    def __init__(self):
+        try:
+            initialize_firebase_app()
+            self._db = None
+            self.logger = logging.getLogger(__name__)
+            self.logger.setLevel(logging.INFO)
+        except Exception as e:
+            print(f"Firebase (async) başlatılırken hata oluştu: {str(e)}")
+            print(traceback.format_exc())
+            raise Exception(f"Firebase (async) başlatılırken hata oluştu: {str(e)}")
+
+    @property
+    def db(self):
+        if self._db is None:
+            self._db = firestore_async.client()
+        return self._db
+
+    @staticmethod
+    def _snapshot_to_dict(doc) -> Dict[str, Any]:
+        data = doc.to_dict()
+        data['id'] = doc.id
+        return data
+
+    async def _stream_query(self, query) -> AsyncIterator[Dict[str, Any]]:
+        """Sorgu sonucunu id eklenmiş sözlükler olarak akıtır"""
+        async for doc in query.stream():
+            yield self._snapshot_to_dict(doc)
+
+    async def _collect(self, query) -> List[Dict[str, Any]]:
+        return [data async for data in self._stream_query(query)]
+
+    async def _get_document(self, collection_name: str, doc_id: str) -> Optional[Dict[str, Any]]:
+        doc = await self.db.collection(collection_name).document(doc_id).get()
+        return self._snapshot_to_dict(doc) if doc.exists else None
+
+    async def stream_collection(self, collection_name: str) -> AsyncIterator[Dict[str, Any]]:
+        """Koleksiyondaki belgeleri tek tek akıtır"""
+        async for data in self._stream_query(self.db.collection(collection_name)):
+            yield data
+
+    async def get_collection(self, collection_name: str) -> List[Dict[str, Any]]:
+        """Belirtilen koleksiyondaki tüm belgeleri getirir"""
+        try:
+            return await self._collect(self.db.collection(collection_name))
+        except Exception as e:
+            self.logger.error(f"Koleksiyon getirme hatası: {str(e)}")
+            return []
+
+    async def add_document(self, collection_name: str, data: Dict[str, Any]) -> Optional[str]:
+        """Koleksiyona yeni belge ekler ve belge ID'sini döndürür."""
+        try:
+            doc_ref = self.db.collection(collection_name).document()
+            await doc_ref.set(data)
+            return doc_ref.id
+        except Exception as e:
+            print(f"Belge eklenirken hata: {str(e)}")
+            return None
+
+    async def delete_document(self, collection_name: str, doc_id: str) -> None:
+        """Belgeyi siler."""
+        try:
+            await self.db.collection(collection_name).document(doc_id).delete()
+        except Exception as e:
+            print(f"Belge silinirken hata: {str(e)}")
+
+    async def delete_collection(self, collection_name: str, batch_size: int = 500) -> None:
+        """Koleksiyondaki tüm belgeleri toplu yazma ile siler."""
+        try:
+            batch = self.db.batch()
+            pending = 0
+            async for doc in self.db.collection(collection_name).stream():
+                batch.delete(doc.reference)
+                pending += 1
+                if pending >= batch_size:
+                    await batch.commit()
+                    batch = self.db.batch()
+                    pending = 0
+            if pending:
+                await batch.commit()
+        except Exception as e:
+            print(f"Koleksiyon silinirken hata: {str(e)}")
+
+    async def get_paginated_data(self, collection_name: str, filters: Dict = None,
+                                 order_by: str = None, limit: int = 20,
+                                 start_after: str = None) -> List[Dict]:
+        """Sayfalama ile veri getir"""
+        try:
+            query = self.db.collection(collection_name)
+
+            if filters:
+                for field, value in filters.items():
+                    query = query.where(field, "==", value)
+
+            if order_by:
+                query = query.order_by(order_by)
+
+            if start_after:
+                last_doc = await self.db.collection(collection_name).document(start_after).get()
+                query = query.start_after(last_doc)
+
+            return await self._collect(query.limit(limit))
+        except Exception as e:
+            raise Exception(f"Sayfalı veri getirme hatası: {str(e)}")
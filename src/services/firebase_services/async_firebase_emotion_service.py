@@ -0,0 +1,88 @@
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional
+from .async_firebase_base import AsyncFirebaseBase
+from config import COLLECTION_USER_EMOTION_HISTORY, COLLECTION_USER_PATTERNS
+import logging
+
+class AsyncFirebaseEmotionService(AsyncFirebaseBase):
+    """FirebaseEmotionService'in asenkron karşılığı"""
+
+    def __init__(self):
+        super().__init__()
+        self.logger = logging.getLogger(__name__)
+
+    async def stream_user_emotion_history(self, user_id: str) -> AsyncIterator[Dict]:
+        """Kullanıcının duygu geçmişini geldikçe akıtır"""
+        query = self.db.collection(COLLECTION_USER_EMOTION_HISTORY).where("user_id", "==", user_id)
+        async for emotion_data in self._stream_query(query):
+            yield emotion_data
+
+    async def get_user_emotion_history(self, user_id: str) -> List[Dict]:
+        """Kullanıcının duygu geçmişini Firestore'dan alır"""
+        try:
+            return [e async for e in self.stream_user_emotion_history(user_id)]
+        except Exception as e:
+            self.logger.error(f"Duygu geçmişi alınırken hata: {str(e)}")
+            return []
+
+    async def add_emotion_data(self, user_id: str, emotion_data: Dict) -> bool:
+        """Yeni duygu verisi ekler"""
+        try:
+            data = {
+                "user_id": user_id,
+                **emotion_data,
+                "timestamp": datetime.now().strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+            }
+            await self.db.collection(COLLECTION_USER_EMOTION_HISTORY).document().set(data)
+            return True
+        except Exception as e:
+            self.logger.error(f"Duygu verisi eklenirken hata: {str(e)}")
+            return False
+
+    async def get_user_pattern(self, user_id: str) -> Optional[Dict]:
+        """Kullanıcının duygu pattern'ini getirir"""
+        try:
+            return await self._get_document(COLLECTION_USER_PATTERNS, user_id)
+        except Exception as e:
+            self.logger.error(f"Pattern alınırken hata: {str(e)}")
+            return None
+
+    async def update_user_pattern(self, user_id: str, pattern: Dict) -> bool:
+        """Kullanıcının duygu pattern'ini günceller"""
+        try:
+            data = {
+                "user_id": user_id,
+                "pattern": pattern,
+                "updated_at": datetime.now().strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+            }
+            await self.db.collection(COLLECTION_USER_PATTERNS).document(user_id).set(data, merge=True)
+            return True
+        except Exception as e:
+            self.logger.error(f"Pattern güncellenirken hata: {str(e)}")
+            return False
+
+    async def get_emotion_statistics(self, user_id: str) -> Dict:
+        """Kullanıcının duygu istatistiklerini geçmişi akıtarak tek geçişte hesaplar"""
+        try:
+            emotion_counts = {}
+            total_emotions = 0
+            async for emotion_data in self.stream_user_emotion_history(user_id):
+                total_emotions += 1
+                emotion = emotion_data.get('emotion')
+                if emotion:
+                    emotion_counts[emotion] = emotion_counts.get(emotion, 0) + 1
+
+            if not total_emotions:
+                return {}
+
+            return {
+                'total_interactions': total_emotions,
+                'emotion_distribution': {
+                    emotion: (count / total_emotions) * 100
+                    for emotion, count in emotion_counts.items()
+                },
+                'last_updated': datetime.now().strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+            }
+        except Exception as e:
+            self.logger.error(f"İstatistikler hesaplanırken hata: {str(e)}")
+            return {}
@@ -0,0 +1,152 @@
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional
+from firebase_admin import firestore
+from .async_firebase_base import AsyncFirebaseBase
+from .firebase_interaction_service import (
+    TIMESTAMP_MS_FIELD, now_ms, window_cutoff_ms, filter_legacy_interactions, legacy_scan_query
+)
+from config import (
+    COLLECTION_INTERACTIONS, COLLECTION_POSTS, COLLECTION_USER_STORY_FLOW, COLLECTION_AD_METRICS, AD_TAG,
+    INTERACTIONS_MIGRATED
+)
+import logging
+import traceback
+
+class AsyncFirebaseInteractionService(AsyncFirebaseBase):
+    """FirebaseInteractionService'in asenkron karşılığı"""
+
+    def __init__(self):
+        super().__init__()
+        self.collection_name = COLLECTION_INTERACTIONS
+        self.logger = logging.getLogger(__name__)
+        self.interactions_migrated = INTERACTIONS_MIGRATED
+
+    async def stream_user_interactions(self, user_id: str, window_days: Optional[float] = None,
+                                       max_count: Optional[int] = None) -> AsyncIterator[Dict]:
+        """Kullanıcının etkileşimlerini geldikçe akıtır; pencere verilirse yeniden eskiye sıralıdır"""
+        query = self.db.collection(self.collection_name).where("userId", "==", user_id)
+        if window_days is not None or max_count is not None:
+            cutoff_ms = window_cutoff_ms(window_days)
+            if cutoff_ms is not None:
+                query = query.where(TIMESTAMP_MS_FIELD, ">=", cutoff_ms)
+            query = query.order_by(TIMESTAMP_MS_FIELD, direction=firestore.Query.DESCENDING)
+            if max_count:
+                query = query.limit(max_count)
+        async for interaction in self._stream_query(query):
+            yield interaction
+
+    async def get_user_interactions(self, user_id: str, window_days: Optional[float] = None,
+                                    max_count: Optional[int] = None) -> List[Dict]:
+        """Kullanıcının etkileşimlerini Firestore'dan alır (bkz. FirebaseInteractionService.get_user_interactions)"""
+        try:
+            interactions = [i async for i in self.stream_user_interactions(user_id, window_days, max_count)]
+            if not self.interactions_migrated and (window_days is not None or max_count is not None):
+                # order_by(timestamp_ms) alanı olmayan belgeleri döndürmez; eski kayıtlar sınırlı taranır
+                legacy_query = legacy_scan_query(
+                    self.db.collection(self.collection_name).where("userId", "==", user_id)
+                )
+                legacy = [i async for i in self._stream_query(legacy_query) if i.get(TIMESTAMP_MS_FIELD) is None]
+                if legacy:
+                    interactions = filter_legacy_interactions(
+                        interactions + legacy, window_cutoff_ms(window_days), max_count
+                    )
+            return interactions
+        except Exception as e:
+            print(f"[FirebaseService ERROR] Etkileşimler alınırken hata oluştu: {str(e)}")
+            return []
+
+    async def add_interaction(
+        self,
+        user_id: str,
+        content_id: str,
+        interaction_type: str,
+        emotion: str,
+        confidence: float = 0.5
+    ) -> bool:
+        """Yeni bir etkileşim ekler"""
+        try:
+            data = {
+                "userId": user_id,
+                "postId": content_id,
+                "interactionType": interaction_type,
+                "emotion": emotion,
+                "confidence": confidence,
+                "timestamp": datetime.now().strftime("%B %d, %Y at %I:%M:%S %p UTC+3"),
+                TIMESTAMP_MS_FIELD: now_ms()
+            }
+            await self.db.collection(self.collection_name).document().set(data)
+            return True
+        except Exception as e:
+            error_msg = f"Etkileşim ekleme hatası: {str(e)}"
+            print(f"[FirebaseService ERROR] {error_msg}")
+            print(f"[FirebaseService ERROR] Hata detayı: {traceback.format_exc()}")
+            self.logger.error(error_msg)
+            return False
+
+    async def get_user_emotion_data(self, user_id: str) -> Dict:
+        """Kullanıcının duygu verilerini getirir"""
+        try:
+            return {
+                'interactions': await self.get_user_interactions(user_id),
+                'last_updated': datetime.now()
+            }
+        except Exception as e:
+            self.logger.error(f"Kullanıcı verisi getirme hatası: {str(e)}")
+            raise
+
+    async def log_interaction(self, user_id: str, content_id: str,
+                              interaction_type: str, emotion: str,
+                              weight: float, is_ad: bool = False) -> None:
+        """Etkileşimi kaydet ve reklam ise metrikleri güncelle"""
+        try:
+            data = {
+                "user_id": user_id,
+                "content_id": content_id,
+                "type": interaction_type,
+                "userId": user_id,
+                "postId": content_id,
+                "interactionType": interaction_type,
+                "emotion": emotion,
+                "weight": weight,
+                "confidence": weight,
+                "timestamp": datetime.now().strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
+                TIMESTAMP_MS_FIELD: now_ms(),
+                "is_ad": is_ad
+            }
+            await self.db.collection(self.collection_name).document().set(data)
+
+            if not is_ad:
+                # Tüm koleksiyonu okumak yerine sadece ilgili postu getir
+                post = await self._get_document(COLLECTION_POSTS, content_id)
+                tags = (post or {}).get('tags') or {}
+                is_ad = tags.get(AD_TAG, False) if isinstance(tags, dict) else AD_TAG in tags
+            if is_ad:
+                await self._update_ad_metrics(content_id, interaction_type, user_id, emotion)
+        except Exception as e:
+            self.logger.error(f"Etkileşim kaydedilirken hata: {str(e)}")
+            raise
+
+    async def _update_ad_metrics(self, ad_id: str, metric_type: str, user_id: str, emotion: str) -> None:
+        """Reklam etkileşimini adMetrics koleksiyonuna olay olarak yazar"""
+        await self.db.collection(COLLECTION_AD_METRICS).document().set({
+            'ad_id': ad_id,
+            'timestamp': datetime.now().isoformat(),
+            'metric_type': metric_type,
+            'user_id': user_id,
+            'emotion_before': emotion,
+            'emotion_after': None
+        })
+
+    async def save_user_story_flow(self, user_id: str, story_flow: list) -> bool:
+        """Kullanıcının hikaye akışını (duygu geçişleri) Firestore'a kaydeder"""
+        try:
+            data = {
+                "userId": user_id,
+                "storyFlow": story_flow,
+                "timestamp": datetime.now().strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+            }
+            await self.db.collection(COLLECTION_USER_STORY_FLOW).document(user_id).set(data)
+            return True
+        except Exception as e:
+            self.logger.error(f"Hikaye akışı kaydedilirken hata: {str(e)}")
+            return False
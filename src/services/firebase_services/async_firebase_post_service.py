@@ -0,0 +1,147 @@
+import asyncio
+import random
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Dict, List, Optional
+from .async_firebase_base import AsyncFirebaseBase
+from .firebase_post_service import extract_keywords
+from config import COLLECTION_POSTS, COLLECTION_POST_METRICS
+import logging
+
+class AsyncFirebasePostService(AsyncFirebaseBase):
+    """FirebasePostService'in asenkron karşılığı"""
+
+    def __init__(self):
+        super().__init__()
+        self.logger = logging.getLogger(__name__)
+
+    def _doc_to_post(self, doc) -> Dict:
+        """Firestore belgesini id ve keyword bilgisi eklenmiş post sözlüğüne çevirir."""
+        post_data = self._snapshot_to_dict(doc)
+        if 'keywords' not in post_data:
+            post_data['keywords'] = extract_keywords(post_data)
+        return post_data
+
+    async def stream_posts(self) -> AsyncIterator[Dict]:
+        """Postları keyword bilgisiyle birlikte tek tek akıtır."""
+        async for doc in self.db.collection(COLLECTION_POSTS).stream():
+            yield self._doc_to_post(doc)
+
+    async def get_all_posts(self) -> List[Dict]:
+        """Tüm postları getirir ve keyword bilgilerini ekler."""
+        try:
+            return [post async for post in self.stream_posts()]
+        except Exception as e:
+            self.logger.error(f"Postlar getirilirken hata: {str(e)}")
+            return []
+
+    async def get_posts_by_emotion(self, emotion: str, limit: int = 20) -> List[Dict]:
+        """Belirli bir duyguya sahip postları al"""
+        try:
+            query = self.db.collection(COLLECTION_POSTS).where("emotion", "==", emotion).limit(limit)
+            return await self._collect(query)
+        except Exception as e:
+            self.logger.error(f"Duygu bazlı postlar alınırken hata: {str(e)}")
+            return []
+
+    async def get_posts_by_date(self, cutoff_date: datetime, limit: int = 10) -> List[Dict]:
+        """Belirli bir tarihten sonraki postları al"""
+        try:
+            query = self.db.collection(COLLECTION_POSTS)\
+                .where("created_at", ">=", cutoff_date)\
+                .order_by("created_at")\
+                .limit(limit)
+            return await self._collect(query)
+        except Exception as e:
+            self.logger.error(f"Tarih bazlı postlar alınırken hata: {str(e)}")
+            return []
+
+    async def _get_posts_by_metrics(self, cutoff_date: datetime, limit: int) -> List[Dict]:
+        """postMetrics'e göre en çok etkileşim alan postları eşzamanlı getirir"""
+        query = self.db.collection(COLLECTION_POST_METRICS).where("updated_at", ">=", cutoff_date)
+        metrics = await self._collect(query)
+        sorted_metrics = sorted(metrics, key=lambda x: x.get('interaction_count', 0), reverse=True)[:limit]
+        posts = await asyncio.gather(*[
+            self._get_document(COLLECTION_POSTS, metric['post_id']) for metric in sorted_metrics
+        ])
+        return [post for post in posts if post]
+
+    async def get_popular_posts(self, cutoff_date: datetime, limit: int = 10) -> List[Dict]:
+        """Belirli bir tarihten sonraki popüler postları al"""
+        try:
+            return await self._get_posts_by_metrics(cutoff_date, limit)
+        except Exception as e:
+            self.logger.error(f"Popüler postlar alınırken hata: {str(e)}")
+            return []
+
+    async def get_random_posts(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Rastgele postları getirir"""
+        try:
+            posts = await self.get_collection(COLLECTION_POSTS)
+            random.shuffle(posts)
+            return posts[:limit]
+        except Exception as e:
+            raise Exception(f"Rastgele postlar alınırken hata: {str(e)}")
+
+    async def add_post(self, post_data: Dict) -> Optional[str]:
+        """Yeni post ekle"""
+        try:
+            now = datetime.now()
+            post_data['created_at'] = now.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+            post_data['timestamp_ms'] = int(now.timestamp() * 1000)
+            post_data['updated_at'] = post_data['created_at']
+            doc_ref = self.db.collection(COLLECTION_POSTS).document()
+            await doc_ref.set(post_data)
+            return doc_ref.id
+        except Exception as e:
+            self.logger.error(f"Post eklenirken hata: {str(e)}")
+            return None
+
+    async def delete_post(self, post_id: str) -> bool:
+        """Belirtilen ID'ye sahip postu siler"""
+        try:
+            await self.db.collection(COLLECTION_POSTS).document(post_id).delete()
+            return True
+        except Exception as e:
+            self.logger.error(f"Post silinirken hata: {str(e)}")
+            return False
+
+    async def update_post_metrics(self, post_id: str, metrics: Dict) -> bool:
+        """Post metriklerini günceller"""
+        try:
+            data = {
+                **metrics,
+                "updated_at": datetime.now().strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+            }
+            await self.db.collection(COLLECTION_POST_METRICS).document(post_id).set(data, merge=True)
+            return True
+        except Exception as e:
+            self.logger.error(f"Post metrikleri güncellenirken hata: {str(e)}")
+            return False
+
+    async def get_recent_content(self, days: int = 7) -> List[Dict]:
+        """Son günlerin içeriklerini getirir"""
+        try:
+            cutoff_date = datetime.now() - timedelta(days=days)
+            query = self.db.collection(COLLECTION_POSTS)\
+                .where("created_at", ">=", cutoff_date)\
+                .order_by("created_at")
+            return await self._collect(query)
+        except Exception as e:
+            self.logger.error(f"Son içerikleri getirme hatası: {str(e)}")
+            return []
+
+    async def get_popular_content(self, days: int = 30) -> List[Dict]:
+        """Popüler içerikleri getirir"""
+        try:
+            return await self._get_posts_by_metrics(datetime.now() - timedelta(days=days), 100)
+        except Exception as e:
+            self.logger.error(f"Popüler içerikleri getirme hatası: {str(e)}")
+            return []
+
+    async def get_post_by_id(self, post_id: str) -> Optional[Dict]:
+        try:
+            doc = await self.db.collection(COLLECTION_POSTS).document(post_id).get()
+            return doc.to_dict() if doc.exists else None
+        except Exception as e:
+            print(f"İçerik getirilirken hata: {str(e)}")
+            return None
@@ -0,0 +1,97 @@
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional
+from firebase_admin import firestore
+from .async_firebase_base import AsyncFirebaseBase
+from config import COLLECTION_USERS, COLLECTION_USER_PATTERNS, COLLECTION_USER_EMOTION_HISTORY
+import logging
+
+class AsyncFirebaseUserService(AsyncFirebaseBase):
+    """FirebaseUserService'in asenkron karşılığı.
+
+    Pattern ve duygu geçmişi metodları REST yerine doğrudan Firestore belgelerini kullanır.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.collection_name = COLLECTION_USERS
+        self.logger = logging.getLogger(__name__)
+
+    async def get_user(self, user_id: str) -> Optional[Dict]:
+        """Kullanıcı bilgilerini Firestore'dan alır"""
+        try:
+            return await self._get_document(self.collection_name, user_id)
+        except Exception as e:
+            self.logger.error(f"Kullanıcı bilgileri alınırken hata: {str(e)}")
+            return None
+
+    async def update_user(self, user_id: str, data: Dict) -> bool:
+        """Kullanıcı bilgilerini günceller"""
+        try:
+            await self.db.collection(self.collection_name).document(user_id).set(data, merge=True)
+            return True
+        except Exception as e:
+            self.logger.error(f"Kullanıcı güncellenirken hata: {str(e)}")
+            return False
+
+    async def stream_users(self) -> AsyncIterator[Dict]:
+        """Kullanıcıları tek tek akıtır"""
+        async for user in self.stream_collection(self.collection_name):
+            yield user
+
+    async def get_all_users(self) -> List[Dict]:
+        """Tüm kullanıcıları getirir"""
+        try:
+            return [user async for user in self.stream_users()]
+        except Exception as e:
+            self.logger.error(f"Kullanıcılar alınırken hata: {str(e)}")
+            return []
+
+    async def delete_user(self, user_id: str) -> bool:
+        """Kullanıcıyı siler"""
+        try:
+            await self.db.collection(self.collection_name).document(user_id).delete()
+            return True
+        except Exception as e:
+            self.logger.error(f"Kullanıcı silinirken hata: {str(e)}")
+            return False
+
+    async def get_user_pattern(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Kullanıcının güncel pattern'ini getir"""
+        try:
+            doc = await self._get_document(COLLECTION_USER_PATTERNS, user_id)
+            return doc.get('pattern') if doc else None
+        except Exception as e:
+            raise Exception(f"Pattern alınırken hata oluştu: {str(e)}")
+
+    async def update_user_pattern(self, user_id: str, pattern: Dict[str, Any]) -> None:
+        """Kullanıcının duygu pattern'ini günceller"""
+        try:
+            await self.db.collection(COLLECTION_USER_PATTERNS).document(user_id).set({
+                "user_id": user_id,
+                "pattern": pattern,
+                "updated_at": datetime.now().isoformat() + "Z"
+            }, merge=True)
+        except Exception as e:
+            raise Exception(f"Kullanıcı pattern'i güncellenirken hata: {str(e)}")
+
+    async def add_user_emotion(self, user_id: str, emotion_data: dict) -> bool:
+        """Kullanıcıya yeni duygu verisi ekle"""
+        try:
+            emotion_data['timestamp'] = datetime.now().isoformat() + "Z"
+            await self.db.collection(COLLECTION_USERS).document(user_id).set(
+                {'emotion_data': firestore.ArrayUnion([emotion_data])},
+                merge=True
+            )
+            return True
+        except Exception as e:
+            raise Exception(f"Duygu verisi eklenirken hata oluştu: {str(e)}")
+
+    async def update_user_emotion_history(self, user_id: str, emotion_data: Dict) -> None:
+        """Kullanıcı duygu geçmişini günceller"""
+        try:
+            await self.db.collection(COLLECTION_USER_EMOTION_HISTORY).document(user_id).set({
+                **emotion_data,
+                "updated_at": datetime.now().isoformat() + "Z"
+            }, merge=True)
+        except Exception as e:
+            raise Exception(f"Kullanıcı duygu geçmişi güncellenirken hata: {str(e)}")
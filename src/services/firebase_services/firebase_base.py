@@ -6,20 +6,24 @@ from typing import List, Dict, Any
 from datetime import datetime
 import os
 
+def initialize_firebase_app() -> None:
+    """Firebase Admin SDK'yı süreç başına bir kez başlatır"""
+    # Firebase Admin SDK sertifika dosyasının yolunu belirle
+    cert_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 
+                           'config', 'lorien-app-tr-firebase-adminsdk.json')
+    
+    # Sadece bir kez initialize et
+    if not firebase_admin._apps:
+        cred = credentials.Certificate(cert_path)
+        firebase_admin.initialize_app(cred)
+
 class FirebaseBase:
     def __init__(self):
         """Firebase servisini başlatır"""
         try:
             print("Firebase servisi başlatılıyor...")
             
-            # Firebase Admin SDK sertifika dosyasının yolunu belirle
-            cert_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 
-                                   'config', 'lorien-app-tr-firebase-adminsdk.json')
-            
-            # Sadece bir kez initialize et
-            if not firebase_admin._apps:
-                cred = credentials.Certificate(cert_path)
-                firebase_admin.initialize_app(cred)
+            initialize_firebase_app()
             
             # Firestore istemcisini oluştur
             self.db = firestore.client()
@@ -1,32 +1,111 @@
 from datetime import datetime
-from typing import Dict, List
+from typing import Callable, Dict, List, Optional
+from firebase_admin import firestore
 from .firebase_base import FirebaseBase
-from config import COLLECTION_INTERACTIONS, COLLECTION_POSTS, COLLECTION_USER_STORY_FLOW
+from config import (
+    COLLECTION_INTERACTIONS, COLLECTION_POSTS, COLLECTION_USER_STORY_FLOW, COLLECTION_USER_EMOTION_AGGREGATES,
+    INTERACTIONS_MIGRATED, LEGACY_INTERACTION_SCAN_LIMIT
+)
+from services.reccomend_service.date_utils import to_epoch
 import logging
+import time
 import traceback
 
+# Sıralanabilir zaman alanı (epoch milisaniye); pencereli sorgular bu alana göre yapılır
+TIMESTAMP_MS_FIELD = "timestamp_ms"
+# Göç öncesi kayıtların zaman alanı
+LEGACY_TIMESTAMP_FIELD = "timestamp"
+
+
+def now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def window_cutoff_ms(window_days: Optional[float]) -> Optional[int]:
+    """Zaman penceresinin başlangıcını epoch milisaniye olarak döndürür"""
+    if window_days is None:
+        return None
+    return now_ms() - int(window_days * 86400 * 1000)
+
+
+def legacy_scan_query(user_query):
+    """Eski kayıt taraması: en yeni LEGACY_INTERACTION_SCAN_LIMIT belge (`timestamp` alanına göre)"""
+    return user_query.order_by(LEGACY_TIMESTAMP_FIELD, direction=firestore.Query.DESCENDING)\
+        .limit(LEGACY_INTERACTION_SCAN_LIMIT)
+
+
+def filter_legacy_interactions(interactions: List[Dict], cutoff_ms: Optional[int],
+                               max_count: Optional[int]) -> List[Dict]:
+    """
+    timestamp_ms'li ve timestamp_ms alanı olmayan eski kayıtları birlikte pencere ve limite göre
+    bellekte süzer (yeniden eskiye); eski kayıtların zamanı `timestamp` alanından çözülür.
+    """
+    dated = []
+    for interaction in interactions:
+        ts_ms = interaction.get(TIMESTAMP_MS_FIELD)
+        if ts_ms is None:
+            epoch = to_epoch(interaction.get(LEGACY_TIMESTAMP_FIELD))
+            ts_ms = int(epoch * 1000) if epoch is not None else 0
+        if cutoff_ms is None or ts_ms >= cutoff_ms:
+            dated.append((ts_ms, interaction))
+    dated.sort(key=lambda x: x[0], reverse=True)
+    if max_count:
+        dated = dated[:max_count]
+    return [interaction for _, interaction in dated]
+
+
 class FirebaseInteractionService(FirebaseBase):
     def __init__(self):
         super().__init__()
         self.collection_name = "userEmotionInteractions"
         self.logger = logging.getLogger(__name__)
+        self.interactions_migrated = INTERACTIONS_MIGRATED
+
+    def _collect_interactions(self, query) -> List[Dict]:
+        interactions = []
+        for doc in query.stream():
+            interaction = doc.to_dict()
+            interaction['id'] = doc.id
+            interactions.append(interaction)
+        return interactions
+
+    def get_user_interactions(self, user_id: str, window_days: Optional[float] = None,
+                              max_count: Optional[int] = None) -> List[Dict]:
+        """Kullanıcının etkileşimlerini Firestore'dan alır.
 
-    def get_user_interactions(self, user_id: str) -> List[Dict]:
-        """Kullanıcının etkileşimlerini Firestore'dan alır"""
+        window_days veya max_count verilirse sadece son window_days gün içindeki en fazla
+        max_count etkileşim, timestamp_ms alanına göre yeniden eskiye sıralı olarak okunur.
+        Parametresiz çağrı tüm geçmişi sırasız döndürür.
+        Göç tamamlanmadıysa (INTERACTIONS_MIGRATED) timestamp_ms'siz eski kayıtlar en fazla
+        LEGACY_INTERACTION_SCAN_LIMIT belgelik bir taramayla sonuca katılır.
+        """
         try:
             print(f"[FirebaseService] Kullanıcı etkileşimleri alınıyor - Kullanıcı: {user_id}")
-            
-            interactions = []
-            docs = self.db.collection(self.collection_name).where("userId", "==", user_id).stream()
-            
-            for doc in docs:
-                interaction = doc.to_dict()
-                interaction['id'] = doc.id
-                interactions.append(interaction)
-            
-            print(f"[FirebaseService] Filtrelenmiş etkileşimler: {interactions}")
+            user_query = self.db.collection(self.collection_name).where("userId", "==", user_id)
+
+            if window_days is None and max_count is None:
+                interactions = self._collect_interactions(user_query)
+            else:
+                cutoff_ms = window_cutoff_ms(window_days)
+                query = user_query
+                if cutoff_ms is not None:
+                    query = query.where(TIMESTAMP_MS_FIELD, ">=", cutoff_ms)
+                query = query.order_by(TIMESTAMP_MS_FIELD, direction=firestore.Query.DESCENDING)
+                if max_count:
+                    query = query.limit(max_count)
+                interactions = self._collect_interactions(query)
+                if not self.interactions_migrated:
+                    # order_by(timestamp_ms) alanı olmayan belgeleri döndürmez
+                    legacy = [
+                        i for i in self._collect_interactions(legacy_scan_query(user_query))
+                        if i.get(TIMESTAMP_MS_FIELD) is None
+                    ]
+                    if legacy:
+                        interactions = filter_legacy_interactions(interactions + legacy, cutoff_ms, max_count)
+
+            print(f"[FirebaseService] {len(interactions)} adet etkileşim alındı")
             return interactions
-                
+
         except Exception as e:
             print(f"[FirebaseService ERROR] Etkileşimler alınırken hata oluştu: {str(e)}")
             return []
@@ -49,7 +128,8 @@ class FirebaseInteractionService(FirebaseBase):
                 "interactionType": interaction_type,
                 "emotion": emotion,
                 "confidence": confidence,
-                "timestamp": timestamp
+                "timestamp": timestamp,
+                TIMESTAMP_MS_FIELD: now_ms()
             }
             
             print(f"[FirebaseService DEBUG] Gönderilen veri: {data}")
@@ -92,10 +172,14 @@ class FirebaseInteractionService(FirebaseBase):
                 "user_id": user_id,
                 "content_id": content_id,
                 "type": interaction_type,
+                "userId": user_id,
+                "postId": content_id,
+                "interactionType": interaction_type,
                 "emotion": emotion,
                 "weight": weight,
                 "confidence": weight,
                 "timestamp": datetime.now().strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
+                TIMESTAMP_MS_FIELD: now_ms(),
                 "is_ad": is_ad
             }
             
@@ -127,4 +211,30 @@ class FirebaseInteractionService(FirebaseBase):
             return True
         except Exception as e:
             self.logger.error(f"Hikaye akışı kaydedilirken hata: {str(e)}")
-            return False 
\ No newline at end of file
+            return False
+
+    def get_emotion_aggregate(self, user_id: str) -> Optional[Dict]:
+        """Kullanıcının artımlı duygu özeti belgesini getirir; yoksa None döner"""
+        doc = self.db.collection(COLLECTION_USER_EMOTION_AGGREGATES).document(user_id).get()
+        return doc.to_dict() if doc.exists else None
+
+    def update_emotion_aggregate(self, user_id: str, update_fn: Callable[[Optional[Dict]], Dict]) -> Optional[Dict]:
+        """Duygu özetini transaction içinde okur, update_fn ile günceller ve yazar.
+
+        Aynı kullanıcı için eşzamanlı etkileşimler birbirinin güncellemesini ezmez;
+        çakışmada Firestore transaction'ı (ve update_fn'i) yeniden dener.
+        """
+        ref = self.db.collection(COLLECTION_USER_EMOTION_AGGREGATES).document(user_id)
+
+        @firestore.transactional
+        def _update(transaction):
+            snapshot = ref.get(transaction=transaction)
+            data = update_fn(snapshot.to_dict() if snapshot.exists else None)
+            transaction.set(ref, data)
+            return data
+
+        try:
+            return _update(self.db.transaction())
+        except Exception as e:
+            self.logger.error(f"Duygu özeti güncellenirken hata: {str(e)}")
+            return None
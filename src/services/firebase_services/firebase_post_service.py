@@ -7,6 +7,29 @@ import logging
 import firebase_admin
 from firebase_admin import credentials, firestore
 
+def extract_keywords(post_data: Dict) -> List[str]:
+    """Post verilerinden keywordleri çıkarır."""
+    keywords = set()
+    
+    # Başlıktan keyword çıkar
+    if 'title' in post_data:
+        title_words = post_data['title'].lower().split()
+        keywords.update([w for w in title_words if len(w) > 3])
+    
+    # İçerikten keyword çıkar
+    if 'content' in post_data:
+        content_words = post_data['content'].lower().split()
+        keywords.update([w for w in content_words if len(w) > 3])
+    
+    # Kategori ve etiketleri ekle
+    if 'category' in post_data:
+        keywords.add(post_data['category'].lower())
+    
+    if 'tags' in post_data:
+        keywords.update([tag.lower() for tag in post_data['tags']])
+    
+    return list(keywords)
+
 class FirebasePostService(FirebaseBase):
     def __init__(self):
         super().__init__()
@@ -28,45 +51,25 @@ class FirebasePostService(FirebaseBase):
         """Tüm postları getirir ve keyword bilgilerini ekler."""
         try:
             posts_ref = self.db.collection(COLLECTION_POSTS)
-            posts = []
-            
-            for post in posts_ref.stream():
-                post_data = post.to_dict()
-                post_data['id'] = post.id
-                
-                # Keyword bilgilerini ekle
-                if 'keywords' not in post_data:
-                    post_data['keywords'] = self._extract_keywords(post_data)
-                
-                posts.append(post_data)
-            
-            return posts
+            return [self._doc_to_post(post) for post in posts_ref.stream()]
         except Exception as e:
             self.logger.error(f"Postlar getirilirken hata: {str(e)}")
             return []
 
-    def _extract_keywords(self, post_data: Dict) -> List[str]:
-        """Post verilerinden keywordleri çıkarır."""
-        keywords = set()
-        
-        # Başlıktan keyword çıkar
-        if 'title' in post_data:
-            title_words = post_data['title'].lower().split()
-            keywords.update([w for w in title_words if len(w) > 3])
-        
-        # İçerikten keyword çıkar
-        if 'content' in post_data:
-            content_words = post_data['content'].lower().split()
-            keywords.update([w for w in content_words if len(w) > 3])
-        
-        # Kategori ve etiketleri ekle
-        if 'category' in post_data:
-            keywords.add(post_data['category'].lower())
+    def _doc_to_post(self, doc) -> Dict:
+        """Firestore belgesini id ve keyword bilgisi eklenmiş post sözlüğüne çevirir."""
+        post_data = doc.to_dict()
+        post_data['id'] = doc.id
         
-        if 'tags' in post_data:
-            keywords.update([tag.lower() for tag in post_data['tags']])
+        # Keyword bilgilerini ekle
+        if 'keywords' not in post_data:
+            post_data['keywords'] = self._extract_keywords(post_data)
         
-        return list(keywords)
+        return post_data
+
+    def _extract_keywords(self, post_data: Dict) -> List[str]:
+        """Post verilerinden keywordleri çıkarır."""
+        return extract_keywords(post_data)
 
     def get_posts_by_emotion(self, emotion: str, limit: int = 20) -> List[Dict]:
         """Belirli bir duyguya sahip postları al"""
@@ -147,7 +150,11 @@ class FirebasePostService(FirebaseBase):
     def add_post(self, post_data: Dict) -> str:
         """Yeni post ekle"""
         try:
-            post_data['created_at'] = datetime.now().strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+            now = datetime.now()
+            post_data['created_at'] = now.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+            post_data['timestamp_ms'] = int(now.timestamp() * 1000)
+            # PostCatalog polling modu değişiklikleri bu alanla takip eder
+            post_data['updated_at'] = post_data['created_at']
             doc_ref = self.db.collection(COLLECTION_POSTS).document()
             doc_ref.set(post_data)
             return doc_ref.id
@@ -0,0 +1,231 @@
+"""
+ad_bandit.py
+Reklam seçimi için Thompson örneklemesi.
+
+Her (reklam, bağlam duygusu) çifti için tıklama ve gösterim sayıları iki float32 matriste
+tutulur (satır: reklam, sütun: Emotion kodu; son sütun duygusu bilinmeyen bağlamlar içindir).
+Bağlam duygusu olayın `slot_emotion` alanıdır: reklamdan önceki postun duygusu. insert_ads bunu
+gösterime ve reklam öğesinin metadata'sına yazar; tıklama aynı değerle bildirildiğinden gösterim
+ve tıklama aynı sütuna düşer. `slot_emotion` alanı olmayan eski gösterimlerde `emotion_before`
+(yine önceki postun duygusu) kullanılır; bağlamı bilinmeyen tıklamalar sayılmaz.
+Tıklama olasılığının sonsal dağılımı
+
+    Beta(AD_BANDIT_PRIOR[0] + tıklama, AD_BANDIT_PRIOR[1] + gösterim - tıklama)
+
+olup `sample` her (reklam, bağlam) için bir örnek çeker (vektörel, I/O yok). Hiç gösterilmemiş
+reklamlar öncülden örneklenir; yeni reklamlar sabit bir CTR eşiğiyle dışlanmak yerine
+belirsizlikleri ölçüsünde gösterim alır.
+
+Sayaçlar AdManager'ın olay akışından (`record`) güncellenir. AdBanditCheckpointer son
+checkpoint'ten beri biriken artışları AD_BANDIT_CHECKPOINT_PATH dosyasına dosya kilidi
+altında ekler ve dosyadaki toplamları geri yükler; aynı makinedeki worker'lar böylece
+birbirlerinin olaylarını da görür.
+"""
+import atexit
+import logging
+import os
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config.config import (
+    AD_BANDIT_PRIOR,
+    AD_BANDIT_CHECKPOINT_PATH,
+    AD_BANDIT_CHECKPOINT_INTERVAL
+)
+from config.emotion_tables import N_EMOTIONS, encode
+from services.reccomend_service.ad_performance import CLICK_METRICS
+
+try:
+    import fcntl
+except ImportError:  # Windows: checkpoint kilitsiz yazılır
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class AdBandit:
+    def __init__(self, prior: Tuple[float, float] = AD_BANDIT_PRIOR, capacity: int = 64,
+                 seed: Optional[int] = None):
+        self.prior_alpha, self.prior_beta = prior
+        self._lock = threading.Lock()
+        self._rows: Dict[str, int] = {}
+        self._ids: List[str] = []
+        shape = (max(capacity, 1), N_EMOTIONS + 1)
+        self._clicks = np.zeros(shape, dtype=np.float32)
+        self._impressions = np.zeros(shape, dtype=np.float32)
+        # Son checkpoint'ten beri gelen artışlar
+        self._new_clicks = np.zeros(shape, dtype=np.float32)
+        self._new_impressions = np.zeros(shape, dtype=np.float32)
+        self._rng = np.random.default_rng(seed)
+        self._lookup: Optional[Tuple[Sequence[str], np.ndarray]] = None  # Son sample çağrısının (ad_ids, satırlar)
+
+    def _row(self, ad_id: str) -> int:
+        """Reklamın satırı; yoksa eklenir (dizi dolarsa kapasite ikiye katlanır). Kilit tutulurken çağrılır."""
+        row = self._rows.get(ad_id)
+        if row is not None:
+            return row
+        row = self._rows[ad_id] = len(self._ids)
+        self._ids.append(ad_id)
+        if row >= len(self._clicks):
+            for name in ('_clicks', '_impressions', '_new_clicks', '_new_impressions'):
+                old = getattr(self, name)
+                grown = np.zeros((len(old) * 2, old.shape[1]), dtype=old.dtype)
+                grown[:len(old)] = old
+                setattr(self, name, grown)
+        return row
+
+    def record(self, metric: Dict[str, Any]) -> None:
+        """Gösterim ve tıklama olaylarını sayar (adMetrics belgesi biçiminde); diğer olaylar yok sayılır."""
+        metric_type = metric.get('metric_type')
+        ad_id = metric.get('ad_id')
+        if ad_id is None or (metric_type != 'impression' and metric_type not in CLICK_METRICS):
+            return
+        if 'slot_emotion' in metric:
+            context = metric['slot_emotion']
+        elif metric_type == 'impression':
+            context = metric.get('emotion_before')
+        else:
+            return  # Tıklamanın hangi gösterim bağlamına ait olduğu bilinmiyor
+        code = encode(context)  # -1: son sütun
+        with self._lock:
+            row = self._row(ad_id)
+            if metric_type == 'impression':
+                self._impressions[row, code] += 1
+                self._new_impressions[row, code] += 1
+            else:
+                self._clicks[row, code] += 1
+                self._new_clicks[row, code] += 1
+
+    def sample(self, ad_ids: Sequence[str], emotion_codes: Sequence[int]) -> np.ndarray:
+        """
+        Tıklama olasılığı örnekleri, şekil (len(ad_ids), len(emotion_codes)). Aynı duygu koduna
+        sahip bağlamlar aynı örneği paylaşır (istek başına (reklam, duygu) için tek çekiliş).
+        """
+        codes, inverse = np.unique(np.asarray(emotion_codes, dtype=np.int64), return_inverse=True)
+        with self._lock:
+            lookup = self._lookup
+            if lookup is not None and lookup[0] is ad_ids:
+                rows = lookup[1]
+            else:
+                rows = np.fromiter((self._row(ad_id) for ad_id in ad_ids), dtype=np.int64, count=len(ad_ids))
+                self._lookup = (ad_ids, rows)
+            clicks = self._clicks[rows[:, None], codes[None, :]]
+            impressions = self._impressions[rows[:, None], codes[None, :]]
+            draws = self._rng.beta(self.prior_alpha + clicks,
+                                   self.prior_beta + np.maximum(impressions - clicks, 0))
+        return draws[:, inverse.ravel()]
+
+    def posterior_mean(self, ad_id: str, emotion_code: int = -1) -> float:
+        """Sonsal ortalama tıklama olasılığı (izleme ve testler için)."""
+        with self._lock:
+            row = self._rows.get(ad_id)
+            clicks = float(self._clicks[row, emotion_code]) if row is not None else 0.0
+            impressions = float(self._impressions[row, emotion_code]) if row is not None else 0.0
+        alpha = self.prior_alpha + clicks
+        return alpha / (alpha + self.prior_beta + max(impressions - clicks, 0.0))
+
+    def checkpoint(self, path: str = AD_BANDIT_CHECKPOINT_PATH) -> int:
+        """
+        Son checkpoint'ten beri biriken artışları dosyadaki toplamlara ekler, dosyayı atomik
+        olarak yeniden yazar ve birleşik toplamları belleğe yükler. Dosyadaki reklam sayısını döndürür.
+        """
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path + '.lock', 'w') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            ids, clicks, impressions = self._read(path)
+            with self._lock:
+                n = len(self._ids)
+                new_ids = list(self._ids)
+                new_clicks = self._new_clicks[:n].copy()
+                new_impressions = self._new_impressions[:n].copy()
+
+            rows = {ad_id: i for i, ad_id in enumerate(ids)}
+            ids = ids + [ad_id for ad_id in new_ids if ad_id not in rows]
+            extra = len(ids) - len(clicks)
+            clicks = np.vstack([clicks, np.zeros((extra, N_EMOTIONS + 1), dtype=np.float32)])
+            impressions = np.vstack([impressions, np.zeros((extra, N_EMOTIONS + 1), dtype=np.float32)])
+            rows.update((ad_id, i) for i, ad_id in enumerate(ids))
+            targets = np.fromiter((rows[ad_id] for ad_id in new_ids), dtype=np.int64, count=n)
+            clicks[targets] += new_clicks
+            impressions[targets] += new_impressions
+
+            tmp_path = path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                np.savez(f, ids=np.array(ids, dtype=str), clicks=clicks, impressions=impressions)
+            os.replace(tmp_path, path)
+
+        with self._lock:
+            self._new_clicks[:n] -= new_clicks
+            self._new_impressions[:n] -= new_impressions
+            local = np.fromiter((self._row(ad_id) for ad_id in ids), dtype=np.int64, count=len(ids))
+            # Yazma sırasında gelen olaylar henüz dosyada değil; toplamlara eklenerek korunur
+            self._clicks[local] = clicks + self._new_clicks[local]
+            self._impressions[local] = impressions + self._new_impressions[local]
+        return len(ids)
+
+    @staticmethod
+    def _read(path: str) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        empty = np.zeros((0, N_EMOTIONS + 1), dtype=np.float32)
+        if not os.path.exists(path):
+            return [], empty, empty
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                clicks = data['clicks'].astype(np.float32)
+                impressions = data['impressions'].astype(np.float32)
+                if clicks.shape[1:] != (N_EMOTIONS + 1,):
+                    raise ValueError(f"beklenmeyen sütun sayısı {clicks.shape}")
+                return [str(ad_id) for ad_id in data['ids']], clicks, impressions
+        except Exception as e:
+            logger.error(f"[AdBandit] Checkpoint okunamadı, yeniden oluşturulacak: {str(e)}")
+            return [], empty, empty
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._ids)
+
+
+class AdBanditCheckpointer:
+    """AdBandit sayaçlarını `interval` saniyede bir dosyayla eşitler; ilk eşitleme açılışta yapılır."""
+
+    def __init__(self, bandit: AdBandit, path: str = AD_BANDIT_CHECKPOINT_PATH,
+                 interval: float = AD_BANDIT_CHECKPOINT_INTERVAL):
+        self.bandit = bandit
+        self.path = path
+        self.interval = interval
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> 'AdBanditCheckpointer':
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name='ad-bandit-checkpoint', daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+        return self
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def close(self) -> None:
+        """Thread'i durdurur ve son artışları yazar."""
+        self.stop()
+        try:
+            self.run_once()
+        except Exception as e:
+            logger.error(f"[AdBandit] Kapanış checkpoint'i yazılamadı: {str(e)}")
+
+    def run_once(self) -> int:
+        count = self.bandit.checkpoint(self.path)
+        logger.info(f"[AdBandit] Checkpoint: {count} reklam.")
+        return count
+
+    def _loop(self) -> None:
+        while True:
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"[AdBandit] Checkpoint yazılamadı: {str(e)}")
+            if self._stop_event.wait(self.interval):
+                return
@@ -0,0 +1,181 @@
+"""
+ad_event_buffer.py
+Reklam olayları (gösterim, tıklama, duygu değişimi) için süreç içi yazma kuyruğu.
+
+AdManager olayları istek thread'inde yalnızca kuyruğa ekler. Arka plan thread'i (start) kuyruğu
+AD_EVENT_FLUSH_INTERVAL saniyede bir ya da AD_EVENT_FLUSH_SIZE olaya ulaşınca boşaltır:
+- Her olay adMetrics'e, kuyruğa eklenirken atanan id'li ayrı bir belge olarak yazılır
+  (AdPerformanceRefresher bunları sayar).
+- Aynı reklamın olay sayaçları birleştirilip `ads/{ad_id}/counters/{shard}` belgelerinden
+  rastgele birine tek Increment ile eklenir; popüler bir reklamın yazmaları böylece
+  AD_COUNTER_SHARDS belgeye dağılır. Toplam değer shard'ların toplamıdır (counter_totals).
+Yazmalar Firestore batch'leriyle yapılır; her batch kendi olaylarının belgelerini ve sayaç
+artışlarını birlikte içerir, yani bir olayın belgesi ve sayacı ya birlikte yazılır ya hiç.
+Yazma hatasında yalnızca commit edilmemiş batch'lerin olayları kuyruğa geri konur; yeniden
+denemede aynı belge id'leri kullanıldığından adMetrics belgeleri çoğalmaz.
+Kuyruk AD_EVENT_MAX_PENDING'i aşarsa yeni olaylar düşürülür.
+Süreç kapanırken kuyruk boşaltılır (atexit).
+"""
+import atexit
+import logging
+import random
+import threading
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from firebase_admin import firestore
+
+from config.config import (
+    COLLECTION_ADS,
+    COLLECTION_AD_METRICS,
+    AD_EVENT_FLUSH_INTERVAL,
+    AD_EVENT_FLUSH_SIZE,
+    AD_EVENT_MAX_PENDING,
+    AD_COUNTER_SHARDS
+)
+
+logger = logging.getLogger(__name__)
+
+COUNTER_SUBCOLLECTION = 'counters'
+BATCH_LIMIT = 500  # Firestore batch başına en fazla yazma
+
+# (adMetrics belge id'si, olay)
+_QueuedEvent = Tuple[str, Dict[str, Any]]
+
+
+class AdEventBuffer:
+    def __init__(
+        self,
+        db,
+        flush_interval: float = AD_EVENT_FLUSH_INTERVAL,
+        flush_size: int = AD_EVENT_FLUSH_SIZE,
+        shards: int = AD_COUNTER_SHARDS,
+        max_pending: int = AD_EVENT_MAX_PENDING
+    ):
+        self.db = db
+        self.flush_interval = flush_interval
+        self.flush_size = flush_size
+        self.shards = max(shards, 1)
+        self.max_pending = max_pending
+        self.dropped = 0  # Kuyruk dolu olduğu için yazılmayan olay sayısı
+        self._events: List[_QueuedEvent] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> 'AdEventBuffer':
+        """Boşaltma thread'ini başlatır (ikinci çağrı bir şey yapmaz)."""
+        with self._lock:
+            if self._thread is not None:
+                return self
+            self._thread = threading.Thread(target=self._loop, name='ad-event-flush', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+        return self
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Thread'i durdurur ve kuyrukta kalanları yazar."""
+        self._stop_event.set()
+        self._wake.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        self.flush()
+
+    def enqueue(self, event: Dict[str, Any]) -> None:
+        """adMetrics belgesini id'siyle kuyruğa ekler; eşik aşılırsa boşaltmayı hemen tetikler."""
+        with self._lock:
+            if len(self._events) >= self.max_pending:
+                self.dropped += 1
+                logger.warning(f"[AdEventBuffer] Kuyruk dolu ({self.max_pending}), olay düşürüldü.")
+                return
+            self._events.append((uuid.uuid4().hex, event))
+            full = len(self._events) >= self.flush_size
+        if full:
+            self._wake.set()
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._events)
+
+    def flush(self) -> int:
+        """Kuyruktaki olayları yazar; yazılan olay sayısını döndürür."""
+        with self._flush_lock:
+            with self._lock:
+                events, self._events = self._events, []
+            if not events:
+                return 0
+            batches = self._batches(events)
+            written = 0
+            for i, batch_events in enumerate(batches):
+                try:
+                    self._write(batch_events)
+                except Exception as e:
+                    failed = [event for pending in batches[i:] for event in pending]
+                    logger.error(f"[AdEventBuffer] {len(failed)} olay yazılamadı, kuyruğa geri konuyor: {str(e)}")
+                    with self._lock:
+                        room = max(self.max_pending - len(self._events), 0)
+                        self._events[:0] = failed[:room]
+                        self.dropped += len(failed) - min(room, len(failed))
+                    break
+                written += len(batch_events)
+            return written
+
+    @staticmethod
+    def _batches(events: List[_QueuedEvent]) -> List[List[_QueuedEvent]]:
+        """Olayları, olay belgeleri + reklam başına sayaç yazması BATCH_LIMIT'i aşmayacak şekilde böler."""
+        batches: List[List[_QueuedEvent]] = []
+        current: List[_QueuedEvent] = []
+        ad_ids = set()
+        for queued in events:
+            ad_id = queued[1]['ad_id']
+            if len(current) + len(ad_ids) + 1 + (ad_id not in ad_ids) > BATCH_LIMIT:
+                batches.append(current)
+                current, ad_ids = [], set()
+            current.append(queued)
+            ad_ids.add(ad_id)
+        if current:
+            batches.append(current)
+        return batches
+
+    def _write(self, events: List[_QueuedEvent]) -> None:
+        """Olay belgelerini ve sayaç artışlarını tek batch'te commit eder."""
+        counts: Dict[str, Dict[str, int]] = {}
+        for _, event in events:
+            by_type = counts.setdefault(event['ad_id'], {})
+            by_type[event['metric_type']] = by_type.get(event['metric_type'], 0) + 1
+
+        metrics = self.db.collection(COLLECTION_AD_METRICS)
+        ads = self.db.collection(COLLECTION_ADS)
+        last_updated = datetime.now().isoformat()
+        batch = self.db.batch()
+        for doc_id, event in events:
+            batch.set(metrics.document(doc_id), event)
+        for ad_id, by_type in counts.items():
+            shard = ads.document(ad_id).collection(COUNTER_SUBCOLLECTION).document(str(random.randrange(self.shards)))
+            batch.set(shard, {
+                'metrics': {metric_type: firestore.Increment(n) for metric_type, n in by_type.items()},
+                'last_updated': last_updated
+            }, merge=True)
+        batch.commit()
+        logger.info(f"[AdEventBuffer] {len(events)} olay, {len(counts)} reklam sayacı yazıldı.")
+
+    def counter_totals(self, ad_id: str) -> Dict[str, int]:
+        """Reklamın shard'lara dağılmış sayaçlarının toplamı (metrik türü -> sayı)."""
+        totals: Dict[str, int] = {}
+        shards = self.db.collection(COLLECTION_ADS).document(ad_id).collection(COUNTER_SUBCOLLECTION).stream()
+        for shard in shards:
+            for metric_type, value in ((shard.to_dict() or {}).get('metrics') or {}).items():
+                totals[metric_type] = totals.get(metric_type, 0) + int(value)
+        return totals
+
+    def _loop(self) -> None:
+        while not self._stop_event.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"[AdEventBuffer] Boşaltma hatası: {str(e)}")
@@ -0,0 +1,231 @@
+"""
+ad_inventory.py
+Ads koleksiyonunun süreç içi kopyası.
+
+Koleksiyon bir kez yüklenir; sonrasında Firestore snapshot listener'ı değişen/silinen
+reklamları uygular (istemcide `on_snapshot` yoksa koleksiyon AD_INVENTORY_POLL_INTERVAL
+saniyede bir yeniden okunur).
+
+Bir reklam `is_active` ise ve `start_date` (varsa) <= şimdi < `end_date` ise yayındadır;
+`end_date` yoksa reklam süresi dolmuş sayılır. Gelecekteki başlangıç/bitiş anları bir
+yığında tutulur; okumalardan önce vakti gelen anlar işlenir ve reklamlar taramasız
+olarak yayına girer/çıkar.
+Yerleştirme aşaması (insert_ads) yayındaki tüm reklamları tek skor matrisinde puanladığı için
+reklamlar duyguya/keyword'e göre ayrıca indekslenmez; sütunları (AdFeatures: duygu kodu,
+keyword bit kümesi) değişiklik olana kadar önbellekte tutulur.
+"""
+import heapq
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from config.config import (
+    COLLECTION_ADS,
+    AD_INVENTORY_POLL_INTERVAL,
+    AD_INVENTORY_READY_TIMEOUT
+)
+from config.emotion_tables import encode
+from services.reccomend_service.algorithms.mmr_diversifier import hash_keyword_bitsets, unpack_bitsets
+from services.reccomend_service.date_utils import to_epoch
+
+logger = logging.getLogger(__name__)
+
+
+class AdFeatures:
+    """Yayındaki reklamların id sırasıyla sütunları; AdInventory.features ile alınır."""
+    __slots__ = ('ads', 'ids', 'emotion_codes', 'keyword_bits', 'keyword_dense')
+
+    def __init__(self, ads: List[Dict[str, Any]]):
+        self.ads = ads
+        self.ids = [ad['id'] for ad in ads]
+        self.emotion_codes = np.fromiter((encode(ad.get('target_emotion')) for ad in ads),
+                                         dtype=np.int64, count=len(ads))
+        self.keyword_bits = hash_keyword_bitsets([ad.get('keywords') or () for ad in ads])
+        self.keyword_dense = unpack_bitsets(self.keyword_bits)
+
+    def __len__(self) -> int:
+        return len(self.ads)
+
+
+class AdInventory:
+    def __init__(self, db, poll_interval: float = AD_INVENTORY_POLL_INTERVAL):
+        self.db = db
+        self.poll_interval = poll_interval
+        self.mode: Optional[str] = None  # 'snapshot' veya 'polling'
+        self.version = 0  # Her değişiklikte artar
+        self._ads: Dict[str, Dict[str, Any]] = {}
+        self._generation: Dict[str, int] = {}  # Yığındaki eski kayıtları ayırt etmek için
+        self._live: Set[str] = set()
+        self._schedule: List[Tuple[float, int, str]] = []  # (epoch, generation, ad_id)
+        self._features: Optional[AdFeatures] = None  # Yayındaki küme değişince yeniden kurulur
+        self._lock = threading.RLock()
+        self._ready = threading.Event()
+        self._stop_event = threading.Event()
+        self._watch = None
+        self._poll_thread: Optional[threading.Thread] = None
+
+    def start(self, ready_timeout: float = AD_INVENTORY_READY_TIMEOUT) -> 'AdInventory':
+        """Reklamları yükler ve değişiklik takibini başlatır (ikinci çağrı bir şey yapmaz)."""
+        with self._lock:
+            if self.mode is not None:
+                return self
+            collection_ref = self.db.collection(COLLECTION_ADS)
+            if hasattr(collection_ref, 'on_snapshot'):
+                try:
+                    self._watch = collection_ref.on_snapshot(self._on_snapshot)
+                    self.mode = 'snapshot'
+                    logger.info("[AdInventory] Snapshot listener başlatıldı.")
+                except Exception as e:
+                    logger.warning(f"[AdInventory] Snapshot listener başlatılamadı, polling kullanılacak: {str(e)}")
+                    self._watch = None
+            if self.mode is None:
+                self.mode = 'polling'
+                self._load_all()
+                self._poll_thread = threading.Thread(target=self._poll_loop, name='ad-inventory-poll', daemon=True)
+                self._poll_thread.start()
+                logger.info(f"[AdInventory] Polling modu başlatıldı ({self.poll_interval} sn).")
+
+        if not self._ready.wait(ready_timeout):
+            logger.warning("[AdInventory] İlk snapshot zamanında gelmedi, tam yükleme yapılıyor.")
+            self._load_all()
+        return self
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._watch is not None:
+            try:
+                self._watch.unsubscribe()
+            except Exception as e:
+                logger.warning(f"[AdInventory] Listener kapatılırken hata: {str(e)}")
+            self._watch = None
+
+    def active_ads(self, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Yayındaki tüm reklamlar (id sırasıyla)."""
+        with self._lock:
+            self._advance(now)
+            return [self._ads[ad_id] for ad_id in sorted(self._live)]
+
+    def features(self, now: Optional[float] = None) -> AdFeatures:
+        """Yayındaki reklamların sütunları (değişiklik yoksa önbellekten)."""
+        with self._lock:
+            self._advance(now)
+            if self._features is None:
+                self._features = AdFeatures([self._ads[ad_id] for ad_id in sorted(self._live)])
+            return self._features
+
+    def get(self, ad_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._ads.get(ad_id)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._live)
+
+    def apply(self, upserted: List[Dict[str, Any]], removed: List[str], now: Optional[float] = None) -> None:
+        """Eklenen/değişen reklamları ve silinen id'leri uygular."""
+        now = time.time() if now is None else now
+        with self._lock:
+            for ad_id in removed:
+                self._unindex(ad_id)
+                self._ads.pop(ad_id, None)
+                self._generation[ad_id] = self._generation.get(ad_id, 0) + 1
+            for ad in upserted:
+                self._upsert(ad, now)
+            if len(self._schedule) > 2 * len(self._ads) + 64:
+                # Eski kuşaklara ait kayıtlar birikmesin
+                self._schedule = [e for e in self._schedule if self._generation.get(e[2]) == e[1]]
+                heapq.heapify(self._schedule)
+            self.version += 1
+
+    def _upsert(self, ad: Dict[str, Any], now: float) -> None:
+        ad_id = ad['id']
+        if self._ads.get(ad_id) == ad:
+            return  # Değişmemiş belge (polling yeniden okuması); zamanlama zaten yığında
+        self._unindex(ad_id)
+        generation = self._generation.get(ad_id, 0) + 1
+        self._generation[ad_id] = generation
+        self._ads[ad_id] = ad
+        if not ad.get('is_active', False):
+            return
+        start, end = self._window(ad)
+        for moment in (start, end):
+            if moment is not None and moment > now:
+                heapq.heappush(self._schedule, (moment, generation, ad_id))
+        if self._is_live(ad, now):
+            self._index(ad_id)
+
+    @staticmethod
+    def _window(ad: Dict[str, Any]) -> Tuple[Optional[float], Optional[float]]:
+        return to_epoch(ad.get('start_date')), to_epoch(ad.get('end_date'))
+
+    def _is_live(self, ad: Dict[str, Any], now: float) -> bool:
+        start, end = self._window(ad)
+        return (ad.get('is_active', False) and (start is None or start <= now)
+                and end is not None and now < end)
+
+    def _advance(self, now: Optional[float]) -> None:
+        """Vakti gelen başlangıç/bitiş anlarını işler."""
+        now = time.time() if now is None else now
+        while self._schedule and self._schedule[0][0] <= now:
+            _, generation, ad_id = heapq.heappop(self._schedule)
+            if self._generation.get(ad_id) != generation or ad_id not in self._ads:
+                continue
+            if self._is_live(self._ads[ad_id], now):
+                self._index(ad_id)
+            else:
+                self._unindex(ad_id)
+
+    def _index(self, ad_id: str) -> None:
+        """Reklamı yayındaki kümeye alır."""
+        if ad_id not in self._live:
+            self._live.add(ad_id)
+            self._features = None
+
+    def _unindex(self, ad_id: str) -> None:
+        """Reklamı yayındaki kümeden çıkarır."""
+        if ad_id in self._live:
+            self._live.discard(ad_id)
+            self._features = None
+
+    @staticmethod
+    def _doc_to_ad(doc) -> Dict[str, Any]:
+        ad = doc.to_dict() or {}
+        ad['id'] = doc.id
+        return ad
+
+    def _on_snapshot(self, docs, changes, read_time) -> None:
+        """Firestore watch thread'inden gelen değişiklikleri uygular."""
+        try:
+            upserted = []
+            removed = []
+            for change in changes:
+                if change.type.name == 'REMOVED':
+                    removed.append(change.document.id)
+                else:
+                    upserted.append(self._doc_to_ad(change.document))
+            self.apply(upserted, removed)
+        except Exception as e:
+            logger.error(f"[AdInventory] Snapshot uygulanırken hata: {str(e)}")
+        finally:
+            self._ready.set()
+
+    def _load_all(self) -> None:
+        """Koleksiyonun tamamını okuyup envanteri onunla eşitler."""
+        try:
+            ads = [self._doc_to_ad(doc) for doc in self.db.collection(COLLECTION_ADS).stream()]
+        except Exception as e:
+            logger.error(f"[AdInventory] Tam yükleme hatası: {str(e)}")
+            return
+        ids = {ad['id'] for ad in ads}
+        with self._lock:
+            removed = [ad_id for ad_id in self._ads if ad_id not in ids]
+            self.apply(ads, removed)
+        self._ready.set()
+        logger.info(f"[AdInventory] Tam yükleme tamamlandı: {len(ads)} reklam, {len(self)} yayında.")
+
+    def _poll_loop(self) -> None:
+        while not self._stop_event.wait(self.poll_interval):
+            self._load_all()
@@ -24,26 +24,6 @@ class AdManager:
         
         return combined_ads[:3]  # En fazla 3 reklam
 
-    def _merge_content_and_ads(
-        self,
-        content: List[Dict[str, Any]],
-        ads: List[Dict[str, Any]],
-        ad_frequency: int
-    ) -> List[Dict[str, Any]]:
-        """İçerik ve reklamları birleştirir"""
-        merged = []
-        ad_index = 0
-        
-        for i, item in enumerate(content):
-            merged.append(item)
-            
-            # Her ad_frequency içerikte bir reklam ekle
-            if (i + 1) % ad_frequency == 0 and ad_index < len(ads):
-                merged.append(ads[ad_index])
-                ad_index += 1
-        
-        return merged
-
     def _get_ad_recommendations(
         self, 
         user_pattern: Dict[str, Any],
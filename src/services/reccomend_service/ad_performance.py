@@ -0,0 +1,212 @@
+"""
+ad_performance.py
+Reklam başına kayan pencereli (AD_PERFORMANCE_WINDOW_DAYS gün) performans özeti.
+
+Her reklam için gün kovalarında gösterim, tıklama ve duygu değişimi sayıları tutulur;
+duygu değişimleri ayrıca "önce_to_sonra" anahtarıyla sayılır. Özet bellektedir ve iki
+yoldan güncellenir:
+- AdManager metrik yazarken olayı `record` ile aynı anda ekler (artımlı).
+- AdPerformanceRefresher adMetrics'in son penceresini tek sorguyla okuyup özeti
+  periyodik olarak yeniden kurar (diğer worker'ların yazdıkları da böylece gelir).
+Reklam yerleştirme `summary` ile (dizi halinde, reklam başına önbellekli) yalnızca bu özeti
+okur; istek sırasında Firestore okuması yoktur.
+Yenileme anında eşzamanlı kaydedilen birkaç olay bir sonraki yenilemeye kadar eksik sayılabilir.
+"""
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from config.config import (
+    COLLECTION_AD_METRICS,
+    AD_PERFORMANCE_WINDOW_DAYS,
+    AD_PERFORMANCE_REFRESH_INTERVAL
+)
+from config.emotion_tables import N_EMOTIONS, encode
+from services.reccomend_service.date_utils import to_epoch
+
+logger = logging.getLogger(__name__)
+
+# Yenileme sorgusunda okunan alanlar
+METRIC_FIELDS = ['ad_id', 'timestamp', 'metric_type', 'emotion_before', 'emotion_after']
+# Tıklama sayılan metrik türleri; track_ad_interaction tıklamaları 'click_count' olarak yazar
+CLICK_METRICS = ('click', 'click_count')
+
+
+class DayBucket:
+    __slots__ = ('impressions', 'clicks', 'emotion_changes', 'change_counts')
+
+    def __init__(self):
+        self.impressions = 0
+        self.clicks = 0
+        self.emotion_changes = 0
+        self.change_counts: Dict[str, int] = {}
+
+
+def _day_of(timestamp: Any) -> Optional[int]:
+    epoch = to_epoch(timestamp)
+    return int(epoch // 86400) if epoch is not None else None
+
+
+class AdPerformanceView:
+    def __init__(self, window_days: int = AD_PERFORMANCE_WINDOW_DAYS):
+        self.window_days = window_days
+        self._lock = threading.Lock()
+        self._ads: Dict[str, Dict[int, DayBucket]] = {}
+        # ad_id -> (oldest_day, ctr, hedef duygu başına duygu değişimi oranı); olay gelince silinir
+        self._summaries: Dict[str, Tuple[int, float, np.ndarray]] = {}
+        # Son summary çağrısının dizileri: (ad_ids, oldest_day, ctr, change_to, id -> satır)
+        self._stack: Optional[Tuple[List[str], int, np.ndarray, np.ndarray, Dict[str, int]]] = None
+        self._dirty: Set[str] = set()  # Son summary'den beri olay gelen reklamlar
+
+    @staticmethod
+    def _add(ads: Dict[str, Dict[int, DayBucket]], metric: Dict[str, Any]) -> None:
+        ad_id = metric.get('ad_id')
+        metric_type = metric.get('metric_type') or ''
+        day = _day_of(metric.get('timestamp'))
+        if ad_id is None or day is None:
+            return
+        bucket = ads.setdefault(ad_id, {}).get(day)
+        if bucket is None:
+            bucket = ads[ad_id][day] = DayBucket()
+        if metric_type == 'impression':
+            bucket.impressions += 1
+        elif metric_type in CLICK_METRICS:
+            bucket.clicks += 1
+        elif metric_type.startswith('emotion_change_'):
+            bucket.emotion_changes += 1
+            emotion_before = metric.get('emotion_before')
+            emotion_after = metric.get('emotion_after')
+            if emotion_before and emotion_after:
+                change_key = f"{emotion_before}_to_{emotion_after}"
+                bucket.change_counts[change_key] = bucket.change_counts.get(change_key, 0) + 1
+
+    def record(self, metric: Dict[str, Any]) -> None:
+        """adMetrics'e yazılan tek bir metrik belgesini özete ekler."""
+        with self._lock:
+            self._add(self._ads, metric)
+            self._summaries.pop(metric.get('ad_id'), None)
+            self._dirty.add(metric.get('ad_id'))
+
+    def replace(self, metrics: Iterable[Dict[str, Any]]) -> int:
+        """Özeti verilen metrik belgelerinden yeniden kurar; okunan belge sayısını döndürür."""
+        ads: Dict[str, Dict[int, DayBucket]] = {}
+        count = 0
+        for metric in metrics:
+            self._add(ads, metric)
+            count += 1
+        with self._lock:
+            self._ads = ads
+            self._summaries = {}
+            self._stack = None
+        return count
+
+    def _totals(self, ad_id: str, oldest_day: int) -> Tuple[int, int, int, Dict[str, int]]:
+        """Pencere içindeki toplamlar; pencere dışına düşen kovalar silinir. Kilit tutulurken çağrılır."""
+        impressions = clicks = emotion_changes = 0
+        emotion_change_scores: Dict[str, int] = {}
+        buckets = self._ads.get(ad_id, {})
+        for day in [d for d in buckets if d < oldest_day]:
+            del buckets[day]
+        for bucket in buckets.values():
+            impressions += bucket.impressions
+            clicks += bucket.clicks
+            emotion_changes += bucket.emotion_changes
+            for change_key, count in bucket.change_counts.items():
+                emotion_change_scores[change_key] = emotion_change_scores.get(change_key, 0) + count
+        return impressions, clicks, emotion_changes, emotion_change_scores
+
+    def summary(self, ad_ids: List[str], now: Optional[datetime] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Yerleştirme için dizi halinde özet: (ctr, change_to). change_to[i, code], i. reklamdan
+        sonra `code` duygusuna geçişlerin gösterime oranıdır (1'e kırpılır); son sütun (kod -1) 0.
+        Satırlar gün değişene ya da reklama yeni olay gelene kadar önbellekten okunur; aynı
+        `ad_ids` listesiyle (AdFeatures.ids) art arda çağrılarda yalnızca olay gelen satırlar
+        yeniden hesaplanır. Dönen diziler salt okunurdur.
+        """
+        oldest_day = _day_of(now or datetime.now()) - self.window_days + 1
+        with self._lock:
+            stack = self._stack
+            if stack is None or stack[0] is not ad_ids or stack[1] != oldest_day:
+                ctr = np.zeros(len(ad_ids))
+                change_to = np.zeros((len(ad_ids), N_EMOTIONS + 1))
+                for i, ad_id in enumerate(ad_ids):
+                    ctr[i], change_to[i] = self._cached_summary(ad_id, oldest_day)
+                stack = self._stack = (ad_ids, oldest_day, ctr, change_to,
+                                       {ad_id: i for i, ad_id in enumerate(ad_ids)})
+            else:
+                _, _, ctr, change_to, rows = stack
+                for ad_id in self._dirty:
+                    i = rows.get(ad_id)
+                    if i is not None:
+                        ctr[i], change_to[i] = self._cached_summary(ad_id, oldest_day)
+            self._dirty.clear()
+        ctr, change_to = stack[2].view(), stack[3].view()
+        ctr.flags.writeable = change_to.flags.writeable = False
+        return ctr, change_to
+
+    def _cached_summary(self, ad_id: str, oldest_day: int) -> Tuple[float, np.ndarray]:
+        cached = self._summaries.get(ad_id)
+        if cached is None or cached[0] != oldest_day:
+            cached = self._summaries[ad_id] = self._summarize(ad_id, oldest_day)
+        return cached[1], cached[2]
+
+    def _summarize(self, ad_id: str, oldest_day: int) -> Tuple[int, float, np.ndarray]:
+        impressions, clicks, _, emotion_change_scores = self._totals(ad_id, oldest_day)
+        row = np.zeros(N_EMOTIONS + 1)
+        if impressions > 0:
+            for change_key, count in emotion_change_scores.items():
+                code = encode(change_key.rsplit('_to_', 1)[-1])
+                if code >= 0:
+                    row[code] += count
+            row = np.minimum(row / impressions, 1.0)
+        return oldest_day, (clicks / impressions if impressions > 0 else 0.0), row
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._ads)
+
+
+class AdPerformanceRefresher:
+    """
+    adMetrics'in son `window_days` gününü tek sorguyla okuyup AdPerformanceView'u
+    `interval` saniyede bir yeniden kurar.
+    """
+
+    def __init__(self, view: AdPerformanceView, db, interval: float = AD_PERFORMANCE_REFRESH_INTERVAL):
+        self.view = view
+        self.db = db
+        self.interval = interval
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> 'AdPerformanceRefresher':
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name='ad-performance', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def run_once(self) -> int:
+        # Metrikler datetime.now().isoformat() ile yazıldığından eşik de aynı biçimdedir
+        cutoff = (datetime.now() - timedelta(days=self.view.window_days)).isoformat()
+        docs = self.db.collection(COLLECTION_AD_METRICS)\
+            .where('timestamp', '>=', cutoff)\
+            .select(METRIC_FIELDS)\
+            .stream()
+        count = self.view.replace(doc.to_dict() for doc in docs)
+        logger.info(f"[AdPerformance] {count} metrik okundu, {len(self.view)} reklam özetlendi.")
+        return count
+
+    def _loop(self) -> None:
+        while True:
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"[AdPerformance] Özet yenilenemedi: {str(e)}")
+            if self._stop_event.wait(self.interval):
+                return
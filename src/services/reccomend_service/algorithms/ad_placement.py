@@ -0,0 +1,89 @@
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from config.config import AD_OPTIMIZATION, AD_PERFORMANCE_WEIGHTS, AD_PEAK_SLOT_BONUS
+from config.emotion_tables import AD_EMOTION_WEIGHT_VECTOR
+from services.reccomend_service.algorithms.mmr_diversifier import jaccard_matrix
+
+# Son hücre (kod -1) duygusu bilinmeyen postlar içindir
+_EMOTION_WEIGHTS = np.append(AD_EMOTION_WEIGHT_VECTOR, AD_EMOTION_WEIGHT_VECTOR.mean())
+
+
+def slot_weights(n_slots: int, strategy: Dict[str, float] = AD_OPTIMIZATION['placement_strategy'],
+                 peak_slot: Optional[int] = None, peak_bonus: float = AD_PEAK_SLOT_BONUS) -> np.ndarray:
+    """
+    Slot başına ağırlık: akış üçe bölünür (beginning / middle / end) ve her slot kendi
+    bölümünün payını en büyük paya oranla alır. `peak_slot` varsa ayrıca `peak_bonus` ile çarpılır.
+    """
+    if n_slots <= 0:
+        return np.empty(0)
+    shares = np.array([strategy.get('beginning', 1.0), strategy.get('middle', 1.0), strategy.get('end', 1.0)])
+    shares = shares / shares.max() if shares.max() > 0 else np.ones(3)
+    region = np.minimum((np.arange(n_slots) * 3) // n_slots, 2)
+    weights = shares[region]
+    if peak_slot is not None and 0 <= peak_slot < n_slots:
+        weights[peak_slot] *= peak_bonus
+    return weights
+
+
+def ad_slot_scores(
+    ad_codes: np.ndarray,
+    ad_bits: np.ndarray,
+    ctr: np.ndarray,
+    change_to: np.ndarray,
+    slot_codes: np.ndarray,
+    slot_bits: np.ndarray,
+    weights: Optional[np.ndarray] = None,
+    performance_weights: Dict[str, float] = AD_PERFORMANCE_WEIGHTS,
+    ad_dense: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Reklam x slot skor matrisi, tek vektörel geçişte. Slot, önündeki postla temsil edilir
+    (slot_codes / slot_bits o postun duygu kodu ve keyword bit kümesidir):
+        emotion  = (hedef duygu eşleşirse 1, yoksa 0.5) * AD_EMOTION_WEIGHTS[post duygusu]
+        keyword  = reklam ve post keyword kümelerinin Jaccard benzerliği
+        perf     = min(ctr * 10, 1) * w_ctr + change_to[reklam, post duygusu] * w_emotion_change
+        skor     = (emotion * w_emotion + keyword * w_keyword + perf * w_performance) * slot ağırlığı
+    change_to ve ctr AdPerformanceView.summary'den, ad_dense (açılmış reklam bit kümeleri)
+    AdFeatures'tan gelir. ctr reklam x slot şeklinde de verilebilir (AdBandit.sample örnekleri).
+    """
+    slot_codes = np.asarray(slot_codes, dtype=np.int64)
+    match = ad_codes[:, None] == slot_codes[None, :]
+    emotion = np.where(match & (slot_codes >= 0)[None, :], 1.0, 0.5) * _EMOTION_WEIGHTS[slot_codes][None, :]
+    keyword = jaccard_matrix(ad_bits, slot_bits, ad_dense)
+    ctr_score = np.minimum(ctr * 10, 1.0)
+    if ctr_score.ndim == 1:
+        ctr_score = ctr_score[:, None]
+    performance = (ctr_score * performance_weights['ctr']
+                   + change_to[:, slot_codes] * performance_weights['emotion_change'])
+    scores = (emotion * performance_weights['emotion'] + keyword * performance_weights['keyword']
+              + performance * performance_weights['performance'])
+    if weights is not None:
+        scores = scores * weights[None, :]
+    return scores
+
+
+def assign_ads(scores: np.ndarray, max_ads: int, min_gap: int = 1,
+               min_score: float = 0.0) -> List[Tuple[int, int]]:
+    """
+    Skor matrisinden açgözlü atama: her adımda en yüksek (reklam, slot) çifti seçilir;
+    reklamın satırı ve slotun `min_gap`'ten yakın komşuları kapatılır. Her reklam en fazla bir
+    kez, slotlar arasında en az `min_gap` içerik kalır. İlk reklam her zaman yerleşir, sonrakiler
+    `min_score` altındaysa durulur. Dönüş: slot sırasıyla (reklam satırı, slot) çiftleri.
+    """
+    if scores.size == 0 or max_ads <= 0:
+        return []
+    scores = scores.astype(np.float64, copy=True)
+    n_slots = scores.shape[1]
+    placed: List[Tuple[int, int]] = []
+    while len(placed) < max_ads:
+        flat = int(np.argmax(scores))
+        best = scores.flat[flat]
+        if best == -np.inf or (placed and best < min_score):
+            break
+        ad, slot = divmod(flat, n_slots)
+        placed.append((ad, slot))
+        scores[ad, :] = -np.inf
+        scores[:, max(slot - min_gap + 1, 0):min(slot + min_gap, n_slots)] = -np.inf
+    return sorted(placed, key=lambda pair: pair[1])
@@ -1,7 +1,9 @@
 from typing import List, Dict
-from collections import defaultdict
+from collections import Counter, defaultdict
 import random
 
+from services.reccomend_service.algorithms.emotion_reranker import rerank_items
+
 def ensure_emotion_diversity(
     recommendations: List[Dict],
     all_contents: List[Dict],
@@ -9,27 +11,26 @@ def ensure_emotion_diversity(
 ) -> List[Dict]:
     """
     Her duygudan en az 'min_per_emotion' içerik olmasını garanti eder.
-    Eksik duygular için öneri listesinde olmayan içeriklerden ekleme yapar.
+    Eksik duygular için öneri listesinde olmayan içeriklerden rastgele ekleme yapar.
+    Sonuç emotion_reranker ile sıralanır: öneriler kendi sıralarına göre önce gelir, eklenenler
+    sonra; mümkünse aynı duygudan ikiden fazla içerik arka arkaya gelmez.
     """
-    emotion_to_contents = defaultdict(list)
-    for c in recommendations:
+    counts = Counter(c.get('emotion') for c in recommendations if c.get('emotion'))
+    recommended_ids = {c.get('id') for c in recommendations}
+    candidates_by_emotion = defaultdict(list)
+    for c in all_contents:
         emotion = c.get('emotion')
-        if emotion:
-            emotion_to_contents[emotion].append(c)
-    # Tüm duyguları belirle (hem önerilerde hem all_contents'ta olanlar)
-    all_emotions = set([c.get('emotion') for c in all_contents if c.get('emotion')])
-    for emotion in all_emotions:
-        eksik = min_per_emotion - len(emotion_to_contents[emotion])
-        if eksik > 0:
-            # Eksikse, öneri listesinde olmayanlardan ekle
-            candidates = [c for c in all_contents if c.get('emotion') == emotion and c not in recommendations]
-            if candidates:
-                to_add = random.sample(candidates, min(eksik, len(candidates)))
-                # Rastgele yerlere ekle
-                for add in to_add:
-                    idx = random.randint(0, len(recommendations))
-                    recommendations.insert(idx, add)
-    return recommendations
+        if emotion and counts[emotion] < min_per_emotion and c.get('id') not in recommended_ids:
+            candidates_by_emotion[emotion].append(c)
+    extras = []
+    for emotion, candidates in candidates_by_emotion.items():
+        eksik = min_per_emotion - counts[emotion]
+        extras.extend(random.sample(candidates, min(eksik, len(candidates))))
+    if not extras:
+        return recommendations
+    # Öneriler mevcut sırayla, eklenenler onlardan sonra skorlanır
+    items = recommendations + extras
+    return rerank_items(items, min_per_emotion=min_per_emotion)
 
 # Örnek kullanım:
 if __name__ == "__main__":
@@ -0,0 +1,129 @@
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from collections import deque
+import heapq
+
+import numpy as np
+
+
+def rerank_by_emotion(
+    codes: Sequence[int],
+    scores: Sequence[float],
+    limit: Optional[int] = None,
+    max_run: Optional[int] = 2,
+    min_per_emotion: int = 0,
+    strict: bool = False,
+    history: Sequence[int] = ()
+) -> List[int]:
+    """
+    Skorlanmış öğeleri duygu kısıtlarıyla yeniden sıralar; seçilen konumları sırayla döndürür.
+
+    Her duygu için skora göre azalan bir kuyruk tutulur, kuyruk başları bir yığında durur.
+    Her konumda izin verilen en iyi baş seçilir (seçim döngüsü O(n log k), k = duygu sayısı):
+    - Aynı duygudan en fazla `max_run` öğe arka arkaya gelir (None: sınırsız). `history`,
+      daha önce yerleştirilmiş öğelerin kodlarıdır; seri oradan devam eder.
+    - İlk `limit` öğede, öğesi olan her duygudan en az `min_per_emotion` öğe bulunur; kalan
+      konum sayısı eksiklere eşitlenince yalnızca eksik duygulardan seçilir (gerekirse seri
+      sınırı aşılır).
+    - Yalnızca seriyi bozacak öğeler kaldığında `strict` ise durulur, değilse yine de eklenir.
+    Negatif kodlar (reklam, duygusu bilinmeyen) nötrdür: seriyi ne sayar ne bozar.
+    Eşit skorlarda küçük konum önce gelir.
+    """
+    codes = np.asarray(codes, dtype=np.int64)
+    scores = np.asarray(scores, dtype=np.float64)
+    n = len(codes)
+    limit = n if limit is None else min(limit, n)
+
+    queues: Dict[int, deque] = {}
+    for position in np.lexsort((np.arange(n), -scores)).tolist():
+        queues.setdefault(int(codes[position]), deque()).append(position)
+    heap = [(-scores[queue[0]], queue[0], code) for code, queue in queues.items()]
+    heapq.heapify(heap)
+
+    deficit = {code: min(min_per_emotion, len(queue)) for code, queue in queues.items() if code >= 0}
+    outstanding = sum(deficit.values())
+
+    run_code, run_length = None, 0
+    for code in history:
+        if code < 0:
+            continue
+        run_length = run_length + 1 if code == run_code else 1
+        run_code = code
+
+    result: List[int] = []
+    while len(result) < limit and heap:
+        blocked = run_code if max_run is not None and run_length >= max_run else None
+        must_fill = outstanding > 0 and limit - len(result) <= outstanding
+        skipped = []
+        chosen = None
+        while heap:
+            entry = heapq.heappop(heap)
+            code = entry[2]
+            if (must_fill and deficit.get(code, 0) <= 0) or (code >= 0 and code == blocked):
+                skipped.append(entry)
+                continue
+            chosen = entry
+            break
+        if chosen is None:
+            if must_fill:
+                # Çeşitlilik seri sınırından önce gelir
+                fallback = [e for e in skipped if deficit.get(e[2], 0) > 0]
+            else:
+                fallback = [] if strict else skipped
+            if not fallback:
+                break
+            chosen = min(fallback)
+            skipped.remove(chosen)
+        for entry in skipped:
+            heapq.heappush(heap, entry)
+
+        code = chosen[2]
+        queue = queues[code]
+        result.append(queue.popleft())
+        if queue:
+            heapq.heappush(heap, (-scores[queue[0]], queue[0], code))
+        if deficit.get(code, 0) > 0:
+            deficit[code] -= 1
+            outstanding -= 1
+        if code >= 0:
+            run_length = run_length + 1 if code == run_code else 1
+            run_code = code
+    return result
+
+
+def rerank_items(
+    items: List[Dict[str, Any]],
+    scores: Optional[Sequence[float]] = None,
+    limit: Optional[int] = None,
+    max_run: Optional[int] = 2,
+    min_per_emotion: int = 0,
+    strict: bool = False,
+    is_neutral: Optional[Callable[[Dict[str, Any]], bool]] = None
+) -> List[Dict[str, Any]]:
+    """
+    rerank_by_emotion'ın sözlük listesi karşılığı. Duygu `emotion` alanından okunur; duygusu
+    olmayan ya da `is_neutral` ile işaretlenen öğeler nötrdür. Skor verilmezse mevcut sıra
+    korunur (ilk öğe en yüksek skor).
+    """
+    label_codes: Dict[Any, int] = {}
+    codes = []
+    for item in items:
+        emotion = item.get('emotion')
+        if emotion is None or (is_neutral is not None and is_neutral(item)):
+            codes.append(-1)
+        else:
+            codes.append(label_codes.setdefault(emotion, len(label_codes)))
+    if scores is None:
+        scores = np.arange(len(items), 0, -1, dtype=np.float64)
+    order = rerank_by_emotion(codes, scores, limit, max_run, min_per_emotion, strict)
+    return [items[position] for position in order]
+
+# Örnek kullanım:
+if __name__ == "__main__":
+    feed = [
+        {'id': 1, 'emotion': 'Neşe (Joy)'},
+        {'id': 2, 'emotion': 'Neşe (Joy)'},
+        {'id': 3, 'emotion': 'Neşe (Joy)'},
+        {'id': 4, 'emotion': 'Korku (Fear)'},
+        {'id': 5, 'emotion': 'Aşk (Love)'}
+    ]
+    print([item['id'] for item in rerank_items(feed, max_run=1)])  # [1, 4, 2, 5, 3]
@@ -0,0 +1,129 @@
+from typing import Dict, Iterable, Optional, Sequence
+import time
+import zlib
+
+import numpy as np
+
+from config.config import KEYWORD_BITSET_BITS, MMR_BUDGET_MS, MMR_LAMBDA
+
+_BYTE_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def _popcount_bytes(words: np.ndarray) -> np.ndarray:
+    """NumPy < 2.0 için: baytlara bölüp tablo ile sayar."""
+    as_bytes = np.ascontiguousarray(words).view(np.uint8).reshape(words.shape[:-1] + (-1,))
+    return _BYTE_POPCOUNT[as_bytes].sum(axis=-1, dtype=np.int64)
+
+
+def _popcount_native(words: np.ndarray) -> np.ndarray:
+    return np.bitwise_count(words).sum(axis=-1, dtype=np.int64)
+
+
+# uint64 dizisinin son ekseni boyunca bit sayısı (satır başına toplam)
+popcount = _popcount_native if hasattr(np, 'bitwise_count') else _popcount_bytes
+
+
+def build_keyword_bitsets(n_rows: int, keyword_rows: Dict[int, np.ndarray],
+                          n_bits: int = KEYWORD_BITSET_BITS) -> np.ndarray:
+    """
+    Satır başına sabit genişlikli keyword bit kümesi, şekil (n_rows, n_bits // 64), uint64.
+    keyword id'si `id % n_bits` bitine düşer; sözlük n_bits'ten büyükse çakışmalar benzerliği
+    biraz yukarı çeker (Jaccard tahmini).
+    """
+    words = max(n_bits // 64, 1)
+    bits = np.zeros((n_rows, words), dtype=np.uint64)
+    if not keyword_rows or n_rows == 0:
+        return bits
+    keyword_ids = np.fromiter(keyword_rows.keys(), dtype=np.int64, count=len(keyword_rows))
+    lengths = np.fromiter((len(r) for r in keyword_rows.values()), dtype=np.int64, count=len(keyword_rows))
+    rows = np.concatenate(list(keyword_rows.values()))
+    positions = np.repeat(keyword_ids % (words * 64), lengths)
+    masks = np.left_shift(np.uint64(1), (positions & 63).astype(np.uint64))
+    np.bitwise_or.at(bits, (rows, positions >> 6), masks)
+    return bits
+
+
+def hash_keyword_bitsets(keyword_lists: Sequence[Iterable[str]], n_bits: int = KEYWORD_BITSET_BITS) -> np.ndarray:
+    """
+    Keyword string listelerinden build_keyword_bitsets ile aynı biçimde bit kümeleri.
+    Bit konumu crc32(keyword) % n_bits'tir (süreçten bağımsız); interner'da olmayan
+    keyword'ler (reklamlar gibi) için kullanılır.
+    """
+    words = max(n_bits // 64, 1)
+    bits = np.zeros((len(keyword_lists), words), dtype=np.uint64)
+    rows, positions = [], []
+    for row, keywords in enumerate(keyword_lists):
+        for keyword in keywords or ():
+            rows.append(row)
+            positions.append(zlib.crc32(str(keyword).encode('utf-8')) % (words * 64))
+    if rows:
+        positions = np.array(positions, dtype=np.int64)
+        masks = np.left_shift(np.uint64(1), (positions & 63).astype(np.uint64))
+        np.bitwise_or.at(bits, (np.array(rows, dtype=np.int64), positions >> 6), masks)
+    return bits
+
+
+def unpack_bitsets(bitsets: np.ndarray) -> np.ndarray:
+    """Bit kümelerini satır başına 0/1 float32 matrise açar (matris çarpımıyla kesişim için)."""
+    return np.unpackbits(np.ascontiguousarray(bitsets).view(np.uint8), axis=1).astype(np.float32)
+
+
+def jaccard_matrix(a: np.ndarray, b: np.ndarray, a_dense: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    a'nın her satırının b'nin her satırına Jaccard benzerliği, şekil (len(a), len(b)); iki boş
+    küme için 0. Kesişimler, yalnızca b'de dolu bit sütunları üzerinde 0/1 matris çarpımıdır;
+    a çok satırlıysa açılmış hali (unpack_bitsets(a)) önbellekten `a_dense` olarak verilebilir.
+    """
+    b_dense = np.unpackbits(np.ascontiguousarray(b).view(np.uint8), axis=1)
+    columns = np.flatnonzero(b_dense.any(axis=0))
+    b_dense = b_dense[:, columns].astype(np.float32)
+    if a_dense is None:
+        a_dense = unpack_bitsets(a)
+    intersection = a_dense[:, columns] @ b_dense.T
+    union = popcount(a)[:, None] + b_dense.sum(axis=1)[None, :] - intersection
+    similarity = np.zeros(intersection.shape)
+    np.divide(intersection, union, out=similarity, where=union > 0)
+    return similarity
+
+
+def jaccard_to(bitsets: np.ndarray, counts: np.ndarray, i: int) -> np.ndarray:
+    """Tüm satırların i. satıra Jaccard benzerliği; iki boş küme için 0."""
+    intersection = popcount(bitsets & bitsets[i])
+    union = counts + counts[i] - intersection
+    similarity = np.zeros(len(bitsets))
+    np.divide(intersection, union, out=similarity, where=union > 0)
+    return similarity
+
+
+def mmr_order(relevance: np.ndarray, bitsets: np.ndarray, k: int, lam: float = MMR_LAMBDA,
+              budget_ms: float = MMR_BUDGET_MS) -> np.ndarray:
+    """
+    Maximal marginal relevance sıralaması. İlk en fazla k konum sırayla
+        lam * relevance - (1 - lam) * seçilenlere en yüksek Jaccard benzerliği
+    en büyük olan adaydır; kalanlar relevance sırasıyla (eşitlikte küçük konum önce) eklenir.
+    Her adım tek bir vektörel popcount çekirdeğidir, toplam O(k * m). Süre `budget_ms`'i
+    aşarsa seçim o adımda kesilir ve kalanlar relevance sırasıyla gelir.
+    """
+    relevance = np.asarray(relevance, dtype=np.float64)
+    m = len(relevance)
+    by_relevance = np.lexsort((np.arange(m), -relevance))
+    k = min(k, m)
+    if k <= 1 or lam >= 1.0:
+        return by_relevance
+
+    deadline = time.perf_counter() + budget_ms / 1000.0
+    counts = popcount(bitsets)
+    max_similarity = np.zeros(m)
+    chosen = np.zeros(m, dtype=bool)
+    order = []
+    for _ in range(k):
+        marginal = lam * relevance - (1.0 - lam) * max_similarity
+        marginal[chosen] = -np.inf
+        best = int(np.argmax(marginal))
+        order.append(best)
+        chosen[best] = True
+        np.maximum(max_similarity, jaccard_to(bitsets, counts, best), out=max_similarity)
+        if time.perf_counter() > deadline:
+            break
+    rest = by_relevance[~chosen[by_relevance]]
+    return np.concatenate([np.array(order, dtype=np.int64), rest])
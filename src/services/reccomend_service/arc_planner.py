@@ -0,0 +1,98 @@
+"""
+arc_planner.py
+get_content_mix için hikaye yayı (duygu sırası) planlayıcısı.
+
+Kullanıcının geçiş sayıları, genel EMOTION_TRANSITION_MATRIX önsel olarak kullanılıp
+yumuşatılmış bir 6x6 olasılık matrisine çevrilir:
+    P[i] = (sayılar[i] + güç * T[i]) / (sayılar[i].toplam + güç)
+Yay, bu matris üzerinde log-olasılıkla ışın aramasıyla bulunur. Aynı duygu yayda iki kez
+yer almaz ve yalnızca katalogda içeriği olan duygulara geçilir. Maliyet kullanıcının kaç
+farklı geçişi olduğuna değil, yay uzunluğu x ışın genişliği x 6'ya bağlıdır.
+"""
+from typing import List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from config.config import STORY_ARC_BEAM_WIDTH, STORY_ARC_LENGTH, STORY_ARC_PRIOR_STRENGTH
+from config.emotion_tables import N_EMOTIONS, TRANSITION_MATRIX, decode, pairs_to_matrix
+
+
+class StoryArc:
+    __slots__ = ('codes', 'edge_probs')
+
+    def __init__(self, codes: List[int], edge_probs: List[float]):
+        self.codes = codes  # Emotion kodları; ilki mevcut duygu
+        self.edge_probs = edge_probs  # edge_probs[k]: codes[k] -> codes[k + 1] olasılığı
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    @property
+    def labels(self) -> List[Optional[str]]:
+        return [decode(c) for c in self.codes]
+
+    def peak_edge(self, steps: Optional[int] = None) -> Optional[int]:
+        """
+        En olası geçişin indeksi (eşitlikte ilki); geçiş yoksa None.
+        `steps` verilirse yalnızca yayın ilk `steps` duygusu arasındaki geçişlere bakılır.
+        """
+        edge_probs = self.edge_probs if steps is None else self.edge_probs[:max(steps - 1, 0)]
+        if not edge_probs:
+            return None
+        return int(np.argmax(edge_probs))
+
+
+class ArcPlanner:
+    def __init__(self, length: int = STORY_ARC_LENGTH, beam_width: int = STORY_ARC_BEAM_WIDTH,
+                 prior_strength: float = STORY_ARC_PRIOR_STRENGTH):
+        self.length = length
+        self.beam_width = beam_width
+        self.prior_strength = prior_strength
+        row_sums = TRANSITION_MATRIX.sum(axis=1, keepdims=True)
+        self._prior = np.divide(TRANSITION_MATRIX, row_sums, out=np.full_like(TRANSITION_MATRIX, 1.0 / N_EMOTIONS),
+                                where=row_sums > 0)
+
+    def transition_probabilities(self, counts: np.ndarray) -> np.ndarray:
+        """Kullanıcının 6x6 geçiş sayılarını önselle harmanlanmış satır-stokastik matrise çevirir."""
+        counts = np.maximum(np.asarray(counts, dtype=np.float64), 0.0)
+        smoothed = counts + self.prior_strength * self._prior
+        totals = smoothed.sum(axis=1, keepdims=True)
+        return np.divide(smoothed, totals, out=self._prior.copy(), where=totals > 0)
+
+    def plan(self, current_code: int, counts: np.ndarray, available: np.ndarray,
+             length: Optional[int] = None) -> StoryArc:
+        """
+        current_code'dan başlayan en olası yayı döndürür.
+        `available[c]`: c duygusunda gösterilebilir içerik var mı. Mevcut duyguda içerik yoksa
+        yay boştur; hiçbir ışın uzatılamazsa yay `length`'ten kısa kalır.
+        """
+        length = self.length if length is None else length
+        if not 0 <= current_code < N_EMOTIONS or not available[current_code] or length <= 0:
+            return StoryArc([], [])
+        probs = self.transition_probabilities(counts)
+        log_probs = np.log(probs, out=np.full_like(probs, -np.inf), where=probs > 0)
+
+        # Işın: (log-olasılık, kodlar)
+        beams: List[Tuple[float, List[int]]] = [(0.0, [current_code])]
+        for _ in range(length - 1):
+            extended: List[Tuple[float, List[int]]] = []
+            for score, codes in beams:
+                allowed = np.array(available, dtype=bool)
+                allowed[codes] = False
+                allowed &= np.isfinite(log_probs[codes[-1]])
+                for code in np.flatnonzero(allowed):
+                    extended.append((score + log_probs[codes[-1], code], codes + [int(code)]))
+            if not extended:
+                break
+            # Kararlı sıralama: eşit skorda önce eklenen (küçük kodlu) yay kalır
+            extended.sort(key=lambda beam: -beam[0])
+            beams = extended[:self.beam_width]
+
+        codes = beams[0][1]
+        edge_probs = [float(probs[a, b]) for a, b in zip(codes, codes[1:])]
+        return StoryArc(codes, edge_probs)
+
+    def plan_from_pairs(self, current_code: int, transitions: Mapping[Tuple[str, str], int],
+                        available: np.ndarray, length: Optional[int] = None) -> StoryArc:
+        """plan'ın {(kaynak, hedef): sayı} biçimindeki geçişlerle çağrılan karşılığı."""
+        return self.plan(current_code, pairs_to_matrix(transitions), available, length)
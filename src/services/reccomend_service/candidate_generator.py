@@ -0,0 +1,85 @@
+"""
+candidate_generator.py
+get_content_mix için iki aşamalı getirmenin ilk (ucuz) aşaması.
+
+Katalog sütunları kurulurken her duygu için iki global liste hazırlanır (CatalogColumns):
+yenilik sırası (emotion_rows) ve kalite sırası (quality_rows). İstek anında her duygunun
+kotası kullanıcının deseni ve planlanan yay duygularıyla orantılı hesaplanır ve bu
+listelerin başından alınır; kullanıcının en güçlü profil keyword'lerini içeren en yeni
+postlar da havuza eklenir. Tam skorlama (relevance/keyword/recency) yalnızca bu sınırlı
+havuzda yapılır, böylece istek maliyeti katalog boyutuna değil havuz boyutuna bağlıdır.
+"""
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+from config.config import (
+    CANDIDATE_ARC_BOOST,
+    CANDIDATE_KEYWORD_FANOUT,
+    CANDIDATE_KEYWORD_TOP,
+    CANDIDATE_MIN_PER_EMOTION,
+    CANDIDATE_POOL_SIZE
+)
+from config.emotion_tables import N_EMOTIONS, to_vector
+from services.reccomend_service.catalog_index import CatalogColumns
+from services.reccomend_service.keyword_profile import KeywordProfile
+
+
+class CandidateGenerator:
+    def __init__(self, pool_size: int = CANDIDATE_POOL_SIZE, min_per_emotion: int = CANDIDATE_MIN_PER_EMOTION,
+                 arc_boost: float = CANDIDATE_ARC_BOOST, keyword_top: int = CANDIDATE_KEYWORD_TOP,
+                 keyword_fanout: int = CANDIDATE_KEYWORD_FANOUT):
+        self.pool_size = pool_size
+        self.min_per_emotion = min_per_emotion
+        self.arc_boost = arc_boost
+        self.keyword_top = keyword_top
+        self.keyword_fanout = keyword_fanout
+
+    def quotas(self, emotion_pattern: Dict[str, float], story_arc: Iterable[int],
+               available: np.ndarray) -> np.ndarray:
+        """
+        Duygu kodu başına aday kotası. İçeriği olan her duygu en az `min_per_emotion` alır;
+        kalan havuz (desen ağırlığı + yaydaysa arc_boost) ile orantılı dağıtılır.
+        Kota o duygudaki içerik sayısını aşmaz.
+        """
+        available = np.asarray(available, dtype=np.int64)
+        has_content = available > 0
+        weights = np.maximum(to_vector(emotion_pattern), 0.0)
+        weights[[c for c in story_arc if 0 <= c < N_EMOTIONS]] += self.arc_boost
+        weights[~has_content] = 0.0
+        if weights.sum() <= 0:
+            weights = has_content.astype(np.float64)
+        floor = np.where(has_content, self.min_per_emotion, 0)
+        spare = max(self.pool_size - int(floor.sum()), 0)
+        total = weights.sum()
+        share = np.floor(spare * weights / total) if total > 0 else np.zeros(N_EMOTIONS)
+        return np.minimum(floor + share.astype(np.int64), available)
+
+    def generate(self, columns: CatalogColumns, emotion_pattern: Dict[str, float], story_arc: Iterable[int],
+                 keyword_profile: Optional[KeywordProfile] = None) -> np.ndarray:
+        """
+        Aday satırlarını artan sırayla (yeniden eskiye) döndürür. Her duygunun kotasının yarısı
+        yenilik listesinden, kalanı kalite listesinde henüz alınmamış satırlardan gelir.
+        Duygusu olmayan postlar havuza alınmaz.
+        """
+        available = np.fromiter((len(rows) for rows in columns.emotion_rows), dtype=np.int64, count=N_EMOTIONS)
+        quotas = self.quotas(emotion_pattern, story_arc, available)
+        parts = []
+        for code, quota in enumerate(quotas):
+            if quota <= 0:
+                continue
+            fresh = columns.emotion_rows[code][:(quota + 1) // 2]
+            # Kalite listesinin ilk `quota` satırında yenilik yarısında olmayan en az quota - len(fresh) satır vardır
+            best = columns.quality_rows[code][:quota]
+            best = best[~np.isin(best, fresh)][:quota - len(fresh)]
+            parts.append(fresh)
+            parts.append(best)
+        if keyword_profile and keyword_profile.interner is columns.interner:
+            for keyword_id in keyword_profile.top_keywords(self.keyword_top):
+                rows = columns.keyword_rows.get(keyword_id)
+                if rows is not None:
+                    parts.append(rows[:self.keyword_fanout])
+        if not parts:
+            return np.empty(0, dtype=np.int64)
+        rows = np.unique(np.concatenate(parts))
+        return rows[columns.emotion_codes[rows] >= 0]
@@ -0,0 +1,204 @@
+"""
+catalog_index.py
+İçerik kataloğu için önceden hazırlanmış indeksler:
+- tüm postların yenilik sırası (insort ile güncel tutulur),
+- puanlama için sütun dizileri (duygu kodu, epoch, keyword sayısı, keyword satırları; bkz. CatalogColumns),
+- duygu başına global yenilik ve kalite sıralı satır listeleri (aday üretimi için).
+
+Kalite skorları çevrimdışı hesaplanır (bkz. content_quality) ve set_quality ile yüklenir.
+
+Postlar indekste PostRecord olarak tutulur; tam belge yalnızca materialize ile alınır.
+
+PostCatalog listener'ı olarak bağlandığında sadece değişen postlar işlenir,
+böylece get_content_mix her istekte katalog üzerinde tam tarama yapmaz.
+Sütun görüntüsü değişikliği uygulayan thread'de (snapshot/polling, kalite zamanlayıcısı)
+yeniden kurulur ve tek atamayla değiştirilir; istekler kilit almadan hazır görüntüyü okur.
+"""
+import bisect
+import threading
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from config.emotion_tables import N_EMOTIONS
+from services.reccomend_service.algorithms.mmr_diversifier import build_keyword_bitsets
+from services.reccomend_service.date_utils import to_epoch
+from services.reccomend_service.post_record import KeywordInterner, PostRecord
+
+BULK_SORT_THRESHOLD = 64
+
+# Sıralı listelerde anahtar: (-epoch, post_id) -> en yeni başta
+_SortKey = Tuple[float, str]
+
+
+def post_epoch(post: Dict[str, Any]) -> float:
+    """Postun zaman damgasını epoch saniyeye çevirir (varsa timestamp_ms); yoksa 0 döner."""
+    ts_ms = post.get('timestamp_ms')
+    if ts_ms is not None:
+        return ts_ms / 1000.0
+    return to_epoch(post.get('timestamp') or post.get('created_at')) or 0.0
+
+
+class CatalogColumns:
+    """
+    Katalogun bir andaki sütun görüntüsü. Satırlar yeniden eskiye sıralıdır
+    (satır i -> records[i], ids[i]); kayıtlar sütunlarla aynı anda alınır.
+    - emotion_codes: Emotion kodu, duygusu olmayan/bilinmeyen post -1
+    - epochs: epoch saniye, zamansız post 0
+    - keyword_counts: farklı keyword sayısı
+    - popularity: likes + yorum + views
+    - quality: çevrimdışı kalite skoru (postMetrics.quality), skoru olmayan post 0
+    - keyword_rows: keyword id -> o keyword'ü içeren satırlar (artan, yani yeniden eskiye)
+    - keyword_bits: satır başına keyword bit kümesi (MMR benzerliği için, bkz. mmr_diversifier)
+    - emotion_rows[kod]: o duygudaki satırlar, yeniden eskiye
+    - quality_rows[kod]: o duygudaki satırlar, kaliteye sonra popülerliğe göre azalan (eşitlikte yeni önce)
+    """
+
+    def __init__(self, records: List[PostRecord], emotion_codes: np.ndarray, epochs: np.ndarray,
+                 keyword_counts: np.ndarray, popularity: np.ndarray, quality: np.ndarray,
+                 keyword_rows: Dict[int, np.ndarray], interner: KeywordInterner):
+        self.records = records
+        ids = self.ids = [r.id for r in records]
+        self.rows: Dict[str, int] = {post_id: row for row, post_id in enumerate(ids)}
+        self.emotion_codes = emotion_codes
+        self.epochs = epochs
+        self.keyword_counts = keyword_counts
+        self.popularity = popularity
+        self.quality = quality
+        self.keyword_rows = keyword_rows
+        self.keyword_bits = build_keyword_bitsets(len(ids), keyword_rows)
+        self.interner = interner
+        self.emotion_rows: List[np.ndarray] = []
+        self.quality_rows: List[np.ndarray] = []
+        for code in range(N_EMOTIONS):
+            rows = np.flatnonzero(emotion_codes == code)
+            self.emotion_rows.append(rows)
+            self.quality_rows.append(rows[np.lexsort((rows, -popularity[rows], -quality[rows]))])
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def emotion_counts(self) -> np.ndarray:
+        """Duygu kodu başına post sayısı (uzunluk N_EMOTIONS)."""
+        return np.fromiter((len(rows) for rows in self.emotion_rows), dtype=np.int64, count=N_EMOTIONS)
+
+
+class CatalogIndex:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.interner = KeywordInterner()
+        self._posts: Dict[str, Dict[str, Any]] = {}
+        self._records: Dict[str, PostRecord] = {}
+        self._by_recency: List[_SortKey] = []
+        self._quality: Dict[str, float] = {}
+        self._columns: CatalogColumns = self._build_columns()
+
+    @classmethod
+    def from_posts(cls, posts: Iterable[Dict[str, Any]]) -> 'CatalogIndex':
+        index = cls()
+        index.apply(list(posts), [])
+        return index
+
+    def attach(self, catalog) -> 'CatalogIndex':
+        """PostCatalog değişikliklerine abone olur."""
+        catalog.add_listener(self.apply)
+        return self
+
+    def apply(self, upserted: List[Dict[str, Any]], removed: List[str]) -> None:
+        """Eklenen/değişen postları indekse yazar, silinenleri çıkarır."""
+        # Toplu yüklemede (ilk snapshot, tam senkronizasyon) tek tek insort yerine sonda sırala
+        bulk = len(upserted) > BULK_SORT_THRESHOLD
+        with self._lock:
+            for post_id in removed:
+                self._remove(post_id)
+            for post in upserted:
+                post_id = post.get('id')
+                if post_id is None:
+                    continue
+                self._remove(post_id)
+                self._add(post_id, post, keep_sorted=not bulk)
+            if bulk:
+                self._by_recency.sort()
+            self._columns = self._build_columns()
+
+    def __len__(self) -> int:
+        return len(self._posts)
+
+    def get(self, post_id: str) -> Optional[Dict[str, Any]]:
+        """Postun tam belgesini döndürür."""
+        return self._posts.get(post_id)
+
+    def record(self, post_id: Any) -> Optional[PostRecord]:
+        return self._records.get(post_id)
+
+    def materialize(self, records: Iterable[PostRecord]) -> List[Dict[str, Any]]:
+        """Yanıt için kayıtların tam belgelerini döndürür (indeksten çıkmış olanlar atlanır)."""
+        posts = self._posts
+        return [posts[r.id] for r in records if r.id in posts]
+
+    def epoch(self, post_id: str) -> float:
+        record = self._records.get(post_id)
+        return record.epoch if record is not None else 0.0
+
+    def set_quality(self, scores: Dict[str, float]) -> None:
+        """Çevrimdışı kalite skorlarını (post id -> skor) değiştirir; sütunlar yeniden kurulur."""
+        with self._lock:
+            self._quality = dict(scores)
+            self._columns = self._build_columns()
+
+    def quality(self, post_id: str) -> float:
+        return self._quality.get(post_id, 0.0)
+
+    def columns(self) -> CatalogColumns:
+        """Güncel sütun görüntüsünü döndürür (kilitsiz; görüntü değişmez, yenisiyle değiştirilir)."""
+        return self._columns
+
+    def _build_columns(self) -> CatalogColumns:
+        """Kilit tutulurken çağrılır."""
+        ids = [post_id for _, post_id in self._by_recency]
+        records = [self._records[post_id] for post_id in ids]
+        n = len(ids)
+        # Satırlar sırayla gezildiği için her keyword'ün satır listesi artan sıradadır
+        rows_by_keyword: Dict[int, List[int]] = defaultdict(list)
+        for row, record in enumerate(records):
+            for keyword_id in record.keyword_ids:
+                rows_by_keyword[keyword_id].append(row)
+        keyword_rows = {keyword_id: np.array(rows, dtype=np.int64) for keyword_id, rows in rows_by_keyword.items()}
+        return CatalogColumns(
+            records,
+            np.fromiter((r.emotion_code for r in records), dtype=np.int8, count=n),
+            np.fromiter((r.epoch for r in records), dtype=np.float64, count=n),
+            np.fromiter((len(r.keyword_ids) for r in records), dtype=np.int32, count=n),
+            np.fromiter((r.popularity for r in records), dtype=np.int64, count=n),
+            np.fromiter((self._quality.get(post_id, 0.0) for post_id in ids), dtype=np.float64, count=n),
+            keyword_rows,
+            self.interner
+        )
+
+    def _add(self, post_id: str, post: Dict[str, Any], keep_sorted: bool = True) -> None:
+        record = PostRecord.from_post(post, post_epoch(post), self.interner)
+        key = (-record.epoch, post_id)
+        self._posts[post_id] = post
+        self._records[post_id] = record
+        if keep_sorted:
+            bisect.insort(self._by_recency, key)
+        else:
+            self._by_recency.append(key)
+
+    def _remove(self, post_id: str) -> None:
+        record = self._records.pop(post_id, None)
+        if record is None:
+            return
+        del self._posts[post_id]
+        key = (-record.epoch, post_id)
+        self._discard(self._by_recency, key)
+
+    @staticmethod
+    def _discard(keys: List[_SortKey], key: _SortKey) -> None:
+        i = bisect.bisect_left(keys, key)
+        if i < len(keys) and keys[i] == key:
+            del keys[i]
+        elif key in keys:
+            # Toplu yükleme sırasında liste henüz sıralanmamış olabilir
+            keys.remove(key)
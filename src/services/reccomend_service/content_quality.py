@@ -0,0 +1,202 @@
+"""
+content_quality.py
+Postlar için çevrimdışı hesaplanan kalite, yenilik ve popülerlik skorları.
+
+Skorlar tüm postlar için numpy ile toplu hesaplanır (CONTENT_QUALITY_METRICS ağırlıklarıyla):
+    engagement_rate: (likes + yorum) / max(views, 1), 1'e kırpılır
+    freshness: 1 / (1 + yaş_gün); zaman damgası olmayan post 0
+    user_reputation: belgedeki alan, yoksa 0.5
+    content_length: min(len(content) / 1000, 1)
+    popularity: log1p(likes + yorum + views), en popüler post 1 olacak şekilde ölçeklenir
+
+ContentQualityJob sonuçları postMetrics'e Firestore batch yazmalarıyla (merge) yazar.
+`updated_at` alanına dokunulmaz; o alan etkileşim metriklerinin tazeliğini gösterir.
+Ranker skorları CatalogIndex.set_quality ile yüklenen `quality` sütunundan okur, istek başına
+hesap yapılmaz. QualityScheduler aynı işi süreç içinde PostCatalog üzerinde periyodik çalıştırır.
+Komut satırı: utils/score_content_quality.py
+"""
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from config.config import (
+    COLLECTION_POST_METRICS,
+    COLLECTION_POSTS,
+    CONTENT_QUALITY_JOB_INTERVAL,
+    CONTENT_QUALITY_JOB_WRITE,
+    CONTENT_QUALITY_METRICS
+)
+from services.reccomend_service.catalog_index import post_epoch
+from services.reccomend_service.post_record import comments_count, count_field
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 400  # Firestore batch başına en fazla 500 yazma
+DEFAULT_REPUTATION = 0.5
+
+
+class QualityScores:
+    """score_posts sonucu; diziler `ids` ile hizalıdır."""
+    __slots__ = ('ids', 'quality', 'freshness', 'popularity')
+
+    def __init__(self, ids: List[str], quality: np.ndarray, freshness: np.ndarray, popularity: np.ndarray):
+        self.ids = ids
+        self.quality = quality
+        self.freshness = freshness
+        self.popularity = popularity
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def as_dict(self) -> Dict[str, float]:
+        """post id -> kalite skoru (CatalogIndex.set_quality girdisi)."""
+        return dict(zip(self.ids, self.quality.tolist()))
+
+    def documents(self, computed_at: str) -> Iterable[tuple]:
+        """postMetrics'e yazılacak (post_id, alanlar) çiftleri."""
+        for post_id, quality, freshness, popularity in zip(
+                self.ids, self.quality.tolist(), self.freshness.tolist(), self.popularity.tolist()):
+            yield post_id, {
+                'post_id': post_id,
+                'quality': quality,
+                'freshness': freshness,
+                'popularity': popularity,
+                'quality_updated_at': computed_at
+            }
+
+
+def score_posts(posts: List[Dict[str, Any]], now: Optional[float] = None) -> QualityScores:
+    """Postların kalite, yenilik ve popülerlik skorlarını tek seferde hesaplar."""
+    now = time.time() if now is None else now
+    posts = [p for p in posts if p.get('id') is not None]
+    n = len(posts)
+    likes = np.fromiter((count_field(p.get('likes')) for p in posts), dtype=np.float64, count=n)
+    comments = np.fromiter((comments_count(p) for p in posts), dtype=np.float64, count=n)
+    views = np.fromiter((count_field(p.get('views')) for p in posts), dtype=np.float64, count=n)
+    epochs = np.fromiter((post_epoch(p) for p in posts), dtype=np.float64, count=n)
+    reputation = np.fromiter((_reputation(p) for p in posts), dtype=np.float64, count=n)
+    lengths = np.fromiter((len(p.get('content') or '') for p in posts), dtype=np.float64, count=n)
+
+    engagement_rate = np.minimum((likes + comments) / np.maximum(views, 1.0), 1.0)
+    age_days = np.floor(np.maximum(now - epochs, 0.0) / 86400)
+    freshness = np.where(epochs > 0, 1.0 / (1.0 + age_days), 0.0)
+    components = {
+        'engagement_rate': engagement_rate,
+        'freshness': freshness,
+        'user_reputation': reputation,
+        'content_length': np.minimum(lengths / 1000, 1.0)
+    }
+    quality = np.zeros(n)
+    for metric, weight in CONTENT_QUALITY_METRICS.items():
+        quality += weight * components[metric]
+
+    log_popularity = np.log1p(likes + comments + views)
+    top = log_popularity.max() if n else 0.0
+    popularity = log_popularity / top if top > 0 else np.zeros(n)
+    return QualityScores([p['id'] for p in posts], quality, freshness, popularity)
+
+
+def _reputation(post: Dict[str, Any]) -> float:
+    value = post.get('user_reputation', DEFAULT_REPUTATION)
+    return float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else DEFAULT_REPUTATION
+
+
+class ContentQualityJob:
+    def __init__(self, db, batch_size: int = BATCH_SIZE, dry_run: bool = False):
+        self.db = db
+        self.batch_size = min(batch_size, 500)
+        self.dry_run = dry_run
+
+    def load_posts(self) -> List[Dict[str, Any]]:
+        """Silinmemiş tüm postları okur (CLI için; uygulama PostCatalog'u kullanır)."""
+        posts = []
+        for doc in self.db.collection(COLLECTION_POSTS).stream():
+            post = doc.to_dict() or {}
+            if not post.get('is_deleted'):
+                post['id'] = doc.id
+                posts.append(post)
+        return posts
+
+    def write(self, scores: QualityScores) -> int:
+        """Skorları postMetrics'e batch'ler halinde yazar; yazılan belge sayısını döndürür."""
+        if self.dry_run:
+            return len(scores)
+        computed_at = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+        collection = self.db.collection(COLLECTION_POST_METRICS)
+        written = 0
+        batch, pending = self.db.batch(), 0
+        for post_id, fields in scores.documents(computed_at):
+            batch.set(collection.document(post_id), fields, merge=True)
+            pending += 1
+            if pending >= self.batch_size:
+                batch.commit()
+                written += pending
+                batch, pending = self.db.batch(), 0
+        if pending:
+            batch.commit()
+            written += pending
+        return written
+
+    def run(self, posts: List[Dict[str, Any]], now: Optional[float] = None) -> QualityScores:
+        start = time.time()
+        scores = score_posts(posts, now)
+        written = self.write(scores)
+        logger.info(f"[ContentQuality] {len(scores)} post skorlandı, {written} belge yazıldı "
+                    f"({time.time() - start:.2f} sn)")
+        return scores
+
+    def load(self) -> Dict[str, float]:
+        """postMetrics'teki kalite skorlarını okur (post id -> quality)."""
+        result = {}
+        for doc in self.db.collection(COLLECTION_POST_METRICS).select(['quality']).stream():
+            value = (doc.to_dict() or {}).get('quality')
+            if isinstance(value, (int, float)):
+                result[doc.id] = float(value)
+        return result
+
+
+class QualityScheduler:
+    """
+    Skorları süreç içinde, PostCatalog'daki postlar üzerinde `interval` saniyede bir hesaplar
+    ve CatalogIndex'e yükler. `write` açıksa postMetrics'e de yazar (birden çok worker varsa
+    yalnızca birinde açılmalıdır).
+    """
+
+    def __init__(self, job: ContentQualityJob, catalog, index, interval: float = CONTENT_QUALITY_JOB_INTERVAL,
+                 write: bool = CONTENT_QUALITY_JOB_WRITE):
+        self.job = job
+        self.catalog = catalog
+        self.index = index
+        self.interval = interval
+        self.write = write
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> 'QualityScheduler':
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name='content-quality', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def run_once(self) -> QualityScores:
+        scores = score_posts(self.catalog.get_posts())
+        self.index.set_quality(scores.as_dict())
+        if self.write:
+            self.job.write(scores)
+        return scores
+
+    def _loop(self) -> None:
+        while True:
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"[ContentQuality] Zamanlanmış skorlama hatası: {str(e)}")
+            if self._stop_event.wait(self.interval):
+                return
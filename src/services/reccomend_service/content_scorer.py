@@ -2,6 +2,8 @@ from typing import Dict, List, Any
 from datetime import datetime, timedelta
 import logging
 
+from config.emotion_tables import encode, opposite_row
+
 class ContentScorer:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
@@ -16,6 +18,7 @@ class ContentScorer:
     ) -> List[Dict]:
         """İçerikleri kullanıcı pattern'ine göre skorlar"""
         scored_contents = []
+        opposites = opposite_row(encode(dominant_emotion))
         
         for content in contents:
             score = 0
@@ -26,7 +29,7 @@ class ContentScorer:
             score += emotion_match
             
             # Süreklilik durumunda zıt duyguları öne çıkar
-            if is_continuous and content_emotion in OPPOSITE_EMOTIONS.get(dominant_emotion, []):
+            if is_continuous and opposites[encode(content_emotion)]:
                 score *= 1.3
             
             # Yeni içeriklere bonus
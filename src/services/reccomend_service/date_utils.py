@@ -1,52 +1,155 @@
 """
 date_utils.py
 Farklı timestamp formatlarını güvenli şekilde parse eden ve UTC'ye normalize eden yardımcı fonksiyonlar.
+
+Desteklenen biçimler:
+- ISO 8601: "2024-05-01", "2024-05-01T12:00:00", "2024-05-01 12:00:00.123456", "...Z", "...+03:00"
+- Firebase konsolu: "May 01, 2024 at 10:00:00 AM UTC" ve add_interaction'ın yazdığı "... UTC+3"
+  (yerel saat; ofset çıkarılarak UTC'ye çevrilir)
+- Epoch: saniye ya da milisaniye (int/float veya sadece rakamlardan oluşan string)
+- datetime nesneleri (Firestore DatetimeWithNanoseconds dahil)
+
+Biçim, string'in şekline bakılarak tek seferde seçilir (strptime denemesi yapılmaz) ve
+string sonuçları LRU önbellekte tutulur. Toplu dönüşüm için NumPy dizisi döndüren
+parse_timestamps_epoch / parse_timestamps_datetime64 kullanılabilir.
 """
-from datetime import datetime, timezone
-from typing import Optional, Any
-import logging
+import re
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Optional, Any, Iterable
+
+import numpy as np
+
+CACHE_SIZE = 65536
+
+# Bu değerden büyük epoch'lar milisaniye kabul edilir (~5138 yılı saniye cinsinden)
+_EPOCH_MS_THRESHOLD = 1e11
+
+_ISO_RE = re.compile(
+    r'(\d{4})-(\d{2})-(\d{2})'
+    r'(?:[T ](\d{2}):(\d{2})(?::(\d{2})(?:[.,](\d{1,9}))?)?)?'
+    r'\s*(Z|[+-]\d{2}(?::?\d{2})?)?'
+)
+_CONSOLE_RE = re.compile(
+    r'([A-Za-z]+)\s+(\d{1,2}),\s*(\d{4})\s+at\s+(\d{1,2}):(\d{2}):(\d{2})(?:\.\d+)?'
+    r'[\s ]*([AaPp][Mm])\s*(?:UTC|GMT)?(?:([+-])(\d{1,2})(?::?(\d{2}))?)?'
+)
+_MONTHS = {
+    name: i + 1 for i, name in enumerate([
+        'january', 'february', 'march', 'april', 'may', 'june',
+        'july', 'august', 'september', 'october', 'november', 'december'
+    ])
+}
+_MONTHS.update({name[:3]: num for name, num in list(_MONTHS.items())})
+
+
+def _offset(sign: str, hours: str, minutes: Optional[str]) -> timedelta:
+    delta = timedelta(hours=int(hours), minutes=int(minutes or 0))
+    return -delta if sign == '-' else delta
+
+
+def _parse_iso(ts: str) -> Optional[datetime]:
+    m = _ISO_RE.fullmatch(ts)
+    if not m:
+        return None
+    year, month, day, hour, minute, second, fraction, tz = m.groups()
+    micro = int((fraction or '0')[:6].ljust(6, '0'))
+    dt = datetime(int(year), int(month), int(day), int(hour or 0), int(minute or 0),
+                  int(second or 0), micro, tzinfo=timezone.utc)
+    if tz and tz != 'Z':
+        digits = tz[1:].replace(':', '')
+        dt -= _offset(tz[0], digits[:2], digits[2:4] or None)
+    return dt
+
+
+def _parse_console(ts: str) -> Optional[datetime]:
+    m = _CONSOLE_RE.fullmatch(ts)
+    if not m:
+        return None
+    month_name, day, year, hour, minute, second, meridiem, sign, off_h, off_m = m.groups()
+    month = _MONTHS.get(month_name.lower())
+    if not month:
+        return None
+    hour = int(hour) % 12 + (12 if meridiem.lower() == 'pm' else 0)
+    dt = datetime(int(year), month, int(day), hour, int(minute), int(second), tzinfo=timezone.utc)
+    if sign:
+        # "UTC+3" yerel saati belirtir; UTC için ofset çıkarılır
+        dt -= _offset(sign, off_h, off_m)
+    return dt
+
+
+def _from_epoch(value: float) -> Optional[datetime]:
+    if value > _EPOCH_MS_THRESHOLD:
+        value /= 1000.0
+    try:
+        return datetime.fromtimestamp(value, tz=timezone.utc)
+    except (OverflowError, OSError, ValueError):
+        return None
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _parse_string(ts: str) -> Optional[datetime]:
+    ts = ts.strip()
+    if not ts:
+        return None
+    try:
+        first = ts[0]
+        if first.isdigit():
+            if ts.isdigit():
+                return _from_epoch(float(ts))
+            return _parse_iso(ts)
+        if first.isalpha():
+            return _parse_console(ts)
+    except ValueError:
+        # Şekli uyan ama geçersiz tarih (ör. 31 Şubat)
+        return None
+    return None
+
 
 def parse_timestamp(ts: Any) -> Optional[datetime]:
     """
     Farklı formatlardaki timestamp'leri güvenli şekilde datetime objesine çevirir ve UTC'ye normalizer.
     Hatalıysa None döner.
     """
-    if not ts:
+    if ts is None or ts == '':
         return None
     if isinstance(ts, datetime):
         if ts.tzinfo is None:
             return ts.replace(tzinfo=timezone.utc)
         return ts.astimezone(timezone.utc)
-    if isinstance(ts, (int, float)):
-        try:
-            return datetime.fromtimestamp(ts, tz=timezone.utc)
-        except Exception:
-            return None
     if isinstance(ts, str):
-        for fmt in [
-            "%Y-%m-%dT%H:%M:%S.%fZ",
-            "%Y-%m-%dT%H:%M:%S.%f",
-            "%Y-%m-%dT%H:%M:%S",
-            "%Y-%m-%d %H:%M:%S",
-            "%B %d, %Y at %I:%M:%S %p UTC",
-            "%Y-%m-%d"
-        ]:
-            try:
-                dt = datetime.strptime(ts, fmt)
-                return dt.replace(tzinfo=timezone.utc)
-            except Exception:
-                continue
-        try:
-            dt = datetime.fromisoformat(ts)
-            if dt.tzinfo is None:
-                dt = dt.replace(tzinfo=timezone.utc)
-            return dt
-        except Exception:
-            return None
+        return _parse_string(ts)
+    if isinstance(ts, (int, float)) and not isinstance(ts, bool):
+        return _from_epoch(ts) if ts == ts else None
     return None
 
+
+def to_epoch(ts: Any) -> Optional[float]:
+    """Timestamp'i epoch saniyeye çevirir; hatalıysa None döner."""
+    dt = parse_timestamp(ts)
+    return dt.timestamp() if dt else None
+
+
+def parse_timestamps_epoch(values: Iterable[Any]) -> np.ndarray:
+    """Toplu dönüşüm: epoch saniye dizisi (float64), hatalı değerler NaN."""
+    return np.fromiter(
+        ((e if e is not None else np.nan) for e in map(to_epoch, values)),
+        dtype=np.float64
+    )
+
+
+def parse_timestamps_datetime64(values: Iterable[Any]) -> np.ndarray:
+    """Toplu dönüşüm: UTC datetime64[us] dizisi, hatalı değerler NaT."""
+    epochs = parse_timestamps_epoch(values)
+    result = np.full(len(epochs), np.datetime64('NaT'), dtype='datetime64[us]')
+    valid = ~np.isnan(epochs)
+    result[valid] = np.round(epochs[valid] * 1e6).astype('int64').astype('datetime64[us]')
+    return result
+
 # Örnek kullanım:
 if __name__ == "__main__":
     print(parse_timestamp("2024-05-01T12:00:00.000Z"))
+    print(parse_timestamp("May 01, 2024 at 03:00:00 PM UTC+3"))
     print(parse_timestamp(1714550400))  # unix timestamp
-    print(parse_timestamp(datetime.now())) 
\ No newline at end of file
+    print(parse_timestamp(datetime.now()))
+    print(parse_timestamps_datetime64(["2024-05-01", "geçersiz", 1714550400000]))
@@ -0,0 +1,46 @@
+"""
+deadline.py
+İstek düzeyinde zaman bütçesi. get_recommendations isteğin başında bir Deadline
+oluşturur ve her aşamaya geçirir; aşamalar kalan süreye göre işi kısaltır
+(en iyi o ana kadarki sonuç) ya da isteğe bağlı aşamaları atlar. Atlanan ve
+kısaltılan aşamalar yanıttaki bozulma bayrağına yazılır.
+"""
+import time
+from typing import Callable, List, Optional
+
+
+class Deadline:
+    def __init__(self, budget_sec: Optional[float], clock: Callable[[], float] = time.perf_counter):
+        """budget_sec None ise süre sınırı yoktur (testler ve çevrimdışı kullanım)."""
+        self._clock = clock
+        self.budget_sec = budget_sec
+        self.started = clock()
+        self.expires_at = float('inf') if budget_sec is None else self.started + budget_sec
+        self.degraded_stages: List[str] = []
+
+    def remaining(self) -> float:
+        """Kalan süre (saniye, en az 0)."""
+        return max(0.0, self.expires_at - self._clock())
+
+    def elapsed(self) -> float:
+        return self._clock() - self.started
+
+    def expired(self) -> bool:
+        return self._clock() >= self.expires_at
+
+    def allows(self, seconds: float) -> bool:
+        """Kalan süre verilen aşama için yetiyor mu?"""
+        return self.remaining() >= seconds
+
+    def timeout(self, cap: float) -> float:
+        """Alt çağrılar için zaman aşımı: cap ile kalan sürenin küçüğü."""
+        return min(cap, self.remaining())
+
+    def degrade(self, stage: str) -> None:
+        """Atlanan ya da yarıda kesilen aşamayı kaydeder (her aşama bir kez)."""
+        if stage not in self.degraded_stages:
+            self.degraded_stages.append(stage)
+
+    @property
+    def degraded(self) -> bool:
+        return bool(self.degraded_stages)
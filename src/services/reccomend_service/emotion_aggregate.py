@@ -0,0 +1,179 @@
+"""
+emotion_aggregate.py
+Kullanıcı başına artımlı tutulan duygu özeti:
+- yarılanma süresiyle sönümlenen duygu ağırlıkları,
+- duygular arası geçiş sayıları (6x6),
+- son duygu, beğenilmeyen duygular ve son etkileşimli postlar.
+
+Özet her /api/track_interaction çağrısında tek etkileşimle güncellenir;
+öneri akışı tüm etkileşim geçmişi yerine bu tek belgeyi okur. Özeti olmayan (eski)
+kullanıcılar için ilk özet etkileşim geçmişinden kurulur (load_aggregate / record_interaction).
+"""
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from config.config import (
+    EMOTION_CATEGORIES,
+    INTERACTION_TYPE_WEIGHTS,
+    EMOTION_AGGREGATE_HALF_LIFE_DAYS,
+    EMOTION_AGGREGATE_RECENT_POSTS,
+    EMOTION_HISTORY_MAX_COUNT
+)
+from services.reccomend_service.date_utils import to_epoch
+
+# Feed esnetme kontrolünde "etkileşim var" sayılan tipler
+ENGAGED_INTERACTION_TYPES = {'like', 'comment', 'emotion'}
+
+_VALID_EMOTIONS = set(EMOTION_CATEGORIES.values())
+
+
+def interaction_epoch(interaction: Dict[str, Any]) -> Optional[float]:
+    """Etkileşimin zaman damgasını epoch saniyeye çevirir; parse edilemezse None döner."""
+    ts_ms = interaction.get('timestamp_ms')
+    if ts_ms is not None:
+        return ts_ms / 1000.0
+    return to_epoch(interaction.get('timestamp'))
+
+
+class EmotionAggregate:
+    def __init__(self, half_life_days: float = EMOTION_AGGREGATE_HALF_LIFE_DAYS,
+                 recent_limit: int = EMOTION_AGGREGATE_RECENT_POSTS):
+        self.half_life = half_life_days * 86400
+        self.recent_limit = recent_limit
+        self.weights: Dict[str, float] = {}
+        self.transitions: Dict[str, Dict[str, int]] = {}
+        self.last_emotion: Optional[str] = None
+        self.dislikes: List[str] = []
+        self.recent_post_ids: List[str] = []
+        self.interaction_count = 0
+        self.updated_at = 0.0
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> 'EmotionAggregate':
+        aggregate = cls()
+        if not data:
+            return aggregate
+        aggregate.weights = dict(data.get('weights', {}))
+        aggregate.transitions = {k: dict(v) for k, v in data.get('transitions', {}).items()}
+        aggregate.last_emotion = data.get('last_emotion')
+        aggregate.dislikes = list(data.get('dislikes', []))
+        aggregate.recent_post_ids = list(data.get('recent_post_ids', []))
+        aggregate.interaction_count = data.get('interaction_count', 0)
+        aggregate.updated_at = data.get('updated_at', 0.0)
+        return aggregate
+
+    @classmethod
+    def from_interactions(cls, interactions: Iterable[Dict[str, Any]]) -> 'EmotionAggregate':
+        """Özeti olmayan kullanıcılar için tam geçmişten bir kez oluşturur."""
+        aggregate = cls()
+        # Zaman damgası olmayanlar en başa alınır, geçişler zaman sırasına göre sayılır
+        dated = [(interaction_epoch(i) or 0.0, n, i) for n, i in enumerate(interactions)]
+        dated.sort(key=lambda x: (x[0], x[1]))
+        for ts, _, interaction in dated:
+            aggregate.apply(interaction, ts or aggregate.updated_at)
+        return aggregate
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'weights': self.weights,
+            'transitions': self.transitions,
+            'last_emotion': self.last_emotion,
+            'dislikes': self.dislikes,
+            'recent_post_ids': self.recent_post_ids,
+            'interaction_count': self.interaction_count,
+            'updated_at': self.updated_at
+        }
+
+    def _decay(self, seconds: float) -> float:
+        return 0.5 ** (seconds / self.half_life) if self.half_life > 0 else 1.0
+
+    def apply(self, interaction: Dict[str, Any], ts: Optional[float] = None) -> None:
+        """Tek etkileşimi özete işler (O(1))."""
+        if ts is None:
+            ts = interaction_epoch(interaction) or time.time()
+        self.interaction_count += 1
+
+        interaction_type = interaction.get('interactionType')
+        post_id = interaction.get('postId') or interaction.get('content_id')
+        if post_id and interaction_type in ENGAGED_INTERACTION_TYPES:
+            if post_id in self.recent_post_ids:
+                self.recent_post_ids.remove(post_id)
+            self.recent_post_ids.append(post_id)
+            del self.recent_post_ids[:-self.recent_limit]
+
+        emotion = interaction.get('emotion')
+        if emotion not in _VALID_EMOTIONS:
+            return
+
+        weight = INTERACTION_TYPE_WEIGHTS.get(interaction_type, 1.0) if interaction_type else 1.0
+        weight *= interaction.get('confidence', 0.5)
+        if ts >= self.updated_at:
+            # Mevcut ağırlıkları yeni etkileşimin zamanına kadar sönümle
+            factor = self._decay(ts - self.updated_at) if self.updated_at else 1.0
+            if factor != 1.0:
+                for e in self.weights:
+                    self.weights[e] *= factor
+            self.updated_at = ts
+        else:
+            # Sıra dışı gelen eski etkileşim: sadece kendi ağırlığı sönümlenir
+            weight *= self._decay(self.updated_at - ts)
+        self.weights[emotion] = self.weights.get(emotion, 0.0) + weight
+
+        if self.last_emotion in _VALID_EMOTIONS:
+            row = self.transitions.setdefault(self.last_emotion, {})
+            row[emotion] = row.get(emotion, 0) + 1
+        self.last_emotion = emotion
+
+        if interaction_type == 'dislike' and emotion not in self.dislikes:
+            self.dislikes.append(emotion)
+
+    def transition_counts(self) -> Dict[Tuple[str, str], int]:
+        """EmotionAnalyzer.analyze_transition_patterns ile aynı biçimde geçiş sayıları."""
+        return {
+            (from_emotion, to_emotion): count
+            for from_emotion, row in self.transitions.items()
+            for to_emotion, count in row.items()
+        }
+
+    def has_engaged_with(self, post_ids: Iterable[str]) -> bool:
+        """Verilen postlardan herhangi biriyle son zamanlarda etkileşim olmuş mu?"""
+        recent = set(self.recent_post_ids)
+        return any(pid in recent for pid in post_ids)
+
+
+def _bootstrap(interaction_service, user_id: str, max_count: int) -> Dict[str, Any]:
+    """
+    Geçmişten ilk özet. get_user_interactions göç tamamlanana kadar (INTERACTIONS_MIGRATED)
+    timestamp_ms'siz eski kayıtları da katar; deploy sonrası ilk etkileşimini yapan kullanıcının
+    özeti yalnızca yeni yazılan etkileşimden değil, önceki geçmişinden de oluşur.
+    """
+    return EmotionAggregate.from_interactions(
+        interaction_service.get_user_interactions(user_id, max_count=max_count)).to_dict()
+
+
+def load_aggregate(interaction_service, user_id: str, aggregate_data: Optional[Dict[str, Any]],
+                   max_count: int = EMOTION_HISTORY_MAX_COUNT) -> EmotionAggregate:
+    """Okunmuş özet belgesini döndürür; yoksa geçmişten bir kez oluşturup kaydeder."""
+    if aggregate_data is not None:
+        return EmotionAggregate.from_dict(aggregate_data)
+
+    def build(existing):
+        return existing if existing is not None else _bootstrap(interaction_service, user_id, max_count)
+
+    return EmotionAggregate.from_dict(interaction_service.update_emotion_aggregate(user_id, build))
+
+
+def record_interaction(interaction_service, user_id: str, interaction: Dict[str, Any],
+                       max_count: int = EMOTION_HISTORY_MAX_COUNT) -> Optional[Dict[str, Any]]:
+    """
+    Kaydedilmiş yeni etkileşimi kullanıcının özetine işler (transaction ile). Özet yoksa
+    geçmişten kurulur; etkileşim zaten yazıldığı için geçmiş onu da içerir.
+    """
+    def update(existing):
+        if existing is None:
+            return _bootstrap(interaction_service, user_id, max_count)
+        aggregate = EmotionAggregate.from_dict(existing)
+        aggregate.apply(interaction, time.time())
+        return aggregate.to_dict()
+
+    return interaction_service.update_emotion_aggregate(user_id, update)
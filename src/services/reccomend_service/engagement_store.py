@@ -0,0 +1,199 @@
+"""
+engagement_store.py
+Post başına zamanla sönümlenen etkileşim sayaçları.
+
+Her post için iki sönümlü toplam tutulur: `weighted` (etkileşim tipi ağırlıklarının toplamı)
+ve `total` (etkileşim sayısı). İkisi de ENGAGEMENT_HALF_LIFE_DAYS yarılanma süresiyle azalır.
+Skor O(1) hesaplanır:
+    min(1, weighted / max(total, 1))
+Taze etkileşimlerde bu, ağırlıkların ortalamasıdır (eski content_engagement ile aynı).
+Etkileşim almayan postların skoru zamanla 0'a iner.
+
+Arka uçlar:
+- SQLiteEngagementStore (varsayılan): aynı makinedeki gunicorn worker'larının paylaştığı SQLite
+  dosyası (ENGAGEMENT_STORE_PATH); kapasite aşılınca en uzun süredir güncellenmeyen satırlar silinir.
+- InMemoryEngagementStore: süreç içi, LRU ile sınırlı kapasite; sayaçlar worker başınadır.
+Hangisinin kullanılacağını ENGAGEMENT_STORE_BACKEND (ENGAGEMENT_STORE ortam değişkeni) belirler
+(create_engagement_store).
+"""
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config.config import (
+    INTERACTION_TYPE_WEIGHTS,
+    ENGAGEMENT_HALF_LIFE_DAYS,
+    ENGAGEMENT_STORE_BACKEND,
+    ENGAGEMENT_STORE_CAPACITY,
+    ENGAGEMENT_STORE_PATH
+)
+
+DEFAULT_INTERACTION_WEIGHT = 0.1  # INTERACTION_TYPE_WEIGHTS'te olmayan tipler için
+SQLITE_MAX_PARAMS = 500  # Tek IN (...) sorgusundaki en fazla parametre
+
+# (weighted, total, updated_at)
+_Counter = Tuple[float, float, float]
+
+
+class EngagementStore:
+    """Arka uçların ortak arayüzü ve sönüm hesabı."""
+
+    def __init__(self, half_life_days: float = ENGAGEMENT_HALF_LIFE_DAYS,
+                 capacity: int = ENGAGEMENT_STORE_CAPACITY):
+        self.half_life = half_life_days * 86400
+        self.capacity = capacity
+
+    def _decay(self, seconds: float) -> float:
+        return 0.5 ** (max(seconds, 0.0) / self.half_life) if self.half_life > 0 else 1.0
+
+    def _bump(self, counter: Optional[_Counter], interaction_type: str, now: float) -> _Counter:
+        weight = INTERACTION_TYPE_WEIGHTS.get(interaction_type, DEFAULT_INTERACTION_WEIGHT)
+        if counter is None:
+            return weight, 1.0, now
+        weighted, total, updated_at = counter
+        factor = self._decay(now - updated_at)
+        return weighted * factor + weight, total * factor + 1.0, max(now, updated_at)
+
+    def _score(self, counter: Optional[_Counter], now: float) -> float:
+        if counter is None:
+            return 0.0
+        weighted, total, updated_at = counter
+        factor = self._decay(now - updated_at)
+        return min(1.0, weighted * factor / max(total * factor, 1.0))
+
+    def record(self, post_id: str, interaction_type: str, now: Optional[float] = None) -> None:
+        raise NotImplementedError
+
+    def score(self, post_id: str, now: Optional[float] = None) -> float:
+        """Postun sönümlü etkileşim skoru; hiç etkileşim yoksa 0."""
+        raise NotImplementedError
+
+    def scores(self, now: Optional[float] = None) -> Dict[str, float]:
+        """Sıfırdan farklı skoru olan tüm postlar (en fazla `capacity` kayıt)."""
+        raise NotImplementedError
+
+    def scores_for(self, post_ids: Iterable[str], now: Optional[float] = None) -> List[float]:
+        """Verilen postların skorları, aynı sırayla (aday kümesi puanlanırken kullanılır)."""
+        raise NotImplementedError
+
+
+class InMemoryEngagementStore(EngagementStore):
+    def __init__(self, half_life_days: float = ENGAGEMENT_HALF_LIFE_DAYS,
+                 capacity: int = ENGAGEMENT_STORE_CAPACITY):
+        super().__init__(half_life_days, capacity)
+        self._counters: 'OrderedDict[str, _Counter]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._counters)
+
+    def record(self, post_id: str, interaction_type: str, now: Optional[float] = None) -> None:
+        now = time.time() if now is None else now
+        with self._lock:
+            self._counters[post_id] = self._bump(self._counters.get(post_id), interaction_type, now)
+            self._counters.move_to_end(post_id)
+            while len(self._counters) > self.capacity:
+                self._counters.popitem(last=False)
+
+    def score(self, post_id: str, now: Optional[float] = None) -> float:
+        return self._score(self._counters.get(post_id), time.time() if now is None else now)
+
+    def scores(self, now: Optional[float] = None) -> Dict[str, float]:
+        now = time.time() if now is None else now
+        with self._lock:
+            counters = list(self._counters.items())
+        return {post_id: s for post_id, s in ((p, self._score(c, now)) for p, c in counters) if s > 0}
+
+    def scores_for(self, post_ids: Iterable[str], now: Optional[float] = None) -> List[float]:
+        now = time.time() if now is None else now
+        counters = self._counters
+        return [self._score(counters.get(post_id), now) for post_id in post_ids]
+
+
+class SQLiteEngagementStore(EngagementStore):
+    """Worker'lar arası paylaşılan sayaçlar. Her thread kendi bağlantısını kullanır."""
+
+    def __init__(self, path: str = ENGAGEMENT_STORE_PATH, half_life_days: float = ENGAGEMENT_HALF_LIFE_DAYS,
+                 capacity: int = ENGAGEMENT_STORE_CAPACITY):
+        super().__init__(half_life_days, capacity)
+        self.path = path
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS engagement ('
+                'post_id TEXT PRIMARY KEY, weighted REAL NOT NULL, total REAL NOT NULL, updated_at REAL NOT NULL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS engagement_updated_at ON engagement (updated_at)')
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._local.conn = conn
+        return conn
+
+    def __len__(self) -> int:
+        return self._connect().execute('SELECT COUNT(*) FROM engagement').fetchone()[0]
+
+    def record(self, post_id: str, interaction_type: str, now: Optional[float] = None) -> None:
+        now = time.time() if now is None else now
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute('SELECT weighted, total, updated_at FROM engagement WHERE post_id = ?',
+                               (post_id,)).fetchone()
+            weighted, total, updated_at = self._bump(row, interaction_type, now)
+            conn.execute('INSERT OR REPLACE INTO engagement VALUES (?, ?, ?, ?)',
+                         (post_id, weighted, total, updated_at))
+            if row is None:
+                # Kapasite aşıldıysa en uzun süredir güncellenmeyen satırları sil
+                conn.execute(
+                    'DELETE FROM engagement WHERE post_id IN ('
+                    'SELECT post_id FROM engagement ORDER BY updated_at DESC LIMIT -1 OFFSET ?)',
+                    (self.capacity,)
+                )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    def score(self, post_id: str, now: Optional[float] = None) -> float:
+        row = self._connect().execute('SELECT weighted, total, updated_at FROM engagement WHERE post_id = ?',
+                                      (post_id,)).fetchone()
+        return self._score(row, time.time() if now is None else now)
+
+    def scores(self, now: Optional[float] = None) -> Dict[str, float]:
+        now = time.time() if now is None else now
+        rows = self._connect().execute('SELECT post_id, weighted, total, updated_at FROM engagement').fetchall()
+        result = {}
+        for post_id, weighted, total, updated_at in rows:
+            s = self._score((weighted, total, updated_at), now)
+            if s > 0:
+                result[post_id] = s
+        return result
+
+    def scores_for(self, post_ids: Iterable[str], now: Optional[float] = None) -> List[float]:
+        now = time.time() if now is None else now
+        post_ids = list(post_ids)
+        conn = self._connect()
+        counters: Dict[str, _Counter] = {}
+        for start in range(0, len(post_ids), SQLITE_MAX_PARAMS):
+            chunk = post_ids[start:start + SQLITE_MAX_PARAMS]
+            placeholders = ','.join('?' * len(chunk))
+            for post_id, weighted, total, updated_at in conn.execute(
+                    f'SELECT post_id, weighted, total, updated_at FROM engagement WHERE post_id IN ({placeholders})',
+                    chunk):
+                counters[post_id] = (weighted, total, updated_at)
+        return [self._score(counters.get(post_id), now) for post_id in post_ids]
+
+
+def create_engagement_store(backend: str = ENGAGEMENT_STORE_BACKEND) -> EngagementStore:
+    """ENGAGEMENT_STORE_BACKEND: 'sqlite' (varsayılan) veya 'memory'."""
+    if backend == 'sqlite':
+        return SQLiteEngagementStore()
+    if backend != 'memory':
+        raise ValueError(f"Bilinmeyen engagement store: {backend}")
+    return InMemoryEngagementStore()
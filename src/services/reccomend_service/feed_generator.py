@@ -1,22 +1,34 @@
 from typing import Dict, List, Any
 import random
 import logging
-from config import EMOTION_CATEGORIES, OPPOSITE_EMOTIONS
+from collections import defaultdict
+
+import numpy as np
+
+from config.emotion_tables import EMOTION_LABELS, N_EMOTIONS, POLARITY, Emotion, encode, encode_all, opposite_row, to_vector
 from services.reccomend_service.date_utils import parse_timestamp
 from services.reccomend_service.shuffle_utils import shuffle_same_score
 from services.reccomend_service.cold_start_utils import get_cold_start_content
 import datetime
 from services.reccomend_service.algorithms.emotion_transition import analyze_emotion_transition
+from services.reccomend_service.algorithms.emotion_reranker import rerank_items
 
 class FeedGenerator:
-    def __init__(self):
+    def __init__(self, post_catalog=None):
         self.logger = logging.getLogger(__name__)
+        self.post_catalog = post_catalog
+
+    def _get_all_posts(self, firebase_service) -> List[Dict[str, Any]]:
+        """Postları katalogdan alır; katalog yoksa koleksiyonu okur"""
+        if self.post_catalog is not None:
+            return self.post_catalog.get_posts()
+        return firebase_service.get_all_posts()
 
     def _handle_cold_start(self, firebase_service) -> List[Dict[str, Any]]:
         """Cold start durumunda rastgele farklı duygulardan içerik önerir"""
         try:
             # Tüm postları al
-            all_posts = firebase_service.get_all_posts()
+            all_posts = self._get_all_posts(firebase_service)
             
             if not all_posts:
                 return []
@@ -26,8 +38,11 @@ class FeedGenerator:
             emotions_used = set()
             
             # Her duygudan en az 2 içerik seç
-            for emotion in EMOTION_CATEGORIES:
-                emotion_posts = [p for p in all_posts if p.get('emotion') == emotion]
+            posts_by_emotion = defaultdict(list)
+            for post in all_posts:
+                posts_by_emotion[encode(post.get('emotion'))].append(post)
+            for emotion in Emotion:
+                emotion_posts = posts_by_emotion[emotion]
                 if emotion_posts:
                     # Her duygudan 2 içerik seç
                     for _ in range(2):
@@ -36,7 +51,7 @@ class FeedGenerator:
                             selected_items.append({
                                 'id': post['id'],
                                 'type': 'post',
-                                'emotion': emotion
+                                'emotion': emotion.label
                             })
                             emotions_used.add(emotion)
                             all_posts.remove(post)
@@ -45,15 +60,15 @@ class FeedGenerator:
             # Kalan içerikleri rastgele doldur
             while len(selected_items) < 20 and all_posts:
                 post = random.choice(all_posts)
-                emotion = post.get('emotion')
+                code = encode(post.get('emotion'))
                 
-                if emotion not in emotions_used or len(emotions_used) >= len(EMOTION_CATEGORIES):
+                if code not in emotions_used or len(emotions_used) >= N_EMOTIONS:
                     selected_items.append({
                         'id': post['id'],
                         'type': 'post',
-                        'emotion': emotion
+                        'emotion': post.get('emotion')
                     })
-                    emotions_used.add(emotion)
+                    emotions_used.add(code)
                 all_posts.remove(post)
 
             # Karıştır
@@ -64,6 +79,7 @@ class FeedGenerator:
             self.logger.error(f"Cold start hatası: {str(e)}")
             return []
 
+    @staticmethod
     def get_time_of_day():
         now = datetime.datetime.now()
         hour = now.hour
@@ -76,30 +92,20 @@ class FeedGenerator:
         else:
             return 'gece'
 
-    POSITIVE_EMOTIONS = ["Neşe (Joy)", "Aşk (Love)", "Şaşkınlık (Surprise)"]
-    NEGATIVE_EMOTIONS = ["Üzüntü (Sadness)", "Korku (Fear)", "Öfke (Anger)"]
-
     # Pattern'i günün saatine göre ağırlıklandır
 
+    @staticmethod
     def adjust_pattern_by_time(pattern: dict) -> dict:
-        time_of_day = get_time_of_day()
+        time_of_day = FeedGenerator.get_time_of_day()
         new_pattern = pattern.copy()
-        if time_of_day == 'sabah':
-            # Sabah pozitif duygulara ağırlık ver
-            for e in POSITIVE_EMOTIONS:
-                if e in new_pattern:
-                    new_pattern[e] *= 1.2
-            for e in NEGATIVE_EMOTIONS:
-                if e in new_pattern:
-                    new_pattern[e] *= 0.8
-        elif time_of_day == 'aksam' or time_of_day == 'gece':
-            # Akşam/gece negatif duygulara ağırlık ver
-            for e in NEGATIVE_EMOTIONS:
-                if e in new_pattern:
-                    new_pattern[e] *= 1.2
-            for e in POSITIVE_EMOTIONS:
-                if e in new_pattern:
-                    new_pattern[e] *= 0.8
+        # Sabah pozitif, akşam/gece negatif duygulara ağırlık ver (POLARITY: +1 pozitif, -1 negatif)
+        favored = 1 if time_of_day == 'sabah' else -1 if time_of_day in ('aksam', 'gece') else 0
+        if favored:
+            factors = np.where(POLARITY == favored, 1.2, 0.8)
+            for e, value in pattern.items():
+                code = encode(e)
+                if code >= 0:
+                    new_pattern[e] = value * float(factors[code])
         # Normalize et
         total = sum(new_pattern.values())
         if total > 0:
@@ -109,6 +115,7 @@ class FeedGenerator:
 
     # Sürpriz içerik ekle
 
+    @staticmethod
     def inject_surprise_content(feed, all_contents, pattern, ratio=0.1):
         # Pattern'de düşük veya sıfır olan duyguları bul
         min_val = min(pattern.values())
@@ -124,26 +131,25 @@ class FeedGenerator:
             feed.insert(idx, item)
         return feed
 
+    @staticmethod
     def find_striking_transition(feed_emotions, pattern):
         """
         Feed'deki duygusal akışta en vurucu geçişin indeksini bulur.
         Kriter: pattern'de düşükten yükseğe geçiş veya pozitif-negatif zıtlık.
         """
-        max_delta = 0
-        striking_idx = None
-        for i in range(1, len(feed_emotions)):
-            prev, curr = feed_emotions[i-1], feed_emotions[i]
-            if prev == curr:
-                continue
-            # Pattern farkı
-            delta = abs(pattern.get(curr, 0) - pattern.get(prev, 0))
-            # Pozitif-negatif zıtlık
-            zıtlik = (prev in POSITIVE_EMOTIONS and curr in NEGATIVE_EMOTIONS) or (prev in NEGATIVE_EMOTIONS and curr in POSITIVE_EMOTIONS)
-            score = delta + (0.2 if zıtlik else 0)
-            if score > max_delta:
-                max_delta = score
-                striking_idx = i
-        return striking_idx
+        codes = encode_all(feed_emotions)
+        if len(codes) < 2:
+            return None
+        # Son hücre (kod -1) bilinmeyen duygular içindir: pattern 0, kutup 0
+        weights = np.append(to_vector(pattern), 0.0)
+        polarity = np.append(POLARITY, 0)
+        prev, curr = codes[:-1], codes[1:]
+        # Pattern farkı + pozitif-negatif zıtlık bonusu
+        delta = np.abs(weights[curr] - weights[prev])
+        zitlik = polarity[prev] * polarity[curr] < 0
+        scores = np.where(prev != curr, delta + np.where(zitlik, 0.2, 0.0), 0.0)
+        best = int(np.argmax(scores))
+        return best + 1 if scores[best] > 0 else None
 
     def _create_personalized_feed(
         self, 
@@ -177,15 +183,19 @@ class FeedGenerator:
             if not recent_posts:
                 recent_posts = firebase_service.get_popular_content(days=30)
             if not recent_posts:
-                all_posts = firebase_service.get_all_posts()
+                all_posts = self._get_all_posts(firebase_service)
                 return get_cold_start_content(all_posts, list(pattern.keys()), total_posts)
-            scored_posts = content_scorer.score_content(recent_posts, pattern, max(pattern.items(), key=lambda x: x[1])[0], is_continuous)
+            dominant_emotion = max(pattern.items(), key=lambda x: x[1])[0]
+            dominant_code = encode(dominant_emotion)
+            scored_posts = content_scorer.score_content(recent_posts, pattern, dominant_emotion, is_continuous)
             scored_posts = shuffle_same_score(scored_posts)
-            scored_ads = content_scorer.score_content(recent_ads, pattern, max(pattern.items(), key=lambda x: x[1])[0], is_continuous, is_ad=True) if recent_ads else []
-            dominant_posts = [p for p in scored_posts if p['emotion'] == max(pattern.items(), key=lambda x: x[1])[0]]
-            opposite_emotions = OPPOSITE_EMOTIONS.get(max(pattern.items(), key=lambda x: x[1])[0], [])
-            opposite_posts = [p for p in scored_posts if p['emotion'] in opposite_emotions]
-            explore_emotions = [e for e in pattern.keys() if e != max(pattern.items(), key=lambda x: x[1])[0] and e not in opposite_emotions]
+            scored_ads = content_scorer.score_content(recent_ads, pattern, dominant_emotion, is_continuous, is_ad=True) if recent_ads else []
+            post_codes = encode_all(p['emotion'] for p in scored_posts)
+            opposites = opposite_row(dominant_code)
+            dominant_posts = [p for p, c in zip(scored_posts, post_codes) if c == dominant_code and c >= 0]
+            opposite_emotions = [EMOTION_LABELS[c] for c in np.flatnonzero(opposites)]
+            opposite_posts = [p for p, c in zip(scored_posts, post_codes) if opposites[c]]
+            explore_emotions = [e for e in pattern.keys() if e != dominant_emotion and e not in opposite_emotions]
             explore_posts = [p for p in scored_posts if p['emotion'] in explore_emotions]
             # Zıt ve keşif duygular pattern'e göre kendi aralarında dağıtılır
             # Zıt duygular
@@ -282,7 +292,7 @@ class FeedGenerator:
                             })
                             ad_index += 1
             # Feed oluşturulduktan sonra sürpriz içerik ekle
-            all_posts = firebase_service.get_all_posts()
+            all_posts = self._get_all_posts(firebase_service)
             feed = self.inject_surprise_content(feed, all_posts, pattern, ratio=0.1)
             feed = avoid_consecutive_same_emotion(feed)
             # --- HİKAYE AKIŞI ANALİZİ ve KAYDI ---
@@ -305,7 +315,7 @@ class FeedGenerator:
             if striking_idx is not None:
                 # Reklamı bu geçişin hemen sonrasına ekle (varsa reklam havuzundan al)
                 recent_ads = firebase_service.get_recent_ads(days=7)
-                scored_ads = content_scorer.score_content(recent_ads, pattern, max(pattern.items(), key=lambda x: x[1])[0], is_continuous, is_ad=True) if recent_ads else []
+                scored_ads = content_scorer.score_content(recent_ads, pattern, dominant_emotion, is_continuous, is_ad=True) if recent_ads else []
                 if scored_ads:
                     ad = scored_ads[0]
                     # Post sıralamasında striking_idx'e karşılık gelen feed indexini bul
@@ -324,22 +334,10 @@ class FeedGenerator:
 
 def avoid_consecutive_same_emotion(feed: list) -> list:
     """
-    Feed'de arka arkaya aynı duygudan post gelmesini minimize eder.
+    Feed'i rastgele karıştırırken arka arkaya aynı duygudan post gelmesini önler
+    (mümkün değilse aynı duygudan devam edilir). Reklamlar seriyi etkilemez.
     """
     if not feed:
         return feed
-    result = []
-    pool = feed.copy()
-    last_emotion = None
-    while pool:
-        # Öncelikle farklı duygudan olanları seç
-        candidates = [item for item in pool if item.get('emotion') != last_emotion or item.get('type') == 'ad']
-        if not candidates:
-            # Mecburen aynı duygudan devam et
-            candidates = pool
-        chosen = random.choice(candidates)
-        result.append(chosen)
-        pool.remove(chosen)
-        if chosen.get('type') == 'post':
-            last_emotion = chosen.get('emotion')
-    return result 
\ No newline at end of file
+    scores = np.random.random(len(feed))
+    return rerank_items(feed, scores, max_run=1, is_neutral=lambda item: item.get('type') == 'ad')
@@ -0,0 +1,103 @@
+"""
+keyword_profile.py
+Kullanıcı başına ağırlıklı keyword ilgi profili.
+
+Profil, kullanıcının gerçekten etkileşim verdiği postlardan (EmotionAggregate.recent_post_ids,
+eskiden yeniye) kurulur: her postun keyword'leri, yeniden eskiye `decay` ile azalan ağırlıkla
+toplanır ve vektör L2 normuna bölünür. Keyword'ler katalogun KeywordInterner id'leriyle tutulur.
+
+Puan, profil ile postun ikili keyword vektörü arasındaki kosinüs benzerliğidir (0..1).
+Aday kümesi PostRecord'ların keyword id'leri üzerinden (score_records) puanlanır; maliyet
+katalog boyutuna değil adayların keyword sayısına bağlıdır.
+Profiller KeywordProfileCache'te TTL ile saklanır.
+"""
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from config.config import KEYWORD_PROFILE_DECAY, KEYWORD_PROFILE_MAX_USERS, KEYWORD_PROFILE_TTL
+from services.reccomend_service.post_record import KeywordInterner, PostRecord
+
+
+class KeywordProfile:
+    __slots__ = ('weights', 'interner')
+
+    def __init__(self, weights: Dict[int, float], interner: KeywordInterner):
+        self.weights = weights  # keyword id -> L2 normlu ağırlık
+        self.interner = interner
+
+    def __len__(self) -> int:
+        return len(self.weights)
+
+    def __bool__(self) -> bool:
+        return bool(self.weights)
+
+    @classmethod
+    def from_posts(cls, post_ids: Iterable[Any], index, decay: float = KEYWORD_PROFILE_DECAY) -> 'KeywordProfile':
+        """`post_ids` eskiden yeniye sıralıdır; indekste olmayan postlar atlanır."""
+        raw: Dict[int, float] = {}
+        weight = 1.0
+        for post_id in reversed(list(post_ids)):
+            record = index.record(post_id)
+            if record is None:
+                continue
+            for keyword_id in record.keyword_ids:
+                raw[keyword_id] = raw.get(keyword_id, 0.0) + weight
+            weight *= decay
+        norm = math.sqrt(sum(w * w for w in raw.values()))
+        weights = {k: w / norm for k, w in raw.items()} if norm > 0 else {}
+        return cls(weights, index.interner)
+
+    def score_keywords(self, keywords: Iterable[str]) -> float:
+        """Tek bir keyword kümesinin profile kosinüs benzerliği."""
+        keywords = {k for k in keywords if k}
+        if not keywords or not self.weights:
+            return 0.0
+        dot = sum(self.weights.get(k, 0.0) for k in self.interner.lookup(keywords))
+        return dot / math.sqrt(len(keywords))
+
+    def score_records(self, records: Iterable[PostRecord]) -> np.ndarray:
+        """Verilen kayıtlar için kosinüs benzerliği; maliyet kayıtların keyword sayısıyla orantılı."""
+        weights = self.weights
+        return np.fromiter(
+            (sum(weights.get(k, 0.0) for k in r.keyword_ids) / math.sqrt(len(r.keyword_ids))
+             if r.keyword_ids and weights else 0.0 for r in records),
+            dtype=np.float64
+        )
+
+    def top_keywords(self, n: int) -> List[int]:
+        """En yüksek ağırlıklı n keyword id'si (eşitlikte küçük id önce)."""
+        return sorted(self.weights, key=lambda k: (-self.weights[k], k))[:n]
+
+
+class KeywordProfileCache:
+    """Kullanıcı profillerini TTL ile tutar; en eski kullanılan profil kapasite aşılınca atılır."""
+
+    def __init__(self, ttl: float = KEYWORD_PROFILE_TTL, max_users: int = KEYWORD_PROFILE_MAX_USERS):
+        self.ttl = ttl
+        self.max_users = max_users
+        self._profiles: 'OrderedDict[str, tuple]' = OrderedDict()  # user_id -> (bitiş anı, KeywordProfile)
+        self._lock = threading.Lock()
+
+    def get(self, user_id: str, post_ids: Iterable[Any], index, now: Optional[float] = None) -> KeywordProfile:
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._profiles.get(user_id)
+            if entry is not None and entry[0] > now and entry[1].interner is index.interner:
+                self._profiles.move_to_end(user_id)
+                return entry[1]
+        profile = KeywordProfile.from_posts(post_ids, index)
+        with self._lock:
+            self._profiles[user_id] = (now + self.ttl, profile)
+            self._profiles.move_to_end(user_id)
+            while len(self._profiles) > self.max_users:
+                self._profiles.popitem(last=False)
+        return profile
+
+    def invalidate(self, user_id: str) -> None:
+        with self._lock:
+            self._profiles.pop(user_id, None)
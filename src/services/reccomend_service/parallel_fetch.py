@@ -0,0 +1,72 @@
+"""
+parallel_fetch.py
+Birbirinden bağımsız Firestore okumalarını süreç genelinde paylaşılan, sınırlı
+boyutlu bir thread havuzunda eşzamanlı çalıştıran yardımcı fonksiyonlar.
+Her çağrının kendi zaman aşımı vardır ve kaynak başına süre ölçülür.
+"""
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from config.config import FANOUT_MAX_WORKERS, FANOUT_CALL_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+# Tüm istekler aynı havuzu kullanır; eşzamanlı Firestore çağrısı sayısı sınırlı kalır
+_executor = ThreadPoolExecutor(max_workers=FANOUT_MAX_WORKERS, thread_name_prefix='fanout')
+
+
+def _timed(fn: Callable[[], Any]) -> Callable[[], Tuple[Any, Optional[Exception], float]]:
+    """Çağrıyı çalıştırır; sonucu, varsa hatayı ve kendi süresini döndürür."""
+    def run():
+        started = time.perf_counter()
+        try:
+            return fn(), None, time.perf_counter() - started
+        except Exception as e:
+            return None, e, time.perf_counter() - started
+    return run
+
+
+def fetch_concurrently(
+    calls: Dict[str, Callable[[], Any]],
+    defaults: Optional[Dict[str, Any]] = None,
+    timeouts: Optional[Dict[str, float]] = None,
+    default_timeout: float = FANOUT_CALL_TIMEOUT
+) -> Tuple[Dict[str, Any], Dict[str, float]]:
+    """
+    Verilen çağrıları eşzamanlı başlatır ve hepsi bitince (veya zaman aşımına
+    uğrayınca) sonuçları birleştirir.
+    Hata veren ya da zaman aşımına uğrayan kaynak için `defaults` içindeki değer
+    (yoksa None) döner. Dönüş: (sonuçlar, kaynak başına saniye cinsinden süre).
+    """
+    defaults = defaults or {}
+    timeouts = timeouts or {}
+    started = time.perf_counter()
+    futures = {name: _executor.submit(_timed(fn)) for name, fn in calls.items()}
+
+    results: Dict[str, Any] = {}
+    timings: Dict[str, float] = {}
+    for name, future in futures.items():
+        # Süre, çağrının başlatıldığı ortak andan itibaren sayılır
+        deadline = started + timeouts.get(name, default_timeout)
+        try:
+            result, error, timings[name] = future.result(timeout=max(0.0, deadline - time.perf_counter()))
+        except FutureTimeoutError:
+            future.cancel()
+            results[name] = defaults.get(name)
+            timings[name] = time.perf_counter() - started
+            logger.error(f"[parallel_fetch] '{name}' zaman aşımına uğradı ({timeouts.get(name, default_timeout)} sn)")
+            continue
+        if error is not None:
+            results[name] = defaults.get(name)
+            logger.error(f"[parallel_fetch] '{name}' okunamadı: {str(error)}")
+        else:
+            results[name] = result
+
+    slowest = max(timings, key=timings.get) if timings else None
+    logger.info(
+        f"[parallel_fetch] {len(calls)} kaynak {time.perf_counter() - started:.3f} sn'de birleştirildi. "
+        f"Süreler: { {k: round(v, 3) for k, v in timings.items()} }, en yavaş: {slowest}"
+    )
+    return results, timings
@@ -0,0 +1,201 @@
+"""
+post_catalog.py
+Posts koleksiyonunu süreç başına bir kez yükleyen ve sonrasında yalnızca
+eklenen/değişen/silinen belgeleri uygulayan canlı içerik kataloğu.
+
+Firestore istemcisinde `on_snapshot` varsa snapshot listener kullanılır.
+Yoksa (emülatör veya yerel test istemcileri) `updated_at` imlecine göre
+periyodik sorgu yapılır; fiziksel silmeler periyodik tam senkronizasyonla yakalanır.
+"""
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+from config.config import (
+    COLLECTION_POSTS,
+    POST_CATALOG_POLL_INTERVAL,
+    POST_CATALOG_RESYNC_INTERVAL,
+    POST_CATALOG_READY_TIMEOUT
+)
+
+logger = logging.getLogger(__name__)
+
+# listener(upserted_posts, removed_ids)
+CatalogListener = Callable[[List[Dict[str, Any]], List[str]], None]
+
+
+class PostCatalog:
+    def __init__(
+        self,
+        post_service,
+        poll_interval: float = POST_CATALOG_POLL_INTERVAL,
+        resync_interval: float = POST_CATALOG_RESYNC_INTERVAL
+    ):
+        self.post_service = post_service
+        self.poll_interval = poll_interval
+        self.resync_interval = resync_interval
+        self.mode: Optional[str] = None  # 'snapshot' veya 'polling'
+        self.version = 0  # Her değişiklikte artar
+        self._posts: Dict[str, Dict[str, Any]] = {}
+        self._posts_list: Optional[List[Dict[str, Any]]] = None
+        self._listeners: List[CatalogListener] = []
+        self._lock = threading.RLock()
+        self._ready = threading.Event()
+        self._stop_event = threading.Event()
+        self._cursor: Optional[str] = None
+        self._watch = None
+        self._poll_thread: Optional[threading.Thread] = None
+
+    def start(self, ready_timeout: float = POST_CATALOG_READY_TIMEOUT) -> 'PostCatalog':
+        """Kataloğu yükler ve değişiklik takibini başlatır."""
+        if self.mode is not None:
+            return self
+
+        collection_ref = self.post_service.db.collection(COLLECTION_POSTS)
+        if hasattr(collection_ref, 'on_snapshot'):
+            try:
+                self._watch = collection_ref.on_snapshot(self._on_snapshot)
+                self.mode = 'snapshot'
+                logger.info("[PostCatalog] Snapshot listener başlatıldı.")
+            except Exception as e:
+                logger.warning(f"[PostCatalog] Snapshot listener başlatılamadı, polling kullanılacak: {str(e)}")
+                self._watch = None
+
+        if self.mode is None:
+            self.mode = 'polling'
+            self._load_all()
+            self._poll_thread = threading.Thread(target=self._poll_loop, name='post-catalog-poll', daemon=True)
+            self._poll_thread.start()
+            logger.info(f"[PostCatalog] Polling modu başlatıldı ({self.poll_interval} sn).")
+
+        if not self._ready.wait(ready_timeout):
+            # İlk snapshot gecikirse istekleri boş katalogla bekletmemek için tam yükleme yap
+            logger.warning("[PostCatalog] İlk snapshot zamanında gelmedi, tam yükleme yapılıyor.")
+            self._load_all()
+        return self
+
+    def stop(self) -> None:
+        """Değişiklik takibini durdurur."""
+        self._stop_event.set()
+        if self._watch is not None:
+            try:
+                self._watch.unsubscribe()
+            except Exception as e:
+                logger.warning(f"[PostCatalog] Listener kapatılırken hata: {str(e)}")
+            self._watch = None
+
+    def add_listener(self, listener: CatalogListener) -> None:
+        """Katalog değişikliklerinde çağrılacak fonksiyonu kaydeder.
+
+        Listener kaydedildiği anda mevcut tüm postları upsert olarak alır.
+        """
+        with self._lock:
+            self._listeners.append(listener)
+            current = list(self._posts.values())
+        if current:
+            listener(current, [])
+
+    def get_posts(self) -> List[Dict[str, Any]]:
+        """Katalogdaki tüm postların sığ bir kopyasını döndürür."""
+        with self._lock:
+            if self._posts_list is None:
+                self._posts_list = list(self._posts.values())
+            return list(self._posts_list)
+
+    def get_post(self, post_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._posts.get(post_id)
+
+    def __len__(self) -> int:
+        return len(self._posts)
+
+    def _on_snapshot(self, docs, changes, read_time) -> None:
+        """Firestore watch thread'inden gelen değişiklikleri uygular."""
+        try:
+            upserted = []
+            removed = []
+            for change in changes:
+                if change.type.name == 'REMOVED':
+                    removed.append(change.document.id)
+                    continue
+                post = self.post_service._doc_to_post(change.document)
+                # Yumuşak silinen postlar _load_all ve _poll_changes'teki gibi katalogdan çıkar
+                if post.get('is_deleted'):
+                    removed.append(post['id'])
+                else:
+                    upserted.append(post)
+            self._apply(upserted, removed)
+        except Exception as e:
+            logger.error(f"[PostCatalog] Snapshot uygulanırken hata: {str(e)}")
+        finally:
+            self._ready.set()
+
+    def _load_all(self) -> None:
+        """Koleksiyonun tamamını okuyup kataloğu onunla eşitler."""
+        try:
+            posts = [
+                self.post_service._doc_to_post(doc)
+                for doc in self.post_service.db.collection(COLLECTION_POSTS).stream()
+            ]
+        except Exception as e:
+            logger.error(f"[PostCatalog] Tam yükleme hatası: {str(e)}")
+            return
+        live = [p for p in posts if not p.get('is_deleted')]
+        live_ids = {p['id'] for p in live}
+        with self._lock:
+            removed = [pid for pid in self._posts if pid not in live_ids]
+        self._apply(live, removed)
+        self._advance_cursor(posts)
+        self._ready.set()
+        logger.info(f"[PostCatalog] Tam yükleme tamamlandı: {len(live)} post.")
+
+    def _poll_loop(self) -> None:
+        since_resync = 0.0
+        while not self._stop_event.wait(self.poll_interval):
+            since_resync += self.poll_interval
+            if since_resync >= self.resync_interval:
+                since_resync = 0.0
+                self._load_all()
+            else:
+                self._poll_changes()
+
+    def _poll_changes(self) -> None:
+        """`updated_at` imlecinden sonra değişen belgeleri uygular."""
+        try:
+            query = self.post_service.db.collection(COLLECTION_POSTS)
+            if self._cursor:
+                query = query.where('updated_at', '>', self._cursor)
+            docs = query.order_by('updated_at').stream()
+            posts = [self.post_service._doc_to_post(doc) for doc in docs]
+        except Exception as e:
+            logger.error(f"[PostCatalog] Değişiklik sorgusu hatası: {str(e)}")
+            return
+        if not posts:
+            return
+        upserted = [p for p in posts if not p.get('is_deleted')]
+        removed = [p['id'] for p in posts if p.get('is_deleted')]
+        self._apply(upserted, removed)
+        self._advance_cursor(posts)
+
+    def _advance_cursor(self, posts: List[Dict[str, Any]]) -> None:
+        stamps = [p['updated_at'] for p in posts if isinstance(p.get('updated_at'), str)]
+        if stamps:
+            latest = max(stamps)
+            if self._cursor is None or latest > self._cursor:
+                self._cursor = latest
+
+    def _apply(self, upserted: List[Dict[str, Any]], removed: List[str]) -> None:
+        if not upserted and not removed:
+            return
+        with self._lock:
+            for post in upserted:
+                self._posts[post['id']] = post
+            removed = [pid for pid in removed if self._posts.pop(pid, None) is not None]
+            self._posts_list = None
+            self.version += 1
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(upserted, removed)
+            except Exception as e:
+                logger.error(f"[PostCatalog] Listener hatası: {str(e)}")
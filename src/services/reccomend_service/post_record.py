@@ -0,0 +1,92 @@
+"""
+post_record.py
+Katalog tarafında postların sıkıştırılmış temsili.
+
+PostRecord yalnızca puanlamada kullanılan alanları tutar (int duygu kodu, epoch,
+intern edilmiş keyword id'leri, popülerlik sayaçları); yorum dizileri gibi ağır
+alanlar taşınmaz. Tam Firestore belgesi CatalogIndex'te bir kez saklanır ve yalnızca
+yanıt oluşturulurken (CatalogIndex.materialize) geri alınır.
+"""
+import threading
+from typing import Any, Dict, FrozenSet, Iterable
+
+from config.emotion_tables import decode, encode
+
+
+class KeywordInterner:
+    """Keyword string'lerini süreç boyunca sabit kalan küçük int id'lere eşler."""
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def intern(self, keyword: str) -> int:
+        keyword_id = self._ids.get(keyword)
+        if keyword_id is None:
+            with self._lock:
+                keyword_id = self._ids.setdefault(keyword, len(self._ids))
+        return keyword_id
+
+    def intern_all(self, keywords: Iterable[str]) -> FrozenSet[int]:
+        return frozenset(self.intern(k) for k in keywords if k)
+
+    def lookup(self, keywords: Iterable[str]) -> FrozenSet[int]:
+        """Daha önce görülmüş keywordlerin id'lerini döndürür (yeni id üretmez)."""
+        ids = self._ids
+        return frozenset(ids[k] for k in keywords if k in ids)
+
+
+def count_field(value: Any) -> int:
+    """Sayaç alanı sayı ya da (beğenen kullanıcılar gibi) dizi olabilir."""
+    if isinstance(value, (list, tuple)):
+        return len(value)
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return int(value)
+    return 0
+
+
+def comments_count(post: Dict[str, Any]) -> int:
+    """commentsCount alanı, yoksa yorum dizisinin uzunluğu ya da sayısal 'comments' alanı."""
+    if 'commentsCount' in post:
+        return count_field(post.get('commentsCount'))
+    return count_field(post.get('comments'))
+
+
+class PostRecord:
+    __slots__ = ('id', 'emotion_code', 'epoch', 'keyword_ids', 'likes', 'comments', 'views')
+
+    def __init__(self, post_id: str, emotion_code: int, epoch: float, keyword_ids: FrozenSet[int],
+                 likes: int = 0, comments: int = 0, views: int = 0):
+        self.id = post_id
+        self.emotion_code = emotion_code  # Emotion kodu; duygusu olmayan/bilinmeyen -1
+        self.epoch = epoch  # epoch saniye; zamansız 0
+        self.keyword_ids = keyword_ids
+        self.likes = likes
+        self.comments = comments
+        self.views = views
+
+    @classmethod
+    def from_post(cls, post: Dict[str, Any], epoch: float, interner: KeywordInterner) -> 'PostRecord':
+        return cls(
+            post.get('id'),
+            encode(post.get('emotion')),
+            epoch,
+            interner.intern_all(post.get('keywords') or ()),
+            count_field(post.get('likes')),
+            comments_count(post),
+            count_field(post.get('views'))
+        )
+
+    @property
+    def emotion(self) -> Any:
+        return decode(self.emotion_code)
+
+    @property
+    def popularity(self) -> int:
+        return self.likes + self.comments + self.views
+
+    def __repr__(self) -> str:
+        return f"PostRecord({self.id!r}, emotion={self.emotion!r}, epoch={self.epoch})"
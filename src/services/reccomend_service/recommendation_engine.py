@@ -1,4 +1,5 @@
 from typing import Dict, List, Any
+import asyncio
 import logging
 from models.emotion_model import EmotionModel
 from services.content_scorer import ContentScorer
@@ -8,7 +9,7 @@ from services.pattern_manager import PatternManager
 from services.reccomend_service.user_history_utils import get_recent_shown_post_ids
 from services.reccomend_service.ab_test_logger import log_recommendation_event
 from services.reccomend_service.cold_start_utils import get_cold_start_content
-from config.config import EMOTION_CATEGORIES
+from config.config import EMOTION_CATEGORIES, EMOTION_HISTORY_WINDOW_DAYS, EMOTION_HISTORY_MAX_COUNT
 
 class RecommendationEngine:
     def __init__(
@@ -28,15 +29,25 @@ class RecommendationEngine:
         self,
         user_id: str,
         limit: int = 20,
-        firebase_service = None
+        firebase_service = None,
+        post_service = None
     ) -> Dict[str, Any]:
-        """Kullanıcı için önerileri oluşturur"""
+        """Kullanıcı için önerileri oluşturur.
+
+        firebase_service ve post_service asenkron (AsyncClient tabanlı) servisler olmalıdır;
+        post_service verilmezse postlar firebase_service üzerinden okunur.
+        """
         try:
             print(f"[RecommendationEngine] Öneriler oluşturuluyor - Kullanıcı: {user_id}")
-            # Kullanıcı etkileşimlerini getir
-            interactions = firebase_service.get_user_interactions(user_id)
-            # İçerikleri getir
-            contents = firebase_service.get_all_posts()
+            # Etkileşimleri ve içerikleri eşzamanlı getir
+            interactions, contents = await asyncio.gather(
+                firebase_service.get_user_interactions(
+                    user_id,
+                    window_days=EMOTION_HISTORY_WINDOW_DAYS,
+                    max_count=EMOTION_HISTORY_MAX_COUNT
+                ),
+                (post_service or firebase_service).get_all_posts()
+            )
             # Soğuk başlangıç kontrolü
             if not interactions:
                 content_mix = get_cold_start_content(contents, list(EMOTION_CATEGORIES.values()), limit)
@@ -0,0 +1,95 @@
+"""
+bench_ad_placement.py
+Reklam yerleştirme aşamasının süresini reklam sayısıyla ölçer (20 içerikli akış):
+- matris: ad_slot_scores + assign_ads (özet ve sütunlar hazırken),
+- insert_ads: envanter sütunları + performans özeti + matris + atama, uçtan uca.
+
+Kullanım:
+    python tests/bench_ad_placement.py [100 300 1000 ...]
+"""
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+# src dizinini Python path'ine ekle
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.config import AD_OPTIMIZATION, EMOTION_CATEGORIES, MIN_AD_RELEVANCE
+from config.emotion_tables import encode
+from models.ad_manager import AdManager
+from services.reccomend_service.ad_inventory import AdInventory
+from services.reccomend_service.ad_performance import AdPerformanceView
+from services.reccomend_service.algorithms.ad_placement import ad_slot_scores, assign_ads, slot_weights
+from services.reccomend_service.algorithms.mmr_diversifier import hash_keyword_bitsets
+
+FEED_SIZE = 20
+REPEAT = 200
+
+
+class NullEventBuffer:
+    def enqueue(self, event):
+        pass
+
+
+class NullFirebase:
+    db = None
+
+
+def make_setup(n_ads: int):
+    rng = random.Random(5)
+    emotions = list(EMOTION_CATEGORIES.values())
+    end = time.time() + 86400
+    ads = [{
+        'id': f'ad{i}', 'is_active': True, 'end_date': end, 'target_emotion': rng.choice(emotions),
+        'keywords': [f'k{rng.randint(0, 200)}' for _ in range(4)], 'content': f'reklam {i}'
+    } for i in range(n_ads)]
+    inventory = AdInventory(None)
+    inventory.mode = 'bench'
+    inventory.apply(ads, [])
+    view = AdPerformanceView()
+    now = datetime.now()
+    for ad in ads:
+        for _ in range(rng.randint(0, 20)):
+            view.record({'ad_id': ad['id'], 'metric_type': rng.choice(['impression', 'impression', 'click']),
+                         'timestamp': (now - timedelta(days=rng.randint(0, 29))).isoformat()})
+    contents = [{'id': f'p{i}', 'emotion': rng.choice(emotions),
+                 'keywords': [f'k{rng.randint(0, 200)}' for _ in range(3)]} for i in range(FEED_SIZE)]
+    manager = AdManager(NullFirebase(), performance_view=view, inventory=inventory, event_buffer=NullEventBuffer())
+    return manager, contents
+
+
+def timed(fn) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        fn()
+    return (time.perf_counter() - start) / REPEAT * 1000
+
+
+def main(sizes):
+    print(f"{'reklam':>8} {'matris (ms)':>12} {'insert_ads (ms)':>16}")
+    for n_ads in sizes:
+        manager, contents = make_setup(n_ads)
+        features = manager.inventory.features()
+        ctr, change_to = manager.performance_view.summary(features.ids)
+        neighbours = contents[:-1]
+        slot_codes = np.array([encode(c['emotion']) for c in neighbours])
+        slot_bits = hash_keyword_bitsets([c['keywords'] for c in neighbours])
+        weights = slot_weights(len(neighbours), peak_slot=7)
+
+        def matrix():
+            scores = ad_slot_scores(features.emotion_codes, features.keyword_bits, ctr, change_to,
+                                    slot_codes, slot_bits, weights)
+            assign_ads(scores, AD_OPTIMIZATION['frequency_cap'], min_gap=manager.ad_frequency,
+                       min_score=MIN_AD_RELEVANCE)
+
+        print(f"{n_ads:>8} {timed(matrix):>12.3f} "
+              f"{timed(lambda: manager.insert_ads(contents, peak_moment_index=8)):>16.3f}")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [100, 300, 1000])
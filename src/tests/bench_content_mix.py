@@ -0,0 +1,91 @@
+"""
+bench_content_mix.py
+get_content_mix sıralama maliyetinin katalog boyutuyla nasıl değiştiğini ölçer:
+- tam: katalogdaki her satır _score_candidates ile skorlanır, sonra duygu seri sınırıyla
+  ilk k seçilir (önceki uygulama),
+- iki aşamalı: CandidateGenerator'ın sınırlı havuzu üretilip yalnızca o skorlanır ve sıralanır,
+- get_content_mix: yay + aday üretimi + doldurma + keşif, uçtan uca.
+İki aşamalı ve uçtan uca süreler katalog büyüdükçe sabit kalmalıdır.
+
+Kullanım:
+    python tests/bench_content_mix.py [1000 10000 100000 ...]
+"""
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+# src dizinini Python path'ine ekle
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.config import EMOTION_CATEGORIES, MAX_SAME_EMOTION_IN_ROW
+from config.emotion_tables import Emotion
+from models.content_recommender import ContentRecommender
+from services.reccomend_service.algorithms.emotion_reranker import rerank_by_emotion
+from services.reccomend_service.catalog_index import CatalogIndex
+from services.reccomend_service.engagement_store import InMemoryEngagementStore
+
+LIMIT = 20
+
+
+def fill_order(columns, rows, scores):
+    return rerank_by_emotion(columns.emotion_codes[rows], scores, limit=LIMIT,
+                             max_run=MAX_SAME_EMOTION_IN_ROW, strict=True)
+
+
+def make_posts(n: int):
+    rng = random.Random(3)
+    emotions = list(EMOTION_CATEGORIES.values())
+    now = datetime.now(timezone.utc)
+    return [{
+        'id': f'p{i}',
+        'emotion': rng.choice(emotions),
+        'timestamp': (now - timedelta(seconds=rng.randint(0, 60 * 86400))).strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
+        'keywords': [f'k{rng.randint(0, 500)}' for _ in range(3)]
+    } for i in range(n)]
+
+
+def full_fill(recommender, index, pattern, arc, now_ts):
+    columns = index.columns()
+    rows = np.flatnonzero(columns.emotion_codes >= 0)
+    scores = recommender._score_candidates(columns, rows, pattern, arc, now_ts)
+    return [index.get(columns.ids[rows[p]]) for p in fill_order(columns, rows, scores)]
+
+
+def two_stage_fill(recommender, index, pattern, arc, now_ts):
+    columns = index.columns()
+    rows = recommender.candidate_generator.generate(columns, pattern, arc)
+    scores = recommender._score_candidates(columns, rows, pattern, arc, now_ts)
+    return [index.get(columns.ids[rows[p]]) for p in fill_order(columns, rows, scores)]
+
+
+def best_of(fn, repeat: int = 3) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(sizes):
+    recommender = ContentRecommender(InMemoryEngagementStore())
+    pattern = {e: 1 / len(EMOTION_CATEGORIES) for e in EMOTION_CATEGORIES.values()}
+    arc = [Emotion.SADNESS, Emotion.JOY]
+    now_ts = datetime.now(timezone.utc).timestamp()
+    print(f"{'n':>8} {'tam (sn)':>10} {'iki aşama (sn)':>15} {'get_content_mix (sn)':>21}")
+    for n in sizes:
+        posts = make_posts(n)
+        index = CatalogIndex.from_posts(posts)  # Sütunlar katalog değişince kurulur; istek maliyetine dahil değil
+        full = best_of(lambda: full_fill(recommender, index, pattern, arc, now_ts))
+        two_stage = best_of(lambda: two_stage_fill(recommender, index, pattern, arc, now_ts))
+        mix = best_of(lambda: recommender.get_content_mix(
+            None, pattern, limit=LIMIT, current_emotion=Emotion.JOY.label, catalog_index=index))
+        print(f"{n:>8} {full:>10.4f} {two_stage:>15.4f} {mix:>21.4f}")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [1_000, 10_000, 100_000])
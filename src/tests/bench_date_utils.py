@@ -0,0 +1,80 @@
+"""
+bench_date_utils.py
+Timestamp çözümleme hızını karşılaştırır:
+- eski: strptime biçimlerini sırayla deneyen önceki parse_timestamp (referans için aşağıda),
+- soğuk: yeni codec, önbellek boşken (her string ilk kez görülüyor),
+- sıcak: yeni codec, aynı stringler ikinci kez (LRU isabetleri),
+- toplu: parse_timestamps_epoch ile NumPy dizisine dönüşüm (sıcak önbellek).
+
+Kullanım:
+    python tests/bench_date_utils.py [n]  (n > CACHE_SIZE olursa sıcak tur da önbellekten düşer)
+"""
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+# src dizinini Python path'ine ekle
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.reccomend_service.date_utils import _parse_string, parse_timestamp, parse_timestamps_epoch
+
+FORMATS = [
+    "%B %d, %Y at %I:%M:%S %p UTC+3",
+    "%Y-%m-%dT%H:%M:%S.%fZ",
+    "%Y-%m-%dT%H:%M:%S",
+    "%B %d, %Y at %I:%M:%S %p UTC",
+]
+
+
+def legacy_parse_timestamp(ts):
+    """Önceki uygulama (karşılaştırma için)"""
+    for fmt in [
+        "%Y-%m-%dT%H:%M:%S.%fZ",
+        "%Y-%m-%dT%H:%M:%S.%f",
+        "%Y-%m-%dT%H:%M:%S",
+        "%Y-%m-%d %H:%M:%S",
+        "%B %d, %Y at %I:%M:%S %p UTC",
+        "%Y-%m-%d"
+    ]:
+        try:
+            return datetime.strptime(ts, fmt).replace(tzinfo=timezone.utc)
+        except Exception:
+            continue
+    try:
+        dt = datetime.fromisoformat(ts)
+        return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+    except Exception:
+        return None
+
+
+def make_values(n: int):
+    rng = random.Random(7)
+    now = datetime.now()
+    return [
+        (now - timedelta(seconds=rng.randint(0, 90 * 86400))).strftime(rng.choice(FORMATS))
+        for _ in range(n)
+    ]
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main(n: int):
+    values = make_values(n)
+    legacy = timed(lambda: [legacy_parse_timestamp(v) for v in values])
+    _parse_string.cache_clear()
+    cold = timed(lambda: [parse_timestamp(v) for v in values])
+    warm = timed(lambda: [parse_timestamp(v) for v in values])
+    batch = timed(lambda: parse_timestamps_epoch(values))
+    print(f"n={n}")
+    for name, seconds in [('eski', legacy), ('soğuk', cold), ('sıcak', warm), ('toplu', batch)]:
+        print(f"  {name:<6} {seconds:8.3f} sn  {n / seconds:>12,.0f} timestamp/sn")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
@@ -0,0 +1,79 @@
+"""
+bench_user_history.py
+Bir istekteki beş geçmiş analizinin (analyze_pattern, get_current_emotion_and_transitions,
+analyze_transition_patterns, detect_emotion_loop, time_weighted_emotion_pattern) maliyetini
+karşılaştırır:
+- liste: her analiz ham etkileşim listesini alır ve timestamp'leri kendisi çözer,
+- paylaşılan: UserHistory bir kez oluşturulur, beş analiz aynı diziler üzerinde çalışır.
+
+Kullanım:
+    python tests/bench_user_history.py [10000 100000 ...]
+"""
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+# src dizinini Python path'ine ekle
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.config import EMOTION_CATEGORIES, INTERACTION_TYPE_WEIGHTS
+from models.emotion_analyzer import EmotionAnalyzer
+from models.user_history import UserHistory
+from services.reccomend_service.algorithms.emotion_loop_detector import detect_emotion_loop
+from services.reccomend_service.algorithms.time_weighting import time_weighted_emotion_pattern
+
+FORMATS = [
+    lambda dt: dt.strftime("%B %d, %Y at %I:%M:%S %p UTC+3"),
+    lambda dt: dt.strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
+    lambda dt: dt.isoformat(),
+]
+
+
+def make_interactions(n: int):
+    rng = random.Random(42)
+    emotions = list(EMOTION_CATEGORIES.values())
+    types = list(INTERACTION_TYPE_WEIGHTS)
+    now = datetime.now()
+    return [{
+        'emotion': rng.choice(emotions),
+        'interactionType': rng.choice(types),
+        'confidence': rng.random(),
+        'timestamp': rng.choice(FORMATS)(now - timedelta(seconds=rng.randint(0, 90 * 86400)))
+    } for _ in range(n)]
+
+
+def run_all(analyzer, data, base):
+    analyzer.analyze_pattern(data, 'bench')
+    analyzer.get_current_emotion_and_transitions(data)
+    analyzer.analyze_transition_patterns(data)
+    detect_emotion_loop(data)
+    time_weighted_emotion_pattern(data, base)
+
+
+def best_of(fn, repeat: int = 3) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(sizes):
+    analyzer = EmotionAnalyzer()
+    base = {e: 1 / len(EMOTION_CATEGORIES) for e in EMOTION_CATEGORIES.values()}
+    print(f"{'n':>8} {'liste (sn)':>12} {'paylaşılan (sn)':>16} {'kazanç':>8}")
+    for n in sizes:
+        interactions = make_interactions(n)
+        with contextlib.redirect_stdout(io.StringIO()):
+            per_list = best_of(lambda: run_all(analyzer, interactions, base))
+            shared = best_of(lambda: run_all(analyzer, UserHistory.from_interactions(interactions), base))
+        print(f"{n:>8} {per_list:>12.3f} {shared:>16.3f} {per_list / shared:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [10_000, 100_000])
@@ -0,0 +1,269 @@
+"""
+fakes.py
+Testlerde paylaşılan bellek içi Firestore ve servis sahteleri.
+
+FakeDb belgeleri `store[koleksiyon yolu][belge id] = alanlar` biçiminde tutar; alt koleksiyonların
+yolu 'ads/a/counters' gibidir ve verilen sözlükler kopyalanmadan kullanılır. Sorgular (where /
+order_by / limit / start_after / select) bellekte uygulanır: sırasız sorgu belge id sırasıyla döner,
+order_by Firestore gibi alanı olmayan belgeleri düşürür. Sorgu adımları ve stream çağrıları
+`db.calls`a, belge okumaları `db.reads`e, commit edilen batch'lerin yazma sayıları `db.commits`e
+eklenir. `db.fail` True iken commit hata verir; `db.commit_budget` verilirse o kadar commit'ten
+sonra hata verir. `snapshot=True` ile koleksiyonlar on_snapshot destekler.
+FakeAsyncDb aynı deponun AsyncClient karşılığıdır.
+"""
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+DESCENDING = 'DESCENDING'  # firestore.Query.DESCENDING
+
+_OPS = {
+    '==': lambda a, b: a == b,
+    '>': lambda a, b: a > b,
+    '>=': lambda a, b: a >= b,
+    '<': lambda a, b: a < b,
+    '<=': lambda a, b: a <= b,
+    'in': lambda a, b: a in b,
+}
+
+
+def _is_increment(value: Any) -> bool:
+    return type(value).__name__ == 'Increment'
+
+
+def _merge(doc: Dict[str, Any], fields: Dict[str, Any]) -> None:
+    """merge=True / update yazımı: iç içe alanlar birleşir, Increment mevcut değere eklenir."""
+    for name, value in fields.items():
+        if _is_increment(value):
+            doc[name] = doc.get(name, 0) + value.value
+        elif isinstance(value, dict):
+            nested = doc.get(name)
+            if not isinstance(nested, dict):
+                nested = doc[name] = {}
+            _merge(nested, value)
+        else:
+            doc[name] = value
+
+
+def snapshot_change(kind: str, doc_id: str, data: Optional[Dict[str, Any]] = None, path: str = 'posts'):
+    """on_snapshot callback'ine verilecek değişiklik (kind: ADDED / MODIFIED / REMOVED)."""
+    return SimpleNamespace(type=SimpleNamespace(name=kind),
+                           document=FakeDoc(FakeDocRef(None, path, doc_id), data or {}))
+
+
+class FakeDoc:
+    def __init__(self, reference: 'FakeDocRef', data: Optional[Dict[str, Any]]):
+        self.reference = reference
+        self.id = reference.id
+        self._data = data
+        self.exists = data is not None
+
+    def to_dict(self) -> Optional[Dict[str, Any]]:
+        return dict(self._data) if self._data is not None else None
+
+
+class FakeDocRef:
+    def __init__(self, db: Optional['FakeDb'], collection_path: str, doc_id: str):
+        self.db = db
+        self.collection_path = collection_path
+        self.id = doc_id
+
+    @property
+    def path(self) -> str:
+        return f'{self.collection_path}/{self.id}'
+
+    def collection(self, name: str) -> 'FakeCollection':
+        return self.db.collection(f'{self.path}/{name}')
+
+    def get(self) -> FakeDoc:
+        self.db.reads.append((self.collection_path, self.id))
+        return FakeDoc(self, self.db.documents(self.collection_path).get(self.id))
+
+    def set(self, data: Dict[str, Any], merge: bool = False) -> None:
+        self.db.write(self, data, merge)
+
+
+class FakeQuery:
+    def __init__(self, db: 'FakeDb', path: str, filters=(), order=None, limit=None, after=None):
+        self.db = db
+        self.path = path
+        self._filters = tuple(filters)
+        self._order = order
+        self._limit = limit
+        self._after = after
+
+    def _copy(self, **changes) -> 'FakeQuery':
+        state = dict(filters=self._filters, order=self._order, limit=self._limit, after=self._after)
+        state.update(changes)
+        return self._query_class(self.db, self.path, **state)
+
+    def where(self, field: str, op: str, value: Any) -> 'FakeQuery':
+        self.db.calls.append(('where', field, op))
+        return self._copy(filters=self._filters + ((field, op, value),))
+
+    def order_by(self, field: str, direction: Optional[str] = None) -> 'FakeQuery':
+        self.db.calls.append(('order_by', field))
+        return self._copy(order=(field, direction == DESCENDING))
+
+    def limit(self, n: int) -> 'FakeQuery':
+        self.db.calls.append(('limit', n))
+        return self._copy(limit=n)
+
+    def start_after(self, snapshot: FakeDoc) -> 'FakeQuery':
+        return self._copy(after=snapshot.id)
+
+    def select(self, fields: List[str]) -> 'FakeQuery':
+        return self
+
+    def _results(self) -> List[FakeDoc]:
+        items = sorted(self.db.documents(self.path).items())
+        for field, op, value in self._filters:
+            # Alanı olmayan belgeler filtreden geçmez
+            items = [(k, v) for k, v in items if v.get(field) is not None and _OPS[op](v[field], value)]
+        if self._order is not None:
+            field, descending = self._order
+            if field != '__name__':
+                items = sorted(((k, v) for k, v in items if field in v), key=lambda kv: kv[1][field],
+                               reverse=descending)
+            elif descending:
+                items.reverse()
+        if self._after is not None:
+            ids = [k for k, _ in items]
+            if self._after in ids:
+                items = items[ids.index(self._after) + 1:]
+        if self._limit is not None:
+            items = items[:self._limit]
+        return [FakeDoc(FakeDocRef(self.db, self.path, k), v) for k, v in items]
+
+    def stream(self) -> List[FakeDoc]:
+        self.db.calls.append(('stream', self._limit is not None))
+        return self._results()
+
+
+FakeQuery._query_class = FakeQuery
+
+
+class FakeCollection(FakeQuery):
+    def __init__(self, db: 'FakeDb', path: str):
+        super().__init__(db, path)
+
+    def document(self, doc_id: Optional[str] = None) -> FakeDocRef:
+        if doc_id is None:
+            self.db.auto_ids += 1
+            doc_id = f'auto{self.db.auto_ids:04d}'
+        return FakeDocRef(self.db, self.path, doc_id)
+
+
+class FakeSnapshotCollection(FakeCollection):
+    def on_snapshot(self, callback):
+        """Callback'i kaydeder ve mevcut belgeleri ADDED olarak hemen iletir (ilk snapshot)."""
+        self.db.snapshot_callbacks[self.path] = callback
+        changes = [SimpleNamespace(type=SimpleNamespace(name='ADDED'), document=doc) for doc in self._results()]
+        callback([], changes, None)
+        return SimpleNamespace(unsubscribe=lambda: None)
+
+
+class FakeBatch:
+    def __init__(self, db: 'FakeDb'):
+        self.db = db
+        self.writes = []
+
+    def set(self, ref: FakeDocRef, fields: Dict[str, Any], merge: bool = False) -> None:
+        self.writes.append((ref, fields, merge, False))
+
+    def update(self, ref: FakeDocRef, fields: Dict[str, Any]) -> None:
+        self.writes.append((ref, fields, True, True))
+
+    def commit(self) -> None:
+        db = self.db
+        if db.fail or (db.commit_budget is not None and len(db.commits) >= db.commit_budget):
+            raise RuntimeError('yazılamadı')
+        db.commits.append(len(self.writes))
+        for ref, fields, merge, must_exist in self.writes:
+            if must_exist and ref.id not in db.documents(ref.collection_path):
+                raise KeyError(f'belge yok: {ref.path}')
+            db.write(ref, fields, merge)
+
+
+class FakeDb:
+    def __init__(self, store: Optional[Dict[str, Dict[str, Dict[str, Any]]]] = None, snapshot: bool = False):
+        self.store = store if store is not None else {}
+        self.snapshot = snapshot
+        self.calls: List[tuple] = []
+        self.reads: List[tuple] = []
+        self.commits: List[int] = []
+        self.commit_budget: Optional[int] = None
+        self.fail = False
+        self.auto_ids = 0
+        self.snapshot_callbacks: Dict[str, Any] = {}
+
+    @property
+    def streams(self) -> int:
+        return sum(1 for call in self.calls if call[0] == 'stream')
+
+    def emit(self, path: str, changes: List[Any]) -> None:
+        """Koleksiyonun on_snapshot callback'ine değişiklik iletir (snapshot_change ile kurulur)."""
+        self.snapshot_callbacks[path]([], changes, None)
+
+    def documents(self, path: str) -> Dict[str, Dict[str, Any]]:
+        return self.store.setdefault(path, {})
+
+    def write(self, ref: FakeDocRef, fields: Dict[str, Any], merge: bool) -> None:
+        docs = self.documents(ref.collection_path)
+        if merge:
+            _merge(docs.setdefault(ref.id, {}), fields)
+        else:
+            docs[ref.id] = dict(fields)
+
+    def collection(self, name: str) -> FakeCollection:
+        return FakeSnapshotCollection(self, name) if self.snapshot else FakeCollection(self, name)
+
+    def batch(self) -> FakeBatch:
+        return FakeBatch(self)
+
+
+class FakeAsyncDocRef(FakeDocRef):
+    async def get(self) -> FakeDoc:
+        return FakeDocRef.get(self)
+
+    async def set(self, data: Dict[str, Any], merge: bool = False) -> None:
+        FakeDocRef.set(self, data, merge)
+
+
+class FakeAsyncQuery(FakeQuery):
+    async def stream(self):
+        for doc in FakeQuery.stream(self):
+            yield doc
+
+
+FakeAsyncQuery._query_class = FakeAsyncQuery
+
+
+class FakeAsyncCollection(FakeAsyncQuery):
+    def document(self, doc_id: Optional[str] = None) -> FakeAsyncDocRef:
+        ref = FakeCollection.document(self, doc_id)
+        return FakeAsyncDocRef(self.db, ref.collection_path, ref.id)
+
+
+class FakeAsyncDb(FakeDb):
+    def collection(self, name: str) -> FakeAsyncCollection:
+        return FakeAsyncCollection(self, name)
+
+
+class FakeEventBuffer:
+    """AdEventBuffer yerine: olayları yazmadan listede tutar."""
+
+    def __init__(self):
+        self.events = []
+
+    def enqueue(self, event: Dict[str, Any]) -> None:
+        self.events.append(event)
+
+
+class FakeFirebase:
+    """AdManager'ın firebase servisi; reklam yolu koleksiyon okumamalıdır."""
+
+    def __init__(self, db: Optional[FakeDb] = None):
+        self.db = db
+
+    def get_collection(self, name: str):
+        raise AssertionError('reklam yerleştirme koleksiyonu okumamalı')
@@ -0,0 +1,112 @@
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+# src dizinini Python path'ine ekle
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from config.emotion_tables import encode
+from services.reccomend_service.ad_bandit import AdBandit, AdBanditCheckpointer
+from services.reccomend_service.ad_inventory import AdInventory
+from models.ad_manager import AdManager
+from tests.fakes import FakeEventBuffer, FakeFirebase
+
+JOY = 'Neşe (Joy)'
+FEAR = 'Korku (Fear)'
+
+
+def shown(bandit, ad_id, emotion, impressions, clicks):
+    for _ in range(impressions):
+        bandit.record({'ad_id': ad_id, 'metric_type': 'impression', 'slot_emotion': emotion})
+    for _ in range(clicks):
+        bandit.record({'ad_id': ad_id, 'metric_type': 'click_count', 'slot_emotion': emotion})
+
+
+class TestAdBandit(unittest.TestCase):
+    def test_posteriors_are_per_emotion(self):
+        bandit = AdBandit(prior=(1.0, 1.0), capacity=1)
+        shown(bandit, 'a', JOY, 100, 50)
+        shown(bandit, 'b', JOY, 100, 1)
+        bandit.record({'ad_id': 'a', 'metric_type': 'view_count', 'slot_emotion': JOY})
+        self.assertAlmostEqual(bandit.posterior_mean('a', encode(JOY)), 51 / 102)
+        self.assertAlmostEqual(bandit.posterior_mean('a', encode(FEAR)), 0.5)
+        self.assertEqual(len(bandit), 2)
+
+        draws = bandit.sample(['a', 'b', 'new'], [encode(JOY), encode(FEAR), encode(JOY)])
+        self.assertEqual(draws.shape, (3, 3))
+        np.testing.assert_array_equal(draws[:, 0], draws[:, 2])
+        wins = sum(int(np.argmax(bandit.sample(['a', 'b'], [encode(JOY)])[:, 0]) == 0) for _ in range(200))
+        self.assertGreater(wins, 190)
+
+    def test_checkpoint_merges_workers(self):
+        path = os.path.join(tempfile.mkdtemp(), 'bandit.npz')
+        first, second = AdBandit(), AdBandit()
+        shown(first, 'a', JOY, 10, 2)
+        shown(second, 'a', JOY, 5, 1)
+        shown(second, 'b', None, 3, 0)
+        self.assertEqual(AdBanditCheckpointer(first, path).run_once(), 1)
+        self.assertEqual(AdBanditCheckpointer(second, path).run_once(), 2)
+        self.assertEqual(first.checkpoint(path), 2)  # Yeni artış yok; diğer worker'ın sayaçları gelir
+
+        restored = AdBandit()
+        restored.checkpoint(path)
+        for bandit in (first, second, restored):
+            self.assertAlmostEqual(bandit.posterior_mean('a', encode(JOY)), restored.posterior_mean('a', encode(JOY)))
+        alpha, beta = restored.prior_alpha, restored.prior_beta
+        self.assertAlmostEqual(restored.posterior_mean('a', encode(JOY)), (alpha + 3) / (alpha + beta + 15))
+        self.assertAlmostEqual(restored.posterior_mean('b'), alpha / (alpha + beta + 3))
+
+
+class TestThompsonStrategy(unittest.TestCase):
+    def setUp(self):
+        end = time.time() + 86400
+        self.inventory = AdInventory(None)
+        self.inventory.mode = 'test'  # Firestore takibi yok
+        self.inventory.apply([
+            {'id': f'ad{i}', 'is_active': True, 'end_date': end, 'target_emotion': JOY,
+             'keywords': ['sun'], 'content': f'Reklam {i}'}
+            for i in range(3)
+        ], [])
+        self.bandit = AdBandit(seed=7)
+        shown(self.bandit, 'ad1', JOY, 200, 60)
+        shown(self.bandit, 'ad0', JOY, 200, 0)
+        shown(self.bandit, 'ad2', JOY, 200, 0)
+        self.manager = AdManager(FakeFirebase(), inventory=self.inventory, event_buffer=FakeEventBuffer(),
+                                 bandit=self.bandit, strategy='thompson')
+
+    def test_single_slot_gets_best_posterior_ad(self):
+        contents = [{'id': 'p0', 'emotion': JOY, 'keywords': ['sun']}, {'id': 'p1', 'emotion': JOY, 'keywords': []}]
+        result = self.manager.insert_ads(contents, peak_moment_index=1)
+        self.assertEqual([item['id'] for item in result], ['p0', 'ad1', 'p1'])
+
+    def test_insert_ads_records_impressions_into_bandit(self):
+        contents = [{'id': f'p{i}', 'emotion': JOY, 'keywords': ['sun']} for i in range(10)]
+        result = self.manager.insert_ads(contents, peak_moment_index=5)
+        ads = [item['id'] for item in result if item.get('is_ad')]
+        self.assertEqual(ads[0], 'ad1')
+        self.assertAlmostEqual(self.bandit.posterior_mean('ad1', encode(JOY)),
+                               (self.bandit.prior_alpha + 60) / (self.bandit.prior_alpha + self.bandit.prior_beta + 201))
+
+    def test_click_counts_under_slot_emotion(self):
+        contents = [{'id': 'p0', 'emotion': JOY, 'keywords': ['sun']}, {'id': 'p1', 'emotion': FEAR, 'keywords': []}]
+        ad = self.manager.insert_ads(contents, peak_moment_index=1)[1]
+        self.assertEqual(ad['metadata']['slot_emotion'], JOY)
+        # Kullanıcının duygusu (Korku) değil, gösterimin bağlamı (Neşe) güncellenir
+        self.manager.track_ad_interaction(ad['id'], 'u1', 'click', emotion_before=FEAR,
+                                          slot_emotion=ad['metadata']['slot_emotion'])
+        alpha, beta = self.bandit.prior_alpha, self.bandit.prior_beta
+        self.assertAlmostEqual(self.bandit.posterior_mean('ad1', encode(JOY)), (alpha + 61) / (alpha + beta + 201))
+        self.assertAlmostEqual(self.bandit.posterior_mean('ad1', encode(FEAR)), alpha / (alpha + beta))
+
+    def test_click_without_slot_emotion_is_not_counted(self):
+        self.bandit.record({'ad_id': 'ad0', 'metric_type': 'click_count', 'emotion_before': FEAR})
+        alpha, beta = self.bandit.prior_alpha, self.bandit.prior_beta
+        self.assertAlmostEqual(self.bandit.posterior_mean('ad0', encode(FEAR)), alpha / (alpha + beta))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import os
+import sys
+import unittest
+
+# src dizinini Python path'ine ekle
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.reccomend_service.ad_event_buffer import AdEventBuffer
+from tests.fakes import FakeDb
+
+
+def event(ad_id, metric_type):
+    return {'ad_id': ad_id, 'metric_type': metric_type, 'timestamp': '2024-05-01T12:00:00'}
+
+
+class TestAdEventBuffer(unittest.TestCase):
+    def setUp(self):
+        self.db = FakeDb()
+        # Thread başlatılmaz; boşaltma testte elle yapılır
+        self.buffer = AdEventBuffer(self.db, shards=4)
+
+    def test_flush_writes_events_and_coalesced_shard_counters(self):
+        for _ in range(3):
+            self.buffer.enqueue(event('a', 'impression'))
+        self.buffer.enqueue(event('a', 'click'))
+        self.buffer.enqueue(event('b', 'impression'))
+        self.assertEqual(self.buffer.flush(), 5)
+        self.assertEqual(self.buffer.pending(), 0)
+        # 5 olay belgesi + reklam başına tek shard yazması, tek batch
+        self.assertEqual(self.db.commits, [7])
+        self.assertEqual(len(self.db.store['adMetrics']), 5)
+        self.assertEqual(self.buffer.counter_totals('a'), {'impression': 3, 'click': 1})
+        self.assertEqual(self.buffer.counter_totals('b'), {'impression': 1})
+
+    def test_counters_sum_across_shards(self):
+        for _ in range(20):
+            self.buffer.enqueue(event('a', 'impression'))
+            self.buffer.flush()
+        self.assertLessEqual(len(self.db.store['ads/a/counters']), 4)
+        self.assertEqual(self.buffer.counter_totals('a'), {'impression': 20})
+
+    def test_large_flush_is_split_into_batches(self):
+        for i in range(600):
+            self.buffer.enqueue(event(f'ad{i % 3}', 'impression'))
+        self.buffer.flush()
+        # Her batch kendi olaylarının sayaç yazmalarını da taşır: 497 + 3 ve 103 + 3
+        self.assertEqual(self.db.commits, [500, 106])
+        self.assertEqual(sum(self.buffer.counter_totals(f'ad{i}')['impression'] for i in range(3)), 600)
+
+    def test_partial_flush_failure_requeues_only_uncommitted_events(self):
+        for i in range(600):
+            self.buffer.enqueue(event(f'ad{i % 3}', 'impression'))
+        self.db.commit_budget = 1
+        self.assertEqual(self.buffer.flush(), 497)
+        self.assertEqual(self.buffer.pending(), 103)
+        self.db.commit_budget = None
+        self.assertEqual(self.buffer.flush(), 103)
+        # Yeniden deneme belge ve sayaçları çoğaltmaz
+        self.assertEqual(len(self.db.store['adMetrics']), 600)
+        self.assertEqual(sum(self.buffer.counter_totals(f'ad{i}')['impression'] for i in range(3)), 600)
+
+    def test_requeued_events_keep_their_document_ids(self):
+        self.buffer.enqueue(event('a', 'impression'))
+        self.db.fail = True
+        self.buffer.flush()
+        doc_id = self.buffer._events[0][0]
+        self.db.fail = False
+        self.buffer.flush()
+        self.assertEqual(list(self.db.store['adMetrics']), [doc_id])
+
+    def test_failed_flush_requeues_and_caps_pending(self):
+        self.buffer.max_pending = 3
+        for i in range(5):
+            self.buffer.enqueue(event('a', 'impression'))
+        self.assertEqual((self.buffer.pending(), self.buffer.dropped), (3, 2))
+        self.db.fail = True
+        self.assertEqual(self.buffer.flush(), 0)
+        self.assertEqual(self.buffer.pending(), 3)
+        self.db.fail = False
+        self.assertEqual(self.buffer.flush(), 3)
+
+    def test_close_drains_queue(self):
+        buffer = AdEventBuffer(self.db, flush_interval=3600).start()
+        buffer.enqueue(event('a', 'impression'))
+        buffer.close()
+        self.assertEqual(buffer.pending(), 0)
+        self.assertEqual(buffer.counter_totals('a'), {'impression': 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
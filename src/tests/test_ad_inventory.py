@@ -0,0 +1,99 @@
+import os
+import sys
+import time
+import unittest
+
+# src dizinini Python path'ine ekle
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.emotion_tables import encode
+from services.reccomend_service.ad_inventory import AdInventory
+from models.ad_manager import AdManager
+from tests.fakes import FakeDb, FakeEventBuffer, FakeFirebase
+
+NOW = 1_700_000_000.0
+DAY = 86400
+
+
+def make_ad(ad_id, emotion='Neşe (Joy)', keywords=(), start=None, end=NOW + 30 * DAY, active=True):
+    ad = {'id': ad_id, 'is_active': active, 'target_emotion': emotion, 'keywords': list(keywords),
+          'content': f'reklam {ad_id}'}
+    if start is not None:
+        ad['start_date'] = start
+    if end is not None:
+        ad['end_date'] = end
+    return ad
+
+
+def ads_db(ads, snapshot=False):
+    return FakeDb({'ads': {ad['id']: {k: v for k, v in ad.items() if k != 'id'} for ad in ads}}, snapshot=snapshot)
+
+
+class TestAdInventory(unittest.TestCase):
+    def setUp(self):
+        self.inventory = AdInventory(FakeDb())
+        self.inventory.apply([
+            make_ad('joy', 'Neşe (Joy)', ['sun']),
+            make_ad('fear', 'Korku (Fear)', ['night', 'sun']),
+            make_ad('off', 'Neşe (Joy)', active=False),
+            make_ad('no_end', 'Neşe (Joy)', end=None),
+            make_ad('expired', 'Neşe (Joy)', end=NOW - DAY)
+        ], [], now=NOW)
+
+    def ids(self, ads):
+        return [ad['id'] for ad in ads]
+
+    def test_live_ads_and_features(self):
+        self.assertEqual(self.ids(self.inventory.active_ads(now=NOW)), ['fear', 'joy'])
+        features = self.inventory.features(now=NOW)
+        self.assertEqual(features.ids, ['fear', 'joy'])
+        self.assertEqual(list(features.emotion_codes), [encode('Korku (Fear)'), encode('Neşe (Joy)')])
+        self.assertIs(self.inventory.features(now=NOW), features)
+
+    def test_schedule_activates_and_expires(self):
+        self.inventory.apply([make_ad('later', 'Aşk (Love)', start=NOW + DAY, end=NOW + 2 * DAY)], [], now=NOW)
+        self.assertNotIn('later', self.ids(self.inventory.active_ads(now=NOW)))
+        self.assertIn('later', self.ids(self.inventory.active_ads(now=NOW + DAY)))
+        self.assertNotIn('later', self.ids(self.inventory.active_ads(now=NOW + 2 * DAY)))
+        self.assertEqual(self.ids(self.inventory.active_ads(now=NOW + 31 * DAY)), [])
+
+    def test_update_and_remove_reindex(self):
+        self.inventory.apply([make_ad('joy', 'Neşe (Joy)', ['beach'])], ['fear'], now=NOW)
+        self.assertEqual(self.ids(self.inventory.active_ads(now=NOW)), ['joy'])
+        self.assertEqual(self.inventory.get('joy')['keywords'], ['beach'])
+        self.assertEqual(self.inventory.features(now=NOW).ids, ['joy'])
+        # Eski kuşağın bitiş anı güncel kaydı etkilemez
+        self.inventory.apply([make_ad('joy', end=NOW + 60 * DAY)], [], now=NOW)
+        self.assertEqual(self.ids(self.inventory.active_ads(now=NOW + 40 * DAY)), ['joy'])
+
+    def test_unchanged_reload_does_not_grow_schedule(self):
+        ads = [make_ad(f'a{i}') for i in range(50)]
+        for _ in range(5):
+            self.inventory.apply([dict(ad) for ad in ads], [], now=NOW)
+        self.assertLessEqual(len(self.inventory._schedule), 2 * 55)
+
+
+class TestAdInventorySources(unittest.TestCase):
+    def test_polling_and_snapshot_start(self):
+        ads = [make_ad('joy', end=time.time() + DAY)]
+        polling = AdInventory(ads_db(ads), poll_interval=3600).start()
+        snapshot = AdInventory(ads_db(ads, snapshot=True)).start()
+        self.assertEqual((polling.mode, snapshot.mode), ('polling', 'snapshot'))
+        self.assertEqual([ad['id'] for ad in polling.active_ads()], ['joy'])
+        self.assertEqual([ad['id'] for ad in snapshot.active_ads()], ['joy'])
+        polling.stop()
+
+    def test_insert_ads_reads_inventory(self):
+        db = ads_db([make_ad('joy', 'Neşe (Joy)', ['sun'], end=time.time() + DAY)], snapshot=True)
+        events = FakeEventBuffer()
+        manager = AdManager(FakeFirebase(db), event_buffer=events)
+        contents = [{'id': 'p1', 'emotion': 'Neşe (Joy)', 'keywords': ['sun']},
+                    {'id': 'p2', 'emotion': 'Korku (Fear)', 'keywords': []}]
+        result = manager.insert_ads(contents, peak_moment_index=1)
+        self.assertEqual([c['id'] for c in result], ['p1', 'joy', 'p2'])
+        self.assertEqual(db.streams, 0)
+        self.assertEqual([(e['ad_id'], e['metric_type']) for e in events.events], [('joy', 'impression')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import os
+import sys
+import time
+import unittest
+from datetime import datetime, timedelta
+
+# src dizinini Python path'ine ekle
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.emotion_tables import encode
+from services.reccomend_service.ad_inventory import AdInventory
+from services.reccomend_service.ad_performance import AdPerformanceRefresher, AdPerformanceView
+from models.ad_manager import AdManager
+from tests.fakes import FakeDb, FakeEventBuffer, FakeFirebase
+
+
+def metric(ad_id, metric_type, days_ago=0, before=None, after=None):
+    return {
+        'ad_id': ad_id,
+        'metric_type': metric_type,
+        'timestamp': (datetime.now() - timedelta(days=days_ago)).isoformat(),
+        'emotion_before': before,
+        'emotion_after': after
+    }
+
+
+def metrics_db(metrics):
+    return FakeDb({'adMetrics': {f'm{i}': m for i, m in enumerate(metrics)}})
+
+
+class TestAdPerformanceView(unittest.TestCase):
+    def test_window_totals_and_emotion_changes(self):
+        view = AdPerformanceView(window_days=30)
+        view.replace([
+            metric('a', 'impression'), metric('a', 'impression', 3), metric('a', 'click', 3),
+            metric('a', 'emotion_change_x', 5, 'Korku (Fear)', 'Neşe (Joy)'),
+            metric('a', 'impression', 40), metric('a', 'click', 40),
+            metric('b', 'impression'), metric('b', None)
+        ])
+        ctr, change_to = view.summary(['a', 'yok'])
+        self.assertEqual(list(ctr), [0.5, 0.0])
+        self.assertAlmostEqual(change_to[0, encode('Neşe (Joy)')], 0.5)
+        self.assertEqual(change_to[0].sum(), 0.5)
+        self.assertEqual(change_to[1].sum(), 0.0)
+
+    def test_record_is_incremental_and_refresh_replaces(self):
+        db = metrics_db([metric('a', 'impression', 1), metric('a', 'impression', 45)])
+        view = AdPerformanceView()
+        refresher = AdPerformanceRefresher(view, db)
+        self.assertEqual(refresher.run_once(), 1)
+        view.record(metric('a', 'click'))
+        self.assertEqual(list(view.summary(['a'])[0]), [1.0])
+        self.assertEqual(refresher.run_once(), 1)
+        self.assertEqual(list(view.summary(['a'])[0]), [0.0])
+
+    def test_click_count_events_count_as_clicks(self):
+        view = AdPerformanceView()
+        view.record(metric('a', 'impression'))
+        view.record(metric('a', 'impression'))
+        view.record(metric('a', 'click_count'))
+        self.assertEqual(list(view.summary(['a'])[0]), [0.5])
+
+    def test_summary_updates_only_changed_rows(self):
+        view = AdPerformanceView()
+        view.replace([metric('a', 'impression'), metric('a', 'impression'), metric('b', 'impression')])
+        ids = ['a', 'b']
+        ctr, _ = view.summary(ids)
+        self.assertEqual(list(ctr), [0.0, 0.0])
+        view.record(metric('a', 'click'))
+        view.record(metric('b', 'emotion_change_x', 0, 'Korku (Fear)', 'Neşe (Joy)'))
+        ctr, change_to = view.summary(ids)
+        self.assertEqual(list(ctr), [0.5, 0.0])
+        self.assertEqual(change_to[1].sum(), 1.0)
+        self.assertFalse(ctr.flags.writeable)
+
+
+class TestAdManagerScoring(unittest.TestCase):
+    def test_placement_reads_view_without_queries(self):
+        firebase = FakeFirebase(FakeDb())
+        inventory = AdInventory(firebase.db)
+        inventory.mode = 'test'  # Firestore takibi yok
+        end = time.time() + 86400
+        inventory.apply([{'id': ad_id, 'is_active': True, 'end_date': end, 'target_emotion': 'Neşe (Joy)',
+                          'keywords': ['sun']} for ad_id in ('good', 'plain')], [])
+        manager = AdManager(firebase, inventory=inventory, event_buffer=FakeEventBuffer())
+        for _ in range(10):
+            manager.performance_view.record(metric('good', 'impression'))
+            manager.performance_view.record(metric('plain', 'impression'))
+        manager.performance_view.record(metric('good', 'click'))
+        contents = [{'id': 'p1', 'emotion': 'Neşe (Joy)', 'keywords': ['sun']},
+                    {'id': 'p2', 'emotion': 'Neşe (Joy)', 'keywords': []}]
+        result = manager.insert_ads(contents, peak_moment_index=1)
+        self.assertEqual([c['id'] for c in result], ['p1', 'good', 'p2'])
+        self.assertEqual(firebase.db.streams, 0)
+
+    def test_metric_writes_update_view(self):
+        events = FakeEventBuffer()
+        manager = AdManager(FakeFirebase(FakeDb()), event_buffer=events)
+        manager._update_ad_metrics('a', 'impression', 'u1')
+        self.assertEqual([e['metric_type'] for e in events.events], ['impression'])
+        manager._update_ad_metrics('a', 'click', 'u1')
+        self.assertEqual(list(manager.performance_view.summary(['a'])[0]), [1.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
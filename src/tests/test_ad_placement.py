@@ -0,0 +1,96 @@
+import os
+import sys
+import time
+import unittest
+
+# src dizinini Python path'ine ekle
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from config.config import AD_OPTIMIZATION, AD_PERFORMANCE_WEIGHTS
+from config.emotion_tables import AD_EMOTION_WEIGHT_VECTOR, N_EMOTIONS, encode
+from services.reccomend_service.ad_inventory import AdInventory
+from services.reccomend_service.ad_performance import AdPerformanceView
+from services.reccomend_service.algorithms.ad_placement import ad_slot_scores, assign_ads, slot_weights
+from services.reccomend_service.algorithms.mmr_diversifier import hash_keyword_bitsets
+from models.ad_manager import AdManager
+from tests.fakes import FakeEventBuffer, FakeFirebase
+
+
+class TestAdSlotScores(unittest.TestCase):
+    def test_matches_scalar_formula(self):
+        ad_keywords = [['sun', 'sea'], ['night'], []]
+        ad_codes = np.array([encode('Neşe (Joy)'), encode('Korku (Fear)'), -1])
+        slot_keywords = [['sun', 'beach'], ['night'], []]
+        slot_codes = np.array([encode('Neşe (Joy)'), encode('Korku (Fear)'), -1])
+        ctr = np.array([0.05, 0.0, 0.2])
+        change_to = np.zeros((3, N_EMOTIONS + 1))
+        change_to[0, encode('Korku (Fear)')] = 0.5
+        weights = np.array([1.0, 0.5, 1.0])
+        scores = ad_slot_scores(ad_codes, hash_keyword_bitsets(ad_keywords), ctr, change_to,
+                                slot_codes, hash_keyword_bitsets(slot_keywords), weights)
+        w = AD_PERFORMANCE_WEIGHTS
+        for a in range(3):
+            for s in range(3):
+                code = slot_codes[s]
+                emotion_weight = AD_EMOTION_WEIGHT_VECTOR[code] if code >= 0 else AD_EMOTION_WEIGHT_VECTOR.mean()
+                emotion = (1.0 if code >= 0 and ad_codes[a] == code else 0.5) * emotion_weight
+                a_set, s_set = set(ad_keywords[a]), set(slot_keywords[s])
+                keyword = len(a_set & s_set) / len(a_set | s_set) if a_set | s_set else 0.0
+                performance = min(ctr[a] * 10, 1.0) * w['ctr'] + change_to[a, code] * w['emotion_change']
+                expected = (emotion * w['emotion'] + keyword * w['keyword'] + performance * w['performance']) * weights[s]
+                self.assertAlmostEqual(scores[a, s], expected, msg=(a, s))
+
+    def test_slot_weights_follow_strategy_and_peak(self):
+        weights = slot_weights(9, {'beginning': 0.2, 'middle': 0.6, 'end': 0.2}, peak_slot=4, peak_bonus=2.0)
+        np.testing.assert_allclose(weights, [1 / 3] * 3 + [1, 2, 1] + [1 / 3] * 3)
+
+
+class TestAssignAds(unittest.TestCase):
+    def test_each_ad_once_with_gap(self):
+        scores = np.array([
+            [0.9, 0.8, 0.1, 0.1, 0.7],
+            [0.85, 0.1, 0.1, 0.6, 0.1],
+        ])
+        self.assertEqual(assign_ads(scores, max_ads=3, min_gap=2), [(0, 0), (1, 3)])
+        self.assertEqual(assign_ads(scores, max_ads=1, min_gap=2), [(0, 0)])
+
+    def test_min_score_applies_after_first(self):
+        scores = np.array([[0.2, 0.1, 0.1], [0.1, 0.1, 0.15]])
+        self.assertEqual(assign_ads(scores, max_ads=2, min_gap=1, min_score=0.3), [(0, 0)])
+
+
+class TestInsertAds(unittest.TestCase):
+    def setUp(self):
+        end = time.time() + 86400
+        self.inventory = AdInventory(None)
+        self.inventory.mode = 'test'  # Firestore takibi yok
+        self.inventory.apply([
+            {'id': f'ad{i}', 'is_active': True, 'end_date': end, 'target_emotion': 'Neşe (Joy)',
+             'keywords': ['sun'], 'content': f'reklam {i}'}
+            for i in range(5)
+        ], [])
+        self.events = FakeEventBuffer()
+        self.manager = AdManager(FakeFirebase(), performance_view=AdPerformanceView(),
+                                 inventory=self.inventory, event_buffer=self.events)
+        self.contents = [{'id': f'p{i}', 'emotion': 'Neşe (Joy)', 'keywords': ['sun']} for i in range(40)]
+
+    def test_places_multiple_ads_within_caps(self):
+        result = self.manager.insert_ads(self.contents, peak_moment_index=14)
+        ads = [i for i, item in enumerate(result) if item.get('is_ad')]
+        self.assertEqual(len(ads), AD_OPTIMIZATION['frequency_cap'])
+        self.assertEqual(len({result[i]['id'] for i in ads}), len(ads))
+        self.assertTrue(all(b - a > self.manager.ad_frequency for a, b in zip(ads, ads[1:])))
+        self.assertEqual([c['id'] for c in result if not c.get('is_ad')], [c['id'] for c in self.contents])
+        # Peak slotu önceliklidir
+        self.assertEqual(ads[0], 14)
+        self.assertEqual(len(self.events.events), len(ads))
+
+    def test_no_live_ads_returns_contents(self):
+        self.inventory.apply([], [f'ad{i}' for i in range(5)])
+        self.assertEqual(self.manager.insert_ads(self.contents, peak_moment_index=14), self.contents)
+
+
+if __name__ == '__main__':
+    unittest.main()
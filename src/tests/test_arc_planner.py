@@ -0,0 +1,59 @@
+import os
+import sys
+import unittest
+
+# src dizinini Python path'ine ekle
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from config.emotion_tables import N_EMOTIONS, Emotion, pairs_to_matrix
+from services.reccomend_service.arc_planner import ArcPlanner, StoryArc
+
+ALL = np.ones(N_EMOTIONS, dtype=bool)
+
+
+class TestArcPlanner(unittest.TestCase):
+    def test_probabilities_blend_counts_with_prior(self):
+        planner = ArcPlanner(prior_strength=2.0)
+        counts = pairs_to_matrix({('Neşe (Joy)', 'Korku (Fear)'): 8})
+        probs = planner.transition_probabilities(counts)
+        np.testing.assert_allclose(probs.sum(axis=1), 1.0)
+        # Joy satırı: (8 + 2 * 0.05) / (8 + 2)
+        self.assertAlmostEqual(probs[Emotion.JOY, Emotion.FEAR], 8.1 / 10)
+        # Sayısı olmayan satır genel matrise eşit kalır
+        self.assertAlmostEqual(probs[Emotion.LOVE, Emotion.LOVE], 0.6)
+
+    def test_plan_follows_personal_counts_without_repeats(self):
+        planner = ArcPlanner(length=4, beam_width=3)
+        counts = pairs_to_matrix({
+            ('Neşe (Joy)', 'Korku (Fear)'): 10,
+            ('Korku (Fear)', 'Neşe (Joy)'): 50,
+            ('Korku (Fear)', 'Aşk (Love)'): 10
+        })
+        arc = planner.plan(Emotion.JOY, counts, ALL)
+        self.assertEqual(arc.codes[:3], [Emotion.JOY, Emotion.FEAR, Emotion.LOVE])
+        self.assertEqual(len(arc), 4)
+        self.assertEqual(len(set(arc.codes)), 4)
+        self.assertEqual(len(arc.edge_probs), 3)
+
+    def test_plan_respects_availability(self):
+        planner = ArcPlanner(length=3)
+        counts = pairs_to_matrix({('Neşe (Joy)', 'Korku (Fear)'): 10})
+        available = np.zeros(N_EMOTIONS, dtype=bool)
+        available[[Emotion.JOY, Emotion.SADNESS]] = True
+        arc = planner.plan(Emotion.JOY, counts, available)
+        self.assertEqual(arc.codes, [Emotion.JOY, Emotion.SADNESS])
+        self.assertEqual(planner.plan(Emotion.FEAR, counts, available).codes, [])
+        self.assertEqual(planner.plan(-1, counts, ALL).codes, [])
+
+    def test_peak_edge_is_most_probable_transition(self):
+        arc = StoryArc([1, 4, 2], [0.3, 0.5])
+        self.assertEqual(arc.peak_edge(), 1)
+        self.assertEqual(arc.peak_edge(2), 0)
+        self.assertIsNone(arc.peak_edge(1))
+        self.assertIsNone(StoryArc([1], []).peak_edge())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import asyncio
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+# src dizinini Python path'ine ekle
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.firebase_services.async_firebase_post_service import AsyncFirebasePostService
+from services.firebase_services.async_firebase_interaction_service import AsyncFirebaseInteractionService
+from tests.fakes import FakeAsyncDb
+
+
+def make_service(cls, db):
+    # Gerçek Firebase uygulamasını başlatmadan servis örneği oluştur
+    with patch('services.firebase_services.async_firebase_base.initialize_firebase_app'):
+        service = cls()
+    service._db = db
+    return service
+
+
+class TestAsyncFirebaseServices(unittest.TestCase):
+    def test_get_all_posts_adds_id_and_keywords(self):
+        db = FakeAsyncDb({'posts': {'p1': {'content': 'Güzel bir gün', 'emotion': 'Mutluluk'}}})
+        service = make_service(AsyncFirebasePostService, db)
+        posts = asyncio.run(service.get_all_posts())
+        self.assertEqual(posts[0]['id'], 'p1')
+        self.assertIn('keywords', posts[0])
+
+    def test_log_interaction_reads_only_target_post(self):
+        db = FakeAsyncDb({
+            'posts': {'ad1': {'tags': {'advertise': True}}, 'p2': {'tags': {}}}
+        })
+        service = make_service(AsyncFirebaseInteractionService, db)
+        asyncio.run(service.log_interaction('u1', 'ad1', 'click', 'Mutluluk', 1.0))
+        self.assertEqual(db.reads, [('posts', 'ad1')])
+        self.assertEqual(db.streams, 0)
+        metrics = list(db.store['adMetrics'].values())
+        self.assertEqual(metrics[0]['ad_id'], 'ad1')
+        self.assertEqual(metrics[0]['metric_type'], 'click')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import os
+import sys
+import unittest
+from datetime import datetime, timedelta, timezone
+
+# src dizinini Python path'ine ekle
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from config.emotion_tables import Emotion
+from services.reccomend_service.candidate_generator import CandidateGenerator
+from services.reccomend_service.catalog_index import CatalogIndex
+from services.reccomend_service.keyword_profile import KeywordProfile
+
+
+def make_post(post_id, emotion, days_ago, likes=0, keywords=()):
+    ts = (datetime.now(timezone.utc) - timedelta(days=days_ago)).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+    return {'id': post_id, 'emotion': emotion, 'timestamp': ts, 'likes': likes, 'keywords': list(keywords)}
+
+
+class TestCandidateGenerator(unittest.TestCase):
+    def setUp(self):
+        posts = [make_post(f'j{i}', 'Neşe (Joy)', i, likes=i) for i in range(50)]
+        posts += [make_post(f'f{i}', 'Korku (Fear)', i) for i in range(50)]
+        posts += [make_post('old_kw', 'Korku (Fear)', 100, keywords=['rare'])]
+        posts += [make_post('no_emotion', None, 0)]
+        self.index = CatalogIndex.from_posts(posts)
+        self.columns = self.index.columns()
+
+    def test_quotas_follow_pattern_and_arc(self):
+        generator = CandidateGenerator(pool_size=40, min_per_emotion=2, arc_boost=0.5)
+        available = np.array([0, 100, 0, 0, 100, 0])
+        quotas = generator.quotas({'Neşe (Joy)': 1.0}, [], available)
+        self.assertEqual(quotas.tolist(), [0, 38, 0, 0, 2, 0])
+        quotas = generator.quotas({'Neşe (Joy)': 0.5}, [Emotion.FEAR], available)
+        self.assertEqual(quotas[Emotion.JOY], quotas[Emotion.FEAR])
+        self.assertLessEqual(quotas.sum(), 40)
+        self.assertEqual(generator.quotas({}, [], np.array([0, 3, 0, 0, 0, 0])).tolist(), [0, 3, 0, 0, 0, 0])
+
+    def test_pool_mixes_recent_and_quality(self):
+        generator = CandidateGenerator(pool_size=12, min_per_emotion=2)
+        rows = generator.generate(self.columns, {'Neşe (Joy)': 1.0}, [])
+        ids = {self.columns.ids[r] for r in rows}
+        self.assertIn('j0', ids)  # en yeni
+        self.assertIn('j49', ids)  # en popüler
+        self.assertIn('f0', ids)  # her duyguya taban kota
+        self.assertNotIn('no_emotion', ids)
+        self.assertTrue(np.all(np.diff(rows) > 0))
+        self.assertLessEqual(len(rows), 12)
+
+    def test_profile_keywords_reach_pool(self):
+        generator = CandidateGenerator(pool_size=12, min_per_emotion=2)
+        profile = KeywordProfile.from_posts(['old_kw'], self.index)
+        rows = generator.generate(self.columns, {'Neşe (Joy)': 1.0}, [], profile)
+        self.assertIn('old_kw', {self.columns.ids[r] for r in rows})
+
+    def test_pool_size_is_bounded_by_catalog(self):
+        generator = CandidateGenerator(pool_size=1000, min_per_emotion=2)
+        rows = generator.generate(self.columns, {'Neşe (Joy)': 1.0}, [Emotion.FEAR])
+        self.assertEqual(len(rows), 101)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+import os
+import sys
+import unittest
+from datetime import datetime, timedelta, timezone
+
+# src dizinini Python path'ine ekle
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from config.config import CONTENT_QUALITY_RANK_WEIGHT
+from config.emotion_tables import Emotion
+from services.reccomend_service.catalog_index import CatalogIndex, post_epoch
+from services.reccomend_service.engagement_store import InMemoryEngagementStore
+from services.reccomend_service.keyword_profile import KeywordProfile
+from models.content_recommender import ContentRecommender
+
+
+def make_post(post_id, emotion, days_ago, keywords=()):
+    ts = (datetime.now(timezone.utc) - timedelta(days=days_ago)).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+    return {'id': post_id, 'emotion': emotion, 'timestamp': ts, 'keywords': list(keywords)}
+
+
+class TestCatalogIndex(unittest.TestCase):
+    def setUp(self):
+        self.posts = [
+            make_post('p1', 'Neşe (Joy)', 10, ['sun']),
+            make_post('p2', 'Neşe (Joy)', 1, ['beach', 'sun']),
+            make_post('p3', 'Korku (Fear)', 3, ['night']),
+            make_post('p4', 'Neşe (Joy)', 40)
+        ]
+        self.index = CatalogIndex.from_posts(self.posts)
+
+    def test_incremental_update_and_remove(self):
+        self.index.apply([make_post('p1', 'Korku (Fear)', 0, ['night'])], ['p2'])
+        columns = self.index.columns()
+        self.assertEqual(columns.ids, ['p1', 'p3', 'p4'])
+        self.assertEqual([columns.ids[r] for r in columns.emotion_rows[Emotion.FEAR]], ['p1', 'p3'])
+        self.assertEqual(columns.emotion_counts()[Emotion.JOY], 1)
+        night, sun = self.index.interner.lookup(['night']), self.index.interner.lookup(['sun'])
+        self.assertEqual(columns.keyword_rows[next(iter(night))].tolist(), [0, 1])
+        self.assertNotIn(next(iter(sun)), columns.keyword_rows)
+
+    def test_bulk_load_matches_incremental(self):
+        posts = [make_post(f'b{i}', 'Aşk (Love)', i % 30) for i in range(200)]
+        bulk = CatalogIndex.from_posts(posts)
+        incremental = CatalogIndex()
+        for post in posts:
+            incremental.apply([post], [])
+        self.assertEqual(bulk.columns().ids, incremental.columns().ids)
+
+    def test_content_mix_uses_index(self):
+        recommender = ContentRecommender(InMemoryEngagementStore())
+        pattern = {'Neşe (Joy)': 0.7, 'Korku (Fear)': 0.3}
+        mix, _ = recommender.get_content_mix(
+            self.posts, pattern, limit=3,
+            current_emotion='Neşe (Joy)',
+            personalized_transitions={('Neşe (Joy)', 'Korku (Fear)'): 2},
+            catalog_index=self.index
+        )
+        self.assertEqual(len(mix), 3)
+        self.assertEqual(mix[0]['emotion'], 'Neşe (Joy)')
+        self.assertEqual(mix[1]['emotion'], 'Korku (Fear)')
+        self.assertEqual(len({c['id'] for c in mix}), 3)
+
+    def test_content_mix_stays_within_contents(self):
+        recommender = ContentRecommender(InMemoryEngagementStore())
+        pattern = {'Neşe (Joy)': 0.7, 'Korku (Fear)': 0.3}
+        subset = [p for p in self.posts if p['id'] != 'p2']
+        mix, _ = recommender.get_content_mix(subset, pattern, limit=10, current_emotion='Neşe (Joy)',
+                                             catalog_index=self.index)
+        self.assertEqual({c['id'] for c in mix}, {'p1', 'p3', 'p4'})
+
+    def test_content_mix_uses_whole_index_without_contents(self):
+        recommender = ContentRecommender(InMemoryEngagementStore())
+        mix, _ = recommender.get_content_mix(None, {'Neşe (Joy)': 0.7, 'Korku (Fear)': 0.3}, limit=10,
+                                             current_emotion='Neşe (Joy)', catalog_index=self.index)
+        self.assertEqual({c['id'] for c in mix}, {'p1', 'p2', 'p3', 'p4'})
+
+    def test_content_mix_reads_one_column_snapshot(self):
+        stale = self.index.columns()
+        self.index.apply([], ['p2', 'p3'])
+        self.assertIsNot(self.index.columns(), stale)  # Görüntü değişiklikle birlikte yeniden kurulur
+        self.assertIn('p2', stale.ids)
+        # İstek görüntüyü aldıktan sonra silinen postlar adaylarda kalır, yanıtta atlanır
+        self.index.columns = lambda: stale
+        recommender = ContentRecommender(InMemoryEngagementStore())
+        mix, _ = recommender.get_content_mix(None, {'Neşe (Joy)': 0.7, 'Korku (Fear)': 0.3}, limit=10,
+                                             current_emotion='Neşe (Joy)', catalog_index=self.index)
+        self.assertEqual({c['id'] for c in mix}, {'p1', 'p4'})
+
+    def test_post_epoch_prefers_timestamp_ms(self):
+        post = make_post('p5', 'Neşe (Joy)', 5)
+        self.assertAlmostEqual(post_epoch(post), (datetime.now(timezone.utc) - timedelta(days=5)).timestamp(), delta=5)
+        post['timestamp_ms'] = 1_700_000_000_123
+        self.assertEqual(post_epoch(post), 1_700_000_000.123)
+        self.index.apply([post], [])
+        self.assertEqual(self.index.columns().ids[-1], 'p5')  # timestamp alanından daha eski
+
+    def test_columns_follow_recency_and_updates(self):
+        columns = self.index.columns()
+        self.assertEqual(columns.ids, ['p2', 'p3', 'p1', 'p4'])
+        self.assertEqual(columns.emotion_codes.tolist(), [1, 4, 1, 1])
+        self.assertEqual(columns.keyword_counts.tolist(), [2, 1, 1, 0])
+        self.index.apply([], ['p3'])
+        self.assertEqual(self.index.columns().ids, ['p2', 'p1', 'p4'])
+
+    def test_vector_scores_match_scalar_formula(self):
+        recommender = ContentRecommender(InMemoryEngagementStore())
+        recommender.update_content_engagement('p1', 'like')
+        profile = KeywordProfile.from_posts(['p3', 'p2'], self.index)
+        self.index.set_quality({'p1': 0.8, 'p3': 0.2})
+        pattern = {'Neşe (Joy)': 0.7, 'Korku (Fear)': 0.3}
+        arc = [Emotion.FEAR]
+        columns = self.index.columns()
+        now_ts = datetime.now(timezone.utc).timestamp()
+        rows = np.arange(len(columns))
+        scores = recommender._score_candidates(columns, rows, pattern, arc, now_ts, profile.score_records(columns.records))
+        for row, post_id in enumerate(columns.ids):
+            content = self.index.get(post_id)
+            days_ago = int((now_ts - columns.epochs[row]) // 86400)
+            recency = 1.0 if days_ago <= 1 else 0.7 if days_ago <= 7 else 0.4 if days_ago <= 30 else 0.2
+            expected = (pattern[content['emotion']] * 0.4
+                        + recommender.calculate_content_relevance(content, pattern, profile) * 0.3
+                        + recency * 0.15
+                        + (0.05 if Emotion.from_label(content['emotion']) in arc else 0.0) * 0.1
+                        + self.index.quality(post_id) * CONTENT_QUALITY_RANK_WEIGHT)
+            self.assertAlmostEqual(scores[row], expected, msg=post_id)
+
+    def test_fill_stage_is_deterministic(self):
+        emotions = ['Neşe (Joy)', 'Korku (Fear)', 'Aşk (Love)']
+        posts = [make_post(f'd{i}', emotions[i % 3], i / 24) for i in range(300)]
+        index = CatalogIndex.from_posts(posts)
+        recommender = ContentRecommender(InMemoryEngagementStore())
+        pattern = {emotion: 1 / 3 for emotion in emotions}
+        first, _ = recommender.get_content_mix(posts, pattern, limit=20, catalog_index=index)
+        second, _ = recommender.get_content_mix(posts, pattern, limit=20, catalog_index=index)
+        # Eşit skorlarda yeni postlar önce gelir
+        self.assertEqual({c['id'] for c in first}, {f'd{i}' for i in range(20)})
+        self.assertEqual({c['id'] for c in first}, {c['id'] for c in second})
+
+
+if __name__ == '__main__':
+    unittest.main()
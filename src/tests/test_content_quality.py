@@ -0,0 +1,89 @@
+import math
+import os
+import sys
+import unittest
+
+# src dizinini Python path'ine ekle
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.config import COLLECTION_POST_METRICS, COLLECTION_POSTS
+from services.reccomend_service.catalog_index import CatalogIndex
+from services.reccomend_service.content_quality import ContentQualityJob, QualityScheduler, score_posts
+from tests.fakes import FakeDb
+
+NOW = 1_700_000_000.0
+DAY = 86400
+
+
+class FakeCatalog:
+    def __init__(self, posts):
+        self.posts = posts
+
+    def get_posts(self):
+        return list(self.posts)
+
+
+def scalar_quality(post, now):
+    likes, comments, views = post.get('likes', 0), post.get('comments', 0), post.get('views', 0)
+    days = int((now - post['timestamp']) // DAY)
+    return (0.4 * min((likes + comments) / max(views, 1), 1.0)
+            + 0.3 * (1 / (1 + days))
+            + 0.2 * post.get('user_reputation', 0.5)
+            + 0.1 * min(len(post.get('content', '')) / 1000, 1))
+
+
+class TestContentQuality(unittest.TestCase):
+    def setUp(self):
+        self.posts = [
+            {'id': 'p1', 'timestamp': NOW - 2 * DAY, 'likes': 5, 'comments': 1, 'views': 20, 'content': 'x' * 500},
+            {'id': 'p2', 'timestamp': NOW, 'likes': 50, 'views': 10, 'user_reputation': 0.9},
+            {'id': 'p3', 'timestamp': NOW - 30 * DAY}
+        ]
+
+    def test_vector_scores_match_scalar_formula(self):
+        scores = score_posts(self.posts, now=NOW)
+        self.assertEqual(scores.ids, ['p1', 'p2', 'p3'])
+        for post, quality in zip(self.posts, scores.quality):
+            self.assertAlmostEqual(quality, scalar_quality(post, NOW), msg=post['id'])
+        self.assertAlmostEqual(scores.popularity[1], 1.0)
+        self.assertAlmostEqual(scores.popularity[0], math.log1p(26) / math.log1p(60))
+        self.assertEqual(scores.popularity[2], 0.0)
+
+    def test_missing_timestamp_is_not_fresh(self):
+        scores = score_posts([{'id': 'p', 'likes': [1, 2]}], now=NOW)
+        self.assertEqual(scores.freshness[0], 0.0)
+
+    def test_write_uses_batches_and_merge(self):
+        db = FakeDb()
+        db.store[COLLECTION_POST_METRICS] = {'p1': {'interaction_count': 7, 'updated_at': 'old'}}
+        posts = [{'id': f'p{i}', 'timestamp': NOW} for i in range(7)]
+        written = ContentQualityJob(db, batch_size=3).write(score_posts(posts, now=NOW))
+        self.assertEqual(written, 7)
+        self.assertEqual(db.commits, [3, 3, 1])
+        metrics = db.store[COLLECTION_POST_METRICS]
+        self.assertEqual(metrics['p1']['interaction_count'], 7)
+        self.assertEqual(metrics['p1']['updated_at'], 'old')
+        self.assertIn('quality', metrics['p6'])
+        self.assertNotIn(COLLECTION_POSTS, db.store)
+
+    def test_dry_run_does_not_write(self):
+        db = FakeDb()
+        self.assertEqual(ContentQualityJob(db, dry_run=True).write(score_posts(self.posts, now=NOW)), 3)
+        self.assertEqual(db.commits, [])
+
+    def test_scheduler_loads_scores_into_index_column(self):
+        posts = [dict(p, emotion='Neşe (Joy)') for p in self.posts]
+        index = CatalogIndex.from_posts(posts)
+        db = FakeDb()
+        scheduler = QualityScheduler(ContentQualityJob(db), FakeCatalog(posts), index, interval=60, write=False)
+        scores = scheduler.run_once()
+        columns = index.columns()
+        for post_id, quality in scores.as_dict().items():
+            self.assertAlmostEqual(columns.quality[columns.rows[post_id]], quality)
+        best = max(scores.as_dict(), key=scores.as_dict().get)
+        self.assertEqual(columns.ids[columns.quality_rows[1][0]], best)
+        self.assertEqual(db.commits, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import os
+import sys
+import unittest
+from datetime import datetime, timezone, timedelta
+
+import numpy as np
+
+# src dizinini Python path'ine ekle
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.reccomend_service.date_utils import (
+    parse_timestamp,
+    parse_timestamps_datetime64,
+    parse_timestamps_epoch,
+    to_epoch
+)
+
+NOON_UTC = datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc)
+
+
+class TestDateUtils(unittest.TestCase):
+    def test_all_known_shapes_parse_to_utc(self):
+        samples = [
+            "2024-05-01T12:00:00.000Z",
+            "2024-05-01T12:00:00.000000",
+            "2024-05-01T12:00:00",
+            "2024-05-01 12:00:00",
+            "2024-05-01T15:00:00+03:00",
+            "May 01, 2024 at 12:00:00 PM UTC",
+            "May 01, 2024 at 03:00:00 PM UTC+3",
+            "May 1, 2024 at 3:00:00 PM UTC+3",
+            "1714564800",
+            1714564800,
+            1714564800000,
+            datetime(2024, 5, 1, 12, 0),
+            datetime(2024, 5, 1, 15, 0, tzinfo=timezone(timedelta(hours=3))),
+        ]
+        for sample in samples:
+            with self.subTest(sample=sample):
+                self.assertEqual(parse_timestamp(sample), NOON_UTC)
+
+    def test_date_only_and_fraction(self):
+        self.assertEqual(parse_timestamp("2024-05-01"), datetime(2024, 5, 1, tzinfo=timezone.utc))
+        self.assertEqual(parse_timestamp("2024-05-01T12:00:00.5Z").microsecond, 500000)
+
+    def test_invalid_values_return_none(self):
+        for sample in [None, "", "Geçersiz tarih", "2024-02-31", "Foo 01, 2024 at 12:00:00 PM UTC", [], True]:
+            with self.subTest(sample=sample):
+                self.assertIsNone(parse_timestamp(sample))
+
+    def test_batch_api(self):
+        values = ["2024-05-01T12:00:00Z", "geçersiz", 1714564800]
+        epochs = parse_timestamps_epoch(values)
+        self.assertEqual(epochs[0], to_epoch(values[0]))
+        self.assertTrue(np.isnan(epochs[1]))
+        stamps = parse_timestamps_datetime64(values)
+        self.assertEqual(stamps[2], np.datetime64('2024-05-01T12:00:00', 'us'))
+        self.assertTrue(np.isnat(stamps[1]))
+
+
+if __name__ == '__main__':
+    unittest.main()
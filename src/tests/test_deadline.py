@@ -0,0 +1,79 @@
+import os
+import sys
+import unittest
+from datetime import datetime, timedelta, timezone
+
+# src dizinini Python path'ine ekle
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.config import RANKING_CHUNK_SIZE
+from services.reccomend_service.catalog_index import CatalogIndex
+from services.reccomend_service.deadline import Deadline
+from services.reccomend_service.engagement_store import InMemoryEngagementStore
+from models.content_recommender import ContentRecommender
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_post(post_id, emotion, hours_ago):
+    ts = (datetime.now(timezone.utc) - timedelta(hours=hours_ago)).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+    return {'id': post_id, 'emotion': emotion, 'timestamp': ts, 'keywords': []}
+
+
+class TestDeadline(unittest.TestCase):
+    def test_budget_and_stage_checks(self):
+        clock = FakeClock()
+        deadline = Deadline(1.0, clock=clock)
+        self.assertTrue(deadline.allows(0.5))
+        self.assertEqual(deadline.timeout(5.0), 1.0)
+        clock.now += 0.7
+        self.assertFalse(deadline.allows(0.5))
+        self.assertFalse(deadline.expired())
+        clock.now += 0.5
+        self.assertTrue(deadline.expired())
+        self.assertEqual(deadline.remaining(), 0.0)
+
+    def test_degraded_stages_are_recorded_once(self):
+        deadline = Deadline(None)
+        self.assertFalse(deadline.degraded)
+        self.assertFalse(deadline.expired())
+        deadline.degrade('ads')
+        deadline.degrade('ads')
+        self.assertTrue(deadline.degraded)
+        self.assertEqual(deadline.degraded_stages, ['ads'])
+
+
+class TestBudgetedContentMix(unittest.TestCase):
+    def setUp(self):
+        emotions = ['Neşe (Joy)', 'Korku (Fear)', 'Aşk (Love)']
+        self.posts = [make_post(f'd{i}', emotions[i % 3], i) for i in range(3 * RANKING_CHUNK_SIZE)]
+        self.index = CatalogIndex.from_posts(self.posts)
+        self.pattern = {'Neşe (Joy)': 0.5, 'Korku (Fear)': 0.5}
+        self.recommender = ContentRecommender(InMemoryEngagementStore())
+
+    def test_expired_deadline_returns_best_so_far(self):
+        clock = FakeClock()
+        deadline = Deadline(0.0, clock=clock)
+        mix, _ = self.recommender.get_content_mix(self.posts, self.pattern, limit=20, catalog_index=self.index,
+                                                  deadline=deadline)
+        self.assertEqual(len(mix), 20)
+        self.assertEqual(len({c['id'] for c in mix}), 20)
+        self.assertEqual(deadline.degraded_stages, ['ranking', 'exploration'])
+
+    def test_unlimited_deadline_matches_no_deadline(self):
+        deadline = Deadline(None)
+        with_deadline, _ = self.recommender.get_content_mix(self.posts, self.pattern, limit=20,
+                                                            catalog_index=self.index, deadline=deadline)
+        without, _ = self.recommender.get_content_mix(self.posts, self.pattern, limit=20, catalog_index=self.index)
+        self.assertEqual({c['id'] for c in with_deadline}, {c['id'] for c in without})
+        self.assertFalse(deadline.degraded)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import os
+import sys
+import unittest
+
+# src dizinini Python path'ine ekle
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.reccomend_service.emotion_aggregate import EmotionAggregate
+from models.emotion_analyzer import EmotionAnalyzer
+
+JOY = "Neşe (Joy)"
+SADNESS = "Üzüntü (Sadness)"
+DAY = 86400
+
+
+def interaction(emotion, ts, interaction_type='like', post_id='p1', confidence=1.0):
+    return {
+        'emotion': emotion,
+        'interactionType': interaction_type,
+        'postId': post_id,
+        'confidence': confidence,
+        'timestamp': ts
+    }
+
+
+class TestEmotionAggregate(unittest.TestCase):
+    def test_incremental_matches_rebuild(self):
+        history = [
+            interaction(JOY, 1_700_000_000),
+            interaction(SADNESS, 1_700_000_000 + DAY, post_id='p2'),
+            interaction(JOY, 1_700_000_000 + 3 * DAY, interaction_type='dislike', post_id='p3'),
+        ]
+        incremental = EmotionAggregate()
+        for i in history:
+            incremental.apply(i)
+        rebuilt = EmotionAggregate.from_interactions(reversed(history))
+
+        self.assertEqual(incremental.to_dict(), rebuilt.to_dict())
+        self.assertEqual(rebuilt.transition_counts(), {(JOY, SADNESS): 1, (SADNESS, JOY): 1})
+        self.assertEqual(rebuilt.last_emotion, JOY)
+        self.assertEqual(rebuilt.dislikes, [JOY])
+        self.assertTrue(rebuilt.has_engaged_with(['p2']))
+        self.assertFalse(rebuilt.has_engaged_with(['p3']))
+
+    def test_weights_decay_with_half_life(self):
+        aggregate = EmotionAggregate(half_life_days=7)
+        aggregate.apply(interaction(JOY, 1_700_000_000))
+        aggregate.apply(interaction(SADNESS, 1_700_000_000 + 7 * DAY))
+        self.assertAlmostEqual(aggregate.weights[JOY], aggregate.weights[SADNESS] / 2)
+
+        pattern = EmotionAnalyzer().analyze_aggregate(aggregate, 'u1')
+        self.assertAlmostEqual(sum(pattern.values()), 1.0)
+        self.assertGreater(pattern[SADNESS], pattern[JOY])
+
+    def test_round_trip_through_dict(self):
+        aggregate = EmotionAggregate.from_interactions([interaction(JOY, 1_700_000_000)])
+        restored = EmotionAggregate.from_dict(aggregate.to_dict())
+        restored.apply(interaction(SADNESS, 1_700_000_100))
+        self.assertEqual(restored.interaction_count, 2)
+        self.assertEqual(restored.transition_counts(), {(JOY, SADNESS): 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import os
+import random
+import sys
+import unittest
+
+# src dizinini Python path'ine ekle
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import datetime, timedelta, timezone
+
+from config.config import MAX_SAME_EMOTION_IN_ROW
+from config.emotion_tables import encode
+from services.reccomend_service.algorithms.emotion_diversity import ensure_emotion_diversity
+from services.reccomend_service.algorithms.emotion_reranker import rerank_by_emotion, rerank_items
+from services.reccomend_service.catalog_index import CatalogIndex
+from services.reccomend_service.engagement_store import InMemoryEngagementStore
+from services.reccomend_service.feed_generator import avoid_consecutive_same_emotion
+from models.content_recommender import ContentRecommender
+
+
+def longest_run(codes):
+    best, run, last = 0, 0, None
+    for code in codes:
+        if code < 0:
+            continue
+        run = run + 1 if code == last else 1
+        last = code
+        best = max(best, run)
+    return best
+
+
+class TestRerankByEmotion(unittest.TestCase):
+    def test_best_allowed_item_per_position(self):
+        codes = [0, 0, 0, 1, 1]
+        scores = [0.9, 0.8, 0.7, 0.2, 0.1]
+        self.assertEqual(rerank_by_emotion(codes, scores, max_run=2), [0, 1, 3, 2, 4])
+        self.assertEqual(rerank_by_emotion(codes, scores, max_run=None), [0, 1, 2, 3, 4])
+
+    def test_history_continues_the_run(self):
+        order = rerank_by_emotion([0, 1], [0.9, 0.1], max_run=2, history=[0, 0])
+        self.assertEqual(order, [1, 0])
+
+    def test_strict_stops_instead_of_breaking_run(self):
+        self.assertEqual(rerank_by_emotion([0, 0, 0], [3, 2, 1], max_run=2, strict=True), [0, 1])
+        self.assertEqual(rerank_by_emotion([0, 0, 0], [3, 2, 1], max_run=2), [0, 1, 2])
+
+    def test_min_per_emotion_within_limit(self):
+        codes = [0, 0, 0, 0, 1, 2]
+        scores = [0.9, 0.8, 0.7, 0.6, 0.1, 0.05]
+        order = rerank_by_emotion(codes, scores, limit=4, max_run=None, min_per_emotion=1)
+        self.assertEqual(order, [0, 1, 4, 5])
+
+    def test_neutral_items_do_not_count(self):
+        order = rerank_by_emotion([0, -1, 0, 0, 1], [5, 4, 3, 2, 1], max_run=2)
+        self.assertEqual(order, [0, 1, 2, 4, 3])
+
+    def test_random_inputs_respect_constraints(self):
+        rng = random.Random(7)
+        for _ in range(200):
+            n = rng.randint(0, 40)
+            codes = [rng.randint(-1, 3) for _ in range(n)]
+            scores = [rng.random() for _ in range(n)]
+            order = rerank_by_emotion(codes, scores, max_run=2)
+            self.assertEqual(sorted(order), list(range(n)))
+            strict = rerank_by_emotion(codes, scores, max_run=2, strict=True)
+            self.assertLessEqual(longest_run([codes[p] for p in strict]), 2)
+
+
+class TestRerankCallers(unittest.TestCase):
+    def test_avoid_consecutive_same_emotion(self):
+        feed = ([{'id': i, 'type': 'post', 'emotion': 'Neşe (Joy)'} for i in range(5)]
+                + [{'id': 10 + i, 'type': 'post', 'emotion': 'Korku (Fear)'} for i in range(5)]
+                + [{'id': 'ad', 'type': 'ad', 'emotion': 'Neşe (Joy)'}])
+        result = avoid_consecutive_same_emotion(feed)
+        self.assertEqual(sorted(map(str, (i['id'] for i in result))), sorted(map(str, (i['id'] for i in feed))))
+        posts = [i['emotion'] for i in result if i['type'] == 'post']
+        self.assertTrue(all(a != b for a, b in zip(posts, posts[1:])))
+
+    def test_ensure_emotion_diversity_adds_missing(self):
+        recs = [{'id': i, 'emotion': 'Neşe (Joy)'} for i in range(4)]
+        all_contents = recs + [{'id': 'f', 'emotion': 'Korku (Fear)'}, {'id': 'x', 'emotion': None}]
+        result = ensure_emotion_diversity(recs, all_contents)
+        self.assertEqual([c['id'] for c in result], [0, 1, 'f', 2, 3])
+
+    def test_rerank_items_keeps_order_without_scores(self):
+        items = [{'emotion': 'a'}, {'emotion': 'b'}, {'emotion': 'a'}]
+        self.assertEqual(rerank_items(items, max_run=1), items)
+
+
+
+class TestContentMixRunLimit(unittest.TestCase):
+    def test_output_respects_max_same_emotion_in_row(self):
+        emotions = ['Neşe (Joy)', 'Korku (Fear)', 'Aşk (Love)']
+        now = datetime.now(timezone.utc)
+        posts = [{'id': f'p{i}', 'emotion': emotions[i % 3], 'keywords': [],
+                  'timestamp': (now - timedelta(hours=i)).strftime("%Y-%m-%dT%H:%M:%S.%fZ")}
+                 for i in range(60)]
+        index = CatalogIndex.from_posts(posts)
+        recommender = ContentRecommender(InMemoryEngagementStore())
+        patterns = [{e: 1 / 3 for e in emotions}, {'Neşe (Joy)': 0.8, 'Korku (Fear)': 0.2}]
+        for run in range(30):
+            mix, _ = recommender.get_content_mix(posts, patterns[run % 2], limit=20, catalog_index=index)
+            self.assertEqual(len(mix), 20)
+            self.assertLessEqual(longest_run([encode(c['emotion']) for c in mix]), MAX_SAME_EMOTION_IN_ROW)
+
+
+if __name__ == '__main__':
+    unittest.main()
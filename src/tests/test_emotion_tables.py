@@ -0,0 +1,69 @@
+import os
+import sys
+import unittest
+
+# src dizinini Python path'ine ekle
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from config.config import AD_EMOTION_WEIGHTS, EMOTION_TRANSITION_MATRIX, OPPOSITE_EMOTIONS
+from config.emotion_tables import (
+    AD_EMOTION_WEIGHT_VECTOR,
+    OPPOSITE_MASK,
+    POLARITY,
+    TRANSITION_MATRIX,
+    Emotion,
+    decode,
+    encode,
+    opposite_row,
+    pairs_to_matrix
+)
+from models.emotion_analyzer import EmotionAnalyzer
+
+
+class TestEmotionTables(unittest.TestCase):
+    def test_codes_round_trip(self):
+        self.assertEqual(encode('Neşe (Joy)'), Emotion.JOY)
+        self.assertEqual(decode(Emotion.JOY), 'Neşe (Joy)')
+        self.assertEqual(Emotion.from_label('Korku (Fear)'), Emotion.FEAR)
+        self.assertEqual(encode(None), -1)
+        self.assertIsNone(decode(-1))
+        self.assertIsNone(Emotion.from_label('bilinmeyen'))
+
+    def test_compiled_tables_match_config(self):
+        for from_label, row in EMOTION_TRANSITION_MATRIX.items():
+            for to_label, prob in row.items():
+                self.assertEqual(TRANSITION_MATRIX[encode(from_label), encode(to_label)], prob)
+        for from_label, targets in OPPOSITE_EMOTIONS.items():
+            expected = sorted(encode(t) for t in targets)
+            self.assertEqual(np.flatnonzero(OPPOSITE_MASK[encode(from_label)]).tolist(), expected)
+        for label, weight in AD_EMOTION_WEIGHTS.items():
+            self.assertEqual(AD_EMOTION_WEIGHT_VECTOR[encode(label)], weight)
+        self.assertEqual(POLARITY[Emotion.JOY], 1)
+        self.assertEqual(POLARITY[Emotion.ANGER], -1)
+        self.assertFalse(TRANSITION_MATRIX.flags.writeable)
+
+    def test_opposite_row_has_unknown_sentinel(self):
+        row = opposite_row(Emotion.JOY)
+        self.assertTrue(row[Emotion.SADNESS])
+        self.assertFalse(row[-1])
+        self.assertFalse(opposite_row(-1).any())
+
+    def test_pairs_to_matrix_skips_unknown(self):
+        matrix = pairs_to_matrix({('Neşe (Joy)', 'Korku (Fear)'): 2, ('Neşe (Joy)', 'x'): 5})
+        self.assertEqual(matrix[Emotion.JOY, Emotion.FEAR], 2)
+        self.assertEqual(matrix.sum(), 2)
+
+
+class TestCodePaths(unittest.TestCase):
+    def test_normalize_pattern_penalizes_dislikes(self):
+        pattern = EmotionAnalyzer()._normalize_pattern({'Neşe (Joy)': 3.0, 'Korku (Fear)': 1.0}, {'Neşe (Joy)'})
+        self.assertEqual(set(pattern), set(EMOTION_TRANSITION_MATRIX))
+        self.assertAlmostEqual(pattern['Neşe (Joy)'], 0.5 / 0.75)
+        self.assertAlmostEqual(sum(pattern.values()), 1.0)
+        self.assertIsInstance(pattern['Korku (Fear)'], float)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import os
+import sys
+import tempfile
+import unittest
+
+# src dizinini Python path'ine ekle
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.reccomend_service.engagement_store import InMemoryEngagementStore, SQLiteEngagementStore
+
+DAY = 86400.0
+
+
+class EngagementStoreCases:
+    def make_store(self, capacity=100):
+        raise NotImplementedError
+
+    def test_fresh_score_is_weight_mean(self):
+        store = self.make_store()
+        store.record('p1', 'like', now=0.0)
+        store.record('p1', 'comment', now=0.0)
+        self.assertAlmostEqual(store.score('p1', now=0.0), (0.1 + 0.15) / 2)
+        self.assertEqual(store.score('missing', now=0.0), 0.0)
+
+    def test_score_decays_with_half_life(self):
+        store = self.make_store()
+        store.record('p1', 'like', now=0.0)
+        self.assertAlmostEqual(store.score('p1', now=2 * DAY), 0.1 * 0.5)
+        # Yeni etkileşim eski sayaçları sönümleyip üstüne eklenir
+        store.record('p1', 'create', now=2 * DAY)
+        self.assertAlmostEqual(store.score('p1', now=2 * DAY), (0.05 + 0.2) / 1.5)
+
+    def test_scores_and_capacity(self):
+        store = self.make_store(capacity=2)
+        store.record('p1', 'like', now=0.0)
+        store.record('p2', 'like', now=1.0)
+        store.record('p3', 'like', now=2.0)
+        self.assertEqual(len(store), 2)
+        self.assertEqual(set(store.scores(now=2.0)), {'p2', 'p3'})
+
+    def test_scores_for_keeps_order(self):
+        store = self.make_store()
+        store.record('p1', 'like', now=0.0)
+        store.record('p2', 'create', now=0.0)
+        ids = ['p2', 'missing', 'p1'] + [f'x{i}' for i in range(600)]
+        scores = store.scores_for(ids, now=0.0)
+        self.assertEqual(len(scores), len(ids))
+        self.assertAlmostEqual(scores[0], 0.2)
+        self.assertEqual(scores[1], 0.0)
+        self.assertAlmostEqual(scores[2], 0.1)
+
+
+class TestInMemoryEngagementStore(EngagementStoreCases, unittest.TestCase):
+    def make_store(self, capacity=100):
+        return InMemoryEngagementStore(half_life_days=2, capacity=capacity)
+
+    def test_lru_keeps_recently_touched(self):
+        store = self.make_store(capacity=2)
+        store.record('p1', 'like', now=0.0)
+        store.record('p2', 'like', now=1.0)
+        store.record('p1', 'like', now=2.0)
+        store.record('p3', 'like', now=3.0)
+        self.assertEqual(set(store.scores(now=3.0)), {'p1', 'p3'})
+
+
+class TestSQLiteEngagementStore(EngagementStoreCases, unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'engagement.sqlite3')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def make_store(self, capacity=100):
+        return SQLiteEngagementStore(self.path, half_life_days=2, capacity=capacity)
+
+    def test_stores_share_the_file(self):
+        writer, reader = self.make_store(), self.make_store()
+        writer.record('p1', 'like', now=0.0)
+        self.assertAlmostEqual(reader.score('p1', now=0.0), 0.1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+import os
+import sys
+import time
+import unittest
+from unittest.mock import patch
+
+# src dizinini Python path'ine ekle
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.config import LEGACY_INTERACTION_SCAN_LIMIT
+from services.reccomend_service.emotion_aggregate import load_aggregate, record_interaction
+from services.firebase_services.firebase_interaction_service import (
+    FirebaseInteractionService,
+    filter_legacy_interactions,
+    window_cutoff_ms
+)
+from tests.fakes import FakeDb
+
+DAY_MS = 86400 * 1000
+
+
+def make_service(docs, migrated=False):
+    with patch('services.firebase_services.firebase_base.initialize_firebase_app'), \
+            patch('services.firebase_services.firebase_base.firestore.client',
+                  return_value=FakeDb({'userEmotionInteractions': docs})):
+        service = FirebaseInteractionService()
+    service.interactions_migrated = migrated
+    return service
+
+
+class TestInteractionWindow(unittest.TestCase):
+    def test_windowed_fetch_is_ordered_and_limited(self):
+        now_ms = int(time.time() * 1000)
+        docs = {
+            f'i{n}': {'userId': 'u1', 'emotion': 'x', 'timestamp_ms': now_ms - n * DAY_MS}
+            for n in range(10)
+        }
+        docs['other'] = {'userId': 'u2', 'timestamp_ms': now_ms}
+        service = make_service(docs)
+
+        result = service.get_user_interactions('u1', window_days=5.5, max_count=3)
+
+        self.assertEqual([i['id'] for i in result], ['i0', 'i1', 'i2'])
+        self.assertIn(('order_by', 'timestamp_ms'), service.db.calls)
+        self.assertIn(('limit', 3), service.db.calls)
+
+    def test_legacy_documents_fall_back_to_in_memory_window(self):
+        service = make_service({
+            'old': {'userId': 'u1', 'timestamp': '2000-01-01T00:00:00'},
+            'new': {'userId': 'u1', 'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime())},
+        })
+        result = service.get_user_interactions('u1', window_days=7, max_count=10)
+        self.assertEqual([i['id'] for i in result], ['new'])
+        self.assertNotIn(('stream', False), service.db.calls)
+        self.assertIn(('limit', LEGACY_INTERACTION_SCAN_LIMIT), service.db.calls)
+
+    def test_legacy_scan_reads_newest_documents_first(self):
+        docs = {f'a{n}': {'userId': 'u1', 'timestamp': f'2024-01-0{n}T00:00:00'} for n in range(1, 6)}
+        service = make_service(docs)
+        with patch('services.firebase_services.firebase_interaction_service.LEGACY_INTERACTION_SCAN_LIMIT', 2):
+            result = service.get_user_interactions('u1', max_count=10)
+        self.assertEqual([i['id'] for i in result], ['a5', 'a4'])
+        self.assertIn(('order_by', 'timestamp'), service.db.calls)
+
+    def test_legacy_history_kept_after_first_new_interaction(self):
+        now_ms = int(time.time() * 1000)
+        yesterday = time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(time.time() - 86400))
+        service = make_service({
+            'legacy': {'userId': 'u1', 'timestamp': yesterday},
+            'new': {'userId': 'u1', 'timestamp': 'x', 'timestamp_ms': now_ms},
+        })
+        result = service.get_user_interactions('u1', window_days=7, max_count=10)
+        self.assertEqual([i['id'] for i in result], ['new', 'legacy'])
+        self.assertNotIn(('stream', False), service.db.calls)
+
+    def test_migrated_store_skips_legacy_scan(self):
+        now_ms = int(time.time() * 1000)
+        service = make_service({
+            'legacy': {'userId': 'u1', 'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime())},
+            'new': {'userId': 'u1', 'timestamp_ms': now_ms - DAY_MS * 30},
+        }, migrated=True)
+        self.assertEqual(service.get_user_interactions('u1', window_days=7, max_count=10), [])
+        self.assertEqual([c for c in service.db.calls if c[0] == 'stream'], [('stream', True)])
+
+    def test_filter_legacy_interactions_sorts_newest_first(self):
+        interactions = [
+            {'id': 'a', 'timestamp': '2024-01-01T00:00:00'},
+            {'id': 'b', 'timestamp': 'May 01, 2024 at 10:00:00 AM UTC+3'},
+            {'id': 'c', 'timestamp': None},
+        ]
+        self.assertEqual([i['id'] for i in filter_legacy_interactions(interactions, None, 2)], ['b', 'a'])
+        self.assertIsNone(window_cutoff_ms(None))
+
+
+
+class TestAggregateBootstrap(unittest.TestCase):
+    """Deploy sonrası ilk etkileşim: özet yok, geçmiş timestamp_ms'siz, yeni kayıt timestamp_ms'li"""
+
+    def setUp(self):
+        now = time.time()
+        docs = {
+            f'legacy{n}': {'userId': 'u1', 'emotion': 'Üzüntü (Sadness)', 'interactionType': 'like',
+                           'postId': f'p{n}', 'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(now - (n + 1) * 3600))}
+            for n in range(4)
+        }
+        self.new = {'userId': 'u1', 'emotion': 'Neşe (Joy)', 'interactionType': 'like', 'postId': 'p9',
+                    'timestamp': 'x', 'timestamp_ms': int(now * 1000)}
+        docs['new'] = self.new
+        self.service = make_service(docs)
+        self.stored = {}
+
+        def update_emotion_aggregate(user_id, update_fn):
+            self.stored[user_id] = update_fn(self.stored.get(user_id))
+            return self.stored[user_id]
+
+        self.service.update_emotion_aggregate = update_emotion_aggregate
+
+    def test_first_interaction_seeds_from_full_history(self):
+        aggregate = record_interaction(self.service, 'u1', self.new, max_count=100)
+        self.assertEqual(aggregate['interaction_count'], 5)
+        self.assertEqual(aggregate['last_emotion'], 'Neşe (Joy)')
+        self.assertEqual(aggregate['recent_post_ids'][-1], 'p9')
+
+    def test_load_bootstraps_once(self):
+        aggregate = load_aggregate(self.service, 'u1', None, max_count=100)
+        self.assertEqual(aggregate.interaction_count, 5)
+        self.assertEqual(record_interaction(self.service, 'u1', self.new)['interaction_count'], 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import os
+import sys
+import unittest
+
+# src dizinini Python path'ine ekle
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.reccomend_service.catalog_index import CatalogIndex
+from services.reccomend_service.keyword_profile import KeywordProfile, KeywordProfileCache
+
+
+class TestKeywordProfile(unittest.TestCase):
+    def setUp(self):
+        self.index = CatalogIndex.from_posts([
+            {'id': 'p1', 'emotion': 'Neşe (Joy)', 'keywords': ['sun', 'beach']},
+            {'id': 'p2', 'emotion': 'Neşe (Joy)', 'keywords': ['sun']},
+            {'id': 'p3', 'emotion': 'Korku (Fear)', 'keywords': ['night']},
+            {'id': 'p4', 'emotion': 'Korku (Fear)', 'keywords': []}
+        ])
+
+    def test_recent_posts_weigh_more(self):
+        # p1 eski, p3 en yeni etkileşim
+        profile = KeywordProfile.from_posts(['p1', 'p3', 'missing'], self.index, decay=0.5)
+        ids = dict(zip(['sun', 'beach', 'night'], map(self.index.interner.intern, ['sun', 'beach', 'night'])))
+        self.assertGreater(profile.weights[ids['night']], profile.weights[ids['sun']])
+        self.assertAlmostEqual(sum(w * w for w in profile.weights.values()), 1.0)
+
+    def test_record_scores_match_single_scores(self):
+        profile = KeywordProfile.from_posts(['p1', 'p2'], self.index)
+        columns = self.index.columns()
+        scores = profile.score_records(columns.records)
+        for row, post_id in enumerate(columns.ids):
+            expected = profile.score_keywords(self.index.get(post_id)['keywords'])
+            self.assertAlmostEqual(scores[row], expected, msg=post_id)
+        self.assertAlmostEqual(profile.score_keywords(['night']), 0.0)
+        self.assertLessEqual(scores.max(), 1.0 + 1e-9)
+
+    def test_empty_profile_scores_zero(self):
+        profile = KeywordProfile.from_posts([], self.index)
+        self.assertFalse(profile)
+        self.assertEqual(profile.score_keywords(['sun']), 0.0)
+        self.assertFalse(profile.score_records(self.index.columns().records).any())
+
+    def test_cache_respects_ttl(self):
+        cache = KeywordProfileCache(ttl=10)
+        first = cache.get('u1', ['p1'], self.index, now=100.0)
+        self.assertIs(cache.get('u1', ['p3'], self.index, now=105.0), first)
+        self.assertIsNot(cache.get('u1', ['p3'], self.index, now=111.0), first)
+        cache.invalidate('u1')
+        self.assertIsNot(cache.get('u1', ['p1'], self.index, now=112.0), first)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import os
+import sys
+import tempfile
+import unittest
+
+# src dizinini Python path'ine ekle
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.migrate_documents import Checkpoint, DocumentMigrator, normalize_interaction, normalize_post
+from tests.fakes import FakeDb
+
+
+class TestMigrateDocuments(unittest.TestCase):
+    def test_normalizers_fill_only_missing_fields(self):
+        legacy = {'user_id': 'u1', 'content_id': 'p1', 'type': 'like', 'timestamp': '2024-01-01T00:00:00.000Z'}
+        self.assertEqual(normalize_interaction(legacy), {
+            'userId': 'u1', 'postId': 'p1', 'interactionType': 'like', 'timestamp_ms': 1704067200000
+        })
+        self.assertEqual(normalize_interaction({**legacy, **normalize_interaction(legacy)}), {})
+        self.assertEqual(normalize_post({'created_at': '2024-01-01T00:00:00.000Z'}), {'timestamp_ms': 1704067200000})
+
+    def test_migration_resumes_from_checkpoint(self):
+        store = {f'd{n:02d}': {'user_id': 'u', 'timestamp': '2024-01-01T00:00:00'} for n in range(25)}
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'checkpoint.json')
+            checkpoint = Checkpoint(path)
+            checkpoint.get('userEmotionInteractions').update({'last_id': 'd09', 'scanned': 10})
+            checkpoint.save()
+
+            db = FakeDb({'userEmotionInteractions': store})
+            progress = DocumentMigrator(db, Checkpoint(path), page_size=4, workers=2).migrate('userEmotionInteractions')
+
+            self.assertTrue(progress['done'])
+            self.assertEqual(progress['scanned'], 25)
+            self.assertEqual(progress['updated'], 15)
+            self.assertNotIn('userId', store['d09'])
+            self.assertEqual(store['d24']['userId'], 'u')
+            self.assertTrue(Checkpoint(path).get('userEmotionInteractions')['done'])
+
+
+if __name__ == '__main__':
+    unittest.main()
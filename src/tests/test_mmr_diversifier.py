@@ -0,0 +1,68 @@
+import os
+import sys
+import unittest
+
+# src dizinini Python path'ine ekle
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from services.reccomend_service.algorithms.mmr_diversifier import (
+    _popcount_bytes,
+    build_keyword_bitsets,
+    jaccard_to,
+    mmr_order,
+    popcount
+)
+from services.reccomend_service.catalog_index import CatalogIndex
+
+
+class TestKeywordBitsets(unittest.TestCase):
+    def setUp(self):
+        self.index = CatalogIndex.from_posts([
+            {'id': 'a', 'emotion': 'Neşe (Joy)', 'keywords': ['sun', 'beach', 'sea']},
+            {'id': 'b', 'emotion': 'Neşe (Joy)', 'keywords': ['sun', 'beach', 'sand']},
+            {'id': 'c', 'emotion': 'Neşe (Joy)', 'keywords': ['night']},
+            {'id': 'd', 'emotion': 'Neşe (Joy)', 'keywords': []}
+        ])
+        self.columns = self.index.columns()
+
+    def test_popcount_fallback_matches(self):
+        words = np.array([[0, 1], [2 ** 64 - 1, 6]], dtype=np.uint64)
+        self.assertEqual(popcount(words).tolist(), [1, 66])
+        self.assertEqual(_popcount_bytes(words).tolist(), [1, 66])
+
+    def test_jaccard_matches_keyword_sets(self):
+        bits = self.columns.keyword_bits
+        counts = popcount(bits)
+        row = self.columns.rows['a']
+        similarity = jaccard_to(bits, counts, row)
+        expected = {'a': 1.0, 'b': 2 / 4, 'c': 0.0, 'd': 0.0}
+        for post_id, value in expected.items():
+            self.assertAlmostEqual(similarity[self.columns.rows[post_id]], value, msg=post_id)
+
+    def test_colliding_ids_share_a_bit(self):
+        bits = build_keyword_bitsets(2, {3: np.array([0]), 3 + 128: np.array([1])}, n_bits=128)
+        self.assertEqual(bits.shape, (2, 2))
+        self.assertTrue(np.array_equal(bits[0], bits[1]))
+
+
+class TestMmrOrder(unittest.TestCase):
+    def setUp(self):
+        # 0 ve 1 aynı keyword'lere sahip, 2 farklı
+        self.bits = build_keyword_bitsets(3, {0: np.array([0, 1]), 1: np.array([0, 1]), 2: np.array([2])})
+        self.relevance = np.array([0.9, 0.85, 0.6])
+
+    def test_near_duplicates_are_pushed_back(self):
+        self.assertEqual(mmr_order(self.relevance, self.bits, k=3, lam=0.5).tolist(), [0, 2, 1])
+
+    def test_lambda_one_is_relevance_order(self):
+        self.assertEqual(mmr_order(self.relevance, self.bits, k=3, lam=1.0).tolist(), [0, 1, 2])
+
+    def test_budget_falls_back_to_relevance(self):
+        order = mmr_order(self.relevance, self.bits, k=3, lam=0.5, budget_ms=0.0)
+        self.assertEqual(order.tolist(), [0, 1, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import os
+import sys
+import threading
+import time
+import unittest
+
+# src dizinini Python path'ine ekle
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.config import PERFORMANCE_METRICS
+from services.reccomend_service.parallel_fetch import fetch_concurrently
+from models.performance_monitor import PerformanceMonitor
+
+
+class TestFetchConcurrently(unittest.TestCase):
+    def setUp(self):
+        self.release = threading.Event()
+
+    def tearDown(self):
+        self.release.set()  # Zaman aşımına uğrayan çağrı havuzda beklemesin
+
+    def slow_call(self):
+        self.release.wait(5)
+        return 'geç'
+
+    def failing_call(self):
+        raise RuntimeError('firestore erişilemiyor')
+
+    def test_results_and_timings(self):
+        results, timings = fetch_concurrently({'a': lambda: 1, 'b': lambda: [2]})
+        self.assertEqual(results, {'a': 1, 'b': [2]})
+        self.assertEqual(set(timings), {'a', 'b'})
+
+    def test_timeout_returns_default(self):
+        started = time.perf_counter()
+        results, timings = fetch_concurrently(
+            {'slow': self.slow_call, 'fast': lambda: 'hızlı'},
+            defaults={'slow': []},
+            timeouts={'slow': 0.05}
+        )
+        self.assertLess(time.perf_counter() - started, 1.0)
+        self.assertEqual(results, {'slow': [], 'fast': 'hızlı'})
+        self.assertGreaterEqual(timings['slow'], 0.05)
+
+    def test_default_timeout_applies_to_all_calls(self):
+        results, _ = fetch_concurrently({'slow': self.slow_call}, default_timeout=0.05)
+        self.assertEqual(results, {'slow': None})
+
+    def test_exception_returns_default(self):
+        results, timings = fetch_concurrently(
+            {'broken': self.failing_call, 'missing': self.failing_call, 'ok': lambda: 3},
+            defaults={'broken': {}}
+        )
+        self.assertEqual(results, {'broken': {}, 'missing': None, 'ok': 3})
+        self.assertIn('broken', timings)
+
+
+class TestPerformanceMonitor(unittest.TestCase):
+    def test_source_timings_window_and_average(self):
+        monitor = PerformanceMonitor()
+        window = PERFORMANCE_METRICS['metric_window_size']
+        for i in range(window + 10):
+            monitor.record_source_timings({'posts': float(i)})
+        self.assertEqual(len(monitor.source_timings['posts']), window)
+        self.assertAlmostEqual(monitor.get_source_timings()['posts'], sum(range(10, window + 10)) / window)
+
+    def test_concurrent_recording(self):
+        monitor = PerformanceMonitor()
+
+        def record():
+            for _ in range(2000):
+                monitor.record_source_timings({'posts': 1.0, 'history': 2.0})
+                monitor._update_metrics('error_rates', 1.0)
+
+        threads = [threading.Thread(target=record) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(monitor.get_source_timings(), {'posts': 1.0, 'history': 2.0})
+        self.assertEqual(len(monitor.metrics['error_rates']), PERFORMANCE_METRICS['metric_window_size'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import os
+import sys
+import unittest
+
+# src dizinini Python path'ine ekle
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.reccomend_service.post_catalog import PostCatalog
+from tests.fakes import FakeDb, snapshot_change as change
+
+
+class FakePostService:
+    def __init__(self, db):
+        self.db = db
+
+    def _doc_to_post(self, doc):
+        post = doc.to_dict()
+        post['id'] = doc.id
+        return post
+
+
+class TestPostCatalog(unittest.TestCase):
+    def test_polling_applies_only_changed_documents(self):
+        store = {
+            'a': {'emotion': 'Neşe (Joy)', 'updated_at': '2025-01-01T00:00:00.000000Z'},
+            'b': {'emotion': 'Aşk (Love)', 'updated_at': '2025-01-02T00:00:00.000000Z'}
+        }
+        service = FakePostService(FakeDb({'posts': store}))
+        catalog = PostCatalog(service, poll_interval=3600).start()
+        self.assertEqual(catalog.mode, 'polling')
+        self.assertEqual({p['id'] for p in catalog.get_posts()}, {'a', 'b'})
+
+        seen = []
+        catalog.add_listener(lambda upserted, removed: seen.append(([p['id'] for p in upserted], removed)))
+        seen.clear()
+
+        store['c'] = {'emotion': 'Korku (Fear)', 'updated_at': '2025-01-03T00:00:00.000000Z'}
+        store['a'] = {'emotion': 'Neşe (Joy)', 'updated_at': '2025-01-04T00:00:00.000000Z', 'is_deleted': True}
+        catalog._poll_changes()
+        catalog.stop()
+
+        self.assertEqual({p['id'] for p in catalog.get_posts()}, {'b', 'c'})
+        self.assertEqual(seen, [(['c'], ['a'])])
+
+    def test_snapshot_changes_update_catalog(self):
+        db = FakeDb(snapshot=True)
+        catalog = PostCatalog(FakePostService(db))
+        catalog.start(ready_timeout=0)
+        self.assertEqual(catalog.mode, 'snapshot')
+
+        db.emit('posts', [change('ADDED', 'x', {'emotion': 'Öfke (Anger)'}),
+                          change('ADDED', 'y', {'emotion': 'Aşk (Love)'})])
+        version = catalog.version
+        db.emit('posts', [change('MODIFIED', 'x', {'emotion': 'Neşe (Joy)'}),
+                          change('REMOVED', 'y')])
+
+        self.assertGreater(catalog.version, version)
+        self.assertEqual(len(catalog), 1)
+        self.assertEqual(catalog.get_post('x')['emotion'], 'Neşe (Joy)')
+
+    def test_snapshot_treats_soft_deleted_posts_as_removals(self):
+        db = FakeDb(snapshot=True)
+        catalog = PostCatalog(FakePostService(db))
+        catalog.start(ready_timeout=0)
+
+        db.emit('posts', [change('ADDED', 'x', {'emotion': 'Öfke (Anger)'}),
+                          change('ADDED', 'z', {'emotion': 'Aşk (Love)', 'is_deleted': True})])
+        self.assertIsNone(catalog.get_post('z'))
+        db.emit('posts', [change('MODIFIED', 'x', {'emotion': 'Öfke (Anger)', 'is_deleted': True})])
+
+        self.assertEqual(len(catalog), 0)
+        self.assertEqual(catalog.get_posts(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
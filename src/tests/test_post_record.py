@@ -0,0 +1,57 @@
+import os
+import sys
+import unittest
+
+# src dizinini Python path'ine ekle
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.reccomend_service.catalog_index import CatalogIndex
+from services.reccomend_service.post_record import KeywordInterner, PostRecord
+
+
+class TestPostRecord(unittest.TestCase):
+    def test_from_post_keeps_compact_fields(self):
+        interner = KeywordInterner()
+        post = {
+            'id': 'p1',
+            'emotion': 'Şaşkınlık (Surprise)',
+            'keywords': ['deniz', 'güneş', 'deniz'],
+            'likes': ['u1', 'u2'],
+            'comments': [{'text': 'çok güzel'}, {'text': 'harika'}, {'text': '!'}],
+            'views': 10
+        }
+        record = PostRecord.from_post(post, 1714564800.0, interner)
+        self.assertEqual(record.emotion_code, 5)
+        self.assertEqual(record.emotion, 'Şaşkınlık (Surprise)')
+        self.assertEqual(record.keyword_ids, interner.lookup(['güneş', 'deniz']))
+        self.assertEqual(len(record.keyword_ids), 2)
+        self.assertEqual((record.likes, record.comments, record.views), (2, 3, 10))
+        self.assertEqual(record.popularity, 15)
+        self.assertFalse(hasattr(record, '__dict__'))
+
+    def test_unknown_emotion_and_comment_count_field(self):
+        record = PostRecord.from_post({'id': 'p2', 'emotion': 'nötr', 'commentsCount': 4}, 0.0, KeywordInterner())
+        self.assertEqual(record.emotion_code, -1)
+        self.assertIsNone(record.emotion)
+        self.assertEqual(record.comments, 4)
+
+    def test_interner_ids_are_stable(self):
+        interner = KeywordInterner()
+        first = interner.intern('a')
+        interner.intern_all(['b', 'c'])
+        self.assertEqual(interner.intern('a'), first)
+        self.assertEqual(interner.lookup(['a', 'yok']), frozenset([first]))
+        self.assertEqual(len(interner), 3)
+
+    def test_index_materializes_full_documents(self):
+        post = {'id': 'p1', 'emotion': 'Neşe (Joy)', 'comments': [{'text': 'x'}]}
+        index = CatalogIndex.from_posts([post])
+        record = index.record('p1')
+        self.assertIsInstance(record, PostRecord)
+        self.assertIs(index.materialize([record])[0], post)
+        index.apply([], ['p1'])
+        self.assertEqual(index.materialize([record]), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import os
+import sys
+import unittest
+
+# src dizinini Python path'ine ekle
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.user_history import UserHistory
+from models.emotion_analyzer import EmotionAnalyzer
+from services.reccomend_service.algorithms.emotion_loop_detector import detect_emotion_loop
+
+JOY = "Neşe (Joy)"
+SADNESS = "Üzüntü (Sadness)"
+LOVE = "Aşk (Love)"
+NOW = 1_700_000_000.0
+DAY = 86400
+
+
+def interaction(emotion, age_days, interaction_type=None, confidence=0.5):
+    return {
+        'emotion': emotion,
+        'interactionType': interaction_type,
+        'confidence': confidence,
+        'timestamp_ms': int((NOW - age_days * DAY) * 1000)
+    }
+
+
+class TestUserHistory(unittest.TestCase):
+    def setUp(self):
+        # Bilerek zaman sırası dışında verilir
+        self.interactions = [
+            interaction(SADNESS, 3),
+            interaction(JOY, 0.5, 'like'),
+            interaction(LOVE, 20, 'dislike'),
+            {'emotion': JOY, 'timestamp': 'geçersiz'},
+            interaction(JOY, 1.5),
+        ]
+        self.history = UserHistory.from_interactions(self.interactions)
+
+    def test_sorted_by_time_with_undated_first(self):
+        self.assertTrue(self.history.dated[1:].all())
+        self.assertFalse(self.history.dated[0])
+        self.assertEqual(self.history.current_emotion(), JOY)
+
+    def test_emotion_weights_apply_type_confidence_and_recency(self):
+        weights = self.history.emotion_weights(recent_days=7, now=NOW)
+        # like (0.1) x 0.5 x 2.0 + 1.0 x 0.5 x 1.5 + zamansız 1.0 x 0.5
+        self.assertAlmostEqual(weights[JOY], 0.1 + 0.75 + 0.5)
+        self.assertAlmostEqual(weights[SADNESS], 0.75)
+        self.assertAlmostEqual(weights[LOVE], -0.05 * 0.5 * 0.5)
+        self.assertEqual(self.history.dislike_emotions(), {LOVE})
+
+    def test_transitions_only_use_dated_interactions(self):
+        self.assertEqual(self.history.transition_counts(), {
+            (LOVE, SADNESS): 1, (SADNESS, JOY): 1, (JOY, JOY): 1
+        })
+
+    def test_analyzer_accepts_list_or_history(self):
+        analyzer = EmotionAnalyzer()
+        self.assertEqual(analyzer.analyze_transition_patterns(self.interactions),
+                         analyzer.analyze_transition_patterns(self.history))
+        self.assertEqual(analyzer.get_current_emotion_and_transitions(self.history)[0], JOY)
+
+    def test_detect_loop(self):
+        history = UserHistory.from_interactions(
+            [interaction(SADNESS, 10)] + [interaction(JOY, 5 - i * 0.1) for i in range(9)]
+        )
+        result = history.detect_loop(window=10, threshold=0.8, now=NOW)
+        self.assertTrue(result['loop'])
+        self.assertEqual(result['count'], 9)
+        self.assertAlmostEqual(result['days'], 5)
+        self.assertFalse(detect_emotion_loop(history, window=10, threshold=0.95)['loop'])
+
+
+if __name__ == '__main__':
+    unittest.main()
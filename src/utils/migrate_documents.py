@@ -0,0 +1,213 @@
+"""
+migrate_documents.py
+userEmotionInteractions ve posts belgelerine kanonik alanları geriye dönük yazan,
+kaldığı yerden devam edebilen toplu göç aracı.
+
+- Etkileşimler: user_id/content_id/type şemasındaki kayıtlara userId/postId/interactionType,
+  tüm kayıtlara epoch milisaniye timestamp_ms alanı eklenir.
+- Postlar: timestamp veya created_at alanından timestamp_ms eklenir.
+
+Belgeler belge id sırasıyla sayfa sayfa okunur; her sayfa tek bir toplu yazma (batch) ile
+güncellenir, batch'ler sınırlı sayıda thread ile paralel commit edilir. Tamamlanan son
+sayfanın id'si checkpoint dosyasına yazılır; araç yeniden çalıştırıldığında oradan devam eder.
+Zaten kanonik olan belgelere yazma yapılmaz, bu yüzden tekrar çalıştırmak güvenlidir.
+
+Kullanım:
+    python utils/migrate_documents.py --collections userEmotionInteractions posts --workers 4
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+# Add the project root directory to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+sys.path.append(project_root)
+
+from config import COLLECTION_INTERACTIONS, COLLECTION_POSTS
+from services.reccomend_service.date_utils import to_epoch
+
+PAGE_SIZE = 400  # Firestore batch başına en fazla 500 yazma
+DEFAULT_WORKERS = 4
+DEFAULT_CHECKPOINT = os.path.join(project_root, 'logs', 'migration_checkpoint.json')
+
+# Eski şema alanı -> kanonik alan
+INTERACTION_FIELD_ALIASES = {
+    'userId': 'user_id',
+    'postId': 'content_id',
+    'interactionType': 'type',
+}
+
+
+def to_epoch_ms(value: Any) -> Optional[int]:
+    epoch = to_epoch(value)
+    return int(round(epoch * 1000)) if epoch is not None else None
+
+
+def normalize_interaction(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Etkileşim belgesinde eksik kanonik alanları döndürür (değişiklik yoksa boş sözlük)"""
+    updates = {}
+    for canonical, legacy in INTERACTION_FIELD_ALIASES.items():
+        if data.get(canonical) is None and data.get(legacy) is not None:
+            updates[canonical] = data[legacy]
+    if data.get('timestamp_ms') is None:
+        ts_ms = to_epoch_ms(data.get('timestamp'))
+        if ts_ms is not None:
+            updates['timestamp_ms'] = ts_ms
+    return updates
+
+
+def normalize_post(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Post belgesinde eksik kanonik alanları döndürür (değişiklik yoksa boş sözlük)"""
+    if data.get('timestamp_ms') is not None:
+        return {}
+    ts_ms = to_epoch_ms(data.get('timestamp') or data.get('created_at'))
+    return {'timestamp_ms': ts_ms} if ts_ms is not None else {}
+
+
+NORMALIZERS: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+    COLLECTION_INTERACTIONS: normalize_interaction,
+    COLLECTION_POSTS: normalize_post,
+}
+
+
+class Checkpoint:
+    """Koleksiyon başına ilerlemeyi JSON dosyasında tutar"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.state: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.state = json.load(f)
+
+    def get(self, collection: str) -> Dict[str, Any]:
+        return self.state.setdefault(collection, {'last_id': None, 'scanned': 0, 'updated': 0, 'done': False})
+
+    def save(self) -> None:
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+class DocumentMigrator:
+    def __init__(self, db, checkpoint: Checkpoint, page_size: int = PAGE_SIZE,
+                 workers: int = DEFAULT_WORKERS, dry_run: bool = False):
+        self.db = db
+        self.checkpoint = checkpoint
+        self.page_size = page_size
+        self.workers = max(1, workers)
+        self.dry_run = dry_run
+
+    def _pages(self, collection: str, last_id: Optional[str]):
+        """Belgeleri id sırasıyla sayfa sayfa okur"""
+        ref = self.db.collection(collection)
+        cursor = None
+        if last_id:
+            snapshot = ref.document(last_id).get()
+            cursor = snapshot if snapshot.exists else None
+        while True:
+            query = ref.order_by('__name__').limit(self.page_size)
+            if cursor is not None:
+                query = query.start_after(cursor)
+            docs = list(query.stream())
+            if not docs:
+                return
+            yield docs
+            cursor = docs[-1]
+            if len(docs) < self.page_size:
+                return
+
+    def _save_checkpoint(self) -> None:
+        # Deneme çalıştırması gerçek göçün ilerlemesini etkilemez
+        if not self.dry_run:
+            self.checkpoint.save()
+
+    def _commit(self, writes) -> int:
+        if self.dry_run or not writes:
+            return len(writes)
+        batch = self.db.batch()
+        for reference, updates in writes:
+            batch.update(reference, updates)
+        batch.commit()
+        return len(writes)
+
+    def migrate(self, collection: str) -> Dict[str, Any]:
+        normalize = NORMALIZERS[collection]
+        progress = self.checkpoint.get(collection)
+        if progress['done']:
+            print(f"[Migration] {collection}: checkpoint'e göre tamamlanmış, atlanıyor")
+            return progress
+
+        start = time.time()
+        scanned_at_start = progress['scanned']
+        # Sırayla beklenen (last_id, scanned, future) kayıtları; checkpoint sadece
+        # kendisinden önceki tüm sayfalar commit edildiğinde ilerletilir.
+        in_flight = deque()
+
+        def drain(block_until: int) -> None:
+            while in_flight and (len(in_flight) > block_until or in_flight[0][2].done()):
+                last_id, scanned, future = in_flight.popleft()
+                progress['updated'] += future.result()
+                progress['last_id'] = last_id
+                progress['scanned'] += scanned
+                self._save_checkpoint()
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='migrate') as executor:
+            for docs in self._pages(collection, progress['last_id']):
+                writes = []
+                for doc in docs:
+                    updates = normalize(doc.to_dict() or {})
+                    if updates:
+                        writes.append((doc.reference, updates))
+                in_flight.append((docs[-1].id, len(docs), executor.submit(self._commit, writes)))
+                # Bellekte en fazla workers*2 sayfa bekletilir
+                drain(self.workers * 2)
+                elapsed = time.time() - start
+                scanned = progress['scanned'] - scanned_at_start
+                print(f"[Migration] {collection}: {progress['scanned']} belge tarandı, "
+                      f"{progress['updated']} güncellendi ({scanned / elapsed if elapsed else 0:.0f} belge/sn)")
+            drain(0)
+
+        progress['done'] = True
+        self._save_checkpoint()
+        elapsed = time.time() - start
+        scanned = progress['scanned'] - scanned_at_start
+        print(f"[Migration] {collection} tamamlandı: {scanned} belge {elapsed:.1f} sn "
+              f"({scanned / elapsed if elapsed else 0:.0f} belge/sn), toplam {progress['updated']} güncelleme")
+        if collection == COLLECTION_INTERACTIONS and not self.dry_run:
+            print("[Migration] Eski etkileşim taramasını kapatmak için API'yi INTERACTIONS_MIGRATED=1 ile başlatın")
+        return progress
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Etkileşim ve post belgelerine kanonik alanları yazar")
+    parser.add_argument('--collections', nargs='+', default=list(NORMALIZERS), choices=list(NORMALIZERS))
+    parser.add_argument('--page-size', type=int, default=PAGE_SIZE)
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS)
+    parser.add_argument('--checkpoint', default=DEFAULT_CHECKPOINT)
+    parser.add_argument('--reset', action='store_true', help="Checkpoint'i yok sayıp baştan başlar")
+    parser.add_argument('--dry-run', action='store_true', help="Yazma yapmadan sadece sayar")
+    args = parser.parse_args(argv)
+
+    from firebase_admin import firestore
+    from services.firebase_services.firebase_base import initialize_firebase_app
+
+    initialize_firebase_app()
+    checkpoint = Checkpoint(args.checkpoint)
+    if args.reset:
+        checkpoint.state = {}
+    migrator = DocumentMigrator(firestore.client(), checkpoint, min(args.page_size, 500),
+                                args.workers, args.dry_run)
+    for collection in args.collections:
+        migrator.migrate(collection)
+
+
+if __name__ == "__main__":
+    main()
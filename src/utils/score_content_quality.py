@@ -0,0 +1,48 @@
+"""
+score_content_quality.py
+Tüm postların kalite, yenilik ve popülerlik skorlarını hesaplayıp postMetrics'e yazan toplu iş.
+
+Postlar tek seferde okunur, skorlar numpy ile birlikte hesaplanır (bkz.
+services/reccomend_service/content_quality.py) ve belgeler en fazla 500 yazmalık
+batch'lerle merge edilerek yazılır. Uygulama skorları CONTENT_QUALITY_JOB_INTERVAL
+kapalıyken açılışta postMetrics'ten okur; cron ile periyodik çalıştırılması önerilir.
+
+Kullanım:
+    python utils/score_content_quality.py [--batch-size 400] [--dry-run]
+"""
+import argparse
+import os
+import sys
+import time
+
+# Add the project root directory to Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+sys.path.append(project_root)
+
+from services.reccomend_service.content_quality import BATCH_SIZE, ContentQualityJob
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Post kalite skorlarını hesaplayıp postMetrics'e yazar")
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+    parser.add_argument('--dry-run', action='store_true', help="Yazma yapmadan sadece skorlar")
+    args = parser.parse_args(argv)
+
+    from firebase_admin import firestore
+    from services.firebase_services.firebase_base import initialize_firebase_app
+
+    initialize_firebase_app()
+    job = ContentQualityJob(firestore.client(), args.batch_size, args.dry_run)
+    start = time.time()
+    posts = job.load_posts()
+    print(f"[ContentQuality] {len(posts)} post okundu ({time.time() - start:.1f} sn)")
+    scores = job.run(posts)
+    if len(scores):
+        print(f"[ContentQuality] Ortalama kalite {scores.quality.mean():.3f}, "
+              f"en yüksek {scores.quality.max():.3f}")
+    print(f"[ContentQuality] Tamamlandı: {len(scores)} post, {time.time() - start:.1f} sn"
+          f"{' (deneme, yazma yapılmadı)' if args.dry_run else ''}")
+
+
+if __name__ == "__main__":
+    main()